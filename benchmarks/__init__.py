@@ -0,0 +1,13 @@
+"""Offline benchmarks of the SDK's own overhead.
+
+The benchmarks run real Portia clients against a scripted fake model and in-process tools, so they
+need no network access or API keys and measure only the time spent in the framework: rendering
+planning prompts, executing plans step by step, compiling execution agent graphs, round trips to
+each storage class and connecting to a local stdio MCP server.
+
+Usage:
+
+python -m benchmarks run --output results.json - run every benchmark, saving the results
+python -m benchmarks run --filter storage. - run the benchmarks whose names start with a prefix
+python -m benchmarks compare baseline.json results.json - fail if any benchmark has regressed
+"""
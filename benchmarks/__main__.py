@@ -0,0 +1,82 @@
+"""Command line interface for the benchmarks."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import click
+
+from benchmarks.runner import (
+    BenchmarkRun,
+    find_regressions,
+    format_results,
+    run_benchmarks,
+    select_benchmarks,
+)
+
+
+@click.group()
+def cli() -> None:
+    """Benchmark the SDK's overhead offline, e.g. `python -m benchmarks run --iterations 50`."""
+
+
+@cli.command()
+@click.option(
+    "--filter",
+    "patterns",
+    multiple=True,
+    help="Only run benchmarks whose names start with this prefix. Can be repeated.",
+)
+@click.option("--iterations", default=20, show_default=True, help="Timed calls per benchmark.")
+@click.option("--warmup", default=2, show_default=True, help="Untimed calls per benchmark.")
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Save the results as JSON to this file.",
+)
+@click.option(
+    "--baseline",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Show the change in median time from results saved by an earlier run.",
+)
+def run(
+    patterns: tuple[str, ...],
+    iterations: int,
+    warmup: int,
+    output: Path | None,
+    baseline: Path | None,
+) -> None:
+    """Run the benchmarks."""
+    names = select_benchmarks(patterns)
+    if not names:
+        raise click.UsageError(f"No benchmarks match {', '.join(patterns)}")
+    results = run_benchmarks(names, iterations=iterations, warmup=warmup)
+    click.echo(format_results(results, BenchmarkRun.load(baseline) if baseline else None))
+    if output:
+        results.save(output)
+
+
+@cli.command()
+@click.argument("baseline", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.argument("current", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option(
+    "--threshold",
+    default=0.2,
+    show_default=True,
+    help="The fractional slowdown in median time counted as a regression.",
+)
+def compare(baseline: Path, current: Path, threshold: float) -> None:
+    """Compare two sets of results, exiting with an error if any benchmark regressed."""
+    baseline_run = BenchmarkRun.load(baseline)
+    current_run = BenchmarkRun.load(current)
+    click.echo(format_results(current_run, baseline_run))
+    regressions = find_regressions(baseline_run, current_run, threshold)
+    for regression in regressions:
+        click.echo(f"Regression: {regression.name} is {regression.ratio:.2f}x slower", err=True)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    cli()
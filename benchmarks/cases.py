@@ -0,0 +1,301 @@
+"""The benchmarks, each timing one hot path of the SDK against in-process fakes.
+
+A benchmark is registered with the @benchmark decorator on a context manager which sets up
+everything it needs and yields the function to time. Setup and teardown are not timed.
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from pydantic import SecretStr
+
+from benchmarks.fakes import AddTool, EchoTool, NoOpTelemetry, ScriptedGenerativeModel, make_tools
+from portia.builder.plan_builder_v2 import PlanBuilderV2
+from portia.builder.reference import Input, StepOutput
+from portia.config import (
+    Config,
+    ExecutionAgentType,
+    GenerativeModelsConfig,
+    LogLevel,
+    StorageClass,
+)
+from portia.end_user import EndUser
+from portia.execution_agents.default_execution_agent import get_default_execution_graph
+from portia.execution_agents.one_shot_agent import get_one_shot_graph
+from portia.mcp_session import close_mcp_session_pools
+from portia.plan import Plan, PlanContext, PlanUUID, Step, Variable
+from portia.plan_run import PlanRun, PlanRunState
+from portia.planning_agents.context import render_prompt_insert_defaults
+from portia.portia import Portia
+from portia.tool import ToolRunContext
+from portia.tool_registry import McpToolRegistry, ToolRegistry
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from portia.builder.plan_v2 import PlanV2
+    from portia.tool import Tool
+
+BENCHMARKS: dict[str, Callable[[], Any]] = {}
+"""The registered benchmarks, keyed by name."""
+
+MCP_SERVER = Path(__file__).with_name("mcp_server.py")
+
+
+class BenchmarkSkippedError(Exception):
+    """Raised while setting up a benchmark which can't run in this environment."""
+
+
+def benchmark(name: str) -> Callable[[Callable[[], Iterator[Callable[[], object]]]], Any]:
+    """Register a benchmark.
+
+    Args:
+        name (str): The name of the benchmark. Dotted prefixes group related benchmarks so they
+            can be selected together, e.g. `storage.`.
+
+    """
+
+    def decorator(setup: Callable[[], Iterator[Callable[[], object]]]) -> Any:  # noqa: ANN401
+        wrapped = contextmanager(setup)
+        BENCHMARKS[name] = wrapped
+        return wrapped
+
+    return decorator
+
+
+def make_portia(
+    model: ScriptedGenerativeModel,
+    tools: list[Tool] | None = None,
+    **config_kwargs: Any,
+) -> Portia:
+    """Make a Portia client which only uses the scripted model and in-process tools."""
+    config = Config.from_default(
+        models=GenerativeModelsConfig(
+            default_model=model,
+            planning_model=model,
+            execution_model=model,
+            introspection_model=model,
+            summarizer_model=model,
+        ),
+        openai_api_key=SecretStr("unused"),
+        default_log_level=LogLevel.ERROR,
+        llm_redis_cache_url=None,
+        **{"storage_class": StorageClass.MEMORY, **config_kwargs},
+    )
+    return Portia(
+        config=config,
+        tools=ToolRegistry(tools if tools is not None else [AddTool(), EchoTool()]),
+        telemetry=NoOpTelemetry(),
+    )
+
+
+def run_to_completion(portia: Portia, plan: Plan | PlanV2) -> PlanRun:
+    """Run a plan, raising if it doesn't complete so a broken benchmark can't pass as fast."""
+    plan_run = portia.run_plan(plan)
+    if plan_run.state != PlanRunState.COMPLETE:
+        raise RuntimeError(f"Benchmark plan run ended in state {plan_run.state}")
+    return plan_run
+
+
+def llm_steps(count: int) -> list[Step]:
+    """Make a chain of LLM tool steps, each taking the previous step's output as input."""
+    return [
+        Step(
+            task=f"Summarise part {i}",
+            tool_id="llm_tool",
+            inputs=[Variable(name=f"$output_{i - 1}")] if i else [],
+            output=f"$output_{i}",
+        )
+        for i in range(count)
+    ]
+
+
+@benchmark("planning.render_prompt.50_tools")
+def render_planning_prompt() -> Iterator[Callable[[], object]]:
+    """Render the planning agent's prompt for a registry of 50 tools and 5 example plans."""
+    tools = make_tools(50)
+    examples = [
+        Plan(plan_context=PlanContext(query=f"Example {i}", tool_ids=[]), steps=llm_steps(3))
+        for i in range(5)
+    ]
+    end_user = EndUser(external_id="benchmark")
+    yield lambda: render_prompt_insert_defaults(
+        "Summarise the news", tools, end_user, examples, None, None
+    )
+
+
+@benchmark("planning.plan")
+def plan_query() -> Iterator[Callable[[], object]]:
+    """Plan a query end to end, from tool selection to saving the plan."""
+    steps = [
+        Step(task=f"Echo part {i}", tool_id=f"echo_tool_{i}", output=f"$output_{i}")
+        for i in range(3)
+    ]
+    portia = make_portia(ScriptedGenerativeModel(steps=steps), tools=make_tools(20))
+    yield lambda: portia.plan("Summarise the news")
+    portia.close()
+
+
+@benchmark("execution.run_plan.10_llm_steps")
+def run_llm_steps() -> Iterator[Callable[[], object]]:
+    """Run a plan of 10 LLM tool steps, measuring the per-step overhead of execution."""
+    portia = make_portia(ScriptedGenerativeModel())
+    plan = Plan(plan_context=PlanContext(query="Summarise", tool_ids=[]), steps=llm_steps(10))
+    yield lambda: run_to_completion(portia, plan)
+    portia.close()
+
+
+@benchmark("execution.one_shot_agent.tool_step")
+def run_one_shot_agent() -> Iterator[Callable[[], object]]:
+    """Run a tool step through the one shot agent, reusing its compiled graph after warmup."""
+    portia = make_portia(
+        ScriptedGenerativeModel(tool_args={"Add_Tool": {"a": 1, "b": 2}}),
+        execution_agent_type=ExecutionAgentType.ONE_SHOT,
+    )
+    plan = Plan(
+        plan_context=PlanContext(query="Add 1 and 2", tool_ids=["add_tool"]),
+        steps=[Step(task="Add 1 and 2", tool_id="add_tool", output="$sum")],
+    )
+    yield lambda: run_to_completion(portia, plan)
+    portia.close()
+
+
+@benchmark("execution.compile_graphs")
+def compile_graphs() -> Iterator[Callable[[], object]]:
+    """Compile the default and one shot execution agents' graphs, as for a first step."""
+
+    def compile_all() -> None:
+        get_default_execution_graph.cache_clear()
+        get_one_shot_graph.cache_clear()
+        for verified_args in (False, True):
+            get_default_execution_graph(verified_args)
+        for sync in (True, False):
+            get_one_shot_graph(sync)
+
+    yield compile_all
+    get_default_execution_graph.cache_clear()
+    get_one_shot_graph.cache_clear()
+
+
+@benchmark("execution.plan_v2.5_steps")
+def run_plan_v2() -> Iterator[Callable[[], object]]:
+    """Run a PlanBuilderV2 plan mixing tool, function and LLM steps."""
+    portia = make_portia(ScriptedGenerativeModel())
+    plan = (
+        PlanBuilderV2("Add numbers and describe the result")
+        .input(name="number", description="The number to start from", default_value=1)
+        .invoke_tool_step(step_name="add", tool="add_tool", args={"a": Input("number"), "b": 2})
+        .function_step(
+            step_name="double",
+            function=lambda total: total * 2,
+            args={"total": StepOutput("add")},
+        )
+        .invoke_tool_step(
+            step_name="echo",
+            tool="echo_tool",
+            args={"text": StepOutput("double")},
+        )
+        .llm_step(step_name="describe", task="Describe the number", inputs=[StepOutput("echo")])
+        .function_step(
+            step_name="length",
+            function=lambda text: len(text),
+            args={"text": StepOutput("describe")},
+        )
+        .build()
+    )
+    yield lambda: run_to_completion(portia, plan)
+    portia.close()
+
+
+def _storage_round_trip(storage_class: StorageClass) -> Iterator[Callable[[], object]]:
+    """Save and load a plan, plan run and end user with a storage class."""
+    with tempfile.TemporaryDirectory() as storage_dir:
+        portia = make_portia(
+            ScriptedGenerativeModel(),
+            storage_class=storage_class,
+            storage_dir=storage_dir,
+        )
+        storage = portia.storage
+        end_user = EndUser(external_id="benchmark")
+        plan = Plan(plan_context=PlanContext(query="Summarise", tool_ids=[]), steps=llm_steps(5))
+
+        def round_trip() -> None:
+            plan_copy = plan.model_copy(update={"id": PlanUUID()})
+            storage.save_plan(plan_copy)
+            storage.save_end_user(end_user)
+            plan_run = PlanRun(plan_id=plan_copy.id, end_user_id=end_user.external_id)
+            storage.save_plan_run(plan_run)
+            storage.get_plan(plan_copy.id)
+            storage.get_plan_run(plan_run.id)
+            storage.get_end_user(end_user.external_id)
+
+        yield round_trip
+        portia.close()
+
+
+@benchmark("storage.memory.round_trip")
+def memory_storage() -> Iterator[Callable[[], object]]:
+    """Round trip through InMemoryStorage."""
+    yield from _storage_round_trip(StorageClass.MEMORY)
+
+
+@benchmark("storage.disk.round_trip")
+def disk_storage() -> Iterator[Callable[[], object]]:
+    """Round trip through DiskFileStorage."""
+    yield from _storage_round_trip(StorageClass.DISK)
+
+
+@benchmark("storage.sqlite.round_trip")
+def sqlite_storage() -> Iterator[Callable[[], object]]:
+    """Round trip through SQLiteStorage."""
+    yield from _storage_round_trip(StorageClass.SQLITE)
+
+
+@benchmark("storage.cloud.round_trip")
+def cloud_storage() -> Iterator[Callable[[], object]]:
+    """Portia Cloud storage needs network access, so it is never benchmarked offline."""
+    raise BenchmarkSkippedError("Portia Cloud storage needs network access")
+    yield  # pragma: no cover
+
+
+@benchmark("mcp.stdio.connect_and_list_tools")
+def mcp_connect() -> Iterator[Callable[[], object]]:
+    """Start a local stdio MCP server, open a session and list its tools."""
+
+    def connect() -> None:
+        McpToolRegistry.from_stdio_connection(
+            server_name="benchmark",
+            command=sys.executable,
+            args=[str(MCP_SERVER)],
+        ).get_tools()
+        close_mcp_session_pools()
+
+    yield connect
+
+
+@benchmark("mcp.stdio.pooled_tool_call")
+def mcp_tool_call() -> Iterator[Callable[[], object]]:
+    """Call a tool on a local stdio MCP server through a pooled session."""
+    registry = McpToolRegistry.from_stdio_connection(
+        server_name="benchmark",
+        command=sys.executable,
+        args=[str(MCP_SERVER)],
+    )
+    tool = registry.get_tool("mcp:benchmark:add_one")
+    portia = make_portia(ScriptedGenerativeModel(), tools=[tool])
+    plan = Plan(plan_context=PlanContext(query="Add one", tool_ids=[tool.id]), steps=[])
+    plan_run = portia.create_plan_run(plan)
+    ctx = ToolRunContext(
+        end_user=portia.initialize_end_user(),
+        plan_run=plan_run,
+        plan=plan,
+        config=portia.config,
+        clarifications=[],
+    )
+    yield lambda: tool.run(ctx, input_number=1)
+    portia.close()
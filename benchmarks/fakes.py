@@ -0,0 +1,217 @@
+"""Deterministic fakes used to benchmark the SDK without network access.
+
+ScriptedGenerativeModel answers every model call instantly from a script, so that benchmarks
+measure the time spent in the framework rather than waiting on an LLM:
+
+- Structured responses are looked up by the name of the schema requested, e.g. the steps of the
+  plan returned for StepsOrError.
+- Text responses, e.g. from the LLM tool and the final output summarizer, return fixed text.
+- When tools are bound to its LangChain client, it calls the first bound tool with scripted
+  arguments, so execution agents run their full tool calling graphs.
+"""
+
+from __future__ import annotations
+
+import itertools
+from typing import TYPE_CHECKING, Any
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import BaseModel, Field
+
+from portia.introspection_agents.introspection_agent import (
+    PreStepIntrospection,
+    PreStepIntrospectionOutcome,
+)
+from portia.model import GenerativeModel, LLMProvider, Message
+from portia.planning_agents.base_planning_agent import StepsOrError
+from portia.telemetry.telemetry_service import BaseProductTelemetry
+from portia.tool import Tool, ToolRunContext
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    from langchain_core.callbacks import CallbackManagerForLLMRun
+    from langchain_core.tools import BaseTool
+
+    from portia.model import BaseModelT
+    from portia.plan import Step
+    from portia.telemetry.views import BaseTelemetryEvent
+
+_tool_call_ids = itertools.count()
+
+
+class ScriptedChatModel(BaseChatModel):
+    """LangChain chat model which calls the first bound tool with scripted arguments.
+
+    Once a tool has been called, or if no tools are bound, it replies with fixed text.
+    """
+
+    text: str = "Done"
+    tool_args: dict[str, dict[str, Any]] = Field(default_factory=dict)
+    bound_tools: list[str] = Field(default_factory=list)
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools: Sequence[BaseTool], **_: Any) -> ScriptedChatModel:  # pyright: ignore[reportIncompatibleMethodOverride]
+        """Bind tools to the model, returning a copy which calls them."""
+        return self.model_copy(update={"bound_tools": [tool.name for tool in tools]})
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,  # noqa: ARG002
+        run_manager: CallbackManagerForLLMRun | None = None,  # noqa: ARG002
+        **_: Any,
+    ) -> ChatResult:
+        tool_name = next(iter(self.bound_tools), None)
+        if tool_name is None or any(message.type == "tool" for message in messages):
+            message = AIMessage(content=self.text)
+        else:
+            message = AIMessage(
+                content="",
+                tool_calls=[
+                    {
+                        "name": tool_name,
+                        "args": self.tool_args.get(tool_name, {}),
+                        "id": f"call_{next(_tool_call_ids)}",
+                    },
+                ],
+            )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+class ScriptedGenerativeModel(GenerativeModel):
+    """A generative model answering every call from a script, without any network access."""
+
+    provider: LLMProvider = LLMProvider.CUSTOM
+
+    def __init__(
+        self,
+        steps: list[Step] | None = None,
+        text: str = "Done",
+        tool_args: dict[str, dict[str, Any]] | None = None,
+        structured_responses: dict[str, Callable[[], BaseModel]] | None = None,
+    ) -> None:
+        """Initialize the model.
+
+        Args:
+            steps (list[Step] | None): The steps of the plan returned to the planning agent.
+            text (str): The text of every unstructured response.
+            tool_args (dict[str, dict[str, Any]] | None): The arguments to call each tool with,
+                keyed by LangChain tool name. The LLM tool is always given a task.
+            structured_responses (dict[str, Callable[[], BaseModel]] | None): Factories for
+                other structured responses, keyed by the name of the schema.
+
+        """
+        super().__init__("scripted")
+        self.steps = steps or []
+        self.text = text
+        self.structured_responses: dict[str, Callable[[], BaseModel]] = {
+            StepsOrError.__name__: lambda: StepsOrError(
+                steps=[step.model_copy(deep=True) for step in self.steps],
+                error=None,
+            ),
+            PreStepIntrospection.__name__: lambda: PreStepIntrospection(
+                outcome=PreStepIntrospectionOutcome.CONTINUE,
+                reason="Scripted",
+            ),
+            **(structured_responses or {}),
+        }
+        self._client = ScriptedChatModel(
+            text=text,
+            tool_args={"LLM_Tool": {"task": "Summarise the inputs"}, **(tool_args or {})},
+        )
+
+    def get_response(self, messages: list[Message]) -> Message:  # noqa: ARG002
+        """Return the scripted text."""
+        return Message(role="assistant", content=self.text)
+
+    def get_structured_response(
+        self,
+        messages: list[Message],  # noqa: ARG002
+        schema: type[BaseModelT],
+        **_: Any,
+    ) -> BaseModelT:
+        """Return the scripted response for the schema."""
+        return schema.model_validate(self.structured_responses[schema.__name__]())
+
+    async def aget_response(self, messages: list[Message]) -> Message:
+        """Return the scripted text."""
+        return self.get_response(messages)
+
+    async def aget_structured_response(
+        self,
+        messages: list[Message],
+        schema: type[BaseModelT],
+        **_: Any,
+    ) -> BaseModelT:
+        """Return the scripted response for the schema."""
+        return self.get_structured_response(messages, schema)
+
+    def to_langchain(self) -> BaseChatModel:
+        """Get the scripted LangChain client."""
+        return self._client
+
+
+class NoOpTelemetry(BaseProductTelemetry):
+    """Telemetry which discards every event, so benchmarks never send anything."""
+
+    def capture(self, event: BaseTelemetryEvent) -> None:
+        """Discard the event."""
+
+
+class AddToolSchema(BaseModel):
+    """Input for AddTool."""
+
+    a: int = Field(..., description="The first number to add")
+    b: int = Field(..., description="The second number to add")
+
+
+class AddTool(Tool[int]):
+    """Adds two numbers in process."""
+
+    id: str = "add_tool"
+    name: str = "Add Tool"
+    description: str = "Adds two numbers together"
+    args_schema: type[BaseModel] = AddToolSchema
+    output_schema: tuple[str, str] = ("int", "The sum of the numbers")
+
+    def run(self, _: ToolRunContext, a: int, b: int) -> int:
+        """Add the numbers."""
+        return a + b
+
+
+class EchoToolSchema(BaseModel):
+    """Input for EchoTool."""
+
+    text: str = Field(..., description="The text to echo")
+
+
+class EchoTool(Tool[str]):
+    """Returns its input in process."""
+
+    id: str = "echo_tool"
+    name: str = "Echo Tool"
+    description: str = "Returns the text it is given"
+    args_schema: type[BaseModel] = EchoToolSchema
+    output_schema: tuple[str, str] = ("str", "The text given")
+
+    def run(self, _: ToolRunContext, text: str) -> str:
+        """Echo the text."""
+        return text
+
+
+def make_tools(count: int) -> list[Tool]:
+    """Make a number of distinct in-process tools, e.g. to fill a planning prompt."""
+    return [
+        EchoTool(
+            id=f"echo_tool_{i}",
+            name=f"Echo Tool {i}",
+            description=f"Returns the text it is given, for use case number {i}",
+        )
+        for i in range(count)
+    ]
@@ -0,0 +1,25 @@
+"""A minimal stdio MCP server for the MCP benchmarks."""
+
+from __future__ import annotations
+
+from mcp.server import FastMCP
+
+server = FastMCP("benchmark", log_level="ERROR")
+
+
+@server.tool()
+def add_one(input_number: float) -> str:
+    """Add one to the input.
+
+    Args:
+        input_number: The input to add one to.
+
+    Returns:
+        The input plus one.
+
+    """
+    return str(input_number + 1)
+
+
+if __name__ == "__main__":
+    server.run(transport="stdio")
@@ -0,0 +1,197 @@
+"""Run benchmarks and compare their results across commits.
+
+Each benchmark is set up once, called a few times to warm up, then timed over a number of
+iterations. Results are written as JSON with enough metadata (commit, Python version, platform)
+to tell runs apart, and two result files can be compared to flag benchmarks whose median time
+has regressed by more than a threshold.
+"""
+
+from __future__ import annotations
+
+import platform
+import statistics
+import subprocess
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from pydantic import BaseModel, Field
+
+from benchmarks.cases import BENCHMARKS, BenchmarkSkippedError
+from portia.version import get_version
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+RESULTS_SCHEMA_VERSION = 1
+MILLISECOND = 1e-3
+
+
+class BenchmarkResult(BaseModel):
+    """The timings of a benchmark, in seconds per call."""
+
+    iterations: int = Field(default=0, description="The number of timed calls.")
+    min: float | None = Field(default=None, description="The fastest call.")
+    median: float | None = Field(default=None, description="The median call.")
+    mean: float | None = Field(default=None, description="The mean call.")
+    stdev: float | None = Field(default=None, description="The standard deviation of calls.")
+    p95: float | None = Field(default=None, description="The 95th percentile call.")
+    skipped: str | None = Field(default=None, description="Why the benchmark was skipped.")
+
+    @classmethod
+    def from_timings(cls, timings: list[float]) -> BenchmarkResult:
+        """Summarise the timings of a benchmark's calls."""
+        ordered = sorted(timings)
+        return cls(
+            iterations=len(ordered),
+            min=ordered[0],
+            median=statistics.median(ordered),
+            mean=statistics.fmean(ordered),
+            stdev=statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+            p95=ordered[min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))],
+        )
+
+
+class BenchmarkRun(BaseModel):
+    """The results of running a set of benchmarks."""
+
+    schema_version: int = RESULTS_SCHEMA_VERSION
+    metadata: dict[str, Any] = Field(default_factory=dict)
+    results: dict[str, BenchmarkResult] = Field(default_factory=dict)
+
+    def save(self, path: Path) -> None:
+        """Save the results as JSON."""
+        path.write_text(self.model_dump_json(indent=2))
+
+    @classmethod
+    def load(cls, path: Path) -> BenchmarkRun:
+        """Load results saved as JSON."""
+        return cls.model_validate_json(path.read_text())
+
+
+class Regression(BaseModel):
+    """A benchmark whose median time has grown by more than the allowed threshold."""
+
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        """How many times slower the benchmark is than the baseline."""
+        return self.current / self.baseline
+
+
+def select_benchmarks(patterns: Iterable[str] = ()) -> list[str]:
+    """Get the names of the benchmarks starting with any of the patterns, or all if none given."""
+    patterns = list(patterns)
+    return [
+        name
+        for name in BENCHMARKS
+        if not patterns or any(name.startswith(pattern) for pattern in patterns)
+    ]
+
+
+def run_benchmark(name: str, iterations: int = 20, warmup: int = 2) -> BenchmarkResult:
+    """Set up a benchmark, warm it up and time it.
+
+    Args:
+        name (str): The name of the benchmark.
+        iterations (int): The number of calls to time.
+        warmup (int): The number of untimed calls made first, e.g. to fill caches.
+
+    """
+    try:
+        with BENCHMARKS[name]() as call:
+            for _ in range(warmup):
+                call()
+            timings = []
+            for _ in range(iterations):
+                start = time.perf_counter()
+                call()
+                timings.append(time.perf_counter() - start)
+    except BenchmarkSkippedError as e:
+        return BenchmarkResult(skipped=str(e))
+    return BenchmarkResult.from_timings(timings)
+
+
+def run_benchmarks(
+    names: Iterable[str],
+    iterations: int = 20,
+    warmup: int = 2,
+) -> BenchmarkRun:
+    """Run benchmarks, recording metadata identifying the code and machine they ran on."""
+    return BenchmarkRun(
+        metadata=_metadata(iterations, warmup),
+        results={name: run_benchmark(name, iterations, warmup) for name in names},
+    )
+
+
+def find_regressions(
+    baseline: BenchmarkRun,
+    current: BenchmarkRun,
+    threshold: float = 0.2,
+) -> list[Regression]:
+    """Find benchmarks whose median time is more than `threshold` slower than the baseline.
+
+    Benchmarks that were skipped or are missing from either run are ignored.
+    """
+    regressions = []
+    for name, result in current.results.items():
+        before = baseline.results.get(name)
+        if before is None or before.median is None or result.median is None:
+            continue
+        if result.median > before.median * (1 + threshold):
+            regressions.append(Regression(name=name, baseline=before.median, current=result.median))
+    return regressions
+
+
+def _metadata(iterations: int, warmup: int) -> dict[str, Any]:
+    return {
+        "commit": _git_commit(),
+        "portia_version": get_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(UTC).isoformat(),
+        "iterations": iterations,
+        "warmup": warmup,
+    }
+
+
+def _git_commit() -> str | None:
+    """Get the commit being benchmarked, if running from a git checkout."""
+    try:
+        return subprocess.run(  # noqa: S603
+            ["git", "rev-parse", "HEAD"],  # noqa: S607
+            capture_output=True,
+            check=True,
+            cwd=Path(__file__).parent,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def format_results(run: BenchmarkRun, baseline: BenchmarkRun | None = None) -> str:
+    """Format results as a table, with the change in median time if given a baseline."""
+    lines = [f"{'benchmark':<45} {'median':>10} {'p95':>10} {'change':>8}"]
+    for name, result in run.results.items():
+        if result.median is None or result.p95 is None:
+            lines.append(f"{name:<45} skipped: {result.skipped}")
+            continue
+        before = baseline.results.get(name) if baseline else None
+        change = f"{result.median / before.median - 1:+.0%}" if before and before.median else ""
+        lines.append(
+            f"{name:<45} {_format_seconds(result.median):>10} "
+            f"{_format_seconds(result.p95):>10} {change:>8}"
+        )
+    return "\n".join(lines)
+
+
+def _format_seconds(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f}s"
+    if seconds >= MILLISECOND:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds * 1e6:.1f}us"
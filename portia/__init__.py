@@ -2,10 +2,17 @@
 
 from __future__ import annotations
 
+from portia.batch import BatchRunResult
 from portia.builder.plan_builder_v2 import PlanBuilderV2
 from portia.builder.plan_v2 import PlanV2
-from portia.builder.reference import Input, StepOutput
-from portia.builder.step_v2 import FunctionStep, InvokeToolStep, LLMStep, SingleToolAgentStep
+from portia.builder.reference import Input, MapItem, StepOutput
+from portia.builder.step_v2 import (
+    FunctionStep,
+    InvokeToolStep,
+    LLMStep,
+    MapStep,
+    SingleToolAgentStep,
+)
 
 # Clarification related classes
 from portia.clarification import (
@@ -28,9 +35,12 @@ from portia.config import (
     Config,
     ExecutionAgentType,
     GenerativeModelsConfig,
+    LLMCacheBackend,
     LLMModel,
+    LogFormat,
     LogLevel,
     PlanningAgentType,
+    PlanRunPersistence,
     StorageClass,
     default_config,
 )
@@ -87,10 +97,19 @@ from portia.plan_run import PlanRun, PlanRunState
 
 # Core classes
 from portia.portia import ExecutionHooks, Portia
+from portia.stage_timing import (
+    InMemoryStageTimingSink,
+    JsonlStageTimingSink,
+    PrometheusStageTimingSink,
+    StageTiming,
+    StageTimingSink,
+)
 
 # Tool related classes
 from portia.tool import Tool, ToolRunContext
+from portia.tool_catalog_cache import ToolCatalogCache
 from portia.tool_decorator import tool
+from portia.tool_index import BM25ToolIndex, EmbeddingToolIndex, ToolIndex
 from portia.tool_registry import (
     DefaultToolRegistry,
     InMemoryToolRegistry,
@@ -105,6 +124,8 @@ __all__ = [
     "SUPPORTED_MISTRALAI_MODELS",
     "SUPPORTED_OPENAI_MODELS",
     "ActionClarification",
+    "BM25ToolIndex",
+    "BatchRunResult",
     "Clarification",
     "ClarificationCategory",
     "ClarificationHandler",
@@ -116,6 +137,7 @@ __all__ = [
     "CustomClarification",
     "DefaultToolRegistry",
     "DuplicateToolError",
+    "EmbeddingToolIndex",
     "ExecutionAgentType",
     "ExecutionHooks",
     "ExtractTool",
@@ -124,6 +146,7 @@ __all__ = [
     "FunctionStep",
     "GenerativeModel",
     "GenerativeModelsConfig",
+    "InMemoryStageTimingSink",
     "InMemoryToolRegistry",
     "Input",
     "InputClarification",
@@ -133,12 +156,17 @@ __all__ = [
     "InvalidPlanRunStateError",
     "InvalidToolDescriptionError",
     "InvokeToolStep",
+    "JsonlStageTimingSink",
+    "LLMCacheBackend",
     "LLMModel",
     "LLMProvider",
     "LLMStep",
     "LLMTool",
     "LocalDataValue",
+    "LogFormat",
     "LogLevel",
+    "MapItem",
+    "MapStep",
     "MapTool",
     "McpToolRegistry",
     "Message",
@@ -153,6 +181,7 @@ __all__ = [
     "PlanNotFoundError",
     "PlanRun",
     "PlanRunNotFoundError",
+    "PlanRunPersistence",
     "PlanRunState",
     "PlanUUID",
     "PlanV2",
@@ -160,17 +189,22 @@ __all__ = [
     "Portia",
     "PortiaBaseError",
     "PortiaToolRegistry",
+    "PrometheusStageTimingSink",
     "SearchTool",
     "SingleToolAgentStep",
     "SseMcpClientConfig",
+    "StageTiming",
+    "StageTimingSink",
     "StdioMcpClientConfig",
     "Step",
     "StepOutput",
     "StorageClass",
     "StorageError",
     "Tool",
+    "ToolCatalogCache",
     "ToolFailedError",
     "ToolHardError",
+    "ToolIndex",
     "ToolNotFoundError",
     "ToolRegistry",
     "ToolRetryError",
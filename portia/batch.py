@@ -0,0 +1,184 @@
+"""Run many queries or plans at once with bounded concurrency.
+
+Portia.run_many, Portia.arun_many, Portia.run_plan_many and Portia.arun_plan_many use the helpers
+in this module to execute a batch of items on a single Portia client, so that every item shares
+its model clients, LLM response cache, cached plans, tool registry and pooled MCP sessions.
+
+At most `max_concurrency` items are in flight at once and items are only taken from the input
+iterable as earlier ones finish, so batches can be arbitrarily large or lazily generated. Results
+are yielded as items complete rather than in input order; each BatchRunResult records the index of
+its item in the input. An item raising an exception doesn't stop the batch - the exception is
+recorded on the item's result instead.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from portia.logger import logger
+from portia.plan_run import PlanRun, PlanRunState
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Iterator
+    from uuid import UUID
+
+    from portia.builder.plan_v2 import PlanV2
+    from portia.common import Serializable
+    from portia.plan import Plan, PlanInput, PlanUUID
+
+    # The items accepted by Portia.run_plan_many: a plan, or a plan and its plan run inputs.
+    PlanRunInputs = list[PlanInput] | list[dict[str, Serializable]] | dict[str, Serializable]
+    PlanItem = (
+        Plan | PlanUUID | UUID | PlanV2 | tuple[Plan | PlanUUID | UUID | PlanV2, PlanRunInputs]
+    )
+
+T = TypeVar("T")
+
+
+class BatchRunResult(BaseModel):
+    """The outcome of one item in a batch.
+
+    Attributes:
+        index: The position of the item in the batch's input.
+        item: The query, plan or (plan, inputs) pair the result is for.
+        plan_run: The plan run for the item, or None if the item raised an exception.
+        error: The exception raised while running the item, if any.
+
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    index: int = Field(description="The position of the item in the batch's input.")
+    item: Any = Field(description="The query, plan or (plan, inputs) pair the result is for.")
+    plan_run: PlanRun | None = Field(
+        default=None,
+        description="The plan run for the item, or None if the item raised an exception.",
+    )
+    error: Exception | None = Field(
+        default=None,
+        description="The exception raised while running the item, if any.",
+    )
+
+    @property
+    def succeeded(self) -> bool:
+        """Whether the item's plan run completed without raising an exception."""
+        return (
+            self.error is None
+            and self.plan_run is not None
+            and self.plan_run.state == PlanRunState.COMPLETE
+        )
+
+
+def run_batch(
+    run_item: Callable[[T], PlanRun],
+    items: Iterable[T],
+    max_concurrency: int,
+) -> Iterator[BatchRunResult]:
+    """Run items on a pool of threads, yielding their results as they complete.
+
+    Context variables aren't copied to threads, so each item runs in a copy of the caller's
+    context. This keeps context-scoped state, such as the LLM response cache, shared with items.
+
+    Args:
+        run_item (Callable[[T], PlanRun]): Runs a single item.
+        items (Iterable[T]): The items to run. These are consumed lazily.
+        max_concurrency (int): The most items running at once.
+
+    Yields:
+        BatchRunResult: The result of each item, in the order the items complete.
+
+    """
+    _validate_max_concurrency(max_concurrency)
+    items_iterator = enumerate(items)
+    pending: dict[Future[PlanRun], tuple[int, T]] = {}
+    executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="portia-batch")
+
+    def submit(count: int) -> None:
+        for index, item in _take(items_iterator, count):
+            context = contextvars.copy_context()
+            pending[executor.submit(context.run, run_item, item)] = (index, item)
+
+    try:
+        submit(max_concurrency)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, item = pending.pop(future)
+                error = future.exception()
+                yield _result(index, item, None if error else future.result(), error)
+            submit(max_concurrency - len(pending))
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+async def arun_batch(
+    run_item: Callable[[T], Awaitable[PlanRun]],
+    items: Iterable[T],
+    max_concurrency: int,
+) -> AsyncIterator[BatchRunResult]:
+    """Run items as tasks on the running event loop, yielding their results as they complete.
+
+    Args:
+        run_item (Callable[[T], Awaitable[PlanRun]]): Runs a single item.
+        items (Iterable[T]): The items to run. These are consumed lazily.
+        max_concurrency (int): The most items running at once.
+
+    Yields:
+        BatchRunResult: The result of each item, in the order the items complete.
+
+    """
+    _validate_max_concurrency(max_concurrency)
+    items_iterator = enumerate(items)
+    pending: dict[asyncio.Task[PlanRun], tuple[int, T]] = {}
+
+    def submit(count: int) -> None:
+        for index, item in _take(items_iterator, count):
+            pending[asyncio.ensure_future(run_item(item))] = (index, item)
+
+    try:
+        submit(max_concurrency)
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                index, item = pending.pop(task)
+                error = task.exception()
+                yield _result(index, item, None if error else task.result(), error)
+            submit(max_concurrency - len(pending))
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+def _take(items: Iterator[tuple[int, T]], count: int) -> Iterator[tuple[int, T]]:
+    """Take up to count items from an iterator."""
+    for _ in range(count):
+        try:
+            yield next(items)
+        except StopIteration:
+            return
+
+
+def _result(
+    index: int,
+    item: object,
+    plan_run: PlanRun | None,
+    error: BaseException | None,
+) -> BatchRunResult:
+    """Build the result of an item, logging it if it failed."""
+    if error is not None and not isinstance(error, Exception):
+        raise error
+    if error is not None:
+        logger().error(f"Batch item {index} failed: {error}")
+    return BatchRunResult(index=index, item=item, plan_run=plan_run, error=error)
+
+
+def _validate_max_concurrency(max_concurrency: int) -> None:
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
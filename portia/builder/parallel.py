@@ -0,0 +1,17 @@
+"""Types to support parallel blocks."""
+
+from pydantic import BaseModel, Field
+
+
+class ParallelBlock(BaseModel):
+    """A parallel block in the plan.
+
+    The steps in a parallel block don't depend on each other, so they are run concurrently. Their
+    outputs are then processed in plan order.
+
+    Args:
+        step_indexes: The indexes of the steps in the block.
+
+    """
+
+    step_indexes: list[int] = Field(default_factory=list)
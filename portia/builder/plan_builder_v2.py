@@ -5,19 +5,22 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any
 
 from portia.builder.conditionals import ConditionalBlock, ConditionalBlockClauseType
+from portia.builder.parallel import ParallelBlock
 from portia.builder.plan_v2 import PlanV2
-from portia.builder.reference import default_step_name
+from portia.builder.reference import Reference, StepOutput, default_step_name
 from portia.builder.step_v2 import (
     ConditionalStep,
     FunctionStep,
     InvokeToolStep,
     LLMStep,
+    MapStep,
     SingleToolAgentStep,
+    StepV2,
 )
 from portia.plan import PlanInput
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterator
 
     from pydantic import BaseModel
 
@@ -40,6 +43,7 @@ class PlanBuilderV2:
         """
         self.plan = PlanV2(steps=[], label=label)
         self._conditional_block_stack: list[ConditionalBlock] = []
+        self._parallel_block: ParallelBlock | None = None
 
     def input(
         self,
@@ -66,12 +70,28 @@ class PlanBuilderV2:
         """Get the current conditional block."""
         return self._conditional_block_stack[-1] if len(self._conditional_block_stack) > 0 else None
 
+    def _append_step(self, step: StepV2) -> None:
+        """Add a step to the plan, adding it to the current parallel block if there is one."""
+        if self._parallel_block is not None:
+            self._parallel_block.step_indexes.append(len(self.plan.steps))
+            step.parallel_block = self._parallel_block
+        self.plan.steps.append(step)
+
+    def _check_not_in_parallel_block(self, method: str) -> None:
+        """Raise an error if a parallel block is open."""
+        if self._parallel_block is not None:
+            raise PlanBuilderError(
+                f"{method} cannot be called from a parallel block. Please add an end_parallel "
+                "first."
+            )
+
     def if_(
         self,
         condition: Callable[..., bool] | str,
         args: dict[str, Any] | None = None,
     ) -> PlanBuilderV2:
         """Add a step that checks a condition."""
+        self._check_not_in_parallel_block("if_")
         parent_block = self._current_conditional_block
         conditional_block = ConditionalBlock(
             clause_step_indexes=[len(self.plan.steps)],
@@ -96,6 +116,7 @@ class PlanBuilderV2:
         args: dict[str, Any] | None = None,
     ) -> PlanBuilderV2:
         """Add a step that checks a condition."""
+        self._check_not_in_parallel_block("else_if_")
         if len(self._conditional_block_stack) == 0:
             raise PlanBuilderError(
                 "else_if_ must be called from a conditional block. Please add an if_ first."
@@ -116,6 +137,7 @@ class PlanBuilderV2:
 
     def else_(self) -> PlanBuilderV2:
         """Add a step that checks a condition."""
+        self._check_not_in_parallel_block("else_")
         if len(self._conditional_block_stack) == 0:
             raise PlanBuilderError(
                 "else_ must be called from a conditional block. Please add an if_ first."
@@ -136,6 +158,7 @@ class PlanBuilderV2:
 
     def endif(self) -> PlanBuilderV2:
         """Exit a conditional block."""
+        self._check_not_in_parallel_block("endif")
         if len(self._conditional_block_stack) == 0:
             raise PlanBuilderError(
                 "endif must be called from a conditional block. Please add an if_ first."
@@ -155,6 +178,40 @@ class PlanBuilderV2:
         self._conditional_block_stack.pop()
         return self
 
+    def parallel_(self) -> PlanBuilderV2:
+        """Start a block of steps that are run concurrently.
+
+        The steps added before the matching end_parallel are run at the same time, so they must
+        not reference each other's outputs. Their outputs are then processed in the order the steps
+        were added.
+        """
+        self._check_not_in_parallel_block("parallel_")
+        self._parallel_block = ParallelBlock()
+        return self
+
+    def end_parallel(self) -> PlanBuilderV2:
+        """Exit a parallel block."""
+        if self._parallel_block is None:
+            raise PlanBuilderError(
+                "end_parallel must be called from a parallel block. Please add a parallel_ first."
+            )
+        block_steps = {
+            key: index
+            for index in self._parallel_block.step_indexes
+            for key in (index, self.plan.steps[index].step_name)
+        }
+        for index in self._parallel_block.step_indexes:
+            step = self.plan.steps[index]
+            for referenced_step in _referenced_steps(step):
+                if block_steps.get(referenced_step, index) != index:
+                    raise PlanBuilderError(
+                        f"Step {step.step_name} references the output of step {referenced_step} "
+                        "in the same parallel block. Steps in a parallel block are run "
+                        "concurrently, so they can't use each other's outputs."
+                    )
+        self._parallel_block = None
+        return self
+
     def llm_step(
         self,
         *,
@@ -174,7 +231,7 @@ class PlanBuilderV2:
             step_name: Optional name for the step. If not provided, will be auto-generated.
 
         """
-        self.plan.steps.append(
+        self._append_step(
             LLMStep(
                 task=task,
                 inputs=inputs or [],
@@ -204,7 +261,7 @@ class PlanBuilderV2:
             step_name: Optional name for the step. If not provided, will be auto-generated.
 
         """
-        self.plan.steps.append(
+        self._append_step(
             InvokeToolStep(
                 tool=tool,
                 args=args or {},
@@ -233,7 +290,7 @@ class PlanBuilderV2:
             step_name: Optional name for the step. If not provided, will be auto-generated.
 
         """
-        self.plan.steps.append(
+        self._append_step(
             FunctionStep(
                 function=function,
                 args=args or {},
@@ -264,7 +321,7 @@ class PlanBuilderV2:
             step_name: Optional name for the step. If not provided, will be auto-generated.
 
         """
-        self.plan.steps.append(
+        self._append_step(
             SingleToolAgentStep(
                 tool=tool,
                 task=task,
@@ -276,6 +333,93 @@ class PlanBuilderV2:
         )
         return self
 
+    def map_llm_step(
+        self,
+        *,
+        over: Any,  # noqa: ANN401
+        task: str,
+        inputs: list[Any] | None = None,
+        output_schema: type[BaseModel] | None = None,
+        max_concurrency: int | None = None,
+        step_name: str | None = None,
+    ) -> PlanBuilderV2:
+        """Add a step that sends a query to the underlying LLM for each item in a list.
+
+        The output of the step is the list of LLM outputs, in the same order as the items.
+
+        Args:
+            over: The list to map over. This can be a reference to a previous step output / plan
+              input (using StepOutput / Input) or just a plain list.
+            task: The task to perform for each item.
+            inputs: The inputs to the task. Use MapItem to reference the item being processed.
+              The other inputs are handled as in llm_step.
+            output_schema: The schema of the output for each item.
+            max_concurrency: The maximum number of items to process at once. If None, all items
+              are processed at once.
+            step_name: Optional name for the step. If not provided, will be auto-generated.
+
+        """
+        step_name = step_name or default_step_name(len(self.plan.steps))
+        self._append_step(
+            MapStep(
+                over=over,
+                step=LLMStep(
+                    task=task,
+                    inputs=inputs or [],
+                    output_schema=output_schema,
+                    step_name=f"{step_name}_item",
+                ),
+                max_concurrency=max_concurrency,
+                step_name=step_name,
+                conditional_block=self._current_conditional_block,
+            )
+        )
+        return self
+
+    def map_invoke_tool_step(
+        self,
+        *,
+        over: Any,  # noqa: ANN401
+        tool: str | Tool,
+        args: dict[str, Any] | None = None,
+        output_schema: type[BaseModel] | None = None,
+        max_concurrency: int | None = None,
+        step_name: str | None = None,
+    ) -> PlanBuilderV2:
+        """Add a step that directly invokes a tool for each item in a list.
+
+        The output of the step is the list of tool outputs, in the same order as the items.
+
+        Args:
+            over: The list to map over. This can be a reference to a previous step output / plan
+              input (using StepOutput / Input) or just a plain list.
+            tool: The tool to invoke. Should either be the id of the tool to call or the Tool
+              instance to call.
+            args: The arguments to the tool. Use MapItem to pass in the item being processed. The
+              other args are handled as in invoke_tool_step.
+            output_schema: The schema of the output for each item.
+            max_concurrency: The maximum number of items to process at once. If None, all items
+              are processed at once.
+            step_name: Optional name for the step. If not provided, will be auto-generated.
+
+        """
+        step_name = step_name or default_step_name(len(self.plan.steps))
+        self._append_step(
+            MapStep(
+                over=over,
+                step=InvokeToolStep(
+                    tool=tool,
+                    args=args or {},
+                    output_schema=output_schema,
+                    step_name=f"{step_name}_item",
+                ),
+                max_concurrency=max_concurrency,
+                step_name=step_name,
+                conditional_block=self._current_conditional_block,
+            )
+        )
+        return self
+
     def final_output(
         self,
         output_schema: type[BaseModel] | None = None,
@@ -301,4 +445,26 @@ class PlanBuilderV2:
                 "An endif must be called for all if_ steps. "
                 "Please add an endif for all if_ steps."
             )
+        if self._parallel_block is not None:
+            raise PlanBuilderError(
+                "An end_parallel must be called for all parallel_ blocks. "
+                "Please add an end_parallel for all parallel_ blocks."
+            )
         return self.plan
+
+
+def _referenced_steps(value: Any) -> Iterator[str | int]:  # noqa: ANN401
+    """Get the steps whose outputs are referenced by a step, or by one of its inputs / args."""
+    if isinstance(value, StepOutput):
+        yield value.step
+    elif isinstance(value, Reference):
+        return
+    elif isinstance(value, StepV2):
+        for field_name in type(value).model_fields:
+            yield from _referenced_steps(getattr(value, field_name))
+    elif isinstance(value, list | tuple):
+        for item in value:
+            yield from _referenced_steps(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _referenced_steps(item)
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from contextvars import ContextVar
 from typing import TYPE_CHECKING, override
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -133,6 +134,40 @@ class Input(Reference):
         return f"{{{{ Input({self.name}) }}}}"
 
 
+current_map_item: ContextVar[ReferenceValue | None] = ContextVar("current_map_item", default=None)
+"""The item being processed by the map step running in the current context."""
+
+
+class MapItem(Reference):
+    """A reference to the item currently being processed by a map step.
+
+    Use this in the inputs / args of the step passed to PlanBuilderV2.map_llm_step or
+    PlanBuilderV2.map_invoke_tool_step. When the plan is run, it is substituted with each element
+    of the list being mapped over in turn.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the map item."""
+        super().__init__()
+
+    @override
+    def get_legacy_name(self, plan: PlanV2) -> str:
+        """Get the name of the reference to use with legacy Portia plans."""
+        return "map_item"
+
+    @override
+    def get_value(self, run_data: RunContext) -> ReferenceValue | None:
+        """Get the value of the item being processed."""
+        value = current_map_item.get()
+        if value is None:
+            logger().warning("MapItem can only be used within a map step")
+        return value
+
+    def __str__(self) -> str:
+        """Get the string representation of the map item."""
+        return "{{ MapItem() }}"
+
+
 class ReferenceValue(BaseModel):
     """Value that can be referenced."""
 
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import itertools
 import re
 from abc import ABC, abstractmethod
@@ -16,10 +17,19 @@ from portia.builder.conditionals import (
     ConditionalBlockClauseType,
     ConditionalStepResult,
 )
-from portia.builder.reference import Input, Reference, ReferenceValue, StepOutput
+from portia.builder.parallel import ParallelBlock
+from portia.builder.reference import (
+    Input,
+    MapItem,
+    Reference,
+    ReferenceValue,
+    StepOutput,
+    current_map_item,
+)
 from portia.clarification import Clarification
 from portia.errors import ToolNotFoundError
 from portia.execution_agents.conditional_evaluation_agent import ConditionalEvaluationAgent
+from portia.execution_agents.output import LocalDataValue
 from portia.model import Message
 from portia.open_source_tools.llm_tool import LLMTool
 from portia.plan import Step, Variable
@@ -39,6 +49,9 @@ class StepV2(BaseModel, ABC):
     conditional_block: ConditionalBlock | None = Field(
         default=None, description="The conditional block this step is part of, if any."
     )
+    parallel_block: ParallelBlock | None = Field(
+        default=None, description="The parallel block this step is part of, if any."
+    )
 
     @abstractmethod
     async def run(self, run_data: RunContext) -> Any:  # noqa: ANN401
@@ -208,12 +221,18 @@ class LLMStep(StepV2):
     async def run(self, run_data: RunContext) -> str | BaseModel:  # pyright: ignore[reportIncompatibleMethodOverride] - needed due to Langsmith decorator
         """Run the LLM query."""
         llm_tool = LLMTool(structured_output_schema=self.output_schema)
+        hooks = run_data.portia.execution_hooks
         tool_ctx = ToolRunContext(
             end_user=run_data.end_user,
             plan_run=run_data.plan_run,
             plan=run_data.legacy_plan,
             config=run_data.portia.config,
             clarifications=[],
+            stream_callback=hooks.get_stream_callback(
+                run_data.plan_run, self.to_legacy_step(run_data.plan)
+            )
+            if hooks.on_llm_response_chunk
+            else None,
         )
         task_data = [
             self._format_value(value, run_data)
@@ -296,8 +315,7 @@ class InvokeToolStep(StepV2):
         )
         args = {k: self._get_value_for_input(v, run_data) for k, v in self.args.items()}
 
-        # TODO(RH): Move to async tool run when we can  # noqa: FIX002, TD003
-        output = tool.run(tool_ctx, **args)
+        output = await tool.arun_without_blocking(tool_ctx, **args)
         if isinstance(output, Clarification) and output.plan_run_id is None:
             output.plan_run_id = run_data.plan_run.id
 
@@ -444,6 +462,91 @@ class SingleToolAgentStep(StepV2):
         )
 
 
+class MapStep(StepV2):
+    """A step that runs another step for each item in a list, collecting the results in order."""
+
+    over: Reference | list[Any] = Field(
+        description=(
+            "The list to map over. This can be a reference to a previous step output / plan input "
+            "(using StepOutput / Input) or just a plain list."
+        )
+    )
+    step: LLMStep | InvokeToolStep = Field(
+        description=(
+            "The step to run for each item. The item being processed can be referenced in the "
+            "step's inputs / args using MapItem."
+        )
+    )
+    max_concurrency: int | None = Field(
+        default=None,
+        ge=1,
+        description="The maximum number of items to process at once. If None, there is no limit.",
+    )
+
+    def __str__(self) -> str:
+        """Return a description of this step for logging purposes."""
+        concurrency_info = (
+            f", max_concurrency={self.max_concurrency}" if self.max_concurrency else ""
+        )
+        return f"MapStep(over={self.over}, step={self.step}{concurrency_info})"
+
+    @override
+    @traceable(name="Map Step - Run")
+    async def run(self, run_data: RunContext) -> list[Any]:  # pyright: ignore[reportIncompatibleMethodOverride] - needed due to Langsmith decorator
+        """Run the step for each item."""
+        items = self._get_value_for_input(self.over, run_data)
+        if not isinstance(items, list | tuple):
+            raise TypeError(f"MapStep can only map over a list, got {type(items).__name__}")
+        semaphore = asyncio.Semaphore(self.max_concurrency or max(len(items), 1))
+
+        async def run_item(index: int, item: Any) -> Any:  # noqa: ANN401
+            async with semaphore:
+                # Each item runs in its own task, so this doesn't affect the other items
+                current_map_item.set(
+                    ReferenceValue(
+                        value=LocalDataValue(value=item),
+                        description=f"Item {index} being processed by step '{self.step_name}'",
+                    )
+                )
+                return await self.step.run(run_data)
+
+        tasks = [asyncio.ensure_future(run_item(index, item)) for index, item in enumerate(items)]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    @override
+    def to_legacy_step(self, plan: PlanV2) -> Step:
+        """Convert this MapStep to a legacy Step."""
+        if isinstance(self.step, LLMStep):
+            task = self.step.task
+            tool_id = LLMTool.LLM_TOOL_ID
+            step_inputs = self.step.inputs
+        else:
+            tool_id = self.step.tool if isinstance(self.step.tool, str) else self.step.tool.id
+            inputs_desc = ", ".join(
+                [
+                    f"{k}={self._resolve_input_names_for_printing(v, plan)}"
+                    for k, v in self.step.args.items()
+                ]
+            )
+            task = f"Use tool {tool_id} with inputs: {inputs_desc}"
+            step_inputs = list(self.step.args.values())
+        over_desc = self._resolve_input_names_for_printing(self.over, plan)
+        return Step(
+            task=f"For each item in {over_desc}: {task}",
+            inputs=self._inputs_to_legacy_plan_variables(
+                [self.over, *(v for v in step_inputs if not isinstance(v, MapItem))], plan
+            ),
+            tool_id=tool_id,
+            output=plan.step_output_name(self),
+            condition=self._get_legacy_condition(plan),
+        )
+
+
 class ConditionalStep(StepV2):
     """A step that represents a conditional clause in a conditional block.
 
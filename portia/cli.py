@@ -5,6 +5,7 @@ Usage:
 portia-cli run "add 4 + 8" - run a query
 portia-cli plan "add 4 + 8" - plan a query
 portia-cli list-tools
+portia-cli rebuild-storage-index - rebuild the index of a disk storage directory
 """
 
 from __future__ import annotations
@@ -27,6 +28,7 @@ from portia.config import Config, GenerativeModelsConfig
 from portia.errors import InvalidConfigError
 from portia.logger import logger
 from portia.portia import ExecutionHooks, Portia
+from portia.storage import DiskFileStorage
 from portia.tool_registry import DefaultToolRegistry
 from portia.version import get_version
 
@@ -228,6 +230,19 @@ def list_tools(
         click.echo(tool.pretty() + "\n")
 
 
+@click.command()
+@click.option(
+    "--storage-dir",
+    default=DEFAULT_FILE_PATH,
+    show_default=True,
+    help="The disk storage directory to index.",
+)
+def rebuild_storage_index(storage_dir: str) -> None:
+    """Rebuild the index of plans and plan runs held in disk storage."""
+    indexed = DiskFileStorage(storage_dir=storage_dir).rebuild_index()
+    click.echo(f"Indexed {indexed} plans and plan runs in {storage_dir}")
+
+
 def _get_config(
     **kwargs,  # noqa: ANN003
 ) -> tuple[CLIConfig, Config]:
@@ -248,6 +263,7 @@ cli.add_command(version)
 cli.add_command(run)
 cli.add_command(plan)
 cli.add_command(list_tools)
+cli.add_command(rebuild_storage_index)
 
 if __name__ == "__main__":
     cli(obj={})
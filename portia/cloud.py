@@ -1,9 +1,78 @@
 """Core client for interacting with portia cloud."""
 
+import asyncio
+import threading
+
 import httpx
 
 from portia.config import Config
 
+DEFAULT_HTTP_LIMITS = httpx.Limits(max_connections=10, max_keepalive_connections=10)
+
+_async_clients: dict[asyncio.AbstractEventLoop, dict[tuple, httpx.AsyncClient]] = {}
+_async_clients_lock = threading.Lock()
+
+
+def get_shared_async_client(
+    base_url: str,
+    headers: dict[str, str],
+    *,
+    limits: httpx.Limits = DEFAULT_HTTP_LIMITS,
+    http2: bool = False,
+) -> httpx.AsyncClient:
+    """Return an async client shared by all callers on the running event loop.
+
+    Clients are keyed by their base URL, headers and connection settings, so callers talking to
+    the same API reuse one connection pool and its kept-alive connections. Clients held for
+    loops which have since closed are dropped.
+
+    Args:
+        base_url (str): The base URL of the API the client talks to.
+        headers (dict[str, str]): The headers sent with every request.
+        limits (httpx.Limits): The connection pool limits of the client.
+        http2 (bool): Whether to enable HTTP/2. Requires the `h2` package to be installed.
+
+    Returns:
+        httpx.AsyncClient: The shared client. Callers must not close it.
+
+    """
+    loop = asyncio.get_running_loop()
+    key = (
+        base_url,
+        tuple(sorted(headers.items())),
+        limits.max_connections,
+        limits.max_keepalive_connections,
+        limits.keepalive_expiry,
+        http2,
+    )
+    with _async_clients_lock:
+        for closed_loop in [other for other in _async_clients if other.is_closed()]:
+            del _async_clients[closed_loop]
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                base_url=base_url,
+                headers=headers,
+                timeout=httpx.Timeout(60),
+                limits=limits,
+                http2=http2,
+            )
+            clients[key] = client
+        return client
+
+
+async def aclose_shared_async_clients() -> None:
+    """Close the shared async clients of the running event loop.
+
+    Clients will be re-created if they are requested again after closing.
+    """
+    loop = asyncio.get_running_loop()
+    with _async_clients_lock:
+        clients = _async_clients.pop(loop, {})
+    for client in clients.values():
+        await client.aclose()
+
 
 class PortiaCloudClient:
     """Base HTTP client builder for interacting with portia cloud."""
@@ -35,19 +104,16 @@ class PortiaCloudClient:
             json_headers (bool): Whether to add json headers to the request.
 
         """
-        headers = {}
-        if json_headers:
-            headers = {
-                "Content-Type": "application/json",
-            }
-        if config.portia_api_key or allow_unauthenticated is False:
-            api_key = config.must_get_api_key("portia_api_key").get_secret_value()
-            headers["Authorization"] = f"Api-Key {api_key}"
         return httpx.Client(
             base_url=config.must_get("portia_api_endpoint", str),
-            headers=headers,
+            headers=cls._headers(
+                config,
+                allow_unauthenticated=allow_unauthenticated,
+                json_headers=json_headers,
+            ),
             timeout=httpx.Timeout(60),
-            limits=httpx.Limits(max_connections=10),
+            limits=cls.http_limits(config),
+            http2=config.portia_http2,
         )
 
     def async_client(
@@ -58,23 +124,81 @@ class PortiaCloudClient:
     ) -> httpx.AsyncClient:
         """Create a new httpx async client.
 
+        The caller owns the returned client and is responsible for closing it. Prefer
+        shared_async_client, which reuses connections between requests.
+
         Args:
-            config (Config): The Portia Configuration instance, containing the API key and endpoint.
             allow_unauthenticated (bool): Whether to allow creation of an unauthenticated client.
             json_headers (bool): Whether to add json headers to the request.
 
         """
+        return httpx.AsyncClient(
+            base_url=self.config.must_get("portia_api_endpoint", str),
+            headers=self._headers(
+                self.config,
+                allow_unauthenticated=allow_unauthenticated,
+                json_headers=json_headers,
+            ),
+            timeout=httpx.Timeout(60),
+            limits=self.http_limits(self.config),
+            http2=self.config.portia_http2,
+        )
+
+    def shared_async_client(
+        self,
+        *,
+        allow_unauthenticated: bool = False,
+        json_headers: bool = True,
+    ) -> httpx.AsyncClient:
+        """Get the async client shared by everything talking to Portia Cloud on this event loop.
+
+        The client keeps connections alive between requests, so callers must not close it. Use
+        aclose_shared_async_clients to release the connections.
+
+        Args:
+            allow_unauthenticated (bool): Whether to allow creation of an unauthenticated client.
+            json_headers (bool): Whether to add json headers to the request.
+
+        """
+        return get_shared_async_client(
+            self.config.must_get("portia_api_endpoint", str),
+            self._headers(
+                self.config,
+                allow_unauthenticated=allow_unauthenticated,
+                json_headers=json_headers,
+            ),
+            limits=self.http_limits(self.config),
+            http2=self.config.portia_http2,
+        )
+
+    @staticmethod
+    def http_limits(config: Config) -> httpx.Limits:
+        """Get the connection pool limits for clients talking to Portia Cloud.
+
+        Args:
+            config (Config): The Portia Configuration instance.
+
+        """
+        return httpx.Limits(
+            max_connections=config.portia_http_max_connections,
+            max_keepalive_connections=config.portia_http_max_keepalive_connections,
+            keepalive_expiry=config.portia_http_keepalive_expiry,
+        )
+
+    @staticmethod
+    def _headers(
+        config: Config,
+        *,
+        allow_unauthenticated: bool,
+        json_headers: bool,
+    ) -> dict[str, str]:
+        """Build the headers sent with every request to Portia Cloud."""
         headers = {}
         if json_headers:
             headers = {
                 "Content-Type": "application/json",
             }
-        if self.config.portia_api_key or allow_unauthenticated is False:
-            api_key = self.config.must_get_api_key("portia_api_key").get_secret_value()
+        if config.portia_api_key or allow_unauthenticated is False:
+            api_key = config.must_get_api_key("portia_api_key").get_secret_value()
             headers["Authorization"] = f"Api-Key {api_key}"
-        return httpx.AsyncClient(
-            base_url=self.config.must_get("portia_api_endpoint", str),
-            headers=headers,
-            timeout=httpx.Timeout(60),
-            limits=httpx.Limits(max_connections=10),
-        )
+        return headers
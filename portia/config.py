@@ -9,6 +9,7 @@ default settings.
 from __future__ import annotations
 
 import os
+import threading
 import warnings
 from collections.abc import Container
 from enum import Enum
@@ -18,6 +19,7 @@ from pydantic import (
     BaseModel,
     ConfigDict,
     Field,
+    PrivateAttr,
     SecretStr,
     field_validator,
     model_validator,
@@ -25,6 +27,7 @@ from pydantic import (
 
 from portia.common import validate_extras_dependencies
 from portia.errors import ConfigNotFoundError, InvalidConfigError
+from portia.llm_cache import get_in_memory_llm_cache, get_sqlite_llm_cache
 from portia.logger import logger
 from portia.model import (
     AnthropicGenerativeModel,
@@ -46,12 +49,47 @@ class StorageClass(Enum):
         MEMORY: Stored in memory.
         DISK: Stored on disk.
         CLOUD: Stored in the cloud.
+        SQLITE: Stored in a local SQLite database.
 
     """
 
     MEMORY = "MEMORY"
     DISK = "DISK"
     CLOUD = "CLOUD"
+    SQLITE = "SQLITE"
+
+
+class LLMCacheBackend(Enum):
+    """Enum representing where LLM responses are cached.
+
+    Attributes:
+        MEMORY: Cached in an in-process LRU cache bounded by size.
+        SQLITE: Cached in a local SQLite database, expiring after a time to live.
+        REDIS: Cached in Redis (requires portia-sdk-python[cache] to be installed).
+
+    """
+
+    MEMORY = "MEMORY"
+    SQLITE = "SQLITE"
+    REDIS = "REDIS"
+
+
+class PlanRunPersistence(Enum):
+    """Enum representing how often plan runs are written to storage while they execute.
+
+    Modes are ordered from most to least durable.
+
+    Attributes:
+        EVERY_WRITE: Save the plan run every time it is updated.
+        PER_STEP: Save the plan run once at the end of each step and whenever its state changes.
+        ON_TRANSITION: Only save the plan run when its state changes, e.g. when it starts, needs
+            clarification, completes or fails.
+
+    """
+
+    EVERY_WRITE = "EVERY_WRITE"
+    PER_STEP = "PER_STEP"
+    ON_TRANSITION = "ON_TRANSITION"
 
 
 class Model(NamedTuple):
@@ -256,12 +294,37 @@ class LogLevel(Enum):
     CRITICAL = "CRITICAL"
 
 
+class LogFormat(Enum):
+    """Enum for the formats the default logger can write logs in.
+
+    Attributes:
+        TEXT: Human readable, coloured text.
+        JSON: One JSON object per line, without colour markup.
+
+    """
+
+    TEXT = "TEXT"
+    JSON = "JSON"
+
+
 FEATURE_FLAG_AGENT_MEMORY_ENABLED = "feature_flag_agent_memory_enabled"
 
 
 E = TypeVar("E", bound=Enum)
 
 
+def _llm_cache_backend_from_env() -> LLMCacheBackend | None:
+    """Get the LLM cache backend set by the LLM_CACHE_BACKEND env var, ignoring unknown values."""
+    value = os.getenv("LLM_CACHE_BACKEND")
+    if not value:
+        return None
+    try:
+        return parse_str_to_enum(value, LLMCacheBackend)
+    except InvalidConfigError:
+        logger().warning(f"Ignoring unknown LLM_CACHE_BACKEND value: {value}")
+        return None
+
+
 def parse_str_to_enum(value: str | E, enum_type: type[E]) -> E:
     """Parse a string to an enum or return the enum as is.
 
@@ -307,6 +370,9 @@ MODEL_EXTRA_KWARGS = {
     },
 }
 
+# Guards the per-config model caches so concurrent callers build each model only once.
+_MODEL_CACHE_LOCK = threading.Lock()
+
 
 class GenerativeModelsConfig(BaseModel):
     """Configuration for a Generative Models.
@@ -365,6 +431,10 @@ class GenerativeModelsConfig(BaseModel):
 # need to cache for longer than a day.
 CACHE_TTL_SECONDS = 60 * 60 * 24
 
+# Plans for similar queries are reused with their steps unchanged, so the threshold can't be set
+# so low that queries about something else match, e.g. "Roman Empire" and "Ottoman Empire".
+MIN_CACHED_PLAN_SIMILARITY_THRESHOLD = 0.95
+
 
 class Config(BaseModel):
     """General configuration for the SDK.
@@ -390,15 +460,27 @@ class Config(BaseModel):
         llm_provider: The LLM provider. If set, Portia uses this to select the best models
             for each agent. Can be None if custom models are provided.
         models: A configuration for the LLM models for Portia to use.
-        storage_class: The storage class used (e.g., MEMORY, DISK, CLOUD).
+        storage_class: The storage class used (e.g., MEMORY, DISK, SQLITE, CLOUD).
         storage_dir: The directory for storage, if applicable.
+        plan_run_persistence: How often plan runs are saved to storage during execution.
+        cached_plan_similarity_threshold: How similar a stored plan's query must be for
+            use_cached_plan to reuse it, unchanged, when no plan exists for the exact query.
+        cached_plan_templates: Whether use_cached_plan also reuses plans made for queries of the
+            same shape with different values, such as a different topic.
         default_log_level: The default log level (e.g., DEBUG, INFO).
         default_log_sink: The default destination for logs (e.g., sys.stdout).
+        default_log_format: The format of logs from the default logger (e.g., TEXT, JSON).
         json_log_serialize: Whether to serialize logs in JSON format.
         planning_agent_type: The planning agent type.
         execution_agent_type: The execution agent type.
         feature_flags: A dictionary of feature flags for the SDK.
         clarifications_enabled: Whether to enable clarifications for the execution agent.
+        max_concurrent_runs: The default maximum number of queries or plans to run at once when
+            running a batch of them.
+        tool_catalog_cache_path: The directory Portia cloud tool catalogs are cached in, or None
+            to always list tools from Portia cloud.
+        tool_catalog_cache_ttl_seconds: How long cached tool catalogs are used before they are
+            refreshed in the background.
 
     """
 
@@ -417,6 +499,28 @@ class Config(BaseModel):
         ),
         description="The API Key for the Portia Cloud API available from the dashboard at https://app.portialabs.ai",
     )
+    portia_http_max_connections: int = Field(
+        default=10,
+        ge=1,
+        description="The maximum number of concurrent connections to the Portia Cloud API per "
+        "HTTP client.",
+    )
+    portia_http_max_keepalive_connections: int = Field(
+        default=10,
+        ge=0,
+        description="The maximum number of idle connections to the Portia Cloud API kept alive "
+        "for reuse per HTTP client.",
+    )
+    portia_http_keepalive_expiry: float = Field(
+        default=30.0,
+        gt=0,
+        description="How long in seconds idle connections to the Portia Cloud API are kept alive.",
+    )
+    portia_http2: bool = Field(
+        default=False,
+        description="Whether to use HTTP/2 for requests to the Portia Cloud API. Requires "
+        "the h2 package, e.g. pip install 'httpx[http2]'.",
+    )
 
     # LLM API Keys
     openai_api_key: SecretStr = Field(
@@ -467,12 +571,61 @@ class Config(BaseModel):
         ),
     )
 
+    # Models built from "provider/model_name" strings, keyed by provider, model name and the
+    # credentials used to build them.
+    _model_cache: dict[tuple[Any, ...], GenerativeModel] = PrivateAttr(default_factory=dict)
+
     llm_redis_cache_url: str | None = Field(
         default_factory=lambda: os.getenv("LLM_REDIS_CACHE_URL"),
         description="Optional Redis URL used for caching LLM responses. This URl should include "
         "the auth details if required for access to the cache.",
     )
 
+    llm_cache_backend: LLMCacheBackend | None = Field(
+        default_factory=_llm_cache_backend_from_env,
+        description="Where to cache LLM responses. Defaults to REDIS if llm_redis_cache_url is "
+        "set, and to no caching otherwise.",
+    )
+
+    @field_validator("llm_cache_backend", mode="before")
+    @classmethod
+    def parse_llm_cache_backend(
+        cls,
+        value: str | LLMCacheBackend | None,
+    ) -> LLMCacheBackend | None:
+        """Parse llm_cache_backend to enum if string provided."""
+        return parse_str_to_enum(value, LLMCacheBackend) if value is not None else None
+
+    llm_cache_max_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        gt=0,
+        description="The maximum total size of the responses held by the MEMORY LLM cache.",
+    )
+
+    llm_cache_path: str = Field(
+        default=".portia/cache/llm_cache.sqlite3",
+        description="The database file used by the SQLITE LLM cache.",
+    )
+
+    llm_cache_ttl_seconds: int = Field(
+        default=CACHE_TTL_SECONDS,
+        gt=0,
+        description="How long cached LLM responses are served for by the SQLITE and REDIS caches.",
+    )
+
+    tool_catalog_cache_path: str | None = Field(
+        default=None,
+        description="The directory Portia cloud tool catalogs are cached in, or None to always "
+        "list tools from Portia cloud.",
+    )
+
+    tool_catalog_cache_ttl_seconds: int = Field(
+        default=60 * 60,
+        gt=0,
+        description="How long cached tool catalogs are used before they are refreshed in the "
+        "background.",
+    )
+
     llm_provider: LLMProvider | None = Field(
         default=None,
         description="The LLM (API) provider. If set, Portia uses this to select the "
@@ -510,17 +663,41 @@ class Config(BaseModel):
 
     @model_validator(mode="after")
     def setup_cache(self) -> Self:
-        """Set up LLM cache if Redis URL is provided."""
-        if self.llm_redis_cache_url and validate_extras_dependencies("cache", raise_error=False):
-            from langchain_redis import RedisCache
-
-            cache = RedisCache(self.llm_redis_cache_url, ttl=CACHE_TTL_SECONDS, prefix="llm:")
-            LangChainGenerativeModel.set_cache(cache)
-        elif self.llm_redis_cache_url:
-            logger().warning(  # pragma: no cover
-                "Not using cache as cache group is not installed. "  # pragma: no cover
-                "Install portia-sdk-python[caching] to use caching."  # pragma: no cover
-            )  # pragma: no cover
+        """Set up the LLM cache for the configured backend."""
+        backend = self.llm_cache_backend
+        if backend is None and self.llm_redis_cache_url:
+            backend = LLMCacheBackend.REDIS
+        match backend:
+            case LLMCacheBackend.MEMORY:
+                LangChainGenerativeModel.set_cache(
+                    get_in_memory_llm_cache(self.llm_cache_max_bytes),
+                )
+            case LLMCacheBackend.SQLITE:
+                LangChainGenerativeModel.set_cache(
+                    get_sqlite_llm_cache(self.llm_cache_path, self.llm_cache_ttl_seconds),
+                )
+            case LLMCacheBackend.REDIS if not self.llm_redis_cache_url:
+                raise InvalidConfigError(
+                    "llm_redis_cache_url",
+                    "Must be set when llm_cache_backend is REDIS",
+                )
+            case LLMCacheBackend.REDIS if validate_extras_dependencies(
+                "cache",
+                raise_error=False,
+            ):
+                from langchain_redis import RedisCache
+
+                cache = RedisCache(
+                    self.llm_redis_cache_url,
+                    ttl=self.llm_cache_ttl_seconds,
+                    prefix="llm:",
+                )
+                LangChainGenerativeModel.set_cache(cache)
+            case LLMCacheBackend.REDIS:
+                logger().warning(  # pragma: no cover
+                    "Not using cache as cache group is not installed. "  # pragma: no cover
+                    "Install portia-sdk-python[caching] to use caching."  # pragma: no cover
+                )  # pragma: no cover
         return self
 
     # Storage Options
@@ -541,7 +718,45 @@ class Config(BaseModel):
     storage_dir: str | None = Field(
         default=None,
         description="If storage class is set to DISK this will be the location where plans "
-        "and runs are written in a JSON format.",
+        "and runs are written in a JSON format. If it is set to SQLITE this is the directory "
+        "holding the database.",
+    )
+
+    plan_run_persistence: PlanRunPersistence = Field(
+        default=PlanRunPersistence.PER_STEP,
+        description="How often plan runs are saved to storage during execution. PER_STEP "
+        "coalesces the writes made within a step into one, ON_TRANSITION only saves when the "
+        "plan run state changes and EVERY_WRITE saves on every update.",
+    )
+
+    @field_validator("plan_run_persistence", mode="before")
+    @classmethod
+    def parse_plan_run_persistence(cls, value: str | PlanRunPersistence) -> PlanRunPersistence:
+        """Parse plan_run_persistence to enum if string provided."""
+        return parse_str_to_enum(value, PlanRunPersistence)
+
+    cached_plan_similarity_threshold: float | None = Field(
+        default=None,
+        ge=MIN_CACHED_PLAN_SIMILARITY_THRESHOLD,
+        le=1,
+        description="If set, planning with use_cached_plan reuses the stored plan whose query is "
+        "most similar to the query when there is no plan for the exact query, provided its "
+        "similarity is at least this threshold (between 0.95 and 1). The plan's steps are not "
+        "rewritten for the new query, so this is meant for queries differing only in case, "
+        "punctuation, spacing or typos. With the default index, a different word in a short "
+        "query (e.g. 'Roman Empire' and 'Ottoman Empire') scores below 0.95, but in long queries "
+        "a single different word counts for less and can score above it, so use 1 to only reuse "
+        "plans for queries which are the same once normalised. If None, only plans for the exact "
+        "query are reused.",
+    )
+
+    cached_plan_templates: bool = Field(
+        default=False,
+        description="If True, plans generated while planning with use_cached_plan are turned into "
+        "templates by replacing the values in their query, such as quoted text, URLs, email "
+        "addresses, numbers and the topic, with plan inputs. Later queries of the same shape "
+        "then reuse the plan with their own values bound to those inputs instead of planning "
+        "again.",
     )
 
     # Logging Options
@@ -566,6 +781,19 @@ class Config(BaseModel):
         default="sys.stdout",
         description="Where to send logs. By default logs will be sent to sys.stdout",
     )
+    # default_log_format controls how default logs are formatted. TEXT logs are coloured for reading
+    # in a terminal, whereas JSON logs have one JSON object per line for log aggregators.
+    default_log_format: LogFormat = Field(
+        default=LogFormat.TEXT,
+        description="The format of logs. Only respected when the default logger is used.",
+    )
+
+    @field_validator("default_log_format", mode="before")
+    @classmethod
+    def parse_default_log_format(cls, value: str | LogFormat) -> LogFormat:
+        """Parse default_log_format to enum if string provided."""
+        return parse_str_to_enum(value, LogFormat)
+
     # json_log_serialize sets whether logs are JSON serialized before sending to the log sink.
     json_log_serialize: bool = Field(
         default=False,
@@ -583,6 +811,21 @@ class Config(BaseModel):
         """Parse execution_agent_type to enum if string provided."""
         return parse_str_to_enum(value, ExecutionAgentType)
 
+    max_parallel_steps: int = Field(
+        default=1,
+        ge=1,
+        description="The maximum number of plan steps to execute at once. Steps only run "
+        "concurrently when neither depends on the other's output and neither has a condition. "
+        "Steps running concurrently don't see each other's outputs as broader context.",
+    )
+
+    max_concurrent_runs: int = Field(
+        default=8,
+        ge=1,
+        description="The default maximum number of queries or plans to run at once in "
+        "Portia.run_many, Portia.arun_many, Portia.run_plan_many and Portia.arun_plan_many.",
+    )
+
     # PlanningAgent Options
     planning_agent_type: PlanningAgentType = Field(
         default=PlanningAgentType.DEFAULT,
@@ -862,6 +1105,9 @@ class Config(BaseModel):
     def _parse_model_string(self, model_string: str) -> GenerativeModel:
         """Parse a model string in the form of "provider-prefix/model_name" to a GenerativeModel.
 
+        Models are built once per config and reused on later calls, unless the credentials
+        for the provider have changed in the meantime.
+
         Supported provider-prefixes are:
         - openai
         - anthropic
@@ -881,7 +1127,39 @@ class Config(BaseModel):
         model_name = parts[1]
 
         llm_provider = LLMProvider(provider)
-        return self._construct_model_from_name(llm_provider, model_name)
+        cache_key = self._model_cache_key(llm_provider, model_name)
+        with _MODEL_CACHE_LOCK:
+            model = self._model_cache.get(cache_key)
+            if model is None:
+                model = self._construct_model_from_name(llm_provider, model_name)
+                self._model_cache[cache_key] = model
+        return model
+
+    def _model_cache_key(self, llm_provider: LLMProvider, model_name: str) -> tuple[Any, ...]:
+        """Get the key a model built from a provider and model name is cached under."""
+        match llm_provider:
+            case LLMProvider.OPENAI:
+                credentials: tuple[Any, ...] = (self.openai_api_key,)
+            case LLMProvider.ANTHROPIC:
+                credentials = (self.anthropic_api_key,)
+            case LLMProvider.MISTRALAI:
+                credentials = (self.mistralai_api_key,)
+            case LLMProvider.GOOGLE | LLMProvider.GOOGLE_GENERATIVE_AI:
+                credentials = (self.google_api_key,)
+            case LLMProvider.AMAZON:
+                credentials = (
+                    self.aws_access_key_id,
+                    self.aws_secret_access_key,
+                    self.aws_default_region,
+                    self.aws_credentials_profile_name,
+                )
+            case LLMProvider.AZURE_OPENAI:
+                credentials = (self.azure_openai_api_key, self.azure_openai_endpoint)
+            case LLMProvider.OLLAMA:
+                credentials = (self.ollama_base_url,)
+            case _:
+                credentials = ()
+        return (llm_provider, model_name, credentials)
 
     def _construct_model_from_name(  # noqa: PLR0911
         self,
@@ -6,6 +6,7 @@ in completing tasks.
 
 from __future__ import annotations
 
+from functools import cache
 from typing import TYPE_CHECKING, Any, Literal
 
 from langchain_core.prompts import (
@@ -23,9 +24,13 @@ from portia.execution_agents.base_execution_agent import BaseExecutionAgent
 from portia.execution_agents.context import StepInput  # noqa: TC001
 from portia.execution_agents.execution_utils import (
     MAX_RETRIES,
+    AgentEdge,
     AgentNode,
     get_arg_value_with_templating,
     process_output,
+    step_edge,
+    step_graph_config,
+    step_node,
     template_in_required_inputs,
     tool_call_or_end,
 )
@@ -40,6 +45,7 @@ from portia.tool import Tool, ToolRunContext
 
 if TYPE_CHECKING:
     from langchain.tools import StructuredTool
+    from langgraph.graph.state import CompiledStateGraph
 
     from portia.config import Config
     from portia.end_user import EndUser
@@ -715,6 +721,9 @@ class DefaultExecutionAgent(BaseExecutionAgent):
             plan=self.plan,
             config=self.config,
             clarifications=self.plan_run.get_clarifications_for_step(),
+            stream_callback=self.execution_hooks.get_stream_callback(self.plan_run, self.step)
+            if self.execution_hooks
+            else None,
         )
 
         model = self.config.get_execution_model()
@@ -724,74 +733,106 @@ class DefaultExecutionAgent(BaseExecutionAgent):
                 ctx=tool_run_ctx,
             ),
         ]
-        tool_node = ToolNode(tools)
-
-        graph = StateGraph(ExecutionState)
-        """
-        The execution graph represented here can be generated using
-        `print(app.get_graph().draw_mermaid())` on the compiled run (and running any agent
-        task). The below represents the current state of the graph (use a mermaid editor
-        to view e.g <https://mermaid.live/edit>)
-        graph TD;
-                __start__([<p>__start__</p>]):::first
-                tool_agent(tool_agent)
-                argument_parser(argument_parser)
-                argument_verifier(argument_verifier)
-                tools(tools)
-                summarizer(summarizer)
-                __end__([<p>__end__</p>]):::last
-                __start__ --> argument_parser;
-                argument_parser --> argument_verifier;
-                summarizer --> __end__;
-                argument_verifier -.-> tool_agent;
-                argument_verifier -.-> __end__;
-                tools -.-> tool_agent;
-                tools -.-> summarizer;
-                tools -.-> __end__;
-                tool_agent -.-> tools;
-                tool_agent -.-> __end__;
-                classDef default fill:#f2f0ff,line-height:1.2
-                classDef first fill-opacity:0
-                classDef last fill:#bfb6fc
-        """
-
-        graph.add_node(AgentNode.TOOL_AGENT, ToolCallingModel(model, tools, self).invoke)
-        if self.verified_args:
-            graph.add_edge(START, AgentNode.TOOL_AGENT)
-        else:
-            graph.add_node(AgentNode.MEMORY_EXTRACTION, MemoryExtractionStep(self).invoke)
-            graph.add_edge(START, AgentNode.MEMORY_EXTRACTION)
-            graph.add_node(AgentNode.ARGUMENT_PARSER, ParserModel(model, self, tool_run_ctx).invoke)
-            graph.add_edge(AgentNode.MEMORY_EXTRACTION, AgentNode.ARGUMENT_PARSER)
-            graph.add_node(
-                AgentNode.ARGUMENT_VERIFIER, VerifierModel(model, self, tool_run_ctx).invoke
-            )
-            graph.add_edge(AgentNode.ARGUMENT_PARSER, AgentNode.ARGUMENT_VERIFIER)
-            graph.add_conditional_edges(
-                AgentNode.ARGUMENT_VERIFIER,
-                self.clarifications_or_continue,
+        implementations = {
+            AgentNode.TOOL_AGENT: ToolCallingModel(model, tools, self).invoke,
+            AgentNode.TOOLS: ToolNode(tools),
+            AgentNode.SUMMARIZER: StepSummarizer(self.config, model, self.tool, self.step).invoke,
+            AgentEdge.AFTER_TOOLS: lambda state: self.next_state_after_tool_call(
+                self.config, state, self.tool
+            ),
+        }
+        if not self.verified_args:
+            implementations.update(
+                {
+                    AgentNode.MEMORY_EXTRACTION: MemoryExtractionStep(self).invoke,
+                    AgentNode.ARGUMENT_PARSER: ParserModel(model, self, tool_run_ctx).invoke,
+                    AgentNode.ARGUMENT_VERIFIER: VerifierModel(model, self, tool_run_ctx).invoke,
+                    AgentEdge.AFTER_ARGUMENT_VERIFIER: self.clarifications_or_continue,
+                }
             )
 
-        graph.add_node(AgentNode.TOOLS, tool_node)
-        graph.add_node(
-            AgentNode.SUMMARIZER,
-            StepSummarizer(self.config, model, self.tool, self.step).invoke,
+        app = get_default_execution_graph(verified_args=self.verified_args is not None)
+        invocation_result = app.invoke(
+            {"messages": [], "step_inputs": []}, step_graph_config(implementations)
         )
-        graph.add_conditional_edges(
-            AgentNode.TOOLS,
-            lambda state: self.next_state_after_tool_call(self.config, state, self.tool),
-        )
-        graph.add_conditional_edges(
-            AgentNode.TOOL_AGENT,
-            tool_call_or_end,
-        )
-        graph.add_edge(AgentNode.SUMMARIZER, END)
-
-        app = graph.compile()
-        invocation_result = app.invoke({"messages": [], "step_inputs": []})
         return process_output(
             self.step,
             invocation_result["messages"],
             self.tool,
             self.new_clarifications,
         )
+
+
+@cache
+def get_default_execution_graph(verified_args: bool) -> CompiledStateGraph:
+    """Get the compiled graph for the DefaultExecutionAgent.
+
+    The graph is compiled once and shared by all DefaultExecutionAgents. The state for each step is
+    passed in through the config when the graph is invoked.
+
+    Args:
+        verified_args (bool): Whether the agent already has verified arguments, in which case the
+            argument parsing and verification nodes are skipped.
+
+    """
+    graph = StateGraph(ExecutionState)
+    """
+    The execution graph represented here can be generated using
+    `print(app.get_graph().draw_mermaid())` on the compiled run (and running any agent
+    task). The below represents the current state of the graph (use a mermaid editor
+    to view e.g <https://mermaid.live/edit>)
+    graph TD;
+            __start__([<p>__start__</p>]):::first
+            tool_agent(tool_agent)
+            argument_parser(argument_parser)
+            argument_verifier(argument_verifier)
+            tools(tools)
+            summarizer(summarizer)
+            __end__([<p>__end__</p>]):::last
+            __start__ --> argument_parser;
+            argument_parser --> argument_verifier;
+            summarizer --> __end__;
+            argument_verifier -.-> tool_agent;
+            argument_verifier -.-> __end__;
+            tools -.-> tool_agent;
+            tools -.-> summarizer;
+            tools -.-> __end__;
+            tool_agent -.-> tools;
+            tool_agent -.-> __end__;
+            classDef default fill:#f2f0ff,line-height:1.2
+            classDef first fill-opacity:0
+            classDef last fill:#bfb6fc
+    """
+
+    graph.add_node(AgentNode.TOOL_AGENT, step_node(AgentNode.TOOL_AGENT, sync=True))
+    if verified_args:
+        graph.add_edge(START, AgentNode.TOOL_AGENT)
+    else:
+        graph.add_node(
+            AgentNode.MEMORY_EXTRACTION, step_node(AgentNode.MEMORY_EXTRACTION, sync=True)
+        )
+        graph.add_edge(START, AgentNode.MEMORY_EXTRACTION)
+        graph.add_node(AgentNode.ARGUMENT_PARSER, step_node(AgentNode.ARGUMENT_PARSER, sync=True))
+        graph.add_edge(AgentNode.MEMORY_EXTRACTION, AgentNode.ARGUMENT_PARSER)
+        graph.add_node(
+            AgentNode.ARGUMENT_VERIFIER, step_node(AgentNode.ARGUMENT_VERIFIER, sync=True)
+        )
+        graph.add_edge(AgentNode.ARGUMENT_PARSER, AgentNode.ARGUMENT_VERIFIER)
+        graph.add_conditional_edges(
+            AgentNode.ARGUMENT_VERIFIER,
+            step_edge(AgentEdge.AFTER_ARGUMENT_VERIFIER),
+        )
+
+    graph.add_node(AgentNode.TOOLS, step_node(AgentNode.TOOLS, sync=True))
+    graph.add_node(AgentNode.SUMMARIZER, step_node(AgentNode.SUMMARIZER, sync=True))
+    graph.add_conditional_edges(
+        AgentNode.TOOLS,
+        step_edge(AgentEdge.AFTER_TOOLS),
+    )
+    graph.add_conditional_edges(
+        AgentNode.TOOL_AGENT,
+        tool_call_or_end,
+    )
+    graph.add_edge(AgentNode.SUMMARIZER, END)
+
+    return graph.compile()
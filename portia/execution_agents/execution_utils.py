@@ -5,12 +5,14 @@ This module contains utility functions for managing agent execution flow.
 
 from __future__ import annotations
 
+import inspect
 import re
 from enum import Enum
 from typing import TYPE_CHECKING, Any, Literal
 
 from jinja2 import Template
 from langchain_core.messages import ToolMessage
+from langchain_core.runnables import Runnable, RunnableConfig
 from langgraph.graph import END, MessagesState
 from pydantic import ValidationError
 
@@ -23,8 +25,11 @@ from portia.errors import (
     ToolSoftError,
 )
 from portia.execution_agents.output import LocalDataValue, Output
+from portia.stage_timing import timed_stage
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from langchain_core.messages import BaseMessage
 
     from portia.execution_agents.context import StepInput
@@ -56,8 +61,86 @@ class AgentNode(str, Enum):
     MEMORY_EXTRACTION = "memory_extraction"
 
 
+class AgentEdge(str, Enum):
+    """Conditional edges for agent execution.
+
+    Attributes:
+        AFTER_ARGUMENT_VERIFIER (str): The edge leaving the argument verifier.
+        AFTER_TOOLS (str): The edge leaving the tools node.
+
+    """
+
+    AFTER_ARGUMENT_VERIFIER = "after_argument_verifier"
+    AFTER_TOOLS = "after_tools"
+
+
 MAX_RETRIES = 4
 
+AGENT_GRAPH_IMPLEMENTATIONS_KEY = "portia_agent_graph_implementations"
+"""The key in the graph's configurable dict holding the implementations for the current step."""
+
+
+def step_graph_config(
+    implementations: dict[AgentNode | AgentEdge, Callable[..., Any] | Runnable],
+) -> RunnableConfig:
+    """Get the config for invoking a compiled agent graph for a step.
+
+    Agent graphs are compiled once and shared between steps. Their nodes and conditional edges
+    delegate to the implementations passed in here, which hold the state for the current step
+    (e.g. the tool and its run context).
+
+    Args:
+        implementations (dict[AgentNode | AgentEdge, Callable[..., Any] | Runnable]): The
+            implementation of each node and conditional edge in the graph.
+
+    """
+    return {"configurable": {AGENT_GRAPH_IMPLEMENTATIONS_KEY: implementations}}
+
+
+def step_node(node: AgentNode, *, sync: bool) -> Callable[..., Any]:
+    """Create a graph node that delegates to the current step's implementation of the node.
+
+    Args:
+        node (AgentNode): The node to create.
+        sync (bool): Whether the graph is invoked synchronously.
+
+    """
+    # The state isn't annotated with a schema, so that nodes receive the graph's full state
+    if sync:
+
+        def invoke(state: dict[str, Any], config: RunnableConfig) -> Any:  # noqa: ANN401
+            implementation = config["configurable"][AGENT_GRAPH_IMPLEMENTATIONS_KEY][node]
+            with timed_stage(node.value):
+                if isinstance(implementation, Runnable):
+                    return implementation.invoke(state, config)
+                return implementation(state)
+
+        return invoke
+
+    async def ainvoke(state: dict[str, Any], config: RunnableConfig) -> Any:  # noqa: ANN401
+        implementation = config["configurable"][AGENT_GRAPH_IMPLEMENTATIONS_KEY][node]
+        with timed_stage(node.value):
+            if isinstance(implementation, Runnable):
+                return await implementation.ainvoke(state, config)
+            result = implementation(state)
+            return await result if inspect.isawaitable(result) else result
+
+    return ainvoke
+
+
+def step_edge(edge: AgentEdge) -> Callable[..., Any]:
+    """Create a conditional edge that delegates to the current step's implementation of the edge.
+
+    Args:
+        edge (AgentEdge): The edge to create.
+
+    """
+
+    def route(state: dict[str, Any], config: RunnableConfig) -> Any:  # noqa: ANN401
+        return config["configurable"][AGENT_GRAPH_IMPLEMENTATIONS_KEY][edge](state)
+
+    return route
+
 
 def is_clarification(artifact: Any) -> bool:  # noqa: ANN401
     """Check if the artifact is a clarification or list of clarifications."""
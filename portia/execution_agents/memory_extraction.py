@@ -13,6 +13,7 @@ from portia.token_check import exceeds_context_threshold
 
 if TYPE_CHECKING:
     from portia.execution_agents.base_execution_agent import BaseExecutionAgent
+    from portia.model import GenerativeModel
 
 
 class MemoryExtractionStep:
@@ -47,8 +48,9 @@ class MemoryExtractionStep:
             for input_variable in self.agent.step.inputs
             if input_variable.name in potential_inputs
         ]
-        if exceeds_context_threshold(step_inputs, self.agent.config.get_execution_model(), 0.9):
-            self._truncate_inputs(step_inputs)
+        model = self.agent.config.get_execution_model()
+        if exceeds_context_threshold(step_inputs, model, 0.9):
+            self._truncate_inputs(step_inputs, model)
 
         if len(step_inputs) != len(self.agent.step.inputs):
             expected_inputs = {input_.name for input_ in self.agent.step.inputs}
@@ -58,12 +60,12 @@ class MemoryExtractionStep:
             )
         return {"step_inputs": step_inputs}
 
-    def _truncate_inputs(self, inputs: list[StepInput]) -> None:
+    def _truncate_inputs(self, inputs: list[StepInput], model: GenerativeModel) -> None:
         """Truncate the step inputs so they fit in the context window."""
         # Replace input values with their description one by one (largest to smallest) until the
         # inputs fit
         inputs.sort(key=lambda x: len(str(x.value)) if x.value is not None else 0, reverse=True)
         for input_ in inputs:
-            if not exceeds_context_threshold(inputs, self.agent.config.get_execution_model(), 0.9):
+            if not exceeds_context_threshold(inputs, model, 0.9):
                 return
             input_.value = input_.description
@@ -8,6 +8,7 @@ be more successful than the OneShotAgent.
 
 from __future__ import annotations
 
+from functools import cache
 from typing import TYPE_CHECKING, Any
 
 from langchain_core.prompts import (
@@ -23,9 +24,13 @@ from portia.execution_agents.base_execution_agent import BaseExecutionAgent
 from portia.execution_agents.clarification_tool import ClarificationTool
 from portia.execution_agents.context import StepInput  # noqa: TC001
 from portia.execution_agents.execution_utils import (
+    AgentEdge,
     AgentNode,
     is_soft_tool_error,
     process_output,
+    step_edge,
+    step_graph_config,
+    step_node,
     template_in_required_inputs,
     tool_call_or_end,
 )
@@ -41,7 +46,8 @@ if TYPE_CHECKING:
     from langchain.tools import StructuredTool
     from langchain_core.language_models.base import LanguageModelInput
     from langchain_core.messages import BaseMessage
-    from langchain_core.runnables import Runnable
+    from langchain_core.runnables import Runnable, RunnableConfig
+    from langgraph.graph.state import CompiledStateGraph
 
     from portia.config import Config
     from portia.end_user import EndUser
@@ -98,8 +104,9 @@ class OneShotToolCallingModel:
                 "1000 words that you want to use verbatim.",
                 template_format="jinja2",
             ),
+            # The tool description and guidelines come before the task and context, which change
+            # with every step, so that calls to the same tool share a cacheable prompt prefix.
             HumanMessagePromptTemplate.from_template(
-                "Task: {{ task }}\n"
                 "The system has a tool available named '{{ tool_name }}'.\n"
                 "Argument schema for the tool:\n{{ tool_args }}\n"
                 "Description of the tool: {{ tool_description }}\n"
@@ -108,17 +115,7 @@ class OneShotToolCallingModel:
                 "argument schema:\n{{ clarification_tool_args }}\n"
                 "{% endif %}"
                 "\n\n----------\n\n"
-                "Context for user input and past steps:\n{{ context }}\n"
-                "\n\n----------\n\n"
-                "The following section contains previous errors. "
-                "Ensure your response avoids these errors. "
-                "The one exception to this is not providing a value for a required argument. "
-                "If a value cannot be extracted from the context, you can leave it blank. "
-                "Do not assume a default value that meets the type expectation or is a common testing value. "  # noqa: E501
-                "Here are the previous errors:\n"
-                "{{ previous_errors }}\n"
-                "\n\n----------\n\n"
-                "Please call the tool to achieve the above task, following the guidelines below:\n"
+                "Please call the tool to achieve the task below, following these guidelines:\n"
                 "- If a tool needs to be called many times, you can repeat the argument\n"
                 "- You may take values from the task, inputs, previous steps or clarifications\n"
                 "- Prefer values clarified in follow-up inputs over initial inputs.\n"
@@ -129,7 +126,19 @@ class OneShotToolCallingModel:
                 "- Ensure arguments align with the tool's schema and intended use."
                 "{% if use_clarification_tool %}- If you are unsure of an argument to use for the "
                 "tool, you can use the clarification tool to clarify what the argument should be.\n"
-                "{% endif %}",
+                "{% endif %}"
+                "\n\n----------\n\n"
+                "Task: {{ task }}\n"
+                "\n\n----------\n\n"
+                "Context for user input and past steps:\n{{ context }}\n"
+                "\n\n----------\n\n"
+                "The following section contains previous errors. "
+                "Ensure your response avoids these errors. "
+                "The one exception to this is not providing a value for a required argument. "
+                "If a value cannot be extracted from the context, you can leave it blank. "
+                "Do not assume a default value that meets the type expectation or is a common testing value. "  # noqa: E501
+                "Here are the previous errors:\n"
+                "{{ previous_errors }}\n",
                 template_format="jinja2",
             ),
         ],
@@ -300,8 +309,9 @@ class OneShotAgent(BaseExecutionAgent):
             Output: The result of the agent's execution, containing the tool call result.
 
         """
-        app = self._setup_graph(sync=True).compile()
-        invocation_result = app.invoke({"messages": [], "step_inputs": []})
+        invocation_result = get_one_shot_graph(sync=True).invoke(
+            {"messages": [], "step_inputs": []}, self._graph_config(sync=True)
+        )
 
         return process_output(
             self.step, invocation_result["messages"], self.tool, self.new_clarifications
@@ -316,14 +326,15 @@ class OneShotAgent(BaseExecutionAgent):
             Output: The result of the agent's execution, containing the tool call result.
 
         """
-        app = self._setup_graph(sync=False).compile()
-        invocation_result = await app.ainvoke({"messages": [], "step_inputs": []})
+        invocation_result = await get_one_shot_graph(sync=False).ainvoke(
+            {"messages": [], "step_inputs": []}, self._graph_config(sync=False)
+        )
         return process_output(
             self.step, invocation_result["messages"], self.tool, self.new_clarifications
         )
 
-    def _setup_graph(self, sync: bool) -> StateGraph:
-        """Set up the graph for the agent."""
+    def _graph_config(self, sync: bool) -> RunnableConfig:
+        """Set up the implementations of the graph's nodes and edges for the current step."""
         if not self.tool:
             raise InvalidAgentError("No tool available")
 
@@ -333,6 +344,9 @@ class OneShotAgent(BaseExecutionAgent):
             plan=self.plan,
             config=self.config,
             clarifications=self.plan_run.get_clarifications_for_step(),
+            stream_callback=self.execution_hooks.get_stream_callback(self.plan_run, self.step)
+            if self.execution_hooks
+            else None,
         )
 
         model = self.config.get_execution_model()
@@ -342,37 +356,53 @@ class OneShotAgent(BaseExecutionAgent):
         clarification_tool = ClarificationTool(step=self.plan_run.current_step_index)
         if self.config.argument_clarifications_enabled:
             tools.append(clarification_tool.to_langchain_with_artifact(ctx=tool_run_ctx, sync=sync))
-        tool_node = ToolNode(tools)
+        tool_calling_model = OneShotToolCallingModel(model, tools, self, tool_run_ctx)
+        step_summarizer = StepSummarizer(self.config, model, self.tool, self.step)
+        return step_graph_config(
+            {
+                AgentNode.MEMORY_EXTRACTION: MemoryExtractionStep(self).invoke,
+                AgentNode.TOOL_AGENT: tool_calling_model.invoke
+                if sync
+                else tool_calling_model.ainvoke,
+                AgentNode.TOOLS: ToolNode(tools),
+                AgentNode.SUMMARIZER: step_summarizer.invoke if sync else step_summarizer.ainvoke,
+                AgentEdge.AFTER_TOOLS: lambda state: self.next_state_after_tool_call(
+                    self.config, state, self.tool
+                ),
+            }
+        )
 
-        graph = StateGraph(ExecutionState)
-        graph.add_node(AgentNode.MEMORY_EXTRACTION, MemoryExtractionStep(self).invoke)
-        graph.add_edge(START, AgentNode.MEMORY_EXTRACTION)
 
-        graph.add_node(
-            AgentNode.TOOL_AGENT,
-            OneShotToolCallingModel(model, tools, self, tool_run_ctx).ainvoke
-            if not sync
-            else OneShotToolCallingModel(model, tools, self, tool_run_ctx).invoke,
-        )
-        graph.add_edge(AgentNode.MEMORY_EXTRACTION, AgentNode.TOOL_AGENT)
-
-        graph.add_node(AgentNode.TOOLS, tool_node)
-        graph.add_node(
-            AgentNode.SUMMARIZER,
-            StepSummarizer(self.config, model, self.tool, self.step).ainvoke
-            if not sync
-            else StepSummarizer(self.config, model, self.tool, self.step).invoke,
-        )
+@cache
+def get_one_shot_graph(sync: bool) -> CompiledStateGraph:
+    """Get the compiled graph for the OneShotAgent.
 
-        # Use execution manager for state transitions
-        graph.add_conditional_edges(
-            AgentNode.TOOL_AGENT,
-            tool_call_or_end,
-        )
-        graph.add_conditional_edges(
-            AgentNode.TOOLS,
-            lambda state: self.next_state_after_tool_call(self.config, state, self.tool),
-        )
-        graph.add_edge(AgentNode.SUMMARIZER, END)
+    The graph is compiled once and shared by all OneShotAgents. The state for each step is passed
+    in through the config when the graph is invoked.
+
+    Args:
+        sync (bool): Whether the graph is invoked synchronously.
+
+    """
+    graph = StateGraph(ExecutionState)
+    graph.add_node(AgentNode.MEMORY_EXTRACTION, step_node(AgentNode.MEMORY_EXTRACTION, sync=sync))
+    graph.add_edge(START, AgentNode.MEMORY_EXTRACTION)
+
+    graph.add_node(AgentNode.TOOL_AGENT, step_node(AgentNode.TOOL_AGENT, sync=sync))
+    graph.add_edge(AgentNode.MEMORY_EXTRACTION, AgentNode.TOOL_AGENT)
+
+    graph.add_node(AgentNode.TOOLS, step_node(AgentNode.TOOLS, sync=sync))
+    graph.add_node(AgentNode.SUMMARIZER, step_node(AgentNode.SUMMARIZER, sync=sync))
+
+    # Use execution manager for state transitions
+    graph.add_conditional_edges(
+        AgentNode.TOOL_AGENT,
+        tool_call_or_end,
+    )
+    graph.add_conditional_edges(
+        AgentNode.TOOLS,
+        step_edge(AgentEdge.AFTER_TOOLS),
+    )
+    graph.add_edge(AgentNode.SUMMARIZER, END)
 
-        return graph
+    return graph.compile()
@@ -14,6 +14,8 @@ from portia.model import Message
 from portia.token_check import exceeds_context_threshold
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from portia.config import Config
     from portia.execution_agents.output import Output
     from portia.plan import Plan
@@ -27,6 +29,8 @@ class FinalOutputSummarizer:
     Attributes:
         config (Config): The configuration for the llm.
         agent_memory (AgentMemory): The agent memory to use for the summarizer.
+        stream_callback (Callable[[str], None] | None): If set, summaries which aren't structured
+            are streamed to this callback chunk by chunk.
 
     """
 
@@ -45,16 +49,24 @@ class FinalOutputSummarizer:
         "the output schema.\n"
     )
 
-    def __init__(self, config: Config, agent_memory: AgentMemory) -> None:
+    def __init__(
+        self,
+        config: Config,
+        agent_memory: AgentMemory,
+        stream_callback: Callable[[str], None] | None = None,
+    ) -> None:
         """Initialize the summarizer agent.
 
         Args:
             config (Config): The configuration for the llm.
             agent_memory (AgentMemory): The agent memory to use for the summarizer.
+            stream_callback (Callable[[str], None] | None): If set, summaries which aren't
+                structured are streamed to this callback chunk by chunk.
 
         """
         self.config = config
         self.agent_memory = agent_memory
+        self.stream_callback = stream_callback
 
     def _build_tasks_and_outputs_context(self, plan: Plan, plan_run: PlanRun) -> str:
         """Build the query, tasks and outputs context.
@@ -122,7 +134,12 @@ class FinalOutputSummarizer:
                 ],
                 SchemaWithSummary,
             )
-        response = model.get_response(
-            [Message(content=self.summarizer_only_prompt + context, role="user")],
-        )
+        messages = [Message(content=self.summarizer_only_prompt + context, role="user")]
+        if self.stream_callback:
+            chunks = []
+            for chunk in model.stream_response(messages):
+                self.stream_callback(chunk)
+                chunks.append(chunk)
+            return "".join(chunks) or None
+        response = model.get_response(messages)
         return str(response.content) if response.content else None
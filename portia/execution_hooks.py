@@ -46,6 +46,7 @@ class ExecutionHooks(BaseModel):
         handled.
     - before_tool_call: Called before the tool is called
     - after_tool_call: Called after the tool is called
+    - on_llm_response_chunk: Called with each chunk of text streamed from LLM responses
     """
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -128,6 +129,33 @@ class ExecutionHooks(BaseModel):
           is raised, when we later resume the plan, the same step will be executed again
     """
 
+    on_llm_response_chunk: Callable[[PlanRun, Step | None, str], None] | None = None
+    """Called with each chunk of text as it is generated by the LLM.
+
+    When set, text responses of the LLM tool, LLM steps and the final output summary are
+    streamed from the model rather than returned once complete, so that the text can be shown as
+    it is generated. Structured outputs are not streamed.
+
+    Args:
+        plan_run: The current plan run
+        step: The step being executed, or None for the final output summary
+        chunk: The next chunk of text in the response
+    """
+
+    def get_stream_callback(
+        self, plan_run: PlanRun, step: Step | None
+    ) -> Callable[[str], None] | None:
+        """Get a callback passing response chunks to on_llm_response_chunk, if it is set.
+
+        Args:
+            plan_run: The current plan run
+            step: The step being executed, or None for the final output summary
+
+        """
+        if self.on_llm_response_chunk is None:
+            return None
+        return partial(self.on_llm_response_chunk, plan_run, step)
+
 
 # Example execution hooks
 
@@ -0,0 +1,300 @@
+"""Local caches for LLM responses.
+
+These caches implement LangChain's BaseCache interface, so they can be used both by LangChain
+chat models and by the instructor-based structured output calls in portia.model. Two backends are
+provided:
+
+- InMemoryLLMCache: an in-process LRU cache bounded by the total size of the cached responses.
+- SQLiteLLMCache: an on-disk cache whose entries expire after a time to live, which can be shared
+  between processes and survives restarts.
+
+Both keep LLMCacheStats counting hits, misses and the time saved by serving responses from the
+cache rather than the LLM.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import abstractmethod
+from collections import OrderedDict
+from contextlib import closing
+from functools import cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
+from pydantic import BaseModel, Field
+
+from portia.stage_timing import record_llm_cache_lookup
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+MAX_PENDING_MISSES = 1_024
+"""MAX_PENDING_MISSES bounds the cache misses tracked while waiting for the LLM's response."""
+
+
+class LLMCacheStats(BaseModel):
+    """A snapshot of how an LLM cache has been used.
+
+    Attributes:
+        hits: The number of lookups served from the cache.
+        misses: The number of lookups not found in the cache.
+        latency_saved_seconds: The total time the LLM took to produce the responses which were
+            later served from the cache.
+
+    """
+
+    hits: int = Field(default=0, description="The number of lookups served from the cache.")
+    misses: int = Field(default=0, description="The number of lookups not found in the cache.")
+    latency_saved_seconds: float = Field(
+        default=0.0,
+        description="The total time the LLM took to produce the responses served from the cache.",
+    )
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def serialize_generations(generations: Sequence[Generation]) -> str:
+    """Serialize LLM generations to JSON for storage in a cache."""
+    return json.dumps(
+        [
+            {
+                "text": generation.text,
+                "generation_info": generation.generation_info,
+                "message": (
+                    message_to_dict(generation.message)
+                    if isinstance(generation, ChatGeneration)
+                    else None
+                ),
+            }
+            for generation in generations
+        ],
+        default=str,
+    )
+
+
+def deserialize_generations(value: str) -> list[Generation]:
+    """Deserialize LLM generations stored with serialize_generations."""
+    generations: list[Generation] = []
+    for raw in json.loads(value):
+        if raw["message"] is not None:
+            (message,) = messages_from_dict([raw["message"]])
+            generations.append(
+                ChatGeneration(message=message, generation_info=raw["generation_info"]),
+            )
+        else:
+            generations.append(Generation(text=raw["text"], generation_info=raw["generation_info"]))
+    return generations
+
+
+class LocalLLMCache(BaseCache):
+    """Base class for the LLM caches kept locally rather than in Redis.
+
+    Subclasses store serialized responses along with how long the LLM took to produce them.
+    The time between a missed lookup and the matching update is taken as the LLM's latency.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the cache."""
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._latency_saved = 0.0
+        self._pending_misses: OrderedDict[str, float] = OrderedDict()
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        """Get the key a response to a prompt from an LLM is stored under."""
+        return hashlib.sha256(f"{llm_string}\0{prompt}".encode()).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        """Look up a cached response based on a prompt and llm_string."""
+        key = self._key(prompt, llm_string)
+        entry = self._get(key)
+        with self._stats_lock:
+            if entry is None:
+                self._misses += 1
+                self._pending_misses[key] = time.monotonic()
+                self._pending_misses.move_to_end(key)
+                while len(self._pending_misses) > MAX_PENDING_MISSES:
+                    self._pending_misses.popitem(last=False)
+            else:
+                value, latency = entry
+                self._hits += 1
+                self._latency_saved += latency
+        record_llm_cache_lookup(hit=entry is not None)
+        if entry is None:
+            return None
+        return deserialize_generations(value)
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Cache the response to a prompt from an LLM."""
+        key = self._key(prompt, llm_string)
+        with self._stats_lock:
+            missed_at = self._pending_misses.pop(key, None)
+        latency = time.monotonic() - missed_at if missed_at is not None else 0.0
+        self._put(key, serialize_generations(return_val), latency)
+
+    def clear(self, **kwargs: Any) -> None:  # noqa: ARG002
+        """Remove every cached response and reset the stats."""
+        self._clear()
+        with self._stats_lock:
+            self._hits = 0
+            self._misses = 0
+            self._latency_saved = 0.0
+            self._pending_misses.clear()
+
+    @property
+    def stats(self) -> LLMCacheStats:
+        """Get a snapshot of how the cache has been used."""
+        with self._stats_lock:
+            return LLMCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                latency_saved_seconds=self._latency_saved,
+            )
+
+    @abstractmethod
+    def _get(self, key: str) -> tuple[str, float] | None:
+        """Get a serialized response and the latency it was produced with, if cached."""
+
+    @abstractmethod
+    def _put(self, key: str, value: str, latency: float) -> None:
+        """Store a serialized response and the latency it was produced with."""
+
+    @abstractmethod
+    def _clear(self) -> None:
+        """Remove every cached response."""
+
+
+class InMemoryLLMCache(LocalLLMCache):
+    """In-process LRU cache of LLM responses bounded by their total size.
+
+    The least recently used responses are evicted once the serialized responses held exceed
+    max_bytes. Responses larger than max_bytes on their own are not cached.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_bytes (int): The maximum total size of the serialized responses held.
+
+        """
+        super().__init__()
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached responses."""
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        """The total size of the serialized responses held."""
+        return self._bytes
+
+    def _get(self, key: str) -> tuple[str, float] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _put(self, key: str, value: str, latency: float) -> None:
+        size = len(value.encode())
+        with self._lock:
+            if (previous := self._entries.pop(key, None)) is not None:
+                self._bytes -= len(previous[0].encode())
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, latency)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.encode())
+
+    def _clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+class SQLiteLLMCache(LocalLLMCache):
+    """On-disk cache of LLM responses whose entries expire after a time to live.
+
+    Expired entries are ignored on lookup and removed whenever a response is added.
+    """
+
+    def __init__(self, path: str | Path, ttl_seconds: int) -> None:
+        """Initialize the cache, creating the database if needed.
+
+        Args:
+            path (str | Path): The path of the SQLite database file.
+            ttl_seconds (int): How long cached responses are served for.
+
+        """
+        super().__init__()
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, latency REAL NOT NULL, "
+                "created_at REAL NOT NULL)"
+            )
+
+    def _connect(self) -> closing[sqlite3.Connection]:
+        """Open a connection to the cache database."""
+        return closing(sqlite3.connect(self.path, timeout=30))
+
+    def _get(self, key: str) -> tuple[str, float] | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, latency FROM llm_cache WHERE key = ? AND created_at > ?",
+                (key, time.time() - self.ttl_seconds),
+            ).fetchone()
+        return (row[0], row[1]) if row is not None else None
+
+    def _put(self, key: str, value: str, latency: float) -> None:
+        now = time.time()
+        with self._connect() as conn, conn:
+            conn.execute("DELETE FROM llm_cache WHERE created_at <= ?", (now - self.ttl_seconds,))
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, latency, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, latency, now),
+            )
+
+    def _clear(self) -> None:
+        with self._connect() as conn, conn:
+            conn.execute("DELETE FROM llm_cache")
+
+
+@cache
+def get_in_memory_llm_cache(max_bytes: int) -> InMemoryLLMCache:
+    """Get the process-wide in-memory LLM cache with the given size budget.
+
+    Configs with the same budget share a cache, so responses survive re-creating the config.
+    """
+    return InMemoryLLMCache(max_bytes)
+
+
+@cache
+def get_sqlite_llm_cache(path: str, ttl_seconds: int) -> SQLiteLLMCache:
+    """Get the SQLite LLM cache stored at the given path."""
+    return SQLiteLLMCache(path, ttl_seconds)
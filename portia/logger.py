@@ -10,6 +10,9 @@ Classes in this file include:
 
 - `LoggerInterface`: A protocol defining the common logging methods (`debug`, `info`, `warning`,
 `error`, `critical`).
+- `LazyMessage`: A log message which is only built if it is logged.
+- `Formatter` and `JsonFormatter`: Formatters for the default logger, producing coloured text or
+one JSON object per line.
 - `LoggerManager`: A class for managing the logger, allowing customization and configuration from
 the application's settings.
 
@@ -19,6 +22,7 @@ This module ensures flexible and configurable logging, supporting both default a
 
 from __future__ import annotations
 
+import json
 import re
 import sys
 import traceback
@@ -27,6 +31,8 @@ from typing import TYPE_CHECKING, Any, Protocol
 from loguru import logger as default_logger
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from portia.config import Config
 
 FUNCTION_COLOR_MAP = {
@@ -38,6 +44,42 @@ FUNCTION_COLOR_MAP = {
     "plan": "fg 39",
 }
 
+# Matches single (rather than already doubled) curly braces
+_SINGLE_BRACE = re.compile(r"(?<!\{)\{(?!\{)|(?<!\})\}(?!\})")
+# The key of the extra fields JsonFormatter passes the formatted record through
+_JSON_EXTRA = "_portia_json"
+
+
+class LazyMessage:
+    """A log message which is only built if it is logged.
+
+    Messages which are expensive to build, e.g. serialised plan runs logged at debug level, can be
+    wrapped in a LazyMessage so that no work is done when the log level filters them out. Loggers
+    build the message by converting it with str(), which the default logger and loggers from the
+    standard logging module only do once they have checked the message's level.
+
+    Example:
+        logger().debug(LazyMessage(lambda: f"New PlanRun State: {plan_run.model_dump_json()}"))
+
+    """
+
+    __slots__ = ("_build", "_message")
+
+    def __init__(self, build: Callable[[], str]) -> None:
+        """Initialize the message with the function which builds it."""
+        self._build = build
+        self._message: str | None = None
+
+    def __str__(self) -> str:
+        """Build the message, or return it if it has already been built."""
+        if self._message is None:
+            self._message = self._build()
+        return self._message
+
+    def format(self, *args: Any, **kwargs: Any) -> str:
+        """Build the message and format it with the arguments, as the default logger does."""
+        return str(self).format(*args, **kwargs)
+
 
 class LoggerInterface(Protocol):
     """General Interface for loggers.
@@ -51,15 +93,17 @@ class LoggerInterface(Protocol):
     - `critical`: For logging critical error messages.
 
     These methods are used throughout the application for logging messages at various levels.
+    Messages may be LazyMessages, which loggers should only convert to strings once they have
+    decided to log them.
 
     """
 
-    def debug(self, msg: str, *args, **kwargs) -> None: ...  # noqa: ANN002, ANN003, D102
-    def info(self, msg: str, *args, **kwargs) -> None: ...  # noqa: ANN002, ANN003, D102
-    def warning(self, msg: str, *args, **kwargs) -> None: ...  # noqa: ANN002, ANN003, D102
-    def error(self, msg: str, *args, **kwargs) -> None: ...  # noqa: ANN002, ANN003, D102
-    def critical(self, msg: str, *args, **kwargs) -> None: ...  # noqa: ANN002, ANN003, D102
-    def exception(self, msg: str, *args, **kwargs) -> None: ...  # noqa: ANN002, ANN003, D102
+    def debug(self, msg: str | LazyMessage, *args, **kwargs) -> None: ...  # noqa: ANN002, ANN003, D102
+    def info(self, msg: str | LazyMessage, *args, **kwargs) -> None: ...  # noqa: ANN002, ANN003, D102
+    def warning(self, msg: str | LazyMessage, *args, **kwargs) -> None: ...  # noqa: ANN002, ANN003, D102
+    def error(self, msg: str | LazyMessage, *args, **kwargs) -> None: ...  # noqa: ANN002, ANN003, D102
+    def critical(self, msg: str | LazyMessage, *args, **kwargs) -> None: ...  # noqa: ANN002, ANN003, D102
+    def exception(self, msg: str | LazyMessage, *args, **kwargs) -> None: ...  # noqa: ANN002, ANN003, D102
 
 
 class Formatter:
@@ -126,12 +170,12 @@ class Formatter:
 
     def _sanitize_message_(self, msg: str, truncate: bool = True) -> str:
         """Sanitize a message to be used in a log record."""
-        # doubles opening curly braces in a string { -> {{
-        msg = re.sub(r"(?<!\{)\{(?!\{)", "{{", msg)
-        # doubles closing curly braces in a string } -> }}
-        msg = re.sub(r"(?<!\})\}(?!\})", "}}", msg)
+        # doubles single curly braces in a string { -> {{ and } -> }}
+        if "{" in msg or "}" in msg:
+            msg = _SINGLE_BRACE.sub(lambda match: match.group() * 2, msg)
         # escapes < and > in a string
-        msg = msg.replace("<", r"\<").replace(">", r"\>")
+        if "<" in msg or ">" in msg:
+            msg = msg.replace("<", r"\<").replace(">", r"\>")
 
         return self._truncated_message_(msg) if truncate else msg
 
@@ -161,8 +205,48 @@ class Formatter:
         return msg
 
 
+class JsonFormatter:
+    """Formats log records as one JSON object per line, without colour markup.
+
+    Unlike the Formatter, messages don't need escaping or truncating, which makes this the faster
+    option for logs that are collected by a log aggregator rather than read in a terminal.
+    """
+
+    def format(self, record: Any) -> str:  # noqa: ANN401
+        """Format a log record as a line of JSON.
+
+        Args:
+            record (dict): A dictionary containing log record information.
+
+        Returns:
+            str: A format string which the default logger renders into the line of JSON.
+
+        """
+        entry = {
+            "time": record["time"].isoformat(),
+            "level": record["level"].name,
+            "name": record["name"],
+            "function": record["function"],
+            "line": record["line"],
+            "message": record["message"],
+        }
+        extra = {key: value for key, value in record["extra"].items() if key != _JSON_EXTRA}
+        if extra:
+            entry["extra"] = extra
+        if record.get("exception") and hasattr(record["exception"], "value"):
+            entry["exception"] = "".join(traceback.format_exception(record["exception"].value))
+        # The returned string is itself formatted with the record, so the JSON is passed through
+        # the record rather than returned, where its braces would need escaping
+        record["extra"][_JSON_EXTRA] = json.dumps(entry, default=str)
+        return f"{{extra[{_JSON_EXTRA}]}}\n"
+
+
 class SafeLogger(LoggerInterface):
-    """A logger that catches exceptions and logs them to the child logger."""
+    """A logger that catches exceptions and logs them to the child logger.
+
+    Besides strings and LazyMessages, each method accepts a function which builds the message.
+    The function is only called if the message is logged.
+    """
 
     def __init__(self, child_logger: LoggerInterface) -> None:
         """Initialize the SafeLogger."""
@@ -173,49 +257,84 @@ class SafeLogger(LoggerInterface):
             else child_logger
         )
 
-    def debug(self, msg: str, *args: Any, **kwargs: Any) -> None:
+    def debug(
+        self,
+        msg: str | LazyMessage | Callable[[], str],
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
         """Wrap the child logger's debug method to catch exceptions."""
         try:
-            self.child_logger.debug(msg, *args, **kwargs)
+            self.child_logger.debug(_lazy(msg), *args, **kwargs)
         except Exception as e:  # noqa: BLE001
             self.child_logger.error(f"Failed to log: {e}")  # noqa: G004, TRY400
 
-    def info(self, msg: str, *args: Any, **kwargs: Any) -> None:
+    def info(
+        self,
+        msg: str | LazyMessage | Callable[[], str],
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
         """Wrap the child logger's info method to catch exceptions."""
         try:
-            self.child_logger.info(msg, *args, **kwargs)
+            self.child_logger.info(_lazy(msg), *args, **kwargs)
         except Exception as e:  # noqa: BLE001
             self.child_logger.error(f"Failed to log: {e}")  # noqa: G004, TRY400
 
-    def warning(self, msg: str, *args: Any, **kwargs: Any) -> None:
+    def warning(
+        self,
+        msg: str | LazyMessage | Callable[[], str],
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
         """Wrap the child logger's warning method to catch exceptions."""
         try:
-            self.child_logger.warning(msg, *args, **kwargs)
+            self.child_logger.warning(_lazy(msg), *args, **kwargs)
         except Exception as e:  # noqa: BLE001
             self.child_logger.error(f"Failed to log: {e}")  # noqa: G004, TRY400
 
-    def error(self, msg: str, *args: Any, **kwargs: Any) -> None:
+    def error(
+        self,
+        msg: str | LazyMessage | Callable[[], str],
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
         """Wrap the child logger's error method to catch exceptions."""
         try:
-            self.child_logger.error(msg, *args, **kwargs)
+            self.child_logger.error(_lazy(msg), *args, **kwargs)
         except Exception as e:  # noqa: BLE001
             self.child_logger.error(f"Failed to log: {e}")  # noqa: G004, TRY400
 
-    def exception(self, msg: str, *args: Any, **kwargs: Any) -> None:
+    def exception(
+        self,
+        msg: str | LazyMessage | Callable[[], str],
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
         """Wrap the child logger's exception method to catch exceptions."""
         try:
-            self.child_logger.exception(msg, *args, **kwargs)
+            self.child_logger.exception(_lazy(msg), *args, **kwargs)
         except Exception as e:  # noqa: BLE001
             self.child_logger.error(f"Failed to log: {e}")  # noqa: G004, TRY400
 
-    def critical(self, msg: str, *args: Any, **kwargs: Any) -> None:
+    def critical(
+        self,
+        msg: str | LazyMessage | Callable[[], str],
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
         """Wrap the child logger's critical method to catch exceptions."""
         try:
-            self.child_logger.critical(msg, *args, **kwargs)
+            self.child_logger.critical(_lazy(msg), *args, **kwargs)
         except Exception as e:  # noqa: BLE001
             self.child_logger.error(f"Failed to log: {e}")  # noqa: G004, TRY400
 
 
+def _lazy(msg: str | LazyMessage | Callable[[], str]) -> str | LazyMessage:
+    """Wrap a function which builds a message in a LazyMessage."""
+    return LazyMessage(msg) if callable(msg) else msg
+
+
 class LoggerManager:
     """Manages the package-level logger.
 
@@ -246,6 +365,7 @@ class LoggerManager:
 
         """
         self.formatter = Formatter()
+        self.json_formatter = JsonFormatter()
         default_logger.remove()
         default_logger.add(
             sys.stdout,
@@ -291,6 +411,8 @@ class LoggerManager:
             # Log a warning if a custom logger is being used
             self._logger.warning("Custom logger is in use; skipping log level configuration.")
         else:
+            from portia.config import LogFormat
+
             default_logger.remove()
             log_sink = config.default_log_sink
             match config.default_log_sink:
@@ -302,7 +424,11 @@ class LoggerManager:
             default_logger.add(
                 log_sink,
                 level=config.default_log_level.value,
-                format=self.formatter.format,
+                format=(
+                    self.json_formatter.format
+                    if config.default_log_format == LogFormat.JSON
+                    else self.formatter.format
+                ),
                 serialize=config.json_log_serialize,
                 catch=True,
             )
@@ -6,28 +6,51 @@ interact with MCP servers. It supports SSE, stdio, and StreamableHTTP transports
 NB. The MCP Python SDK is asynchronous, so care must be taken when using MCP functionality
 from this module in an async context.
 
+Opening a session is expensive (for stdio it spawns the server process, and every transport
+performs an `initialize()` handshake), so sessions used for tool calls are kept warm in an
+`McpSessionPool`. There is one pool per event loop, and synchronous callers share a single
+background event loop so their sessions survive across calls.
+
 Classes:
     SseMcpClientConfig: Configuration for an MCP client that connects via SSE.
     StdioMcpClientConfig: Configuration for an MCP client that connects via stdio.
     StreamableHttpMcpClientConfig: Configuration for an MCP client that connects via StreamableHTTP.
     McpClientConfig: The configuration to connect to an MCP server.
+    McpSessionPool: A pool of long-lived MCP sessions for a single event loop.
 """
 
 from __future__ import annotations
 
+import asyncio
+import atexit
 import json
+import threading
+import time
+from collections import defaultdict
 from contextlib import asynccontextmanager
 from datetime import timedelta
-from typing import TYPE_CHECKING, Any, Literal
+from typing import TYPE_CHECKING, Any, Literal, TypeVar
 
+import anyio
 import httpx
 from mcp import ClientSession, StdioServerParameters, stdio_client
 from mcp.client.sse import sse_client
 from mcp.client.streamable_http import streamablehttp_client
 from pydantic import BaseModel, ConfigDict, Field
 
+from portia.logger import logger
+
 if TYPE_CHECKING:
-    from collections.abc import AsyncIterator
+    from collections.abc import AsyncIterator, Callable, Coroutine
+
+T = TypeVar("T")
+
+"""Pooled sessions idle for longer than this are pinged before being reused."""
+MCP_SESSION_HEALTH_CHECK_INTERVAL_SECONDS = 30.0
+MCP_SESSION_PING_TIMEOUT_SECONDS = 5.0
+
+"""Errors indicating that the transport of a pooled session has gone away."""
+MCP_CONNECTION_ERRORS = (anyio.ClosedResourceError, anyio.BrokenResourceError)
 
 
 class SseMcpClientConfig(BaseModel):
@@ -168,3 +191,261 @@ async def get_mcp_session(mcp_client_config: McpClientConfig) -> AsyncIterator[C
         ):
             await session.initialize()
             yield session
+
+
+def mcp_session_key(mcp_client_config: McpClientConfig) -> str:
+    """Return the key identifying the connection described by an MCP client config.
+
+    The tool call timeout does not affect the connection itself, so it is excluded so that
+    configs differing only by timeout share a session.
+    """
+    exclude = {"tool_call_timeout_seconds"}
+    auth_key = ""
+    if isinstance(mcp_client_config, StreamableHttpMcpClientConfig):
+        exclude.add("auth")
+        auth_key = f":{id(mcp_client_config.auth)}" if mcp_client_config.auth else ""
+    return (
+        f"{type(mcp_client_config).__name__}:"
+        f"{mcp_client_config.model_dump_json(exclude=exclude)}{auth_key}"
+    )
+
+
+class _PooledMcpSession:
+    """An MCP session held open by a long-lived task on the pool's event loop.
+
+    The MCP transports are built on anyio task groups, which must be entered and exited from
+    the same task. The session is therefore opened and closed by a dedicated holder task while
+    callers on the same loop use it concurrently.
+    """
+
+    def __init__(
+        self,
+        mcp_client_config: McpClientConfig,
+        session_factory: Callable[[McpClientConfig], Any],
+    ) -> None:
+        self.mcp_client_config = mcp_client_config
+        self._session_factory = session_factory
+        self._ready = asyncio.Event()
+        self._closed = asyncio.Event()
+        self._session: ClientSession | None = None
+        self._error: Exception | None = None
+        self._task: asyncio.Task[None] | None = None
+        self.last_used = time.monotonic()
+
+    @property
+    def session(self) -> ClientSession:
+        """The underlying MCP session."""
+        if self._session is None:
+            raise RuntimeError("MCP session is not connected")
+        return self._session
+
+    @property
+    def is_alive(self) -> bool:
+        """Whether the holder task is still running with an open session."""
+        return self._session is not None and self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Open the session, raising the connection error if it could not be opened."""
+        self._task = asyncio.create_task(self._hold())
+        await self._ready.wait()
+        if self._session is None:
+            raise self._error or RuntimeError("MCP session closed before it was ready")
+
+    async def _hold(self) -> None:
+        try:
+            async with self._session_factory(self.mcp_client_config) as session:
+                self._session = session
+                self._ready.set()
+                await self._closed.wait()
+        except Exception as e:  # noqa: BLE001 - surfaced to callers of start() or logged
+            if self._ready.is_set():
+                logger().debug(f"Error closing MCP session for {self.mcp_client_config}: {e}")
+            self._error = e
+        finally:
+            self._session = None
+            self._ready.set()
+
+    async def check_health(self) -> bool:
+        """Check the session is usable, pinging the server if it has been idle for a while."""
+        if not self.is_alive:
+            return False
+        if time.monotonic() - self.last_used < MCP_SESSION_HEALTH_CHECK_INTERVAL_SECONDS:
+            return True
+        try:
+            await asyncio.wait_for(self.session.send_ping(), MCP_SESSION_PING_TIMEOUT_SECONDS)
+        except Exception:  # noqa: BLE001
+            return False
+        self.last_used = time.monotonic()
+        return True
+
+    async def aclose(self) -> None:
+        """Close the session and wait for the holder task to exit."""
+        self._closed.set()
+        if self._task is not None and not self._task.done():
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+class McpSessionPool:
+    """A pool of long-lived MCP sessions for a single event loop, keyed by client config.
+
+    Sessions are opened on first use and reused for subsequent calls. A session whose
+    connection has gone away, or which fails a health check after being idle, is discarded
+    and re-opened on the next call.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty pool."""
+        self._sessions: dict[str, _PooledMcpSession] = {}
+        self._locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    def __len__(self) -> int:
+        """Return the number of sessions held by the pool."""
+        return len(self._sessions)
+
+    @asynccontextmanager
+    async def session(
+        self,
+        mcp_client_config: McpClientConfig,
+        session_factory: Callable[[McpClientConfig], Any] | None = None,
+    ) -> AsyncIterator[ClientSession]:
+        """Borrow a pooled session for the given config, opening one if needed.
+
+        Args:
+            mcp_client_config: The configuration to connect to an MCP server.
+            session_factory: The context manager used to open new sessions. Defaults to
+                `get_mcp_session`.
+
+        Yields:
+            ClientSession: An initialized MCP session.
+
+        """
+        key = mcp_session_key(mcp_client_config)
+        pooled = await self._acquire(key, mcp_client_config, session_factory or get_mcp_session)
+        try:
+            yield pooled.session
+        except MCP_CONNECTION_ERRORS:
+            logger().debug(f"MCP session for {mcp_client_config.server_name} lost its connection")
+            await self._discard(key, pooled)
+            raise
+        finally:
+            pooled.last_used = time.monotonic()
+
+    async def _acquire(
+        self,
+        key: str,
+        mcp_client_config: McpClientConfig,
+        session_factory: Callable[[McpClientConfig], Any],
+    ) -> _PooledMcpSession:
+        async with self._locks[key]:
+            pooled = self._sessions.get(key)
+            if pooled is not None and not await pooled.check_health():
+                logger().debug(
+                    f"Reconnecting unhealthy MCP session for {mcp_client_config.server_name}"
+                )
+                await self._discard(key, pooled)
+                pooled = None
+            if pooled is None:
+                pooled = _PooledMcpSession(mcp_client_config, session_factory)
+                await pooled.start()
+                self._sessions[key] = pooled
+            return pooled
+
+    async def _discard(self, key: str, pooled: _PooledMcpSession) -> None:
+        if self._sessions.get(key) is pooled:
+            del self._sessions[key]
+        await pooled.aclose()
+
+    async def aclose(self) -> None:
+        """Close all sessions in the pool."""
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        await asyncio.gather(*(pooled.aclose() for pooled in sessions))
+
+
+_pools: dict[asyncio.AbstractEventLoop, McpSessionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_mcp_session_pool() -> McpSessionPool:
+    """Return the MCP session pool for the running event loop.
+
+    Sessions held for loops which have since closed were shut down with the loop, so their
+    pools are dropped here.
+    """
+    loop = asyncio.get_running_loop()
+    with _pools_lock:
+        for closed_loop in [other for other in _pools if other.is_closed()]:
+            del _pools[closed_loop]
+        if loop not in _pools:
+            _pools[loop] = McpSessionPool()
+        return _pools[loop]
+
+
+class _McpLoopThread:
+    """A background event loop used to hold MCP sessions for synchronous callers."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="portia-mcp-sessions",
+                    daemon=True,
+                )
+                self._thread.start()
+            loop = self._loop
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    def stop(self) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop, self._thread = None, None
+        if loop is None or thread is None:
+            return
+
+        async def _close_pool() -> None:
+            await get_mcp_session_pool().aclose()
+            # Cancel calls still running, so their callers are woken rather than left waiting on
+            # a loop which has stopped
+            current = asyncio.current_task()
+            tasks = [task for task in asyncio.all_tasks() if task is not current]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        asyncio.run_coroutine_threadsafe(_close_pool(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+_mcp_loop_thread = _McpLoopThread()
+
+
+def run_mcp_coroutine_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """Run an MCP coroutine from synchronous code on the shared background event loop.
+
+    Using a single long-lived loop (rather than `asyncio.run` per call) is what allows pooled
+    sessions to be reused between synchronous tool calls.
+    """
+    return _mcp_loop_thread.run(coro)
+
+
+def close_mcp_session_pools() -> None:
+    """Close the pooled sessions held for synchronous callers and stop the background loop.
+
+    The sessions are shared by every Portia client in the process, so this is called when the
+    process exits rather than when a client is closed. Calls still running on the loop are
+    cancelled. Sessions pooled on other event loops are closed with `McpSessionPool.aclose`, or
+    when that loop shuts down.
+    """
+    _mcp_loop_thread.stop()
+
+
+atexit.register(close_mcp_session_pools)
@@ -26,6 +26,8 @@ from portia.common import validate_extras_dependencies
 from portia.token_check import estimate_tokens
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterator
+
     from langchain_core.caches import BaseCache
     from langchain_core.language_models.chat_models import BaseChatModel
     from openai.types.chat import ChatCompletionMessageParam
@@ -105,6 +107,45 @@ class LLMProvider(Enum):
 
 BaseModelT = TypeVar("BaseModelT", bound=BaseModel)
 
+NON_SEMANTIC_INSTRUCTOR_KWARGS = frozenset({"max_retries", "timeout", "extra_headers"})
+"""Instructor call arguments which don't change the response, so are left out of cache keys."""
+
+
+def _instructor_cache_key(
+    messages: list[ChatCompletionMessageParam],
+    schema: type[BaseModel],
+    provider: str,
+    model: str | None,
+    kwargs: dict[str, Any],
+) -> tuple[str, str]:
+    """Get the prompt and LLM string an instructor call's response is cached under.
+
+    The key covers the messages, the response schema and the arguments which affect the
+    response. Arguments which only affect how the call is made, such as retries and timeouts,
+    are left out so that they don't split the cache.
+    """
+    cache_data = {
+        "schema": schema.model_json_schema(),
+        **{
+            key: value for key, value in kwargs.items() if key not in NON_SEMANTIC_INSTRUCTOR_KWARGS
+        },
+    }
+    data_hash = hashlib.md5(  # nosec B324  # noqa: S324
+        json.dumps(cache_data, sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return json.dumps(messages, sort_keys=True, default=str), f"{provider}:{model}:{data_hash}"
+
+
+def _content_text(content: str | list[str | dict]) -> str:
+    """Get the text from the content of a message chunk, skipping any thinking blocks."""
+    if isinstance(content, str):
+        return content
+    return "".join(
+        item if isinstance(item, str) else item.get("text", "")
+        for item in content
+        if isinstance(item, str) or item.get("type") == "text"
+    )
+
 
 class GenerativeModel(ABC):
     """Base class for all generative model clients."""
@@ -174,6 +215,38 @@ class GenerativeModel(ABC):
         """
         raise NotImplementedError("async is not implemented")  # pragma: no cover
 
+    def stream_response(self, messages: list[Message]) -> Iterator[str]:
+        """Call the model and yield its response in chunks of text as they are generated.
+
+        Models that can't stream yield their whole response as a single chunk.
+
+        Args:
+            messages (list[Message]): The list of messages to send to the model.
+
+        Yields:
+            str: The next chunk of the response.
+
+        """
+        response = self.get_response(messages)
+        if response.content:
+            yield str(response.content)
+
+    async def astream_response(self, messages: list[Message]) -> AsyncIterator[str]:
+        """Call the model and yield its response in chunks of text as they are generated async.
+
+        Models that can't stream yield their whole response as a single chunk.
+
+        Args:
+            messages (list[Message]): The list of messages to send to the model.
+
+        Yields:
+            str: The next chunk of the response.
+
+        """
+        response = await self.aget_response(messages)
+        if response.content:
+            yield str(response.content)
+
     def get_context_window_size(self) -> int:
         """Get the context window size of the model.
 
@@ -262,6 +335,36 @@ class LangChainGenerativeModel(GenerativeModel):
         response = await self._client.ainvoke(langchain_messages)
         return Message.from_langchain(response)
 
+    def stream_response(self, messages: list[Message]) -> Iterator[str]:
+        """Stream the response using LangChain model.
+
+        Args:
+            messages (list[Message]): The list of messages to send to the model.
+
+        Yields:
+            str: The next chunk of the response.
+
+        """
+        langchain_messages = [msg.to_langchain() for msg in messages]
+        for chunk in self._client.stream(langchain_messages):
+            if text := _content_text(chunk.content):
+                yield text
+
+    async def astream_response(self, messages: list[Message]) -> AsyncIterator[str]:
+        """Stream the response using LangChain model asynchronously.
+
+        Args:
+            messages (list[Message]): The list of messages to send to the model.
+
+        Yields:
+            str: The next chunk of the response.
+
+        """
+        langchain_messages = [msg.to_langchain() for msg in messages]
+        async for chunk in self._client.astream(langchain_messages):
+            if text := _content_text(chunk.content):
+                yield text
+
     async def aget_structured_response(
         self,
         messages: list[Message],
@@ -302,15 +405,7 @@ class LangChainGenerativeModel(GenerativeModel):
                 response_model=schema, messages=messages, **kwargs
             )
 
-        cache_data = {
-            "schema": schema.model_json_schema(),
-            **kwargs,
-        }
-        data_hash = hashlib.md5(  # nosec B324  # noqa: S324
-            json.dumps(cache_data, sort_keys=True, default=str).encode()
-        ).hexdigest()
-        llm_string = f"{provider}:{model}:{data_hash}"
-        prompt = json.dumps(messages)
+        prompt, llm_string = _instructor_cache_key(messages, schema, provider, model, kwargs)
         try:
             cached = cache.lookup(prompt, llm_string)
             if cached and len(cached) > 0:
@@ -343,15 +438,7 @@ class LangChainGenerativeModel(GenerativeModel):
                 response_model=schema, messages=messages, **kwargs
             )
 
-        cache_data = {
-            "schema": schema.model_json_schema(),
-            **kwargs,
-        }
-        data_hash = hashlib.md5(  # nosec B324  # noqa: S324
-            json.dumps(cache_data, sort_keys=True, default=str).encode()
-        ).hexdigest()
-        llm_string = f"{provider}:{model}:{data_hash}"
-        prompt = json.dumps(messages)
+        prompt, llm_string = _instructor_cache_key(messages, schema, provider, model, kwargs)
         try:
             cached = await cache.alookup(prompt, llm_string)
             if cached and len(cached) > 0:
@@ -371,6 +458,15 @@ class LangChainGenerativeModel(GenerativeModel):
         _llm_cache.set(cache)
         set_llm_cache(cache)
 
+    @classmethod
+    def get_cache(cls) -> BaseCache | None:
+        """Get the cache for the model, if one is set.
+
+        Local caches (see portia.llm_cache) expose hit, miss and latency saved counters through
+        their stats property.
+        """
+        return _llm_cache.get()
+
 
 class OpenAIGenerativeModel(LangChainGenerativeModel):
     """OpenAI model implementation."""
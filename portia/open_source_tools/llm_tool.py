@@ -97,11 +97,17 @@ class LLMTool(Tool[str | BaseModel]):
     def run(
         self, ctx: ToolRunContext, task: str, task_data: list[Any] | str | None = None
     ) -> str | BaseModel:
-        """Run the LLMTool."""
+        """Run the LLMTool, streaming the response to ctx.stream_callback if it is set."""
         model = ctx.config.get_generative_model(self.model) or ctx.config.get_default_model()
         messages = self._get_messages(task, task_data)
         if self.structured_output_schema:
             return model.get_structured_response(messages, self.structured_output_schema)
+        if ctx.stream_callback:
+            chunks = []
+            for chunk in model.stream_response(messages):
+                ctx.stream_callback(chunk)
+                chunks.append(chunk)
+            return "".join(chunks)
 
         response = model.get_response(messages)
         return str(response.content)
@@ -109,11 +115,17 @@ class LLMTool(Tool[str | BaseModel]):
     async def arun(
         self, ctx: ToolRunContext, task: str, task_data: list[Any] | str | None = None
     ) -> str | BaseModel:
-        """Run the LLMTool asynchronously."""
+        """Run the LLMTool asynchronously, streaming the response to ctx.stream_callback if set."""
         model = ctx.config.get_generative_model(self.model) or ctx.config.get_default_model()
         messages = self._get_messages(task, task_data)
         if self.structured_output_schema:
             return await model.aget_structured_response(messages, self.structured_output_schema)
+        if ctx.stream_callback:
+            chunks = []
+            async for chunk in model.astream_response(messages):
+                ctx.stream_callback(chunk)
+                chunks.append(chunk)
+            return "".join(chunks)
         response = await model.aget_response(messages)
         return str(response.content)
 
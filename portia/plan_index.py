@@ -0,0 +1,267 @@
+"""Similarity indexes over the queries of stored plans.
+
+Local storage backends keep a PlanQueryIndex up to date as plans are saved, so that
+get_similar_plans works without Portia Cloud and Portia.plan can reuse plans generated for
+near-identical queries. Two indexes are provided:
+
+- TfidfPlanQueryIndex: an offline index comparing TF-IDF weighted word and character trigram
+  vectors of normalised queries. This is the default and needs no extra dependencies.
+- EmbeddingPlanQueryIndex: a semantic index backed by any LangChain Embeddings implementation.
+
+Similarity scores are cosine similarities between 0 and 1, where 1 means the normalised queries
+are identical (or, for embeddings, point the same way).
+"""
+
+from __future__ import annotations
+
+import itertools
+import math
+import re
+import threading
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from langchain_core.embeddings import Embeddings
+
+_NON_ALPHANUMERIC = re.compile(r"[^0-9a-z]+")
+_NGRAM_SIZE = 3
+
+
+def normalize_query(query: str) -> str:
+    """Normalise a query so that differences in case, punctuation and spacing are ignored."""
+    return _NON_ALPHANUMERIC.sub(" ", query.casefold()).strip()
+
+
+def query_features(query: str) -> Counter[str]:
+    """Get the word and character trigram counts of a query once normalised."""
+    normalized = normalize_query(query)
+    features = Counter(f"w:{word}" for word in normalized.split())
+    padded = f" {normalized} "
+    features.update(
+        f"c:{padded[i : i + _NGRAM_SIZE]}" for i in range(len(padded) - _NGRAM_SIZE + 1)
+    )
+    return features
+
+
+class PlanQueryIndex(ABC):
+    """Base class for similarity indexes over the queries of stored plans.
+
+    Plans are keyed by their id as a string. Re-adding a plan replaces its entry but keeps its
+    place in the order plans were first added, which breaks ties between equally similar plans in
+    favour of the most recently added.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._lock = threading.Lock()
+        self._order: dict[str, int] = {}
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        """Return the number of plans indexed."""
+        return len(self._order)
+
+    def __contains__(self, plan_id: str) -> bool:
+        """Check if a plan is indexed."""
+        return plan_id in self._order
+
+    def add(self, plan_id: str, query: str) -> None:
+        """Add a plan's query to the index, replacing any entry for the same plan."""
+        with self._lock:
+            if plan_id not in self._order:
+                self._order[plan_id] = next(self._counter)
+        self._add(plan_id, query)
+
+    def remove(self, plan_id: str) -> None:
+        """Remove a plan from the index if present."""
+        with self._lock:
+            self._order.pop(plan_id, None)
+        self._remove(plan_id)
+
+    def clear(self) -> None:
+        """Remove every plan from the index."""
+        with self._lock:
+            self._order.clear()
+        self._clear()
+
+    def similar(
+        self, query: str, threshold: float = 0.5, limit: int = 10
+    ) -> list[tuple[str, float]]:
+        """Get the plans whose queries are most similar to a query.
+
+        Args:
+            query (str): The query to compare against.
+            threshold (float): The minimum similarity of plans returned.
+            limit (int): The maximum number of plans to return.
+
+        Returns:
+            list[tuple[str, float]]: Plan ids and their similarity, most similar first.
+
+        """
+        scores = self._scores(query)
+        with self._lock:
+            order = dict(self._order)
+        matches = [
+            (plan_id, score)
+            for plan_id, score in scores.items()
+            if score >= threshold and plan_id in order
+        ]
+        matches.sort(key=lambda match: (-match[1], -order[match[0]]))
+        return matches[:limit]
+
+    @abstractmethod
+    def _add(self, plan_id: str, query: str) -> None:
+        """Index a plan's query."""
+
+    @abstractmethod
+    def _remove(self, plan_id: str) -> None:
+        """Remove a plan's query from the index."""
+
+    @abstractmethod
+    def _clear(self) -> None:
+        """Remove every plan's query from the index."""
+
+    @abstractmethod
+    def _scores(self, query: str) -> dict[str, float]:
+        """Get the similarity of each indexed plan sharing anything with the query."""
+
+
+class TfidfPlanQueryIndex(PlanQueryIndex):
+    """Cosine similarity between TF-IDF weighted word and character trigram vectors of queries.
+
+    Character trigrams make the index tolerant of typos and small changes in wording, while word
+    features favour queries sharing whole words.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        super().__init__()
+        self._features: dict[str, Counter[str]] = {}
+        self._postings: dict[str, set[str]] = {}
+        self._norms: dict[str, float] = {}
+
+    def _add(self, plan_id: str, query: str) -> None:
+        features = query_features(query)
+        with self._lock:
+            self._discard(plan_id)
+            self._features[plan_id] = features
+            for feature in features:
+                self._postings.setdefault(feature, set()).add(plan_id)
+            self._norms.clear()
+
+    def _remove(self, plan_id: str) -> None:
+        with self._lock:
+            self._discard(plan_id)
+            self._norms.clear()
+
+    def _clear(self) -> None:
+        with self._lock:
+            self._features.clear()
+            self._postings.clear()
+            self._norms.clear()
+
+    def _scores(self, query: str) -> dict[str, float]:
+        query_counts = query_features(query)
+        with self._lock:
+            count = len(self._features)
+            query_weights = {
+                feature: _tf(frequency) * self._idf(feature, count)
+                for feature, frequency in query_counts.items()
+            }
+            query_norm = math.sqrt(sum(weight * weight for weight in query_weights.values()))
+            if not query_norm:
+                return {}
+            dot_products: dict[str, float] = {}
+            for feature, query_weight in query_weights.items():
+                idf = self._idf(feature, count)
+                for plan_id in self._postings.get(feature, ()):
+                    weight = _tf(self._features[plan_id][feature]) * idf
+                    dot_products[plan_id] = dot_products.get(plan_id, 0.0) + query_weight * weight
+            return {
+                plan_id: min(dot_product / (query_norm * self._norm(plan_id, count)), 1.0)
+                for plan_id, dot_product in dot_products.items()
+            }
+
+    def _idf(self, feature: str, count: int) -> float:
+        """Get the smoothed inverse document frequency of a feature. The caller holds the lock."""
+        return math.log((1 + count) / (1 + len(self._postings.get(feature, ())))) + 1
+
+    def _norm(self, plan_id: str, count: int) -> float:
+        """Get the length of a plan's weighted vector, caching it until the index changes."""
+        norm = self._norms.get(plan_id)
+        if norm is None:
+            norm = math.sqrt(
+                sum(
+                    (_tf(frequency) * self._idf(feature, count)) ** 2
+                    for feature, frequency in self._features[plan_id].items()
+                ),
+            )
+            self._norms[plan_id] = norm
+        return norm
+
+    def _discard(self, plan_id: str) -> None:
+        """Remove a plan's features. The caller must hold the lock."""
+        features = self._features.pop(plan_id, None)
+        if features is None:
+            return
+        for feature in features:
+            plan_ids = self._postings[feature]
+            plan_ids.discard(plan_id)
+            if not plan_ids:
+                del self._postings[feature]
+
+
+class EmbeddingPlanQueryIndex(PlanQueryIndex):
+    """Cosine similarity between embeddings of queries.
+
+    Any LangChain Embeddings implementation can be used, e.g. a locally hosted
+    sentence-transformers model or the embedding model of an LLM provider.
+    """
+
+    def __init__(self, embeddings: Embeddings) -> None:
+        """Initialize an empty index.
+
+        Args:
+            embeddings (Embeddings): The model used to embed queries.
+
+        """
+        super().__init__()
+        self.embeddings = embeddings
+        self._vectors: dict[str, list[float]] = {}
+
+    def _add(self, plan_id: str, query: str) -> None:
+        (vector,) = self.embeddings.embed_documents([query])
+        with self._lock:
+            self._vectors[plan_id] = _normalize(vector)
+
+    def _remove(self, plan_id: str) -> None:
+        with self._lock:
+            self._vectors.pop(plan_id, None)
+
+    def _clear(self) -> None:
+        with self._lock:
+            self._vectors.clear()
+
+    def _scores(self, query: str) -> dict[str, float]:
+        with self._lock:
+            vectors = dict(self._vectors)
+        if not vectors:
+            return {}
+        query_vector = _normalize(self.embeddings.embed_query(query))
+        return {
+            plan_id: sum(q * v for q, v in zip(query_vector, vector, strict=True))
+            for plan_id, vector in vectors.items()
+        }
+
+
+def _tf(frequency: int) -> float:
+    """Dampen repeated features so they don't dominate a query's vector."""
+    return 1 + math.log(frequency)
+
+
+def _normalize(vector: list[float]) -> list[float]:
+    """Scale a vector to unit length so dot products give cosine similarity."""
+    norm = math.sqrt(sum(value * value for value in vector))
+    return [value / norm for value in vector] if norm else vector
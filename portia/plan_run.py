@@ -27,6 +27,7 @@ from portia.clarification import (
 from portia.common import PortiaEnum
 from portia.execution_agents.output import LocalDataValue, Output
 from portia.prefixed_uuid import PlanRunUUID, PlanUUID
+from portia.stage_timing import StageTiming
 
 
 class PlanRunState(PortiaEnum):
@@ -89,6 +90,8 @@ class PlanRun(BaseModel):
         state (PlanRunState): The current state of the PlanRun.
         outputs (PlanRunOutputs): Outputs of the PlanRun including clarifications.
         plan_run_inputs (dict[str, LocalDataValue]): Dict mapping plan input names to their values.
+        stage_timings (list[StageTiming]): The timings of the stages executed in this process, if
+            the Portia client was given stage timing sinks. These are not persisted.
 
     """
 
@@ -128,6 +131,12 @@ class PlanRun(BaseModel):
         description="The optional structured output schema for the plan run.",
     )
 
+    stage_timings: list[StageTiming] = Field(
+        default_factory=list,
+        exclude=True,
+        description="The timings of the stages executed in this process, if recorded.",
+    )
+
     def get_outstanding_clarifications(self) -> ClarificationListType:
         """Return all outstanding clarifications.
 
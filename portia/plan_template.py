@@ -0,0 +1,265 @@
+"""Plan templates let a plan be reused for queries of the same shape with different values.
+
+A template is made from a plan by finding the parts of its query that look like values - quoted
+text, URLs, email addresses, the topic of the query and numbers - and replacing them in the plan's
+steps with references to plan inputs. For example, the plan for "Write an outline about whales"
+becomes a template for "Write an outline about {topic}" whose steps refer to `$topic`.
+
+A later query of the same shape, e.g. "Write an outline about volcanoes", is served by copying the
+templated plan and binding the new values to its plan inputs, without calling the planning agent.
+A template is only made if every value found in the query appears in the plan's steps, and no step
+still mentions words from a value once the values are substituted, so plans which paraphrase or
+otherwise depend on the values in ways that can't be substituted are never reused for different
+values. The topic ends at the end of its clause, e.g. at "and", "then", "to", "for" or a comma, so
+the rest of the query stays part of the template's shape: the plan for "Write an outline about
+whales and email it to Bob" is only reused for queries which also email the outline to Bob.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel, Field
+
+from portia.plan import Plan, PlanContext, PlanInput, Variable
+
+if TYPE_CHECKING:
+    from portia.plan import Step
+
+_SLOT_PATTERNS: list[tuple[str, re.Pattern[str]]] = [
+    ("quoted_text", re.compile(r"\"([^\"]+)\"|“([^”]+)”")),
+    ("url", re.compile(r"https?://[^\s\"'<>]+[^\s\"'<>.,;:!?)]")),
+    ("email", re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")),
+    (
+        "topic",
+        re.compile(
+            r"\b(?:about|regarding|titled|called|on the topic of)\s+([^,.;:!?\n\"“”{}]+?)"
+            r"(?=\s+(?:and|then|to|for)\b|\s*[,.;:!?\n\"“”{}]|\s*$)",
+            re.IGNORECASE,
+        ),
+    ),
+    ("number", re.compile(r"(?<![\w.{])\d+(?:\.\d+)?(?![\w}])")),
+]
+
+# Words too common to show that a step still depends on a value once it has been substituted
+_COMMON_WORDS = frozenset(
+    {"a", "an", "and", "at", "by", "for", "from", "in", "of", "on", "or", "the", "to", "with"},
+)
+_PLAN_INPUT_REFERENCE = re.compile(r"\$\w+")
+
+
+def parse_query(query: str) -> tuple[str, dict[str, str]]:
+    """Split a query into its shape and the values filling it.
+
+    Returns:
+        tuple[str, dict[str, str]]: The query with each value replaced by a `{slot}` placeholder,
+            and the value of each slot. Slots are named after the kind of value they hold,
+            numbered from the second of a kind, e.g. `topic`, `number` and `number_2`.
+
+    """
+    slots: dict[str, str] = {}
+    pattern = query
+    for kind, regex in _SLOT_PATTERNS:
+
+        def _replace(match: re.Match[str], kind: str = kind) -> str:
+            group = next((i for i, text in enumerate(match.groups(), 1) if text), 0)
+            start, end = match.span(group)
+            raw = match.string[start:end]
+            value = raw.strip()
+            if not value:
+                return match.group(0)
+            count = sum(1 for name in slots if name == kind or name.startswith(f"{kind}_"))
+            name = kind if count == 0 else f"{kind}_{count + 1}"
+            slots[name] = value
+            leading = raw[: len(raw) - len(raw.lstrip())]
+            trailing = raw[len(raw.rstrip()) :]
+            return (
+                f"{match.string[match.start() : start]}{leading}{{{name}}}{trailing}"
+                f"{match.string[end : match.end()]}"
+            )
+
+        pattern = regex.sub(_replace, pattern)
+    return pattern, slots
+
+
+def template_key(pattern: str) -> str:
+    """Normalise a query's shape so that case, spacing and closing punctuation are ignored."""
+    return " ".join(pattern.casefold().split()).rstrip(" .?!")
+
+
+class PlanTemplate(BaseModel):
+    """A plan whose steps refer to plan inputs in place of the values in its query.
+
+    Attributes:
+        pattern: The shape of the query the plan was made for, with `{slot}` placeholders.
+        slots: The names of the slots in the pattern. Each is bound to the plan input `$slot`.
+        plan: The templated plan.
+
+    """
+
+    pattern: str = Field(description="The shape of the query with {slot} placeholders.")
+    slots: list[str] = Field(description="The names of the slots in the pattern.")
+    plan: Plan = Field(description="The plan with its query's values replaced by plan inputs.")
+
+    @classmethod
+    def from_plan(cls, plan: Plan) -> PlanTemplate | None:
+        """Make a template from a plan, if its query has values which can be substituted.
+
+        Returns:
+            PlanTemplate | None: The template, or None if no values were found in the query, if
+                any value can't be found in the plan's steps, if a step still mentions words from
+                a value once the values are substituted or if a slot's plan input clashes with
+                one of the plan's own inputs.
+
+        """
+        pattern, slots = parse_query(plan.plan_context.query)
+        if not slots:
+            return None
+        input_names = {plan_input.name for plan_input in plan.plan_inputs}
+        steps = [step.model_copy(deep=True) for step in plan.steps]
+        plan_inputs = [plan_input.model_copy() for plan_input in plan.plan_inputs]
+        for name, value in slots.items():
+            input_name = f"${name}"
+            if input_name in input_names or not _substitute(steps, value, input_name, name):
+                return None
+            plan_inputs.append(PlanInput(name=input_name, description=_slot_description(name)))
+        if any(_mentions_words(steps, value) for value in slots.values()):
+            return None
+        return cls(
+            pattern=pattern,
+            slots=list(slots),
+            plan=Plan(
+                plan_context=plan.plan_context.model_copy(),
+                steps=steps,
+                plan_inputs=plan_inputs,
+                structured_output_schema=plan.structured_output_schema,
+            ),
+        )
+
+    def instantiate(self, query: str, values: dict[str, str]) -> Plan:
+        """Create a new plan for a query by binding values to the template's slots.
+
+        Args:
+            query (str): The query the new plan is for.
+            values (dict[str, str]): The value of each slot.
+
+        Returns:
+            Plan: A new plan whose slot plan inputs hold the given values.
+
+        """
+        return Plan(
+            plan_context=PlanContext(query=query, tool_ids=self.plan.plan_context.tool_ids),
+            steps=[step.model_copy(deep=True) for step in self.plan.steps],
+            plan_inputs=[
+                plan_input.model_copy(update={"value": values[plan_input.name[1:]]})
+                if plan_input.name[1:] in self.slots
+                else plan_input.model_copy()
+                for plan_input in self.plan.plan_inputs
+            ],
+            structured_output_schema=self.plan.structured_output_schema,
+        )
+
+
+class PlanTemplateCache:
+    """An in-memory LRU cache of plan templates keyed by the shape of their query."""
+
+    DEFAULT_MAX_TEMPLATES = 1_000
+
+    def __init__(self, max_templates: int = DEFAULT_MAX_TEMPLATES) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            max_templates (int): The most templates kept before the least recently used are
+                dropped.
+
+        """
+        self.max_templates = max_templates
+        self._lock = threading.Lock()
+        self._templates: OrderedDict[str, PlanTemplate] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of templates cached."""
+        return len(self._templates)
+
+    def add(self, plan: Plan) -> PlanTemplate | None:
+        """Make a template from a plan and cache it, replacing any template of the same shape.
+
+        Returns:
+            PlanTemplate | None: The template, or None if the plan can't be templated.
+
+        """
+        template = PlanTemplate.from_plan(plan)
+        if template is None:
+            return None
+        with self._lock:
+            key = template_key(template.pattern)
+            self._templates[key] = template
+            self._templates.move_to_end(key)
+            while len(self._templates) > self.max_templates:
+                self._templates.popitem(last=False)
+        return template
+
+    def instantiate(self, query: str) -> Plan | None:
+        """Create a plan for a query from a cached template of the same shape, if there is one."""
+        pattern, values = parse_query(query)
+        if not values:
+            return None
+        with self._lock:
+            template = self._templates.get(template_key(pattern))
+            if template is None:
+                return None
+            self._templates.move_to_end(template_key(pattern))
+        return template.instantiate(query, values)
+
+    def clear(self) -> None:
+        """Remove every cached template."""
+        with self._lock:
+            self._templates.clear()
+
+
+def _substitute(steps: list[Step], value: str, input_name: str, slot: str) -> bool:
+    """Replace a value with a reference to a plan input in the steps which mention it.
+
+    Returns:
+        bool: Whether any step mentioned the value.
+
+    """
+    regex = re.compile(rf"(?<!\w){re.escape(value)}(?!\w)", re.IGNORECASE)
+    found = False
+    for step in steps:
+        task = regex.sub(lambda _: input_name, step.task)
+        condition = regex.sub(lambda _: input_name, step.condition) if step.condition else None
+        if task == step.task and condition == step.condition:
+            continue
+        found = True
+        step.task = task
+        step.condition = condition
+        if all(variable.name != input_name for variable in step.inputs):
+            step.inputs.append(Variable(name=input_name, description=_slot_description(slot)))
+    return found
+
+
+def _mentions_words(steps: list[Step], value: str) -> bool:
+    """Check if any step mentions an uncommon word from a value outside of plan input references."""
+    words = {word for word in re.findall(r"\w+", value.casefold()) if word not in _COMMON_WORDS}
+    for step in steps:
+        text = _PLAN_INPUT_REFERENCE.sub(" ", f"{step.task} {step.condition or ''}").casefold()
+        if words & set(re.findall(r"\w+", text)):
+            return True
+    return False
+
+
+def _slot_description(slot: str) -> str:
+    """Describe the value a slot holds, e.g. `number_2` is "The 2nd number in the query"."""
+    kind, _, position = slot.rpartition("_") if slot[-1].isdigit() else (slot, "", "")
+    ordinal = f"{position}{_ordinal_suffix(int(position))} " if position else ""
+    return f"The {ordinal}{kind.replace('_', ' ')} in the query"
+
+
+def _ordinal_suffix(number: int) -> str:
+    if 10 <= number % 100 <= 20:  # noqa: PLR2004
+        return "th"
+    return {1: "st", 2: "nd", 3: "rd"}.get(number % 10, "th")
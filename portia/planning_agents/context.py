@@ -3,7 +3,10 @@
 from __future__ import annotations
 
 from datetime import UTC, datetime
-from typing import TYPE_CHECKING
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+from pydantic import BaseModel, Field
 
 from portia.templates.example_plans import DEFAULT_EXAMPLE_PLANS
 from portia.templates.render import render_template
@@ -13,6 +16,33 @@ if TYPE_CHECKING:
     from portia.plan import Plan, PlanInput
     from portia.tool import Tool
 
+MAX_CACHED_TOOL_DESCRIPTIONS = 4_096
+"""MAX_CACHED_TOOL_DESCRIPTIONS bounds the tool descriptions kept for rendering prompts."""
+
+
+class PlanningPrompt(BaseModel):
+    """The prompt for the PlanningAgent, rendered once for all attempts at a plan.
+
+    Only the errors from previous attempts change between attempts, so the rest of the prompt
+    is rendered up front and each attempt just renders the errors in between.
+    """
+
+    context: str = Field(
+        description="The instructions, tools, examples and per-request context before the errors.",
+    )
+    request: str = Field(description="The request, which comes after the errors.")
+
+    def render(self, previous_errors: list[str] | None = None) -> str:
+        """Render the prompt for an attempt, given the errors from previous attempts."""
+        return (
+            self.context
+            + render_template(
+                "default_planning_agent_errors.xml.jinja",
+                previous_errors=previous_errors,
+            )
+            + self.request
+        )
+
 
 def render_prompt_insert_defaults(
     query: str,
@@ -22,14 +52,37 @@ def render_prompt_insert_defaults(
     plan_inputs: list[PlanInput] | None = None,
     previous_errors: list[str] | None = None,
 ) -> str:
-    """Render the prompt for the PlanningAgent with defaults inserted if not provided."""
+    """Render the prompt for the PlanningAgent with defaults inserted if not provided.
+
+    The stable parts of the prompt (instructions, tools and examples) come first, in a
+    deterministic order, so that requests share a prefix that LLM providers can cache. The parts
+    that change between requests (the date, end user, plan inputs, errors and query) come last.
+    """
+    return build_planning_prompt(query, tool_list, end_user, examples, plan_inputs).render(
+        previous_errors,
+    )
+
+
+def build_planning_prompt(
+    query: str,
+    tool_list: list[Tool],
+    end_user: EndUser,
+    examples: list[Plan] | None = None,
+    plan_inputs: list[PlanInput] | None = None,
+) -> PlanningPrompt:
+    """Render the parts of the PlanningAgent's prompt which are the same for every attempt.
+
+    Defaults are inserted as in render_prompt_insert_defaults.
+    """
     system_context = default_query_system_context()
     non_default_examples_provided = True
 
     if examples is None:
         examples = DEFAULT_EXAMPLE_PLANS
         non_default_examples_provided = False
-    tools_with_descriptions = get_tool_descriptions_for_tools(tool_list=tool_list)
+    tools_with_descriptions = get_tool_descriptions_for_tools(
+        tool_list=sorted(tool_list, key=lambda tool: tool.id),
+    )
 
     plan_input_dicts = None
     if plan_inputs:
@@ -38,16 +91,21 @@ def render_prompt_insert_defaults(
             for plan_input in plan_inputs
         ]
 
-    return render_template(
-        "default_planning_agent.xml.jinja",
-        query=query,
-        tools=tools_with_descriptions,
-        end_user=end_user,
-        examples=examples,
-        system_context=system_context,
-        non_default_examples_provided=non_default_examples_provided,
-        plan_inputs=plan_input_dicts,
-        previous_errors=previous_errors,
+    return PlanningPrompt(
+        context=render_template(
+            "default_planning_agent_context.xml.jinja",
+            tools=tools_with_descriptions,
+            end_user=end_user,
+            examples=examples,
+            system_context=system_context,
+            plan_inputs=plan_input_dicts,
+        ),
+        request=render_template(
+            "default_planning_agent_request.xml.jinja",
+            query=query,
+            tools=tools_with_descriptions,
+            non_default_examples_provided=non_default_examples_provided,
+        ),
     )
 
 
@@ -56,15 +114,37 @@ def default_query_system_context() -> list[str]:
     return [f"Today is {datetime.now(UTC).strftime('%Y-%m-%d')}"]
 
 
-def get_tool_descriptions_for_tools(tool_list: list[Tool]) -> list[dict[str, str]]:
-    """Given a list of tool names, return the descriptions of the tools."""
+def get_tool_descriptions_for_tools(tool_list: list[Tool]) -> list[dict[str, Any]]:
+    """Given a list of tool names, return the descriptions of the tools.
+
+    Generating the JSON schema of a tool's arguments is slow, so descriptions are cached for each
+    version of a tool, i.e. until any of the fields they are built from change. The descriptions
+    returned are shared and must not be modified.
+    """
     return [
-        {
-            "id": tool.id,
-            "name": tool.name,
-            "description": tool.description,
-            "args": tool.args_schema.model_json_schema()["properties"],
-            "output_schema": str(tool.output_schema),
-        }
+        _tool_description(
+            tool.id,
+            tool.name,
+            tool.description,
+            tool.args_schema,
+            tool.output_schema,
+        )
         for tool in tool_list
     ]
+
+
+@lru_cache(maxsize=MAX_CACHED_TOOL_DESCRIPTIONS)
+def _tool_description(
+    tool_id: str,
+    name: str,
+    description: str,
+    args_schema: type[BaseModel],
+    output_schema: tuple[str, str],
+) -> dict[str, Any]:
+    return {
+        "id": tool_id,
+        "name": name,
+        "description": description,
+        "args": args_schema.model_json_schema()["properties"],
+        "output_schema": str(output_schema),
+    }
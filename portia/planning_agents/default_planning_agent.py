@@ -8,7 +8,7 @@ from typing import TYPE_CHECKING
 from portia.model import Message
 from portia.open_source_tools.llm_tool import LLMTool
 from portia.planning_agents.base_planning_agent import BasePlanningAgent, StepsOrError
-from portia.planning_agents.context import render_prompt_insert_defaults
+from portia.planning_agents.context import build_planning_prompt
 
 if TYPE_CHECKING:
     from portia.config import Config
@@ -82,16 +82,10 @@ class DefaultPlanningAgent(BasePlanningAgent):
         plan_inputs: list[PlanInput] | None = None,
     ) -> StepsOrError:
         """Generate a plan or error using an LLM from a query and a list of tools."""
+        # Retries only add the previous errors to the prompt, so the rest is rendered once
+        prompt = build_planning_prompt(query, tool_list, end_user, examples, plan_inputs)
         previous_errors = []
         for i in range(self.max_retries):
-            prompt = render_prompt_insert_defaults(
-                query,
-                tool_list,
-                end_user,
-                examples,
-                plan_inputs,
-                previous_errors,
-            )
             response = self.model.get_structured_response(
                 schema=StepsOrError,
                 messages=[
@@ -99,7 +93,7 @@ class DefaultPlanningAgent(BasePlanningAgent):
                         role="system",
                         content=self.planning_prompt,
                     ),
-                    Message(role="user", content=prompt),
+                    Message(role="user", content=prompt.render(previous_errors)),
                 ],
             )
             steps_or_error = self._process_response(response, tool_list, plan_inputs, i)
@@ -163,21 +157,15 @@ class DefaultPlanningAgent(BasePlanningAgent):
         plan_inputs: list[PlanInput] | None = None,
     ) -> StepsOrError:
         """Generate a plan or error using an LLM from a query and a list of tools."""
+        # Retries only add the previous errors to the prompt, so the rest is rendered once
+        prompt = build_planning_prompt(query, tool_list, end_user, examples, plan_inputs)
         previous_errors = []
         for i in range(self.max_retries):
-            prompt = render_prompt_insert_defaults(
-                query,
-                tool_list,
-                end_user,
-                examples,
-                plan_inputs,
-                previous_errors,
-            )
             response = await self.model.aget_structured_response(
                 schema=StepsOrError,
                 messages=[
                     Message(role="system", content=self.planning_prompt),
-                    Message(role="user", content=prompt),
+                    Message(role="user", content=prompt.render(previous_errors)),
                 ],
             )
             steps_or_error = self._process_response(response, tool_list, plan_inputs, i)
@@ -22,13 +22,16 @@ complex queries using various planning and execution agent configurations.
 from __future__ import annotations
 
 import asyncio
+import threading
 import time
-from typing import TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Self
 from uuid import UUID
 
 from langsmith import traceable
 from pydantic import BaseModel, ConfigDict, Field
 
+from portia.batch import BatchRunResult, arun_batch, run_batch
 from portia.builder.conditionals import ConditionalBlockClauseType, ConditionalStepResult
 from portia.builder.plan_v2 import PlanV2
 from portia.builder.reference import ReferenceValue
@@ -42,6 +45,7 @@ from portia.config import (
     ExecutionAgentType,
     GenerativeModelsConfig,
     PlanningAgentType,
+    PlanRunPersistence,
     StorageClass,
 )
 from portia.end_user import EndUser
@@ -69,16 +73,26 @@ from portia.introspection_agents.introspection_agent import (
     PreStepIntrospection,
     PreStepIntrospectionOutcome,
 )
-from portia.logger import logger, logger_manager
+from portia.logger import LazyMessage, logger, logger_manager
 from portia.open_source_tools.llm_tool import LLMTool
 from portia.plan import Plan, PlanContext, PlanInput, PlanUUID, ReadOnlyPlan, ReadOnlyStep, Step
 from portia.plan_run import PlanRun, PlanRunState, PlanRunUUID, ReadOnlyPlanRun
+from portia.plan_template import PlanTemplateCache
 from portia.planning_agents.default_planning_agent import DefaultPlanningAgent
+from portia.stage_timing import (
+    TimedStage,
+    atimed_call,
+    record_stage_timings,
+    timed_call,
+    timed_stage,
+)
+from portia.step_scheduler import StepScheduler
 from portia.storage import (
     MAX_OUTPUT_LOG_LENGTH,
     DiskFileStorage,
     InMemoryStorage,
     PortiaCloudStorage,
+    SQLiteStorage,
     StorageError,
 )
 from portia.telemetry.telemetry_service import BaseProductTelemetry, ProductTelemetry
@@ -93,11 +107,15 @@ from portia.tool_wrapper import ToolCallWrapper
 from portia.version import get_version
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import AsyncIterator, Iterable, Iterator, Sequence
+    from typing import Any
 
+    from portia.batch import PlanItem
+    from portia.builder.step_v2 import StepV2
     from portia.common import Serializable
     from portia.execution_agents.base_execution_agent import BaseExecutionAgent
     from portia.planning_agents.base_planning_agent import BasePlanningAgent
+    from portia.stage_timing import StageTimingSink
 
 
 class RunContext(BaseModel):
@@ -128,6 +146,7 @@ class Portia:
         tools: ToolRegistry | list[Tool] | None = None,
         execution_hooks: ExecutionHooks | None = None,
         telemetry: BaseProductTelemetry | None = None,
+        stage_timing_sinks: Sequence[StageTimingSink] | None = None,
     ) -> None:
         """Initialize storage and tools.
 
@@ -140,6 +159,9 @@ class Portia:
             execution_hooks (ExecutionHooks | None): Hooks that can be used to modify or add
                 extra functionality to the run of a plan.
             telemetry (BaseProductTelemetry | None): Anonymous telemetry service.
+            stage_timing_sinks (Sequence[StageTimingSink] | None): Sinks to send the timing of
+                each stage of plan runs to (see portia.stage_timing). Timings are only recorded
+                if sinks are given.
 
         """
         self.config = config if config else Config.from_default()
@@ -150,6 +172,11 @@ class Portia:
         self._log_models(self.config)
         self.telemetry = telemetry if telemetry else ProductTelemetry()
         self.execution_hooks = execution_hooks if execution_hooks else ExecutionHooks()
+        self.stage_timing_sinks = list(stage_timing_sinks or [])
+        self._unsaved_plan_run_ids: set[PlanRunUUID] = set()
+        self._step_executor: ThreadPoolExecutor | None = None
+        self._step_executor_lock = threading.Lock()
+        self.plan_templates = PlanTemplateCache()
         if not self.config.has_api_key("portia_api_key"):
             logger().warning(
                 "No Portia API key found, Portia cloud tools and storage will not be available.",
@@ -167,9 +194,54 @@ class Portia:
                 self.storage = InMemoryStorage()
             case StorageClass.DISK:
                 self.storage = DiskFileStorage(storage_dir=self.config.storage_dir)
+            case StorageClass.SQLITE:
+                self.storage = SQLiteStorage(storage_dir=self.config.storage_dir)
             case StorageClass.CLOUD:
                 self.storage = PortiaCloudStorage(config=self.config)
 
+    def close(self) -> None:
+        """Release resources owned by this client: its SQLite connections and step threads.
+
+        Pooled MCP sessions and Portia Cloud HTTP connections are shared by every client in the
+        process, so closing one client doesn't close them under the others. They are closed when
+        the process exits, or explicitly with close_mcp_session_pools, McpSessionPool.aclose and
+        aclose_shared_async_clients.
+        """
+        if isinstance(self.storage, SQLiteStorage):
+            self.storage.close()
+        with self._step_executor_lock:
+            if self._step_executor:
+                self._step_executor.shutdown()
+                self._step_executor = None
+
+    async def aclose(self) -> None:
+        """Release resources owned by this client asynchronously.
+
+        See close for what is released.
+        """
+        if isinstance(self.storage, SQLiteStorage):
+            await asyncio.to_thread(self.storage.close)
+        with self._step_executor_lock:
+            if self._step_executor:
+                self._step_executor.shutdown(wait=False)
+                self._step_executor = None
+
+    def __enter__(self) -> Self:
+        """Use the client as a context manager, closing it on exit."""
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        """Close the client."""
+        self.close()
+
+    async def __aenter__(self) -> Self:
+        """Use the client as an async context manager, closing it on exit."""
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        """Close the client."""
+        await self.aclose()
+
     def initialize_end_user(self, end_user: str | EndUser | None = None) -> EndUser:
         """Handle initializing the end_user based on the provided type."""
         default_external_id = "portia:default_user"
@@ -237,7 +309,9 @@ class Portia:
                 for the query. This is passed on to plan runs created from this plan but will not be
                 stored with the plan itself if using cloud storage and must be re-attached to the
                 plan run if using cloud storage.
-            use_cached_plan (bool): Whether to use a cached plan if it exists.
+            use_cached_plan (bool): Whether to use a cached plan if it exists. Plans made for
+                other queries can also be reused, see Config.cached_plan_templates and
+                Config.cached_plan_similarity_threshold.
 
         Returns:
             PlanRun: The run resulting from executing the query.
@@ -303,7 +377,9 @@ class Portia:
                 for the query. This is passed on to plan runs created from this plan but will not be
                 stored with the plan itself if using cloud storage and must be re-attached to the
                 plan run if using cloud storage.
-            use_cached_plan (bool): Whether to use a cached plan if it exists.
+            use_cached_plan (bool): Whether to use a cached plan if it exists. Plans made for
+                other queries can also be reused, see Config.cached_plan_templates and
+                Config.cached_plan_similarity_threshold.
 
         Returns:
             PlanRun: The run resulting from executing the query.
@@ -338,6 +414,106 @@ class Portia:
         plan_run = await self._acreate_plan_run(plan, end_user, coerced_plan_run_inputs)
         return await self._aresume(plan_run)
 
+    def run_many(
+        self,
+        queries: Iterable[str],
+        tools: list[Tool] | list[str] | None = None,
+        example_plans: Sequence[Plan | PlanUUID | str] | None = None,
+        end_user: str | EndUser | None = None,
+        plan_run_inputs: list[PlanInput] | list[dict[str, str]] | dict[str, str] | None = None,
+        structured_output_schema: type[BaseModel] | None = None,
+        use_cached_plan: bool = False,
+        max_concurrency: int | None = None,
+    ) -> Iterator[BatchRunResult]:
+        """Plan and execute many queries at once, as with Portia.run for each query.
+
+        Queries run on a pool of threads sharing this client, and are taken from `queries` as
+        earlier ones finish. An exception raised for one query is recorded on its result rather
+        than stopping the batch.
+
+        Args:
+            queries (Iterable[str]): The queries to be executed.
+            tools (list[Tool] | list[str] | None): List of tools to use for every query.
+            example_plans (Sequence[Plan | PlanUUID | str] | None): Optional list of example
+            plans or plan IDs to use when planning every query.
+            end_user (str | EndUser | None = None): The end user for every plan run.
+            plan_run_inputs (list[PlanInput] | list[dict[str, str]] | dict[str, str] | None):
+                Provides input values for every run.
+            structured_output_schema (type[BaseModel] | None): The optional structured output schema
+                for every query.
+            use_cached_plan (bool): Whether to use a cached plan if it exists.
+            max_concurrency (int | None): The most queries to run at once. Defaults to
+                Config.max_concurrent_runs.
+
+        Returns:
+            Iterator[BatchRunResult]: The result of each query, in the order the queries complete.
+                Queries only start running once iteration begins.
+
+        """
+        return run_batch(
+            lambda query: self.run(
+                query,
+                tools,
+                example_plans,
+                end_user,
+                plan_run_inputs,
+                structured_output_schema,
+                use_cached_plan,
+            ),
+            queries,
+            max_concurrency or self.config.max_concurrent_runs,
+        )
+
+    def arun_many(
+        self,
+        queries: Iterable[str],
+        tools: list[Tool] | list[str] | None = None,
+        example_plans: Sequence[Plan | PlanUUID | str] | None = None,
+        end_user: str | EndUser | None = None,
+        plan_run_inputs: list[PlanInput] | list[dict[str, str]] | dict[str, str] | None = None,
+        structured_output_schema: type[BaseModel] | None = None,
+        use_cached_plan: bool = False,
+        max_concurrency: int | None = None,
+    ) -> AsyncIterator[BatchRunResult]:
+        """Plan and execute many queries at once, as with Portia.arun for each query.
+
+        Queries run as tasks on the running event loop, and are taken from `queries` as earlier
+        ones finish. An exception raised for one query is recorded on its result rather than
+        stopping the batch. Iterate over the results with `async for`.
+
+        Args:
+            queries (Iterable[str]): The queries to be executed.
+            tools (list[Tool] | list[str] | None): List of tools to use for every query.
+            example_plans (Sequence[Plan | PlanUUID | str] | None): Optional list of example
+            plans or plan IDs to use when planning every query.
+            end_user (str | EndUser | None = None): The end user for every plan run.
+            plan_run_inputs (list[PlanInput] | list[dict[str, str]] | dict[str, str] | None):
+                Provides input values for every run.
+            structured_output_schema (type[BaseModel] | None): The optional structured output schema
+                for every query.
+            use_cached_plan (bool): Whether to use a cached plan if it exists.
+            max_concurrency (int | None): The most queries to run at once. Defaults to
+                Config.max_concurrent_runs.
+
+        Returns:
+            AsyncIterator[BatchRunResult]: The result of each query, in the order the queries
+                complete. Queries only start running once iteration begins.
+
+        """
+        return arun_batch(
+            lambda query: self.arun(
+                query,
+                tools,
+                example_plans,
+                end_user,
+                plan_run_inputs,
+                structured_output_schema,
+                use_cached_plan,
+            ),
+            queries,
+            max_concurrency or self.config.max_concurrent_runs,
+        )
+
     def _coerce_plan_run_inputs(
         self,
         plan_run_inputs: list[PlanInput]
@@ -403,7 +579,9 @@ class Portia:
                 for the query. This is passed on to plan runs created from this plan but will be
                 not be stored with the plan itself if using cloud storage and must be re-attached
                 to the plan run if using cloud storage.
-            use_cached_plan (bool): Whether to use a cached plan if it exists.
+            use_cached_plan (bool): Whether to use a cached plan if it exists. Plans made for
+                other queries can also be reused, see Config.cached_plan_templates and
+                Config.cached_plan_similarity_threshold.
 
         Returns:
             Plan: The plan for executing the query.
@@ -437,6 +615,76 @@ class Portia:
             use_cached_plan,
         )
 
+    def _get_cached_plan(self, query: str) -> Plan | None:
+        """Get a stored plan to reuse for the query, if there is one.
+
+        A plan for the exact query is preferred. Failing that, if the config sets
+        cached_plan_templates, a plan is made from a template for queries of the same shape.
+        Finally, if the config sets cached_plan_similarity_threshold, the plan whose query is most
+        similar is used as long as it meets the threshold. Its steps aren't rewritten for the
+        query, so a warning is logged whenever a plan made for a different query is reused.
+        """
+        try:
+            return self.storage.get_plan_by_query(query)
+        except StorageError as e:
+            exact_error = e
+        if self.config.cached_plan_templates and (plan := self.plan_templates.instantiate(query)):
+            self.storage.save_plan(plan)
+            logger().info(f"Using plan template for query - {query}", plan=str(plan.id))
+            return plan
+        threshold = self.config.cached_plan_similarity_threshold
+        if threshold is not None:
+            try:
+                similar_plans = self.storage.get_similar_plans(query, threshold=threshold, limit=1)
+            except (StorageError, NotImplementedError) as e:
+                logger().warning(f"Error getting similar cached plans: {e}")
+            else:
+                if similar_plans:
+                    plan = similar_plans[0]
+                    logger().warning(
+                        f"Reusing cached plan {plan.id} for query - {query}. The plan was made "
+                        f"for a similar query - {plan.plan_context.query} - and its steps are "
+                        "reused unchanged.",
+                    )
+                    return plan
+        logger().warning(f"Error getting cached plan. Using new plan instead: {exact_error}")
+        return None
+
+    async def _aget_cached_plan(self, query: str) -> Plan | None:
+        """Get a stored plan to reuse for the query asynchronously, if there is one.
+
+        See _get_cached_plan for how the plan is chosen.
+        """
+        try:
+            return await self.storage.aget_plan_by_query(query)
+        except StorageError as e:
+            exact_error = e
+        if self.config.cached_plan_templates and (plan := self.plan_templates.instantiate(query)):
+            await self.storage.asave_plan(plan)
+            logger().info(f"Using plan template for query - {query}", plan=str(plan.id))
+            return plan
+        threshold = self.config.cached_plan_similarity_threshold
+        if threshold is not None:
+            try:
+                similar_plans = await self.storage.aget_similar_plans(
+                    query,
+                    threshold=threshold,
+                    limit=1,
+                )
+            except (StorageError, NotImplementedError) as e:
+                logger().warning(f"Error getting similar cached plans: {e}")
+            else:
+                if similar_plans:
+                    plan = similar_plans[0]
+                    logger().warning(
+                        f"Reusing cached plan {plan.id} for query - {query}. The plan was made "
+                        f"for a similar query - {plan.plan_context.query} - and its steps are "
+                        "reused unchanged.",
+                    )
+                    return plan
+        logger().warning(f"Error getting cached plan. Using new plan instead: {exact_error}")
+        return None
+
     def _resolve_example_plans(
         self, example_plans: Sequence[Plan | PlanUUID | str] | None
     ) -> list[Plan] | None:
@@ -595,7 +843,9 @@ class Portia:
                 for the query. This is passed on to plan runs created from this plan but will be
                 not be stored with the plan itself if using cloud storage and must be re-attached
                 to the plan run if using cloud storage.
-            use_cached_plan (bool): Whether to use a cached plan if it exists.
+            use_cached_plan (bool): Whether to use a cached plan if it exists. Plans made for
+                other queries can also be reused, see Config.cached_plan_templates and
+                Config.cached_plan_similarity_threshold.
 
         Returns:
             Plan: The plan for executing the query.
@@ -663,7 +913,9 @@ class Portia:
                 for the query. This is passed on to plan runs created from this plan but will be
                 not be stored with the plan itself if using cloud storage and must be re-attached
                 to the plan run if using cloud storage.
-            use_cached_plan (bool): Whether to use a cached plan if it exists.
+            use_cached_plan (bool): Whether to use a cached plan if it exists. Plans made for
+                other queries can also be reused, see Config.cached_plan_templates and
+                Config.cached_plan_similarity_threshold.
 
         Returns:
             Plan: The plan for executing the query.
@@ -672,11 +924,8 @@ class Portia:
             PlanError: If there is an error while generating the plan.
 
         """
-        if use_cached_plan:
-            try:
-                return self.storage.get_plan_by_query(query)
-            except StorageError as e:
-                logger().warning(f"Error getting cached plan. Using new plan instead: {e}")
+        if use_cached_plan and (cached_plan := self._get_cached_plan(query)):
+            return cached_plan
 
         if isinstance(tools, list):
             tools = [
@@ -723,11 +972,13 @@ class Portia:
         )
 
         self.storage.save_plan(plan)
+        if use_cached_plan and self.config.cached_plan_templates:
+            self.plan_templates.add(plan)
         logger().info(
             f"Plan created with {len(plan.steps)} steps",
             plan=str(plan.id),
         )
-        logger().debug(plan.pretty_print())
+        logger().debug(LazyMessage(plan.pretty_print))
 
         return plan
 
@@ -765,7 +1016,9 @@ class Portia:
                 for the query. This is passed on to plan runs created from this plan but will be
                 not be stored with the plan itself if using cloud storage and must be re-attached
                 to the plan run if using cloud storage.
-            use_cached_plan (bool): Whether to use a cached plan if it exists.
+            use_cached_plan (bool): Whether to use a cached plan if it exists. Plans made for
+                other queries can also be reused, see Config.cached_plan_templates and
+                Config.cached_plan_similarity_threshold.
 
         Returns:
             Plan: The plan for executing the query.
@@ -774,11 +1027,8 @@ class Portia:
             PlanError: If there is an error while generating the plan.
 
         """
-        if use_cached_plan:
-            try:
-                return await self.storage.aget_plan_by_query(query)
-            except StorageError as e:
-                logger().warning(f"Error getting cached plan. Using new plan instead: {e}")
+        if use_cached_plan and (cached_plan := await self._aget_cached_plan(query)):
+            return cached_plan
 
         if isinstance(tools, list):
             tools = [
@@ -824,11 +1074,13 @@ class Portia:
         )
 
         await self.storage.asave_plan(plan)
+        if use_cached_plan and self.config.cached_plan_templates:
+            self.plan_templates.add(plan)
         logger().info(
             f"Plan created with {len(plan.steps)} steps",
             plan=str(plan.id),
         )
-        logger().debug(plan.pretty_print())
+        logger().debug(LazyMessage(plan.pretty_print))
 
         return plan
 
@@ -971,6 +1223,76 @@ class Portia:
         )
         return await self._aresume(plan_run)
 
+    def run_plan_many(
+        self,
+        plans: Iterable[PlanItem],
+        end_user: str | EndUser | None = None,
+        structured_output_schema: type[BaseModel] | None = None,
+        max_concurrency: int | None = None,
+    ) -> Iterator[BatchRunResult]:
+        """Run many plans at once, as with Portia.run_plan for each plan.
+
+        Plans run on a pool of threads sharing this client, and are taken from `plans` as earlier
+        ones finish. An exception raised for one plan is recorded on its result rather than
+        stopping the batch.
+
+        Args:
+            plans (Iterable[PlanItem]): The plans to run, or (plan, plan_run_inputs) pairs to run
+                a plan with its own input values. The same plan can appear many times with
+                different inputs.
+            end_user (str | EndUser | None = None): The end user for every plan run.
+            structured_output_schema (type[BaseModel] | None): The optional structured output schema
+                for every plan run.
+            max_concurrency (int | None): The most plans to run at once. Defaults to
+                Config.max_concurrent_runs.
+
+        Returns:
+            Iterator[BatchRunResult]: The result of each plan, in the order the plans complete.
+                Plans only start running once iteration begins.
+
+        """
+
+        def run_item(item: PlanItem) -> PlanRun:
+            plan, plan_run_inputs = item if isinstance(item, tuple) else (item, None)
+            return self.run_plan(plan, end_user, plan_run_inputs, structured_output_schema)
+
+        return run_batch(run_item, plans, max_concurrency or self.config.max_concurrent_runs)
+
+    def arun_plan_many(
+        self,
+        plans: Iterable[PlanItem],
+        end_user: str | EndUser | None = None,
+        structured_output_schema: type[BaseModel] | None = None,
+        max_concurrency: int | None = None,
+    ) -> AsyncIterator[BatchRunResult]:
+        """Run many plans at once, as with Portia.arun_plan for each plan.
+
+        Plans run as tasks on the running event loop, and are taken from `plans` as earlier ones
+        finish. An exception raised for one plan is recorded on its result rather than stopping
+        the batch. Iterate over the results with `async for`.
+
+        Args:
+            plans (Iterable[PlanItem]): The plans to run, or (plan, plan_run_inputs) pairs to run
+                a plan with its own input values. The same plan can appear many times with
+                different inputs.
+            end_user (str | EndUser | None = None): The end user for every plan run.
+            structured_output_schema (type[BaseModel] | None): The optional structured output schema
+                for every plan run.
+            max_concurrency (int | None): The most plans to run at once. Defaults to
+                Config.max_concurrent_runs.
+
+        Returns:
+            AsyncIterator[BatchRunResult]: The result of each plan, in the order the plans
+                complete. Plans only start running once iteration begins.
+
+        """
+
+        async def run_item(item: PlanItem) -> PlanRun:
+            plan, plan_run_inputs = item if isinstance(item, tuple) else (item, None)
+            return await self.arun_plan(plan, end_user, plan_run_inputs, structured_output_schema)
+
+        return arun_batch(run_item, plans, max_concurrency or self.config.max_concurrent_runs)
+
     def _get_plan_run_from_plan(
         self,
         plan: Plan | PlanUUID | UUID,
@@ -1317,7 +1639,7 @@ class Portia:
                 if not any(plan_input.name == input_obj.name for plan_input in plan.plan_inputs):
                     logger().warning(f"Ignoring unknown plan input: {input_obj.name}")
 
-            self.storage.save_plan_run(plan_run)
+            self._save_plan_run(plan_run)
 
     async def _aprocess_plan_input_values(  # noqa: C901
         self,
@@ -1380,7 +1702,7 @@ class Portia:
                 if not any(plan_input.name == input_obj.name for plan_input in plan.plan_inputs):
                     logger().warning(f"Ignoring unknown plan input: {input_obj.name}")
 
-            await self.storage.asave_plan_run(plan_run)
+            await self._asave_plan_run(plan_run)
 
     def execute_plan_run_and_handle_clarifications(
         self,
@@ -1393,7 +1715,8 @@ class Portia:
                 PlanRunState.COMPLETE,
                 PlanRunState.FAILED,
             ]:
-                plan_run = self._execute_plan_run(plan, plan_run)
+                with record_stage_timings(plan_run, self.stage_timing_sinks):
+                    plan_run = self._execute_plan_run(plan, plan_run)
 
                 plan_run = self._handle_clarifications(plan_run)
                 if len(plan_run.get_outstanding_clarifications()) > 0:
@@ -1402,6 +1725,8 @@ class Portia:
         except KeyboardInterrupt:
             logger().info("Execution interrupted by user. Setting plan run state to FAILED.")
             self._set_plan_run_state(plan_run, PlanRunState.FAILED)
+        finally:
+            self._flush_plan_run(plan_run)
 
         return plan_run
 
@@ -1416,7 +1741,8 @@ class Portia:
                 PlanRunState.COMPLETE,
                 PlanRunState.FAILED,
             ]:
-                plan_run = await self._aexecute_plan_run(plan, plan_run)
+                with record_stage_timings(plan_run, self.stage_timing_sinks):
+                    plan_run = await self._aexecute_plan_run(plan, plan_run)
 
                 plan_run = self._handle_clarifications(plan_run)
                 if len(plan_run.get_outstanding_clarifications()) > 0:
@@ -1425,6 +1751,8 @@ class Portia:
         except KeyboardInterrupt:
             logger().info("Execution interrupted by user. Setting plan run state to FAILED.")
             self._set_plan_run_state(plan_run, PlanRunState.FAILED)
+        finally:
+            self._flush_plan_run(plan_run)
 
         return plan_run
 
@@ -1514,7 +1842,11 @@ class Portia:
         )
 
         logger().debug(
-            f"Clarification resolved: {matched_clarification.model_dump_json(indent=4)}",
+            LazyMessage(
+                lambda: (
+                    f"Clarification resolved: {matched_clarification.model_dump_json(indent=4)}"
+                ),
+            ),
         )
         self.storage.save_plan_run(plan_run)
         return plan_run
@@ -1622,7 +1954,58 @@ class Portia:
     def _set_plan_run_state(self, plan_run: PlanRun, state: PlanRunState) -> None:
         """Set the state of a plan run and persist it to storage."""
         plan_run.state = state
-        self.storage.save_plan_run(plan_run)
+        self._save_plan_run(plan_run, PlanRunPersistence.ON_TRANSITION)
+
+    def _save_plan_run(
+        self,
+        plan_run: PlanRun,
+        persistence: PlanRunPersistence = PlanRunPersistence.EVERY_WRITE,
+    ) -> None:
+        """Save a plan run if the configured persistence mode requires this write.
+
+        Writes which are skipped are coalesced into the next one that isn't, and any left over
+        when execution stops are written by _flush_plan_run.
+
+        Args:
+            plan_run (PlanRun): The plan run to save.
+            persistence (PlanRunPersistence): The least durable persistence mode which still
+                requires this write. Plain updates only need saving in EVERY_WRITE mode, the end
+                of a step in PER_STEP mode and state transitions in every mode.
+
+        """
+        modes = list(PlanRunPersistence)
+        if modes.index(self.config.plan_run_persistence) > modes.index(persistence):
+            self._unsaved_plan_run_ids.add(plan_run.id)
+            return
+        self._unsaved_plan_run_ids.discard(plan_run.id)
+        with timed_stage(TimedStage.STORAGE_SAVE):
+            self.storage.save_plan_run(plan_run)
+
+    async def _asave_plan_run(
+        self,
+        plan_run: PlanRun,
+        persistence: PlanRunPersistence = PlanRunPersistence.EVERY_WRITE,
+    ) -> None:
+        """Save a plan run asynchronously if the configured persistence mode requires this write.
+
+        Args:
+            plan_run (PlanRun): The plan run to save.
+            persistence (PlanRunPersistence): The least durable persistence mode which still
+                requires this write.
+
+        """
+        modes = list(PlanRunPersistence)
+        if modes.index(self.config.plan_run_persistence) > modes.index(persistence):
+            self._unsaved_plan_run_ids.add(plan_run.id)
+            return
+        self._unsaved_plan_run_ids.discard(plan_run.id)
+        with timed_stage(TimedStage.STORAGE_SAVE):
+            await self.storage.asave_plan_run(plan_run)
+
+    def _flush_plan_run(self, plan_run: PlanRun) -> None:
+        """Save a plan run if it has updates which were deferred by _save_plan_run."""
+        if plan_run.id in self._unsaved_plan_run_ids:
+            self._save_plan_run(plan_run, PlanRunPersistence.ON_TRANSITION)
 
     def create_plan_run(
         self,
@@ -1709,7 +2092,7 @@ class Portia:
         )
         self._process_plan_input_values(plan, plan_run, plan_run_inputs)
         # Ensure the plan is saved before the plan run
-        self.storage.save_plan_run(plan_run)
+        self._save_plan_run(plan_run, PlanRunPersistence.ON_TRANSITION)
         return plan_run
 
     async def _acreate_plan_run(
@@ -1739,7 +2122,7 @@ class Portia:
         )
         await self._aprocess_plan_input_values(plan, plan_run, plan_run_inputs)
         # Ensure the plan is saved before the plan run
-        await self.storage.asave_plan_run(plan_run)
+        await self._asave_plan_run(plan_run, PlanRunPersistence.ON_TRANSITION)
         return plan_run
 
     def _execute_plan_run(self, plan: Plan, plan_run: PlanRun) -> PlanRun:
@@ -1757,6 +2140,8 @@ class Portia:
         self._log_execute_start(plan_run, plan)
         last_executed_step_output = self._get_last_executed_step_output(plan, plan_run)
         introspection_agent = self._get_introspection_agent()
+        if self.config.max_parallel_steps > 1:
+            return self._execute_steps_in_parallel(plan, plan_run, introspection_agent)
         for index in range(plan_run.current_step_index, len(plan.steps)):
             step = plan.steps[index]
             plan_run.current_step_index = index
@@ -1772,29 +2157,10 @@ class Portia:
                 continue
             except Exception as e:  # noqa: BLE001 - We want to capture all other failures here
                 return self._handle_execution_error(plan_run, plan, index, step, e)
-            else:
-                self._set_step_output(last_executed_step_output, plan_run, step)
-                logger().info(
-                    f"Step output - {last_executed_step_output.get_summary()!s}",
-                )
-            try:
-                if clarified_plan_run := self._handle_post_step_execution(
-                    plan, plan_run, index, step, last_executed_step_output
-                ):
-                    # No after_plan_run call here as the plan run will be resumed later
-                    return clarified_plan_run
-            except Exception as e:  # noqa: BLE001 - We want to capture all exceptions from the hook here
-                logger().error(
-                    "Error in post-step stage for step {index}: {error}",
-                    index=index,
-                    error=e,
-                    plan=str(plan.id),
-                    plan_run=str(plan_run.id),
-                )
-                error_output = LocalDataValue(value=str(e))
-                self._set_step_output(error_output, plan_run, step)
-                # Skip the after_step_execution hook as we have already run it
-                return self._handle_plan_run_execution_error(plan_run, plan, error_output)
+            if stopped_plan_run := self._complete_step(
+                plan, plan_run, index, step, last_executed_step_output
+            ):
+                return stopped_plan_run
 
         return self._post_plan_run_execution(plan, plan_run, last_executed_step_output)
 
@@ -1813,6 +2179,8 @@ class Portia:
         self._log_execute_start(plan_run, plan)
         last_executed_step_output = self._get_last_executed_step_output(plan, plan_run)
         introspection_agent = self._get_introspection_agent()
+        if self.config.max_parallel_steps > 1:
+            return await self._aexecute_steps_in_parallel(plan, plan_run, introspection_agent)
         for index in range(plan_run.current_step_index, len(plan.steps)):
             step = plan.steps[index]
             plan_run.current_step_index = index
@@ -1828,31 +2196,269 @@ class Portia:
                 continue
             except Exception as e:  # noqa: BLE001 - We want to capture all other failures here
                 return self._handle_execution_error(plan_run, plan, index, step, e)
-            else:
-                self._set_step_output(last_executed_step_output, plan_run, step)
-                logger().info(
-                    f"Step output - {last_executed_step_output.get_summary()!s}",
+            if stopped_plan_run := self._complete_step(
+                plan, plan_run, index, step, last_executed_step_output
+            ):
+                return stopped_plan_run
+
+        return self._post_plan_run_execution(plan, plan_run, last_executed_step_output)
+
+    def _complete_step(
+        self,
+        plan: Plan,
+        plan_run: PlanRun,
+        index: int,
+        step: Step,
+        step_output: Output,
+    ) -> PlanRun | None:
+        """Record the output of an executed step and run the post-step stage.
+
+        Returns:
+            PlanRun | None: The plan run if execution should stop, because the step raised
+                clarifications or the post-step stage failed.
+
+        """
+        self._set_step_output(step_output, plan_run, step)
+        logger().info(
+            f"Step output - {step_output.get_summary()!s}",
+        )
+        try:
+            # No after_plan_run call here if clarifications were raised as the plan run will be
+            # resumed later
+            return self._handle_post_step_execution(plan, plan_run, index, step, step_output)
+        except Exception as e:  # noqa: BLE001 - We want to capture all exceptions from the hook here
+            logger().error(
+                "Error in post-step stage for step {index}: {error}",
+                index=index,
+                error=e,
+                plan=str(plan.id),
+                plan_run=str(plan_run.id),
+            )
+            error_output = LocalDataValue(value=str(e))
+            self._set_step_output(error_output, plan_run, step)
+            # Skip the after_step_execution hook as we have already run it
+            return self._handle_plan_run_execution_error(plan_run, plan, error_output)
+
+    def _get_step_executor(self) -> ThreadPoolExecutor:
+        """Get the thread pool used to execute independent steps concurrently."""
+        with self._step_executor_lock:
+            if self._step_executor is None:
+                self._step_executor = ThreadPoolExecutor(
+                    max_workers=self.config.max_parallel_steps,
+                    thread_name_prefix="portia-step",
                 )
-            try:
-                if clarified_plan_run := self._handle_post_step_execution(
-                    plan, plan_run, index, step, last_executed_step_output
+            return self._step_executor
+
+    def _execute_steps_in_parallel(
+        self,
+        plan: Plan,
+        plan_run: PlanRun,
+        introspection_agent: BaseIntrospectionAgent,
+    ) -> PlanRun:
+        """Execute the remaining steps of a plan run, running independent steps concurrently.
+
+        Batches of independent steps are executed on a thread pool. Hooks are called and outputs
+        are processed in plan order, so hooks and clarifications behave as if the steps had been
+        executed one after another.
+
+        Args:
+            plan (Plan): The plan to execute.
+            plan_run (PlanRun): The plan run to execute.
+            introspection_agent (BaseIntrospectionAgent): The introspection agent.
+
+        Returns:
+            PlanRun: The updated plan run after execution.
+
+        """
+        scheduler = StepScheduler(plan)
+        completed = scheduler.completed_steps(plan_run)
+        while batch := scheduler.next_batch(completed, self.config.max_parallel_steps):
+            if len(batch) == 1:
+                index = batch[0]
+                step = plan.steps[index]
+                plan_run.current_step_index = index
+                try:
+                    step_output = self._execute_step(
+                        plan,
+                        plan_run,
+                        step,
+                        self._get_last_executed_step_output(plan, plan_run),
+                        introspection_agent,
+                    )
+                except SkipExecutionError as e:
+                    logger().info(f"Skipping step {index}: {e}")
+                    if e.should_return:
+                        return plan_run
+                    completed.add(index)
+                    continue
+                except Exception as e:  # noqa: BLE001 - We want to capture all other failures here
+                    return self._handle_execution_error(plan_run, plan, index, step, e)
+                if stopped_plan_run := self._complete_step(
+                    plan, plan_run, index, step, step_output
                 ):
-                    # No after_plan_run call here as the plan run will be resumed later
-                    return clarified_plan_run
-            except Exception as e:  # noqa: BLE001 - We want to capture all exceptions from the hook here
-                logger().error(
-                    "Error in post-step stage for step {index}: {error}",
-                    index=index,
-                    error=e,
-                    plan=str(plan.id),
-                    plan_run=str(plan_run.id),
+                    return stopped_plan_run
+                completed.add(index)
+                continue
+
+            results, agents = self._prepare_parallel_steps(plan, plan_run, batch, completed)
+            futures = {
+                index: self._get_step_executor().submit(
+                    timed_call(TimedStage.STEP, index, agent.execute_sync)
                 )
-                error_output = LocalDataValue(value=str(e))
-                self._set_step_output(error_output, plan_run, step)
-                # Skip the after_step_execution hook as we have already run it
-                return self._handle_plan_run_execution_error(plan_run, plan, error_output)
+                for index, agent in agents.items()
+            }
+            for index, future in futures.items():
+                try:
+                    results[index] = future.result()
+                except Exception as e:  # noqa: BLE001 - We want to capture all other failures here
+                    results[index] = e
+            if stopped_plan_run := self._complete_parallel_steps(
+                plan, plan_run, results, completed
+            ):
+                return stopped_plan_run
 
-        return self._post_plan_run_execution(plan, plan_run, last_executed_step_output)
+        plan_run.current_step_index = max(len(plan.steps) - 1, 0)
+        return self._post_plan_run_execution(
+            plan, plan_run, self._get_last_executed_step_output(plan, plan_run)
+        )
+
+    async def _aexecute_steps_in_parallel(
+        self,
+        plan: Plan,
+        plan_run: PlanRun,
+        introspection_agent: BaseIntrospectionAgent,
+    ) -> PlanRun:
+        """Execute the remaining steps of a plan run, running independent steps concurrently.
+
+        Batches of independent steps are executed concurrently on the event loop. Hooks are called
+        and outputs are processed in plan order, so hooks and clarifications behave as if the
+        steps had been executed one after another.
+
+        Args:
+            plan (Plan): The plan to execute.
+            plan_run (PlanRun): The plan run to execute.
+            introspection_agent (BaseIntrospectionAgent): The introspection agent.
+
+        Returns:
+            PlanRun: The updated plan run after execution.
+
+        """
+        scheduler = StepScheduler(plan)
+        completed = scheduler.completed_steps(plan_run)
+        while batch := scheduler.next_batch(completed, self.config.max_parallel_steps):
+            if len(batch) == 1:
+                index = batch[0]
+                step = plan.steps[index]
+                plan_run.current_step_index = index
+                try:
+                    step_output = await self._aexecute_step(
+                        plan,
+                        plan_run,
+                        step,
+                        self._get_last_executed_step_output(plan, plan_run),
+                        introspection_agent,
+                    )
+                except SkipExecutionError as e:
+                    logger().info(f"Skipping step {index}: {e}")
+                    if e.should_return:
+                        return plan_run
+                    completed.add(index)
+                    continue
+                except Exception as e:  # noqa: BLE001 - We want to capture all other failures here
+                    return self._handle_execution_error(plan_run, plan, index, step, e)
+                if stopped_plan_run := self._complete_step(
+                    plan, plan_run, index, step, step_output
+                ):
+                    return stopped_plan_run
+                completed.add(index)
+                continue
+
+            results, agents = self._prepare_parallel_steps(plan, plan_run, batch, completed)
+            outputs = await asyncio.gather(
+                *(
+                    atimed_call(TimedStage.STEP, index, agent.execute_async())
+                    for index, agent in agents.items()
+                ),
+                return_exceptions=True,
+            )
+            for index, output in zip(agents, outputs, strict=True):
+                if isinstance(output, BaseException) and not isinstance(output, Exception):
+                    raise output
+                results[index] = output
+            if stopped_plan_run := self._complete_parallel_steps(
+                plan, plan_run, results, completed
+            ):
+                return stopped_plan_run
+
+        plan_run.current_step_index = max(len(plan.steps) - 1, 0)
+        return self._post_plan_run_execution(
+            plan, plan_run, self._get_last_executed_step_output(plan, plan_run)
+        )
+
+    def _prepare_parallel_steps(
+        self,
+        plan: Plan,
+        plan_run: PlanRun,
+        batch: list[int],
+        completed: set[int],
+    ) -> tuple[dict[int, Output | Exception], dict[int, BaseExecutionAgent]]:
+        """Run the before-step stage for a batch of steps, in plan order.
+
+        Steps skipped by the before_step_execution hook are marked as completed.
+
+        Returns:
+            tuple[dict[int, Output | Exception], dict[int, BaseExecutionAgent]]: Errors raised
+                while preparing steps, and the agents to execute the remaining steps with.
+
+        """
+        errors: dict[int, Output | Exception] = {}
+        agents: dict[int, BaseExecutionAgent] = {}
+        for index in batch:
+            plan_run.current_step_index = index
+            try:
+                agents[index] = self._prepare_step_agent(plan, plan_run, plan.steps[index])
+            except SkipExecutionError as e:
+                logger().info(f"Skipping step {index}: {e}")
+                completed.add(index)
+            except Exception as e:  # noqa: BLE001 - We want to capture all other failures here
+                errors[index] = e
+        return errors, agents
+
+    def _complete_parallel_steps(
+        self,
+        plan: Plan,
+        plan_run: PlanRun,
+        results: dict[int, Output | Exception],
+        completed: set[int],
+    ) -> PlanRun | None:
+        """Process the results of a batch of steps in plan order.
+
+        Returns:
+            PlanRun | None: The plan run if execution should stop, because a step failed or
+                raised clarifications.
+
+        """
+        needs_clarification = False
+        for index in sorted(results):
+            step = plan.steps[index]
+            plan_run.current_step_index = index
+            result = results[index]
+            if isinstance(result, Exception):
+                return self._handle_execution_error(plan_run, plan, index, step, result)
+            if stopped_plan_run := self._complete_step(plan, plan_run, index, step, result):
+                if stopped_plan_run.state != PlanRunState.NEED_CLARIFICATION:
+                    return stopped_plan_run
+                needs_clarification = True
+            else:
+                completed.add(index)
+        if needs_clarification:
+            # Resume from the first step which hasn't completed
+            plan_run.current_step_index = min(
+                index for index in range(len(plan.steps)) if index not in completed
+            )
+            self._save_plan_run(plan_run, PlanRunPersistence.ON_TRANSITION)
+            return plan_run
+        return None
 
     def _handle_post_step_execution(
         self,
@@ -1878,9 +2484,9 @@ class Portia:
         self._handle_after_step_execution_hook(plan, plan_run, step, last_executed_step_output)
 
         # persist at the end of each step
-        self.storage.save_plan_run(plan_run)
+        self._save_plan_run(plan_run, PlanRunPersistence.PER_STEP)
         logger().debug(
-            f"New PlanRun State: {plan_run.model_dump_json(indent=4)}",
+            LazyMessage(lambda: f"New PlanRun State: {plan_run.model_dump_json(indent=4)}"),
         )
         return None
 
@@ -1922,24 +2528,18 @@ class Portia:
             SkipExecutionError: If the step should be skipped.
 
         """
-        # Handle the introspection outcome
-        (plan_run, pre_step_outcome) = self._generate_introspection_outcome(
-            introspection_agent=introspection_agent,
-            plan=plan,
-            plan_run=plan_run,
-            last_executed_step_output=last_executed_step_output,
-        )
-        self._handle_pre_step_outcome(plan, plan_run, pre_step_outcome)
-        self._handle_before_step_execution_hook(plan, plan_run, step)
-
-        # we pass read only copies of the state to the agent so that the portia remains
-        # responsible for handling the output of the agent and updating the state.
-        agent = self.get_agent_for_step(
-            step=ReadOnlyStep.from_step(step),
-            plan=ReadOnlyPlan.from_plan(plan),
-            plan_run=ReadOnlyPlanRun.from_plan_run(plan_run),
-        )
-        return agent.execute_sync()
+        with timed_stage(TimedStage.STEP, plan_run.current_step_index):
+            # Handle the introspection outcome
+            with timed_stage(TimedStage.INTROSPECTION):
+                (plan_run, pre_step_outcome) = self._generate_introspection_outcome(
+                    introspection_agent=introspection_agent,
+                    plan=plan,
+                    plan_run=plan_run,
+                    last_executed_step_output=last_executed_step_output,
+                )
+            self._handle_pre_step_outcome(plan, plan_run, pre_step_outcome)
+            agent = self._prepare_step_agent(plan, plan_run, step)
+            return agent.execute_sync()
 
     async def _aexecute_step(
         self,
@@ -1965,24 +2565,35 @@ class Portia:
             SkipExecutionError: If the step should be skipped.
 
         """
-        # Handle the introspection outcome
-        (plan_run, pre_step_outcome) = await self._agenerate_introspection_outcome(
-            introspection_agent=introspection_agent,
-            plan=plan,
-            plan_run=plan_run,
-            last_executed_step_output=last_executed_step_output,
-        )
-        self._handle_pre_step_outcome(plan, plan_run, pre_step_outcome)
+        with timed_stage(TimedStage.STEP, plan_run.current_step_index):
+            # Handle the introspection outcome
+            with timed_stage(TimedStage.INTROSPECTION):
+                (plan_run, pre_step_outcome) = await self._agenerate_introspection_outcome(
+                    introspection_agent=introspection_agent,
+                    plan=plan,
+                    plan_run=plan_run,
+                    last_executed_step_output=last_executed_step_output,
+                )
+            self._handle_pre_step_outcome(plan, plan_run, pre_step_outcome)
+            agent = self._prepare_step_agent(plan, plan_run, step)
+            return await agent.execute_async()
+
+    def _prepare_step_agent(self, plan: Plan, plan_run: PlanRun, step: Step) -> BaseExecutionAgent:
+        """Run the before_step_execution hook and get the agent to execute the current step with.
+
+        Raises:
+            SkipExecutionError: If the hook decided the step should be skipped.
+
+        """
         self._handle_before_step_execution_hook(plan, plan_run, step)
 
         # we pass read only copies of the state to the agent so that the portia remains
         # responsible for handling the output of the agent and updating the state.
-        agent = self.get_agent_for_step(
+        return self.get_agent_for_step(
             step=ReadOnlyStep.from_step(step),
             plan=ReadOnlyPlan.from_plan(plan),
             plan_run=ReadOnlyPlanRun.from_plan_run(plan_run),
         )
-        return await agent.execute_async()
 
     def _handle_before_step_execution_hook(self, plan: Plan, plan_run: PlanRun, step: Step) -> None:
         """Handle the before step execution hook.
@@ -2393,11 +3004,16 @@ class Portia:
             return final_output
 
         try:
-            summarizer = FinalOutputSummarizer(config=self.config, agent_memory=self.storage)
-            output = summarizer.create_summary(
-                plan_run=ReadOnlyPlanRun.from_plan_run(plan_run),
-                plan=ReadOnlyPlan.from_plan(plan),
+            summarizer = FinalOutputSummarizer(
+                config=self.config,
+                agent_memory=self.storage,
+                stream_callback=self.execution_hooks.get_stream_callback(plan_run, None),
             )
+            with timed_stage(TimedStage.FINAL_OUTPUT_SUMMARY):
+                output = summarizer.create_summary(
+                    plan_run=ReadOnlyPlanRun.from_plan_run(plan_run),
+                    plan=ReadOnlyPlan.from_plan(plan),
+                )
             if (
                 isinstance(output, BaseModel)
                 and plan_run.structured_output_schema
@@ -2461,7 +3077,11 @@ class Portia:
                 plan_run=str(plan_run.id),
             )
             logger().debug(
-                f"Clarification requested: {clarification.model_dump_json(indent=4)}",
+                LazyMessage(
+                    lambda clarification=clarification: (
+                        f"Clarification requested: {clarification.model_dump_json(indent=4)}"
+                    ),
+                ),
             )
         existing_clarification_ids = [clar.id for clar in plan_run.outputs.clarifications]
         new_clarifications = [
@@ -2585,7 +3205,7 @@ class Portia:
             step_output = self.storage.save_plan_run_output(step.output, step_output, plan_run.id)
             plan_run.outputs.step_outputs[step.output] = step_output
 
-        self.storage.save_plan_run(plan_run)
+        self._save_plan_run(plan_run)
         return step_output
 
     def _check_remaining_tool_readiness(
@@ -2716,7 +3336,8 @@ class Portia:
                 PlanRunState.COMPLETE,
                 PlanRunState.FAILED,
             ]:
-                plan_run = await self._execute_builder_plan(plan, run_data)
+                with record_stage_timings(plan_run, self.stage_timing_sinks):
+                    plan_run = await self._execute_builder_plan(plan, run_data)
 
                 plan_run = self._handle_clarifications(plan_run)
                 if len(plan_run.get_outstanding_clarifications()) > 0:
@@ -2725,25 +3346,42 @@ class Portia:
         except KeyboardInterrupt:
             logger().info("Execution interrupted by user. Setting plan run state to FAILED.")
             self._set_plan_run_state(plan_run, PlanRunState.FAILED)
+        finally:
+            self._flush_plan_run(plan_run)
 
         return plan_run
 
-    async def _execute_builder_plan(self, plan: PlanV2, run_data: RunContext) -> PlanRun:  # noqa: C901, PLR0912, PLR0915
+    async def _execute_builder_plan(self, plan: PlanV2, run_data: RunContext) -> PlanRun:  # noqa: C901, PLR0912
         """Execute a Portia plan."""
         self._set_plan_run_state(run_data.plan_run, PlanRunState.IN_PROGRESS)
         self._log_execute_start(run_data.plan_run, run_data.legacy_plan)
 
         output_value = self._get_last_executed_step_output(run_data.legacy_plan, run_data.plan_run)
         branch_stack: list[ConditionalStepResult] = []
+        last_parallel_step_index = -1
         for i, step in enumerate(plan.steps):
-            if i < run_data.plan_run.current_step_index:
+            if i < run_data.plan_run.current_step_index or i <= last_parallel_step_index:
                 logger().debug(f"Skipping step {i}: {step}")
                 continue
 
+            if step.parallel_block is not None:
+                # Run the rest of the parallel block, including this step, at the same time
+                block_indexes = [index for index in step.parallel_block.step_indexes if index >= i]
+                stopped_plan_run, output_value = await self._execute_builder_parallel_block(
+                    plan, run_data, block_indexes
+                )
+                if stopped_plan_run:
+                    return stopped_plan_run
+                last_parallel_step_index = block_indexes[-1]
+                run_data.plan_run.current_step_index = min(
+                    last_parallel_step_index + 1, len(plan.steps) - 1
+                )
+                continue
+
             logger().info(f"Starting step {i}: {step}")
 
             try:
-                result = await step.run(run_data)
+                result = await atimed_call(TimedStage.STEP, i, step.run(run_data))
             except Exception as e:  # noqa: BLE001
                 return self._handle_execution_error(
                     run_data.plan_run, run_data.legacy_plan, i, step.to_legacy_step(plan), e
@@ -2781,46 +3419,11 @@ class Portia:
                 logger().debug("Exiting conditional branch")
                 branch_stack.pop()
 
-            output_value = LocalDataValue(value=result)
-            # This may persist the output to memory - store the memory value if it does
-            output_value = self._set_step_output(
-                output_value, run_data.plan_run, step.to_legacy_step(plan)
-            )
-            output = ReferenceValue(
-                value=output_value,
-                description=(f"Output from step '{step.step_name}' (Description: {step})"),
+            stopped_plan_run, output_value = self._complete_builder_step(
+                plan, run_data, i, step, result
             )
-            run_data.step_output_values.append(output)
-
-            try:
-                if clarified_plan_run := self._handle_post_step_execution(
-                    run_data.legacy_plan,
-                    run_data.plan_run,
-                    i,
-                    step.to_legacy_step(plan),
-                    output_value,
-                ):
-                    # No after_plan_run call here as the plan run will be resumed later
-                    return clarified_plan_run
-            except Exception as e:  # noqa: BLE001 - We want to capture all exceptions from the hook here
-                logger().error(
-                    "Error in post-step stage for step {index}: {error}",
-                    index=i,
-                    error=e,
-                    plan=str(plan.id),
-                    plan_run=str(run_data.plan_run.id),
-                )
-                error_value = LocalDataValue(value=str(e))
-                self._set_step_output(error_value, run_data.plan_run, step.to_legacy_step(plan))
-                error_output = ReferenceValue(
-                    value=error_value,
-                    description=(f"Error from step '{step.step_name}' (Description: {step})"),
-                )
-                run_data.step_output_values.append(error_output)
-                # Skip the after_step_execution hook as we have already run it
-                return self._handle_plan_run_execution_error(
-                    run_data.plan_run, run_data.legacy_plan, error_value
-                )
+            if stopped_plan_run:
+                return stopped_plan_run
 
             # Don't increment current step beyond the last step
             if jump_to_step_index is None and i < len(plan.steps) - 1:
@@ -2837,6 +3440,124 @@ class Portia:
             skip_summarization=not plan.summarize and plan.final_output_schema is None,
         )
 
+    def _complete_builder_step(
+        self,
+        plan: PlanV2,
+        run_data: RunContext,
+        index: int,
+        step: StepV2,
+        result: Any,  # noqa: ANN401
+    ) -> tuple[PlanRun | None, Output]:
+        """Record the result of a builder step and run the post-step stage.
+
+        Returns:
+            tuple[PlanRun | None, Output]: The plan run if execution should stop, because the step
+                raised clarifications or the post-step stage failed, and the step output.
+
+        """
+        output_value = LocalDataValue(value=result)
+        # This may persist the output to memory - store the memory value if it does
+        output_value = self._set_step_output(
+            output_value, run_data.plan_run, step.to_legacy_step(plan)
+        )
+        output = ReferenceValue(
+            value=output_value,
+            description=(f"Output from step '{step.step_name}' (Description: {step})"),
+        )
+        run_data.step_output_values.append(output)
+
+        try:
+            # No after_plan_run call here if clarifications were raised as the plan run will be
+            # resumed later
+            clarified_plan_run = self._handle_post_step_execution(
+                run_data.legacy_plan,
+                run_data.plan_run,
+                index,
+                step.to_legacy_step(plan),
+                output_value,
+            )
+        except Exception as e:  # noqa: BLE001 - We want to capture all exceptions from the hook here
+            logger().error(
+                "Error in post-step stage for step {index}: {error}",
+                index=index,
+                error=e,
+                plan=str(plan.id),
+                plan_run=str(run_data.plan_run.id),
+            )
+            error_value = LocalDataValue(value=str(e))
+            self._set_step_output(error_value, run_data.plan_run, step.to_legacy_step(plan))
+            error_output = ReferenceValue(
+                value=error_value,
+                description=(f"Error from step '{step.step_name}' (Description: {step})"),
+            )
+            run_data.step_output_values.append(error_output)
+            # Skip the after_step_execution hook as we have already run it
+            return self._handle_plan_run_execution_error(
+                run_data.plan_run, run_data.legacy_plan, error_value
+            ), error_value
+        return clarified_plan_run, output_value
+
+    async def _execute_builder_parallel_block(
+        self,
+        plan: PlanV2,
+        run_data: RunContext,
+        block_indexes: list[int],
+    ) -> tuple[PlanRun | None, Output]:
+        """Run the steps of a parallel block concurrently, then process their results in order.
+
+        Each step runs with its own shallow copy of the plan run, whose current step index is that
+        of the step, so tool calls and clarifications made while it runs are attributed to it. The
+        copies share the plan run's outputs, which are only updated once all the steps are done.
+
+        Returns:
+            tuple[PlanRun | None, Output]: The plan run if execution should stop, because a step
+                failed or raised clarifications, and the output of the last step processed.
+
+        """
+        steps = [plan.steps[index] for index in block_indexes]
+        for index, step in zip(block_indexes, steps, strict=True):
+            logger().info(f"Starting step {index}: {step}")
+        results = await asyncio.gather(
+            *(
+                atimed_call(
+                    TimedStage.STEP,
+                    index,
+                    step.run(
+                        run_data.model_copy(
+                            update={
+                                "plan_run": run_data.plan_run.model_copy(
+                                    update={"current_step_index": index},
+                                ),
+                            },
+                        ),
+                    ),
+                )
+                for index, step in zip(block_indexes, steps, strict=True)
+            ),
+            return_exceptions=True,
+        )
+
+        output_value: Output | None = None
+        for index, step, result in zip(block_indexes, steps, results, strict=True):
+            run_data.plan_run.current_step_index = index
+            if isinstance(result, BaseException):
+                if not isinstance(result, Exception):
+                    raise result
+                return self._handle_execution_error(
+                    run_data.plan_run,
+                    run_data.legacy_plan,
+                    index,
+                    step.to_legacy_step(plan),
+                    result,
+                ), LocalDataValue(value=str(result))
+            stopped_plan_run, output_value = self._complete_builder_step(
+                plan, run_data, index, step, result
+            )
+            if stopped_plan_run:
+                return stopped_plan_run, output_value
+            logger().info(f"Completed step {index}, result: {result}")
+        return None, output_value or LocalDataValue(value=None)
+
     @staticmethod
     def _log_models(config: Config) -> None:
         """Log the models set in the configuration."""
@@ -0,0 +1,414 @@
+"""Time each stage of a plan run.
+
+When a Portia client is given stage timing sinks, every plan run it executes records a
+StageTiming for each stage of its steps: introspection, the nodes of the execution agents' graphs
+(memory extraction, argument parsing and verification, tool calling LLM turns, tool calls and
+summarisation), the final output summary and saving the plan run to storage. Each timing records
+the stage's duration, the tokens used by LangChain model calls made within it and its lookups in a
+local LLM cache (see portia.llm_cache). Tokens and lookups count towards every stage they happen
+within, including enclosing stages, so a step's timing includes those of its execution agent's
+nodes. Summing them across nested stages counts them more than once.
+
+Timings are attached to PlanRun.stage_timings and sent to each sink as they complete. Sinks are
+provided for keeping timings in memory, appending them to a JSONL file and exposing aggregates in
+the Prometheus text exposition format.
+
+Stages are timed with the timed_stage context manager. The plan run being timed and the enclosing
+stage are held in context variables, so stages nested anywhere within a plan run's execution are
+attributed to it without threading state through every call. Timing is a no-op outside of a plan
+run with sinks.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+from langchain_core.tracers.context import register_configure_hook
+from pydantic import BaseModel, Field
+
+from portia.common import PortiaEnum
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterator, Sequence
+
+    from langchain_core.outputs import LLMResult
+
+    from portia.plan_run import PlanRun
+
+T = TypeVar("T")
+
+
+class TimedStage(PortiaEnum):
+    """The stages of a plan run timed outside of the execution agents' graphs.
+
+    Stages within the graphs are named after their AgentNode, e.g. argument_parser.
+    """
+
+    STEP = "step"
+    INTROSPECTION = "introspection"
+    FINAL_OUTPUT_SUMMARY = "final_output_summary"
+    STORAGE_SAVE = "storage_save"
+
+
+class StageTiming(BaseModel):
+    """The time spent in one stage of a plan run.
+
+    Attributes:
+        stage: The name of the stage.
+        step_index: The index of the step the stage belongs to, if any.
+        started_at: When the stage started.
+        duration_seconds: How long the stage took.
+        input_tokens: The input tokens used by LangChain model calls within the stage, including
+            its nested stages.
+        output_tokens: The output tokens used by LangChain model calls within the stage,
+            including its nested stages.
+        llm_cache_hits: The lookups in a local LLM cache within the stage, including its nested
+            stages, served from the cache.
+        llm_cache_misses: The lookups in a local LLM cache within the stage, including its
+            nested stages, not found in the cache.
+        error: The error raised by the stage, if any.
+
+    """
+
+    stage: str = Field(description="The name of the stage.")
+    step_index: int | None = Field(
+        default=None,
+        description="The index of the step the stage belongs to, if any.",
+    )
+    started_at: datetime = Field(description="When the stage started.")
+    duration_seconds: float = Field(description="How long the stage took.")
+    input_tokens: int = Field(
+        default=0,
+        description="The input tokens used by LangChain model calls within the stage, including "
+        "its nested stages.",
+    )
+    output_tokens: int = Field(
+        default=0,
+        description="The output tokens used by LangChain model calls within the stage, including "
+        "its nested stages.",
+    )
+    llm_cache_hits: int = Field(
+        default=0,
+        description="The lookups in a local LLM cache within the stage, including its nested "
+        "stages, served from the cache.",
+    )
+    llm_cache_misses: int = Field(
+        default=0,
+        description="The lookups in a local LLM cache within the stage, including its nested "
+        "stages, not found in the cache.",
+    )
+    error: str | None = Field(default=None, description="The error raised by the stage, if any.")
+
+
+class StageTimingSink(ABC):
+    """Receives the timing of each stage of the plan runs it is given to.
+
+    Sinks may be called from several threads at once, e.g. when steps run in parallel.
+    """
+
+    @abstractmethod
+    def record(self, plan_run: PlanRun, timing: StageTiming) -> None:
+        """Record the timing of a stage.
+
+        Args:
+            plan_run (PlanRun): The plan run the stage belongs to.
+            timing (StageTiming): The timing of the stage.
+
+        """
+
+
+class InMemoryStageTimingSink(StageTimingSink):
+    """Keeps stage timings in memory, e.g. for tests or inspecting a run in a notebook."""
+
+    def __init__(self) -> None:
+        """Initialize the sink."""
+        self._lock = threading.Lock()
+        self._timings: list[tuple[str, StageTiming]] = []
+
+    def record(self, plan_run: PlanRun, timing: StageTiming) -> None:
+        """Keep the timing of a stage."""
+        with self._lock:
+            self._timings.append((str(plan_run.id), timing))
+
+    def timings(self, plan_run_id: str | None = None) -> list[StageTiming]:
+        """Get the recorded timings, optionally only those of one plan run."""
+        with self._lock:
+            return [
+                timing
+                for run_id, timing in self._timings
+                if plan_run_id is None or run_id == plan_run_id
+            ]
+
+
+class JsonlStageTimingSink(StageTimingSink):
+    """Appends stage timings to a file, one JSON object per line."""
+
+    def __init__(self, path: str | Path) -> None:
+        """Initialize the sink.
+
+        Args:
+            path (str | Path): The file to append timings to. Its directory is created if needed.
+
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def record(self, plan_run: PlanRun, timing: StageTiming) -> None:
+        """Append the timing of a stage to the file."""
+        line = json.dumps({"plan_run_id": str(plan_run.id), **timing.model_dump(mode="json")})
+        with self._lock, self.path.open("a") as f:
+            f.write(line + "\n")
+
+
+class PrometheusStageTimingSink(StageTimingSink):
+    """Aggregates stage timings per stage for exposing to Prometheus.
+
+    Serve the output of render() from a metrics endpoint for Prometheus to scrape.
+    """
+
+    _COUNTERS = (
+        ("duration_seconds", "portia_stage_duration_seconds_sum", "Time spent in each stage."),
+        (
+            "input_tokens",
+            "portia_stage_input_tokens_total",
+            "Input tokens used in each stage, including its nested stages.",
+        ),
+        (
+            "output_tokens",
+            "portia_stage_output_tokens_total",
+            "Output tokens used in each stage, including its nested stages.",
+        ),
+        (
+            "llm_cache_hits",
+            "portia_stage_llm_cache_hits_total",
+            "LLM cache hits in each stage, including its nested stages.",
+        ),
+        (
+            "llm_cache_misses",
+            "portia_stage_llm_cache_misses_total",
+            "LLM cache misses in each stage, including its nested stages.",
+        ),
+    )
+
+    def __init__(self) -> None:
+        """Initialize the sink."""
+        self._lock = threading.Lock()
+        self._counts: dict[str, int] = defaultdict(int)
+        self._errors: dict[str, int] = defaultdict(int)
+        self._totals: dict[str, dict[str, float]] = defaultdict(lambda: defaultdict(float))
+
+    def record(self, plan_run: PlanRun, timing: StageTiming) -> None:  # noqa: ARG002
+        """Add the timing of a stage to the stage's aggregates."""
+        with self._lock:
+            self._counts[timing.stage] += 1
+            if timing.error is not None:
+                self._errors[timing.stage] += 1
+            for field, _, _ in self._COUNTERS:
+                self._totals[field][timing.stage] += getattr(timing, field)
+
+    def render(self) -> str:
+        """Render the aggregates in the Prometheus text exposition format."""
+        with self._lock:
+            lines = [
+                "# HELP portia_stage_duration_seconds_count The number of times each stage ran.",
+                "# TYPE portia_stage_duration_seconds_count counter",
+                *_samples("portia_stage_duration_seconds_count", self._counts),
+                "# HELP portia_stage_errors_total The number of times each stage raised an error.",
+                "# TYPE portia_stage_errors_total counter",
+                *_samples("portia_stage_errors_total", self._errors),
+            ]
+            for field, name, description in self._COUNTERS:
+                lines += [
+                    f"# HELP {name} {description}",
+                    f"# TYPE {name} counter",
+                    *_samples(name, self._totals[field]),
+                ]
+        return "\n".join(lines) + "\n"
+
+
+def _samples(name: str, values: dict[str, Any]) -> list[str]:
+    return [f'{name}{{stage="{stage}"}} {value}' for stage, value in sorted(values.items())]
+
+
+class _Recorder:
+    """Sends the timings of a plan run's stages to the plan run and the sinks."""
+
+    def __init__(self, plan_run: PlanRun, sinks: Sequence[StageTimingSink]) -> None:
+        self.plan_run = plan_run
+        self.sinks = sinks
+
+    def record(self, timing: StageTiming) -> None:
+        self.plan_run.stage_timings.append(timing)
+        for sink in self.sinks:
+            sink.record(self.plan_run, timing)
+
+
+class _Span:
+    """The counters of a stage in progress, and the enclosing stage's span they also count to."""
+
+    def __init__(self, stage: str, step_index: int | None, parent: _Span | None) -> None:
+        self.stage = stage
+        self.step_index = step_index
+        self.parent = parent
+        self.lock = threading.Lock()
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.llm_cache_hits = 0
+        self.llm_cache_misses = 0
+
+    def add(
+        self,
+        *,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        llm_cache_hits: int = 0,
+        llm_cache_misses: int = 0,
+    ) -> None:
+        """Add to the counters of this stage and every stage enclosing it."""
+        span: _Span | None = self
+        while span is not None:
+            with span.lock:
+                span.input_tokens += input_tokens
+                span.output_tokens += output_tokens
+                span.llm_cache_hits += llm_cache_hits
+                span.llm_cache_misses += llm_cache_misses
+            span = span.parent
+
+
+_recorder: ContextVar[_Recorder | None] = ContextVar("stage_timing_recorder", default=None)
+_span: ContextVar[_Span | None] = ContextVar("stage_timing_span", default=None)
+
+
+@contextmanager
+def record_stage_timings(plan_run: PlanRun, sinks: Sequence[StageTimingSink]) -> Iterator[None]:
+    """Record the timings of the stages run within the context for a plan run.
+
+    Args:
+        plan_run (PlanRun): The plan run being executed.
+        sinks (Sequence[StageTimingSink]): The sinks to send timings to. If empty, nothing is
+            recorded.
+
+    """
+    if not sinks:
+        yield
+        return
+    recorder_token = _recorder.set(_Recorder(plan_run, sinks))
+    handler_token = _usage_handler.set(_UsageCallbackHandler())
+    try:
+        yield
+    finally:
+        _usage_handler.reset(handler_token)
+        _recorder.reset(recorder_token)
+
+
+@contextmanager
+def timed_stage(stage: str, step_index: int | None = None) -> Iterator[None]:
+    """Time a stage of the plan run being recorded, if any.
+
+    Args:
+        stage (str): The name of the stage.
+        step_index (int | None): The index of the step the stage belongs to. Defaults to that of
+            the enclosing stage.
+
+    """
+    recorder = _recorder.get()
+    if recorder is None:
+        yield
+        return
+    parent = _span.get()
+    if step_index is None and parent is not None:
+        step_index = parent.step_index
+    span = _Span(stage, step_index, parent)
+    token = _span.set(span)
+    started_at = datetime.now(UTC)
+    start = time.perf_counter()
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        error = repr(e)
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        _span.reset(token)
+        recorder.record(
+            StageTiming(
+                stage=stage,
+                step_index=step_index,
+                started_at=started_at,
+                duration_seconds=duration,
+                input_tokens=span.input_tokens,
+                output_tokens=span.output_tokens,
+                llm_cache_hits=span.llm_cache_hits,
+                llm_cache_misses=span.llm_cache_misses,
+                error=error,
+            ),
+        )
+
+
+def timed_call(stage: str, step_index: int | None, func: Callable[[], T]) -> Callable[[], T]:
+    """Wrap a function to be run on another thread so that it is timed as a stage.
+
+    Context variables aren't copied to threads, so the wrapped function runs in a copy of the
+    current context.
+    """
+    context = contextvars.copy_context()
+
+    def call() -> T:
+        with timed_stage(stage, step_index):
+            return func()
+
+    return lambda: context.run(call)
+
+
+async def atimed_call(stage: str, step_index: int | None, awaitable: Awaitable[T]) -> T:
+    """Await an awaitable, timing it as a stage."""
+    with timed_stage(stage, step_index):
+        return await awaitable
+
+
+def record_llm_cache_lookup(*, hit: bool) -> None:
+    """Count a lookup in an LLM cache towards the stage in progress and its enclosing stages."""
+    span = _span.get()
+    if span is not None:
+        span.add(llm_cache_hits=int(hit), llm_cache_misses=int(not hit))
+
+
+class _UsageCallbackHandler(BaseCallbackHandler):
+    """Counts the tokens used by LangChain model calls towards the stages in progress."""
+
+    def on_llm_end(self, response: LLMResult, **_: Any) -> None:
+        span = _span.get()
+        if span is None:
+            return
+        for generation in (g for gs in response.generations for g in gs):
+            if not isinstance(generation, ChatGeneration):
+                continue
+            message = generation.message
+            if isinstance(message, AIMessage) and message.usage_metadata:
+                span.add(
+                    input_tokens=message.usage_metadata["input_tokens"],
+                    output_tokens=message.usage_metadata["output_tokens"],
+                )
+
+
+_usage_handler: ContextVar[_UsageCallbackHandler | None] = ContextVar(
+    "stage_timing_usage_handler",
+    default=None,
+)
+# Adds the handler to every LangChain run started while a plan run's timings are being recorded
+register_configure_hook(_usage_handler, inheritable=True)
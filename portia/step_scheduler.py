@@ -0,0 +1,87 @@
+"""Scheduling of plan steps which can be executed concurrently.
+
+Steps in a plan declare the outputs of earlier steps they use as inputs, which lets us derive a
+dependency graph between them. Steps which don't depend on each other (directly or through a
+shared output name) can then be executed at the same time.
+
+Steps with a condition are evaluated by the introspection agent against the whole plan run and
+may end the run early, so they act as barriers: they wait for every earlier step, and every
+later step waits for them.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from portia.plan import Plan
+    from portia.plan_run import PlanRun
+
+
+class StepScheduler:
+    """Works out which steps of a plan are ready to be executed together."""
+
+    def __init__(self, plan: Plan) -> None:
+        """Build the dependency graph for a plan.
+
+        Args:
+            plan (Plan): The plan to schedule.
+
+        """
+        self.plan = plan
+        self.dependencies = [self._get_dependencies(index) for index in range(len(plan.steps))]
+
+    def _get_dependencies(self, index: int) -> set[int]:
+        """Get the indexes of the earlier steps that a step must wait for."""
+        step = self.plan.steps[index]
+        input_names = {variable.name for variable in step.inputs}
+        dependencies = set()
+        for earlier_index, earlier_step in enumerate(self.plan.steps[:index]):
+            earlier_input_names = {variable.name for variable in earlier_step.inputs}
+            if (
+                step.condition
+                or earlier_step.condition
+                # The step reads the earlier step's output
+                or earlier_step.output in input_names
+                # The step overwrites the earlier step's output, or an input it reads
+                or step.output == earlier_step.output
+                or step.output in earlier_input_names
+            ):
+                dependencies.add(earlier_index)
+        return dependencies
+
+    def completed_steps(self, plan_run: PlanRun) -> set[int]:
+        """Get the steps of a plan run that don't need to be executed (again).
+
+        Steps before the plan run's current step are complete, as are later steps which were
+        executed alongside an earlier step and didn't raise any clarifications.
+
+        Args:
+            plan_run (PlanRun): The plan run being executed.
+
+        """
+        return set(range(plan_run.current_step_index)) | {
+            index
+            for index in range(plan_run.current_step_index + 1, len(self.plan.steps))
+            if self.plan.steps[index].output in plan_run.outputs.step_outputs
+            and not plan_run.get_clarifications_for_step(index)
+        }
+
+    def next_batch(self, completed: set[int], max_steps: int) -> list[int]:
+        """Get the next steps to execute, in plan order.
+
+        Args:
+            completed (set[int]): The indexes of steps which have completed.
+            max_steps (int): The maximum number of steps to return.
+
+        Returns:
+            list[int]: The indexes of up to max_steps steps whose dependencies have completed.
+
+        """
+        batch = []
+        for index, dependencies in enumerate(self.dependencies):
+            if index not in completed and dependencies <= completed:
+                batch.append(index)
+                if len(batch) == max_steps:
+                    break
+        return batch
@@ -13,6 +13,8 @@ Classes:
     runs, and tool calls in a temporary, volatile storage medium.
     - FileStorage: A file-based implementation of the `Storage` class for storing plans, runs,
       and tool calls as local files in the filesystem.
+    - SQLiteStorage: A SQLite-backed implementation of the `Storage` class for durable local
+      storage that can be shared by several workers on the same machine.
     - PortiaCloudStorage: A cloud-based implementation of the `Storage` class that interacts with
     the Portia Cloud API to save and retrieve plans, runs, and tool call records.
 
@@ -26,12 +28,20 @@ Each storage class handles the following tasks:
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import json
+import os
+import sqlite3
 import sys
+import threading
 from abc import ABC, abstractmethod
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
+from functools import partial
 from io import BytesIO
 from pathlib import Path
-from typing import TYPE_CHECKING, TypeVar
+from typing import TYPE_CHECKING, Any, TypeVar
 from urllib.parse import urlencode
 
 import httpx
@@ -47,6 +57,7 @@ from portia.execution_agents.output import (
 )
 from portia.logger import logger
 from portia.plan import Plan, PlanUUID
+from portia.plan_index import PlanQueryIndex, TfidfPlanQueryIndex
 from portia.plan_run import (
     PlanRun,
     PlanRunOutputs,
@@ -57,9 +68,12 @@ from portia.prefixed_uuid import PLAN_RUN_UUID_PREFIX, PLAN_UUID_PREFIX
 from portia.tool_call import ToolCallRecord, ToolCallStatus
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
     from portia.config import Config
 
 T = TypeVar("T", bound=BaseModel)
+R = TypeVar("R")
 
 MAX_OUTPUT_LOG_LENGTH = 1000
 
@@ -524,6 +538,26 @@ def log_tool_call(tool_call: ToolCallRecord) -> None:
             logger().debug("Tool returned clarifications", output=output)
 
 
+def _get_similar_plans(
+    plan_index: PlanQueryIndex,
+    get_plan: Callable[[PlanUUID], Plan],
+    query: str,
+    threshold: float,
+    limit: int,
+) -> list[Plan]:
+    """Load the plans most similar to a query according to a local plan index.
+
+    Plans which can no longer be found are dropped from the index.
+    """
+    plans = []
+    for plan_id, _ in plan_index.similar(query, threshold, limit):
+        try:
+            plans.append(get_plan(PlanUUID.from_string(plan_id)))
+        except PlanNotFoundError:
+            plan_index.remove(plan_id)
+    return plans
+
+
 class InMemoryStorage(PlanStorage, RunStorage, AdditionalStorage, AgentMemory):
     """Simple storage class that keeps plans + runs in memory.
 
@@ -535,12 +569,19 @@ class InMemoryStorage(PlanStorage, RunStorage, AdditionalStorage, AgentMemory):
     outputs: defaultdict[PlanRunUUID, dict[str, LocalDataValue]]
     end_users: dict[str, EndUser]
 
-    def __init__(self) -> None:
-        """Initialize Storage."""
+    def __init__(self, plan_index: PlanQueryIndex | None = None) -> None:
+        """Initialize Storage.
+
+        Args:
+            plan_index (PlanQueryIndex | None): The index used to find plans with similar queries.
+                Defaults to a TfidfPlanQueryIndex.
+
+        """
         self.plans = {}
         self.runs = {}
         self.outputs = defaultdict(dict)
         self.end_users = {}
+        self.plan_index = plan_index or TfidfPlanQueryIndex()
 
     def save_plan(self, plan: Plan) -> None:
         """Add plan to dict.
@@ -550,6 +591,7 @@ class InMemoryStorage(PlanStorage, RunStorage, AdditionalStorage, AgentMemory):
 
         """
         self.plans[plan.id] = plan
+        self.plan_index.add(str(plan.id), plan.plan_context.query)
 
     def get_plan(self, plan_id: PlanUUID) -> Plan:
         """Get plan from dict.
@@ -593,6 +635,20 @@ class InMemoryStorage(PlanStorage, RunStorage, AdditionalStorage, AgentMemory):
         """
         return plan_id in self.plans
 
+    def get_similar_plans(self, query: str, threshold: float = 0.5, limit: int = 10) -> list[Plan]:
+        """Get the plans whose queries are most similar to the query.
+
+        Args:
+            query (str): The query to get similar plans for.
+            threshold (float): The minimum similarity, between 0 and 1, of plans returned.
+            limit (int): The maximum number of plans to return.
+
+        Returns:
+            list[Plan]: The similar plans, most similar first.
+
+        """
+        return _get_similar_plans(self.plan_index, self.get_plan, query, threshold, limit)
+
     def save_plan_run(self, plan_run: PlanRun) -> None:
         """Add run to dict.
 
@@ -726,20 +782,243 @@ class InMemoryStorage(PlanStorage, RunStorage, AdditionalStorage, AgentMemory):
         return None
 
 
+DISK_STORAGE_INDEX_FILE = "index.sqlite3"
+"""DISK_STORAGE_INDEX_FILE is the name of the index database kept with DiskFileStorage files."""
+
+DISK_STORAGE_INDEX_VERSION = 2
+"""DISK_STORAGE_INDEX_VERSION is bumped whenever the index schema changes, forcing a rebuild."""
+
+
+def _query_hash(query: str) -> str:
+    """Hash a query for lookup in the disk storage index."""
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+class DiskFileStorageIndex:
+    """SQLite index over the plans and plan runs held by a DiskFileStorage.
+
+    The JSON files remain the source of truth. The index maps queries to plan ids and plan
+    run ids to their state so that lookups and filtered, paginated listings do not need to
+    deserialize every file in the storage directory. If the index is missing or was written with
+    an older schema, it is rebuilt from the files on first use.
+    """
+
+    def __init__(self, storage_dir: str) -> None:
+        """Initialize the index.
+
+        Args:
+            storage_dir (str): The DiskFileStorage directory the index lives in.
+
+        """
+        self.storage_dir = storage_dir
+        self.path = Path(storage_dir, DISK_STORAGE_INDEX_FILE)
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> closing[sqlite3.Connection]:
+        """Open a connection to the index database."""
+        return closing(sqlite3.connect(self.path, timeout=30))
+
+    def _ensure_initialized(self) -> None:
+        """Create the schema, rebuilding from the files if the index is new or outdated."""
+        if self._initialized:
+            return
+        with self._init_lock:
+            if self._initialized:
+                return
+            Path(self.storage_dir).mkdir(parents=True, exist_ok=True)
+            with self._connect() as conn:
+                (version,) = conn.execute("PRAGMA user_version").fetchone()
+                if version != DISK_STORAGE_INDEX_VERSION:
+                    self._create_schema(conn)
+                    self._populate(conn)
+            self._initialized = True
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        """(Re)create the index tables."""
+        with conn:
+            conn.executescript(
+                """
+                DROP TABLE IF EXISTS plans;
+                DROP TABLE IF EXISTS plan_runs;
+                CREATE TABLE plans (
+                    id TEXT PRIMARY KEY, query_hash TEXT NOT NULL, query TEXT NOT NULL
+                );
+                CREATE INDEX plans_query_hash ON plans (query_hash);
+                CREATE TABLE plan_runs (id TEXT PRIMARY KEY, state TEXT NOT NULL);
+                CREATE INDEX plan_runs_state ON plan_runs (state);
+                """
+            )
+            conn.execute(f"PRAGMA user_version = {DISK_STORAGE_INDEX_VERSION}")
+
+    def _populate(self, conn: sqlite3.Connection) -> int:
+        """Index every plan and plan run file in the storage directory, oldest first.
+
+        Returns:
+            int: The number of files indexed.
+
+        """
+        files = sorted(
+            (
+                f
+                for f in Path(self.storage_dir).iterdir()
+                if f.is_file()
+                and f.suffix == ".json"
+                and f.name.startswith((PLAN_UUID_PREFIX, PLAN_RUN_UUID_PREFIX))
+            ),
+            key=lambda f: f.stat().st_mtime,
+        )
+        indexed = 0
+        with conn:
+            for f in files:
+                try:
+                    if f.name.startswith(PLAN_RUN_UUID_PREFIX):
+                        plan_run = PlanRun.model_validate_json(f.read_text(encoding="utf-8"))
+                        self._upsert_plan_run(conn, plan_run)
+                    else:
+                        plan = Plan.model_validate_json(f.read_text(encoding="utf-8"))
+                        self._upsert_plan(conn, plan)
+                except (ValidationError, OSError) as e:
+                    logger().warning(f"Skipping {f.name} when building storage index: {e}")
+                    continue
+                indexed += 1
+        return indexed
+
+    def rebuild(self) -> int:
+        """Regenerate the index from the files in the storage directory.
+
+        Returns:
+            int: The number of plans and plan runs indexed.
+
+        """
+        with self._init_lock:
+            Path(self.storage_dir).mkdir(parents=True, exist_ok=True)
+            with self._connect() as conn:
+                self._create_schema(conn)
+                indexed = self._populate(conn)
+            self._initialized = True
+        return indexed
+
+    @staticmethod
+    def _upsert_plan(conn: sqlite3.Connection, plan: Plan) -> None:
+        conn.execute(
+            "INSERT INTO plans (id, query_hash, query) VALUES (?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET "
+            "query_hash = excluded.query_hash, query = excluded.query",
+            (str(plan.id), _query_hash(plan.plan_context.query), plan.plan_context.query),
+        )
+
+    @staticmethod
+    def _upsert_plan_run(conn: sqlite3.Connection, plan_run: PlanRun) -> None:
+        conn.execute(
+            "INSERT INTO plan_runs (id, state) VALUES (?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET state = excluded.state",
+            (str(plan_run.id), plan_run.state.value),
+        )
+
+    def add_plan(self, plan: Plan) -> None:
+        """Record a saved plan in the index."""
+        self._ensure_initialized()
+        with self._connect() as conn, conn:
+            self._upsert_plan(conn, plan)
+
+    def add_plan_run(self, plan_run: PlanRun) -> None:
+        """Record a saved plan run and its current state in the index."""
+        self._ensure_initialized()
+        with self._connect() as conn, conn:
+            self._upsert_plan_run(conn, plan_run)
+
+    def plan_ids_for_query(self, query: str) -> list[str]:
+        """Get the ids of plans saved for the query, most recently created first."""
+        self._ensure_initialized()
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id FROM plans WHERE query_hash = ? ORDER BY rowid DESC",
+                (_query_hash(query),),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def plan_queries(self, after_rowid: int = 0) -> list[tuple[int, str, str]]:
+        """Get the row, id and query of each plan added to the index after the given row.
+
+        Rows increase as plans are added, so callers can fetch only the plans added since they
+        last checked.
+        """
+        self._ensure_initialized()
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT rowid, id, query FROM plans WHERE rowid > ? ORDER BY rowid",
+                (after_rowid,),
+            ).fetchall()
+
+    def plan_run_ids(
+        self,
+        run_state: PlanRunState | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> tuple[list[str], int]:
+        """Get plan run ids in creation order, optionally filtered by state.
+
+        Args:
+            run_state (PlanRunState | None): Optionally filter runs by their state.
+            limit (int | None): The maximum number of ids to return, or None for all of them.
+            offset (int): The number of matching ids to skip.
+
+        Returns:
+            tuple[list[str], int]: The requested ids and the total number of matching runs.
+
+        """
+        self._ensure_initialized()
+        where, params = ("WHERE state = ?", (run_state.value,)) if run_state else ("", ())
+        with self._connect() as conn:
+            (count,) = conn.execute(f"SELECT COUNT(*) FROM plan_runs {where}", params).fetchone()  # noqa: S608
+            rows = conn.execute(
+                f"SELECT id FROM plan_runs {where} ORDER BY rowid LIMIT ? OFFSET ?",  # noqa: S608
+                (*params, -1 if limit is None else limit, offset),
+            ).fetchall()
+        return [row[0] for row in rows], count
+
+    def remove(self, entity_id: str) -> None:
+        """Drop an entry whose file no longer exists."""
+        self._ensure_initialized()
+        with self._connect() as conn, conn:
+            conn.execute("DELETE FROM plans WHERE id = ?", (entity_id,))
+            conn.execute("DELETE FROM plan_runs WHERE id = ?", (entity_id,))
+
+
 class DiskFileStorage(PlanStorage, RunStorage, AdditionalStorage, AgentMemory):
     """Disk-based implementation of the Storage interface.
 
-    Stores serialized Plan and Run objects as JSON files on disk.
+    Stores serialized Plan and Run objects as JSON files on disk. A DiskFileStorageIndex is kept
+    alongside the files so that lookups by query and listings by state don't need to read every
+    file. Use rebuild_index (or `portia-cli rebuild-storage-index`) if files are added or removed
+    outside of this class.
     """
 
-    def __init__(self, storage_dir: str | None) -> None:
+    DEFAULT_PAGE_SIZE = 20
+
+    def __init__(
+        self,
+        storage_dir: str | None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        plan_index: PlanQueryIndex | None = None,
+    ) -> None:
         """Set storage dir.
 
         Args:
             storage_dir (str | None): Optional directory for storing files.
+            page_size (int): The number of plan runs returned per page by get_plan_runs.
+            plan_index (PlanQueryIndex | None): The index used to find plans with similar queries.
+                Defaults to a TfidfPlanQueryIndex. It is loaded from the storage index the first
+                time similar plans are requested, and kept up to date from then on.
 
         """
         self.storage_dir = storage_dir or ".portia"
+        self.page_size = page_size
+        self.index = DiskFileStorageIndex(self.storage_dir)
+        self.plan_index = plan_index or TfidfPlanQueryIndex()
+        self._plan_index_lock = threading.Lock()
+        self._plan_index_rowid: int | None = None
 
     def _ensure_storage(self, file_path: str | None = None) -> None:
         """Ensure that we have the storage directories required.
@@ -758,14 +1037,20 @@ class DiskFileStorage(PlanStorage, RunStorage, AdditionalStorage, AgentMemory):
     def _write(self, file_path: str, content: BaseModel) -> None:
         """Write a serialized Plan or Run to a JSON file.
 
+        The content is written to a temporary file first and moved into place so that readers
+        never see a partially written file.
+
         Args:
             file_path (str): Path of the file to write.
             content (BaseModel): The Plan or Run object to serialize.
 
         """
         self._ensure_storage(file_path)  # Ensure storage directory exists
-        with Path(self.storage_dir, file_path).open("w", encoding="utf-8") as file:
+        path = Path(self.storage_dir, file_path)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as file:
             file.write(content.model_dump_json(indent=4))
+        tmp_path.replace(path)
 
     def _read(self, file_name: str, model: type[T]) -> T:
         """Read a JSON file and deserialize it into a BaseModel instance.
@@ -786,6 +1071,26 @@ class DiskFileStorage(PlanStorage, RunStorage, AdditionalStorage, AgentMemory):
             f = file.read()
             return model.model_validate_json(f)
 
+    def rebuild_index(self) -> int:
+        """Regenerate the storage index from the plan and plan run files on disk.
+
+        Returns:
+            int: The number of plans and plan runs indexed.
+
+        """
+        indexed = self.index.rebuild()
+        with self._plan_index_lock:
+            self.plan_index.clear()
+            self._plan_index_rowid = None
+        return indexed
+
+    def _sync_plan_index(self) -> None:
+        """Add the plans saved since the plan index was last synced, loading it if needed."""
+        with self._plan_index_lock:
+            for rowid, plan_id, query in self.index.plan_queries(self._plan_index_rowid or 0):
+                self.plan_index.add(plan_id, query)
+                self._plan_index_rowid = rowid
+
     def save_plan(self, plan: Plan) -> None:
         """Save a Plan object to the storage.
 
@@ -794,6 +1099,9 @@ class DiskFileStorage(PlanStorage, RunStorage, AdditionalStorage, AgentMemory):
 
         """
         self._write(f"{plan.id}.json", plan)
+        self.index.add_plan(plan)
+        if self._plan_index_rowid is not None:
+            self.plan_index.add(str(plan.id), plan.plan_context.query)
 
     def get_plan(self, plan_id: PlanUUID) -> Plan:
         """Retrieve a Plan object by its ID.
@@ -816,22 +1124,18 @@ class DiskFileStorage(PlanStorage, RunStorage, AdditionalStorage, AgentMemory):
     def get_plan_by_query(self, query: str) -> Plan:
         """Get a plan by query.
 
-        This method will return the first plan that matches the query. This is not always the most
-        recent plan.
+        This method will return the most recently created plan that matches the query.
 
         Args:
             query (str): The query to get a plan for.
 
         """
-        # Get all plan files and sort by modification time (newest first)
-        # Using st_mtime for cross-platform compatibility
-        plan_files = [
-            f
-            for f in Path(self.storage_dir).iterdir()
-            if f.is_file() and f.name.startswith(PLAN_UUID_PREFIX)
-        ]
-        for f in plan_files:
-            plan = self._read(f.name, Plan)
+        for plan_id in self.index.plan_ids_for_query(query):
+            try:
+                plan = self._read(f"{plan_id}.json", Plan)
+            except FileNotFoundError:
+                self.index.remove(plan_id)
+                continue
             if plan.plan_context.query == query:
                 return plan
         raise StorageError(f"No plan found for query: {query}")
@@ -848,6 +1152,21 @@ class DiskFileStorage(PlanStorage, RunStorage, AdditionalStorage, AgentMemory):
         """
         return Path(self.storage_dir, f"{plan_id}.json").exists()
 
+    def get_similar_plans(self, query: str, threshold: float = 0.5, limit: int = 10) -> list[Plan]:
+        """Get the plans whose queries are most similar to the query.
+
+        Args:
+            query (str): The query to get similar plans for.
+            threshold (float): The minimum similarity, between 0 and 1, of plans returned.
+            limit (int): The maximum number of plans to return.
+
+        Returns:
+            list[Plan]: The similar plans, most similar first.
+
+        """
+        self._sync_plan_index()
+        return _get_similar_plans(self.plan_index, self.get_plan, query, threshold, limit)
+
     def save_plan_run(self, plan_run: PlanRun) -> None:
         """Save PlanRun object to the storage.
 
@@ -856,6 +1175,7 @@ class DiskFileStorage(PlanStorage, RunStorage, AdditionalStorage, AgentMemory):
 
         """
         self._write(f"{plan_run.id}.json", plan_run)
+        self.index.add_plan_run(plan_run)
 
     def get_plan_run(self, plan_run_id: PlanRunUUID) -> PlanRun:
         """Retrieve PlanRun object by its ID.
@@ -878,34 +1198,38 @@ class DiskFileStorage(PlanStorage, RunStorage, AdditionalStorage, AgentMemory):
     def get_plan_runs(
         self,
         run_state: PlanRunState | None = None,
-        page: int | None = None,  # noqa: ARG002
+        page: int | None = None,
     ) -> PlanRunListResponse:
-        """Find all plan runs in storage that match state.
+        """Find plan runs in storage that match state, in the order they were created.
 
         Args:
             run_state (RunState | None): Optionally filter runs by their state.
-            page (int | None): Optional pagination data which is not used for in memory storage.
+            page (int | None): The 1-indexed page of page_size results to return. If not
+                provided, all matching runs are returned.
 
         Returns:
-            list[Run]: A list of Run objects that match the given state.
+            PlanRunListResponse: The matching runs along with pagination data.
 
         """
-        self._ensure_storage()
+        if page is not None and page < 1:
+            raise StorageError(f"Invalid page number: {page}")
 
-        plan_runs = []
+        limit = None if page is None else self.page_size
+        offset = 0 if page is None else (page - 1) * self.page_size
+        plan_run_ids, count = self.index.plan_run_ids(run_state, limit, offset)
 
-        directory_path = Path(self.storage_dir)
-        for f in directory_path.iterdir():
-            if f.is_file() and f.name.startswith(PLAN_RUN_UUID_PREFIX):
-                plan_run = self._read(f.name, PlanRun)
-                if not run_state or plan_run.state == run_state:
-                    plan_runs.append(plan_run)
+        plan_runs = []
+        for plan_run_id in plan_run_ids:
+            try:
+                plan_runs.append(self._read(f"{plan_run_id}.json", PlanRun))
+            except FileNotFoundError:
+                self.index.remove(plan_run_id)
 
         return PlanRunListResponse(
             results=plan_runs,
-            count=len(plan_runs),
-            current_page=1,
-            total_pages=1,
+            count=count,
+            current_page=page or 1,
+            total_pages=1 if page is None else max(1, -(-count // self.page_size)),
         )
 
     def save_plan_run_output(
@@ -982,23 +1306,798 @@ class DiskFileStorage(PlanStorage, RunStorage, AdditionalStorage, AgentMemory):
             return None
 
 
+SQLITE_STORAGE_FILE = "portia.sqlite3"
+"""SQLITE_STORAGE_FILE is the name of the database SQLiteStorage creates in its storage dir."""
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS plans (
+    id TEXT PRIMARY KEY,
+    query TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS plans_query ON plans (query);
+CREATE TABLE IF NOT EXISTS plan_runs (
+    id TEXT PRIMARY KEY,
+    plan_id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    end_user_id TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS plan_runs_state ON plan_runs (state);
+CREATE INDEX IF NOT EXISTS plan_runs_end_user_id ON plan_runs (end_user_id);
+CREATE TABLE IF NOT EXISTS outputs (
+    plan_run_id TEXT NOT NULL,
+    output_name TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (plan_run_id, output_name)
+);
+CREATE TABLE IF NOT EXISTS end_users (
+    external_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tool_calls (
+    plan_run_id TEXT NOT NULL,
+    step INTEGER NOT NULL,
+    tool_name TEXT NOT NULL,
+    end_user_id TEXT,
+    status TEXT NOT NULL,
+    input TEXT NOT NULL,
+    output TEXT NOT NULL,
+    latency_seconds REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tool_calls_plan_run_id ON tool_calls (plan_run_id);
+"""
+
+_INSERT_TOOL_CALL = (
+    "INSERT INTO tool_calls (plan_run_id, step, tool_name, end_user_id, status, input, output, "
+    "latency_seconds) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+class SQLiteStorage(PlanStorage, RunStorage, AdditionalStorage, AgentMemory):
+    """SQLite implementation of the Storage interface.
+
+    Stores plans, plan runs, outputs, end users and tool calls in a single SQLite database in WAL
+    mode, so several threads or worker processes on the same machine can safely share it.
+    Connections are borrowed from a small pool for each operation, so threads that come and go
+    (e.g. from asyncio.to_thread or batch runs) don't each hold a connection open, and statements
+    are cached per connection.
+
+    Tool calls are buffered and written in batches, either when batch_size of them are pending,
+    alongside the next plan run save or on flush / close. Async methods run on a small pool of
+    threads owned by the storage rather than the shared default executor.
+    """
+
+    DEFAULT_PAGE_SIZE = 20
+    DEFAULT_BATCH_SIZE = 50
+    DEFAULT_MAX_WORKERS = 4
+    MAX_IDLE_CONNECTIONS = 8
+
+    def __init__(
+        self,
+        storage_dir: str | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        plan_index: PlanQueryIndex | None = None,
+    ) -> None:
+        """Open (and if necessary create) the database.
+
+        Args:
+            storage_dir (str | None): Optional directory for the database file.
+            page_size (int): The number of plan runs returned per page by get_plan_runs.
+            batch_size (int): The number of tool calls to buffer before writing them.
+            max_workers (int): The number of threads used to run async methods.
+            plan_index (PlanQueryIndex | None): The index used to find plans with similar queries.
+                Defaults to a TfidfPlanQueryIndex. It is loaded from the database the first time
+                similar plans are requested, and kept up to date from then on.
+
+        """
+        self.storage_dir = storage_dir or ".portia"
+        self.db_path = Path(self.storage_dir, SQLITE_STORAGE_FILE)
+        self.page_size = page_size
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._idle_connections: list[sqlite3.Connection] = []
+        self._generation = 0
+        self._pending_tool_calls: list[tuple] = []
+        self._executor: ThreadPoolExecutor | None = None
+        self.plan_index = plan_index or TfidfPlanQueryIndex()
+        self._plan_index_lock = threading.Lock()
+        self._plan_index_rowid: int | None = None
+        Path(self.storage_dir).mkdir(parents=True, exist_ok=True)
+        with self._connection() as conn:
+            conn.executescript(_SQLITE_SCHEMA)
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection from the pool for the duration of the context.
+
+        A connection is opened if none are idle. Once returned, it is kept for reuse unless
+        MAX_IDLE_CONNECTIONS are already idle or the storage was closed while it was in use.
+        """
+        with self._lock:
+            conn = self._idle_connections.pop() if self._idle_connections else None
+            generation = self._generation
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=30,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+        try:
+            yield conn
+        finally:
+            with self._lock:
+                keep = (
+                    generation == self._generation
+                    and len(self._idle_connections) < self.MAX_IDLE_CONNECTIONS
+                )
+                if keep:
+                    self._idle_connections.append(conn)
+            if not keep:
+                conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in a write transaction, rolling back on error."""
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _fetchone(self, sql: str, params: tuple) -> tuple | None:
+        with self._connection() as conn:
+            return conn.execute(sql, params).fetchone()
+
+    async def _arun(self, func: Callable[..., R], *args: Any) -> R:
+        """Run a blocking method on the storage's own threads, starting them if needed."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="portia-sqlite",
+                )
+            executor = self._executor
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, partial(func, *args))
+
+    def _take_pending_tool_calls(self) -> list[tuple]:
+        with self._lock:
+            pending, self._pending_tool_calls = self._pending_tool_calls, []
+        return pending
+
+    def flush(self) -> None:
+        """Write any buffered tool calls to the database."""
+        pending = self._take_pending_tool_calls()
+        if pending:
+            with self._transaction() as conn:
+                conn.executemany(_INSERT_TOOL_CALL, pending)
+
+    def close(self) -> None:
+        """Flush buffered writes, close idle connections and shut down the async threads.
+
+        Connections in use by other threads are closed once they are returned rather than
+        mid-query, and async calls already submitted still complete. The storage can still be used
+        afterwards, in which case new connections and threads are started.
+        """
+        self.flush()
+        with self._lock:
+            connections, self._idle_connections = self._idle_connections, []
+            self._generation += 1
+            executor, self._executor = self._executor, None
+        for conn in connections:
+            conn.close()
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def save_plan(self, plan: Plan) -> None:
+        """Save a Plan object to the database.
+
+        Args:
+            plan (Plan): The Plan object to save.
+
+        """
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO plans (id, query, data) VALUES (?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET query = excluded.query, data = excluded.data",
+                (str(plan.id), plan.plan_context.query, plan.model_dump_json()),
+            )
+        if self._plan_index_rowid is not None:
+            self.plan_index.add(str(plan.id), plan.plan_context.query)
+
+    def get_plan(self, plan_id: PlanUUID) -> Plan:
+        """Retrieve a Plan object by its ID.
+
+        Args:
+            plan_id (PlanUUID): The ID of the Plan to retrieve.
+
+        Returns:
+            Plan: The retrieved Plan object.
+
+        Raises:
+            PlanNotFoundError: If the Plan is not found.
+
+        """
+        row = self._fetchone("SELECT data FROM plans WHERE id = ?", (str(plan_id),))
+        if row is None:
+            raise PlanNotFoundError(plan_id)
+        return Plan.model_validate_json(row[0])
+
+    def get_plan_by_query(self, query: str) -> Plan:
+        """Get the most recently created plan for a query.
+
+        Args:
+            query (str): The query to get a plan for.
+
+        """
+        row = self._fetchone(
+            "SELECT data FROM plans WHERE query = ? ORDER BY rowid DESC LIMIT 1",
+            (query,),
+        )
+        if row is None:
+            raise StorageError(f"No plan found for query: {query}")
+        return Plan.model_validate_json(row[0])
+
+    def plan_exists(self, plan_id: PlanUUID) -> bool:
+        """Check if a plan exists in the database.
+
+        Args:
+            plan_id (PlanUUID): The UUID of the plan to check.
+
+        Returns:
+            bool: True if the plan exists, False otherwise.
+
+        """
+        return self._fetchone("SELECT 1 FROM plans WHERE id = ?", (str(plan_id),)) is not None
+
+    def _sync_plan_index(self) -> None:
+        """Add the plans saved since the plan index was last synced, loading it if needed.
+
+        Plans saved by other processes sharing the database are picked up here too.
+        """
+        with self._plan_index_lock, self._connection() as conn:
+            rows = conn.execute(
+                "SELECT rowid, id, query FROM plans WHERE rowid > ? ORDER BY rowid",
+                (self._plan_index_rowid or 0,),
+            ).fetchall()
+            for rowid, plan_id, query in rows:
+                self.plan_index.add(plan_id, query)
+                self._plan_index_rowid = rowid
+
+    def get_similar_plans(self, query: str, threshold: float = 0.5, limit: int = 10) -> list[Plan]:
+        """Get the plans whose queries are most similar to the query.
+
+        Args:
+            query (str): The query to get similar plans for.
+            threshold (float): The minimum similarity, between 0 and 1, of plans returned.
+            limit (int): The maximum number of plans to return.
+
+        Returns:
+            list[Plan]: The similar plans, most similar first.
+
+        """
+        self._sync_plan_index()
+        return _get_similar_plans(self.plan_index, self.get_plan, query, threshold, limit)
+
+    def save_plan_run(self, plan_run: PlanRun) -> None:
+        """Save PlanRun object to the database, along with any buffered tool calls.
+
+        Args:
+            plan_run (PlanRun): The Run object to save.
+
+        """
+        pending = self._take_pending_tool_calls()
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO plan_runs (id, plan_id, state, end_user_id, data) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET state = excluded.state, data = excluded.data",
+                (
+                    str(plan_run.id),
+                    str(plan_run.plan_id),
+                    plan_run.state.value,
+                    plan_run.end_user_id,
+                    plan_run.model_dump_json(),
+                ),
+            )
+            if pending:
+                conn.executemany(_INSERT_TOOL_CALL, pending)
+
+    def get_plan_run(self, plan_run_id: PlanRunUUID) -> PlanRun:
+        """Retrieve PlanRun object by its ID.
+
+        Args:
+            plan_run_id (PlanRunUUID): The ID of the PlanRun to retrieve.
+
+        Returns:
+            PlanRun: The retrieved PlanRun object.
+
+        Raises:
+            PlanRunNotFoundError: If the PlanRun is not found.
+
+        """
+        row = self._fetchone("SELECT data FROM plan_runs WHERE id = ?", (str(plan_run_id),))
+        if row is None:
+            raise PlanRunNotFoundError(plan_run_id)
+        return PlanRun.model_validate_json(row[0])
+
+    def get_plan_runs(
+        self,
+        run_state: PlanRunState | None = None,
+        page: int | None = None,
+    ) -> PlanRunListResponse:
+        """Find plan runs that match state, in the order they were created.
+
+        Args:
+            run_state (RunState | None): Optionally filter runs by their state.
+            page (int | None): The 1-indexed page of page_size results to return. If not
+                provided, all matching runs are returned.
+
+        Returns:
+            PlanRunListResponse: The matching runs along with pagination data.
+
+        """
+        if page is not None and page < 1:
+            raise StorageError(f"Invalid page number: {page}")
+
+        where, params = ("WHERE state = ?", (run_state.value,)) if run_state else ("", ())
+        limit = -1 if page is None else self.page_size
+        offset = 0 if page is None else (page - 1) * self.page_size
+        with self._connection() as conn:
+            (count,) = conn.execute(f"SELECT COUNT(*) FROM plan_runs {where}", params).fetchone()  # noqa: S608
+            rows = conn.execute(
+                f"SELECT data FROM plan_runs {where} ORDER BY rowid LIMIT ? OFFSET ?",  # noqa: S608
+                (*params, limit, offset),
+            ).fetchall()
+
+        return PlanRunListResponse(
+            results=[PlanRun.model_validate_json(row[0]) for row in rows],
+            count=count,
+            current_page=page or 1,
+            total_pages=1 if page is None else max(1, -(-count // self.page_size)),
+        )
+
+    def save_plan_run_output(
+        self,
+        output_name: str,
+        output: Output,
+        plan_run_id: PlanRunUUID,
+    ) -> Output:
+        """Save Output from a plan run to agent memory in the database.
+
+        Args:
+            output_name (str): The name of the output within the plan
+            output (Output): The Output object to save
+            plan_run_id (PlanRunUUID): The ID of the current plan run
+
+        """
+        _check_size(output_name, output)
+        if not isinstance(output, LocalDataValue):
+            logger().warning(
+                f"Storing output that is already in agent memory: {output}",
+            )
+            return output
+
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO outputs (plan_run_id, output_name, data) VALUES (?, ?, ?) "
+                "ON CONFLICT(plan_run_id, output_name) DO UPDATE SET data = excluded.data",
+                (str(plan_run_id), output_name, output.model_dump_json()),
+            )
+        return AgentMemoryValue(
+            output_name=output_name,
+            plan_run_id=plan_run_id,
+            summary=output.get_summary() or "",
+        )
+
+    def get_plan_run_output(self, output_name: str, plan_run_id: PlanRunUUID) -> LocalDataValue:
+        """Retrieve an Output from agent memory in the database.
+
+        Args:
+            output_name (str): The name of the output to retrieve
+            plan_run_id (PlanRunUUID): The ID of the plan run
+
+        Returns:
+            Output: The retrieved Output object
+
+        Raises:
+            StorageError: If the output is not found
+
+        """
+        row = self._fetchone(
+            "SELECT data FROM outputs WHERE plan_run_id = ? AND output_name = ?",
+            (str(plan_run_id), output_name),
+        )
+        if row is None:
+            raise StorageError(f"No output {output_name} found for plan run {plan_run_id}")
+        return LocalDataValue.model_validate_json(row[0])
+
+    def save_tool_call(self, tool_call: ToolCallRecord) -> None:
+        """Log the tool call and buffer it to be written with the next batch.
+
+        Args:
+            tool_call (ToolCallRecord): The ToolCallRecord object to save.
+
+        """
+        log_tool_call(tool_call)
+        record = (
+            str(tool_call.plan_run_id),
+            tool_call.step,
+            tool_call.tool_name,
+            tool_call.end_user_id,
+            tool_call.status.value,
+            json.dumps(tool_call.serialize_input()),
+            json.dumps(tool_call.serialize_output()),
+            tool_call.latency_seconds,
+        )
+        with self._lock:
+            self._pending_tool_calls.append(record)
+            should_flush = len(self._pending_tool_calls) >= self.batch_size
+        if should_flush:
+            self.flush()
+
+    def save_end_user(self, end_user: EndUser) -> EndUser:
+        """Save an end user, merging additional data with any existing record.
+
+        Args:
+            end_user (EndUser): The EndUser object to save.
+
+        """
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT data FROM end_users WHERE external_id = ?",
+                (end_user.external_id,),
+            ).fetchone()
+            if row is not None:
+                existing_end_user = EndUser.model_validate_json(row[0])
+                end_user.additional_data = {
+                    **existing_end_user.additional_data,
+                    **end_user.additional_data,
+                }
+            conn.execute(
+                "INSERT INTO end_users (external_id, data) VALUES (?, ?) "
+                "ON CONFLICT(external_id) DO UPDATE SET data = excluded.data",
+                (end_user.external_id, end_user.model_dump_json()),
+            )
+        return end_user
+
+    def get_end_user(self, external_id: str) -> EndUser | None:
+        """Get an end user from the database.
+
+        Args:
+            external_id (str): The id of the end user object to get.
+
+        """
+        row = self._fetchone("SELECT data FROM end_users WHERE external_id = ?", (external_id,))
+        return EndUser.model_validate_json(row[0]) if row is not None else None
+
+    async def asave_plan(self, plan: Plan) -> None:
+        """Save a plan asynchronously.
+
+        Args:
+            plan (Plan): The Plan object to save.
+
+        """
+        await self._arun(self.save_plan, plan)
+
+    async def aget_plan(self, plan_id: PlanUUID) -> Plan:
+        """Retrieve a plan by its ID asynchronously.
+
+        Args:
+            plan_id (PlanUUID): The UUID of the plan to retrieve.
+
+        """
+        return await self._arun(self.get_plan, plan_id)
+
+    async def aget_plan_by_query(self, query: str) -> Plan:
+        """Get a plan by query asynchronously.
+
+        Args:
+            query (str): The query to get a plan for.
+
+        """
+        return await self._arun(self.get_plan_by_query, query)
+
+    async def aplan_exists(self, plan_id: PlanUUID) -> bool:
+        """Check if a plan exists asynchronously.
+
+        Args:
+            plan_id (PlanUUID): The UUID of the plan to check.
+
+        """
+        return await self._arun(self.plan_exists, plan_id)
+
+    async def aget_similar_plans(
+        self,
+        query: str,
+        threshold: float = 0.5,
+        limit: int = 10,
+    ) -> list[Plan]:
+        """Get the plans whose queries are most similar to the query asynchronously.
+
+        Args:
+            query (str): The query to get similar plans for.
+            threshold (float): The minimum similarity, between 0 and 1, of plans returned.
+            limit (int): The maximum number of plans to return.
+
+        """
+        return await self._arun(self.get_similar_plans, query, threshold, limit)
+
+    async def asave_plan_run(self, plan_run: PlanRun) -> None:
+        """Save a plan run asynchronously.
+
+        Args:
+            plan_run (PlanRun): The PlanRun object to save.
+
+        """
+        await self._arun(self.save_plan_run, plan_run)
+
+    async def aget_plan_run(self, plan_run_id: PlanRunUUID) -> PlanRun:
+        """Retrieve a plan run by its ID asynchronously.
+
+        Args:
+            plan_run_id (PlanRunUUID): The UUID of the run to retrieve.
+
+        """
+        return await self._arun(self.get_plan_run, plan_run_id)
+
+    async def aget_plan_runs(
+        self,
+        run_state: PlanRunState | None = None,
+        page: int | None = None,
+    ) -> PlanRunListResponse:
+        """Find plan runs that match state asynchronously.
+
+        Args:
+            run_state (RunState | None): Optionally filter runs by their state.
+            page (int | None): The 1-indexed page of results to return.
+
+        """
+        return await self._arun(self.get_plan_runs, run_state, page)
+
+    async def asave_plan_run_output(
+        self,
+        output_name: str,
+        output: Output,
+        plan_run_id: PlanRunUUID,
+    ) -> Output:
+        """Save an output from a plan run to agent memory asynchronously.
+
+        Args:
+            output_name (str): The name of the output within the plan
+            output (Output): The Output object to save
+            plan_run_id (PlanRunUUID): The ID of the current plan run
+
+        """
+        return await self._arun(self.save_plan_run_output, output_name, output, plan_run_id)
+
+    async def aget_plan_run_output(
+        self, output_name: str, plan_run_id: PlanRunUUID
+    ) -> LocalDataValue:
+        """Retrieve an Output from agent memory asynchronously.
+
+        Args:
+            output_name (str): The name of the output to retrieve
+            plan_run_id (PlanRunUUID): The ID of the plan run
+
+        """
+        return await self._arun(self.get_plan_run_output, output_name, plan_run_id)
+
+    async def asave_tool_call(self, tool_call: ToolCallRecord) -> None:
+        """Save a tool call asynchronously.
+
+        Args:
+            tool_call (ToolCallRecord): The ToolCallRecord object to save.
+
+        """
+        await self._arun(self.save_tool_call, tool_call)
+
+    async def asave_end_user(self, end_user: EndUser) -> EndUser:
+        """Save an end user asynchronously.
+
+        Args:
+            end_user (EndUser): The EndUser object to save.
+
+        """
+        return await self._arun(self.save_end_user, end_user)
+
+    async def aget_end_user(self, external_id: str) -> EndUser | None:
+        """Get an end user asynchronously.
+
+        Args:
+            external_id (str): The id of the end user to get.
+
+        """
+        return await self._arun(self.get_end_user, external_id)
+
+
+class AgentMemoryCacheStats(BaseModel):
+    """Counters describing how an AgentMemoryCache has been used."""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hits(self) -> int:
+        """The number of lookups served from either tier."""
+        return self.memory_hits + self.disk_hits
+
+
+class AgentMemoryCache:
+    """Two-tier LRU cache for agent memory outputs fetched from or saved to Portia Cloud.
+
+    Entries are stored as JSON files under cache_dir. An in-process index tracks the size and
+    recency of each file so that eviction never needs to scan the directory, and the most
+    recently used entries are also kept in memory so hot values don't need to be read from disk.
+    Both tiers are bounded in bytes, and the disk tier can additionally be bounded in entries.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_bytes: int,
+        max_memory_bytes: int,
+        max_entries: int | None = None,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            cache_dir (str): The directory to store cached entries in.
+            max_bytes (int): The maximum total size of the entries stored on disk.
+            max_memory_bytes (int): The maximum total size of the entries kept in memory.
+            max_entries (int | None): Optionally, the maximum number of entries stored on disk.
+
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_memory_bytes = max_memory_bytes
+        self.max_entries = max_entries
+        self.stats = AgentMemoryCacheStats()
+        self._lock = threading.Lock()
+        self._disk: OrderedDict[str, int] | None = None
+        self._disk_bytes = 0
+        self._memory: OrderedDict[str, str] = OrderedDict()
+        self._memory_bytes = 0
+
+    def _disk_index(self) -> OrderedDict[str, int]:
+        """Get the index of entries on disk, scanning the cache directory on first use."""
+        if self._disk is None:
+            Path(self.cache_dir).mkdir(parents=True, exist_ok=True)
+            files = [(f, f.stat()) for f in Path(self.cache_dir).glob("**/*.json")]
+            files.sort(key=lambda f: f[1].st_mtime)
+            self._disk = OrderedDict(
+                (f.relative_to(self.cache_dir).as_posix(), stat.st_size) for f, stat in files
+            )
+            self._disk_bytes = sum(self._disk.values())
+        return self._disk
+
+    def get(self, key: str) -> str | None:
+        """Get a cached entry, marking it as recently used.
+
+        Args:
+            key (str): The relative path of the entry.
+
+        Returns:
+            str | None: The cached JSON, or None if the entry isn't cached.
+
+        """
+        with self._lock:
+            disk = self._disk_index()
+            if (content := self._memory.get(key)) is not None:
+                self._memory.move_to_end(key)
+                if key in disk:
+                    disk.move_to_end(key)
+                self.stats.memory_hits += 1
+                return content
+
+            try:
+                content = Path(self.cache_dir, key).read_text(encoding="utf-8")
+            except FileNotFoundError:
+                disk.pop(key, None)
+                self.stats.misses += 1
+                return None
+
+            if key in disk:
+                disk.move_to_end(key)
+            else:
+                # The entry was written by another process sharing the cache directory
+                self._add_to_disk_index(key, len(content.encode("utf-8")))
+            self._add_to_memory(key, content)
+            self.stats.disk_hits += 1
+            return content
+
+    def put(self, key: str, content: str) -> None:
+        """Store an entry in both tiers, evicting least recently used entries as needed.
+
+        Args:
+            key (str): The relative path of the entry.
+            content (str): The JSON to store.
+
+        """
+        size = len(content.encode("utf-8"))
+        with self._lock:
+            if size > self.max_bytes:
+                logger().debug(f"Not caching {key} as it is larger than the cache")
+                self._remove_from_memory(key)
+                self._disk_bytes -= self._disk_index().pop(key, 0)
+                Path(self.cache_dir, key).unlink(missing_ok=True)
+                return
+            path = Path(self.cache_dir, key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_text(content, encoding="utf-8")
+            tmp_path.replace(path)
+            self._add_to_disk_index(key, size)
+            self._add_to_memory(key, content)
+
+    def _add_to_disk_index(self, key: str, size: int) -> None:
+        disk = self._disk_index()
+        self._disk_bytes += size - disk.pop(key, 0)
+        disk[key] = size
+        while disk and (
+            self._disk_bytes > self.max_bytes
+            or (self.max_entries is not None and len(disk) > self.max_entries)
+        ):
+            evicted_key, evicted_size = disk.popitem(last=False)
+            self._disk_bytes -= evicted_size
+            self._remove_from_memory(evicted_key)
+            Path(self.cache_dir, evicted_key).unlink(missing_ok=True)
+            self.stats.evictions += 1
+            logger().debug(f"Removed least recently used cache file: {evicted_key}")
+
+    def _add_to_memory(self, key: str, content: str) -> None:
+        self._remove_from_memory(key)
+        size = len(content.encode("utf-8"))
+        if size > self.max_memory_bytes:
+            return
+        self._memory[key] = content
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted.encode("utf-8"))
+
+    def _remove_from_memory(self, key: str) -> None:
+        if (content := self._memory.pop(key, None)) is not None:
+            self._memory_bytes -= len(content.encode("utf-8"))
+
+
 class PortiaCloudStorage(Storage, AgentMemory):
     """Save plans, runs and tool calls to portia cloud."""
 
     DEFAULT_MAX_CACHE_SIZE = 20
+    DEFAULT_MAX_CACHE_BYTES = 256 * 1024 * 1024
+    DEFAULT_MAX_MEMORY_CACHE_BYTES = 32 * 1024 * 1024
 
     def __init__(
         self,
         config: Config,
         cache_dir: str | None = None,
-        max_cache_size: int = DEFAULT_MAX_CACHE_SIZE,
+        max_cache_size: int | None = DEFAULT_MAX_CACHE_SIZE,
+        max_cache_bytes: int = DEFAULT_MAX_CACHE_BYTES,
+        max_memory_cache_bytes: int = DEFAULT_MAX_MEMORY_CACHE_BYTES,
     ) -> None:
         """Initialize the PortiaCloudStorage instance.
 
         Args:
             config (Config): The configuration containing API details for Portia Cloud.
             cache_dir (str | None): Optional directory for local caching of outputs.
-            max_cache_size (int): The maximum number of files to cache locally.
+            max_cache_size (int | None): The maximum number of outputs to cache locally, or None
+                to only limit the cache by size.
+            max_cache_bytes (int): The maximum total size of the outputs cached on disk.
+            max_memory_cache_bytes (int): The maximum total size of the outputs also kept in
+                memory.
 
         """
         self.client = PortiaCloudClient.new_client(config)
@@ -1007,47 +2106,25 @@ class PortiaCloudStorage(Storage, AgentMemory):
         self.client_builder = PortiaCloudClient(config)
         self.cache_dir = cache_dir or ".portia/cache/agent_memory"
         self.max_cache_size = max_cache_size
-        self._ensure_cache_dir()
-
-    def _ensure_cache_dir(self, file_path: str | None = None) -> None:
-        """Ensure that we have the cache directories required.
-
-        This ensures that the cache directory exists as well as any other sub-directories
-        needed for the file_path.
-
-        Args:
-            file_path (str | None): Optional path to ensure parent directories exist.
-
-        """
-        Path(self.cache_dir).mkdir(parents=True, exist_ok=True)
-        if file_path:
-            Path(self.cache_dir, file_path).parent.mkdir(parents=True, exist_ok=True)
-
-    def _ensure_cache_size(self) -> None:
-        """Manage the cache size by removing the oldest file if the cache is full."""
-        json_files = list(Path(self.cache_dir).glob("**/*.json"))
-        if len(json_files) >= self.max_cache_size:
-            oldest_file = min(json_files, key=lambda f: f.stat().st_mtime)
-            oldest_file.unlink()
-            logger().debug(f"Removed oldest cache file: {oldest_file}")
+        self.cache = AgentMemoryCache(
+            self.cache_dir,
+            max_bytes=max_cache_bytes,
+            max_memory_bytes=max_memory_cache_bytes,
+            max_entries=max_cache_size,
+        )
 
     def _write_to_cache(self, file_path: str, content: BaseModel) -> None:
-        """Write a serialized object to a JSON file in the cache.
+        """Write a serialized object to the cache.
 
         Args:
             file_path (str): Path of the file to write.
             content (BaseModel): The object to serialize.
 
         """
-        self._ensure_cache_dir(file_path)
-        self._ensure_cache_size()
-
-        # Write the file
-        with Path(self.cache_dir, file_path).open("w", encoding="utf-8") as file:
-            file.write(content.model_dump_json(indent=4))
+        self.cache.put(file_path, content.model_dump_json())
 
     def _read_from_cache(self, file_name: str, model: type[T]) -> T:
-        """Read a JSON file from cache and deserialize it into a BaseModel instance.
+        """Read an object from the cache and deserialize it into a BaseModel instance.
 
         Args:
             file_name (str): Name of the file to read.
@@ -1061,9 +2138,10 @@ class PortiaCloudStorage(Storage, AgentMemory):
             ValidationError: If the deserialization fails.
 
         """
-        with Path(self.cache_dir, file_name).open("r", encoding="utf-8") as file:
-            f = file.read()
-            return model.model_validate_json(f)
+        content = self.cache.get(file_name)
+        if content is None:
+            raise FileNotFoundError(file_name)
+        return model.model_validate_json(content)
 
     def check_response(self, response: httpx.Response) -> None:
         """Validate the response from Portia API.
@@ -1127,20 +2205,20 @@ class PortiaCloudStorage(Storage, AgentMemory):
 
         """
         try:
-            async with self.client_builder.async_client() as client:
-                response = await client.post(
-                    url="/api/v0/plans/",
-                    json={
-                        "id": str(plan.id),
-                        "query": plan.plan_context.query,
-                        "tool_ids": plan.plan_context.tool_ids,
-                        "steps": [step.model_dump(mode="json") for step in plan.steps],
-                        "plan_inputs": [
-                            {**input_.model_dump(mode="json"), "description": input_.description}
-                            for input_ in plan.plan_inputs
-                        ],
-                    },
-                )
+            client = self.client_builder.shared_async_client()
+            response = await client.post(
+                url="/api/v0/plans/",
+                json={
+                    "id": str(plan.id),
+                    "query": plan.plan_context.query,
+                    "tool_ids": plan.plan_context.tool_ids,
+                    "steps": [step.model_dump(mode="json") for step in plan.steps],
+                    "plan_inputs": [
+                        {**input_.model_dump(mode="json"), "description": input_.description}
+                        for input_ in plan.plan_inputs
+                    ],
+                },
+            )
         except Exception as e:
             raise StorageError(e) from e
         else:
@@ -1184,10 +2262,10 @@ class PortiaCloudStorage(Storage, AgentMemory):
 
         """
         try:
-            async with self.client_builder.async_client() as client:
-                response = await client.get(
-                    url=f"/api/v0/plans/{plan_id}/",
-                )
+            client = self.client_builder.shared_async_client()
+            response = await client.get(
+                url=f"/api/v0/plans/{plan_id}/",
+            )
         except Exception as e:
             raise StorageError(e) from e
         else:
@@ -1255,10 +2333,10 @@ class PortiaCloudStorage(Storage, AgentMemory):
 
         """
         try:
-            async with self.client_builder.async_client() as client:
-                response = await client.get(
-                    url=f"/api/v0/plans/{plan_id}/",
-                )
+            client = self.client_builder.shared_async_client()
+            response = await client.get(
+                url=f"/api/v0/plans/{plan_id}/",
+            )
         except Exception:  # noqa: BLE001
             return False
         else:
@@ -1304,21 +2382,20 @@ class PortiaCloudStorage(Storage, AgentMemory):
 
         """
         try:
-            async with self.client_builder.async_client() as client:
-                response = await client.put(
-                    url=f"/api/v0/plan-runs/{plan_run.id}/",
-                    json={
-                        "current_step_index": plan_run.current_step_index,
-                        "state": plan_run.state,
-                        "end_user": plan_run.end_user_id,
-                        "outputs": plan_run.outputs.model_dump(mode="json"),
-                        "plan_id": str(plan_run.plan_id),
-                        "plan_run_inputs": {
-                            k: v.model_dump(mode="json")
-                            for k, v in plan_run.plan_run_inputs.items()
-                        },
+            client = self.client_builder.shared_async_client()
+            response = await client.put(
+                url=f"/api/v0/plan-runs/{plan_run.id}/",
+                json={
+                    "current_step_index": plan_run.current_step_index,
+                    "state": plan_run.state,
+                    "end_user": plan_run.end_user_id,
+                    "outputs": plan_run.outputs.model_dump(mode="json"),
+                    "plan_id": str(plan_run.plan_id),
+                    "plan_run_inputs": {
+                        k: v.model_dump(mode="json") for k, v in plan_run.plan_run_inputs.items()
                     },
-                )
+                },
+            )
         except Exception as e:
             raise StorageError(e) from e
         else:
@@ -1373,10 +2450,10 @@ class PortiaCloudStorage(Storage, AgentMemory):
 
         """
         try:
-            async with self.client_builder.async_client() as client:
-                response = await client.get(
-                    url=f"/api/v0/plan-runs/{plan_run_id}/",
-                )
+            client = self.client_builder.shared_async_client()
+            response = await client.get(
+                url=f"/api/v0/plan-runs/{plan_run_id}/",
+            )
         except Exception as e:
             raise StorageError(e) from e
         else:
@@ -1472,10 +2549,10 @@ class PortiaCloudStorage(Storage, AgentMemory):
                 query["page"] = page
             if run_state:
                 query["run_state"] = run_state.value
-            async with self.client_builder.async_client() as client:
-                response = await client.get(
-                    url=f"/api/v0/plan-runs/?{urlencode(query)}",
-                )
+            client = self.client_builder.shared_async_client()
+            response = await client.get(
+                url=f"/api/v0/plan-runs/?{urlencode(query)}",
+            )
         except Exception as e:
             raise StorageError(e) from e
         else:
@@ -1549,20 +2626,20 @@ class PortiaCloudStorage(Storage, AgentMemory):
         """
         try:
             _check_size(f"{tool_call.tool_name} output", tool_call.output)
-            async with self.client_builder.async_client() as client:
-                response = await client.post(
-                    url="/api/v0/tool-calls/",
-                    json={
-                        "plan_run_id": str(tool_call.plan_run_id),
-                        "tool_name": tool_call.tool_name,
-                        "step": tool_call.step,
-                        "end_user_id": tool_call.end_user_id or "",
-                        "input": tool_call.serialize_input(),
-                        "output": tool_call.serialize_output(),
-                        "status": tool_call.status,
-                        "latency_seconds": tool_call.latency_seconds,
-                    },
-                )
+            client = self.client_builder.shared_async_client()
+            response = await client.post(
+                url="/api/v0/tool-calls/",
+                json={
+                    "plan_run_id": str(tool_call.plan_run_id),
+                    "tool_name": tool_call.tool_name,
+                    "step": tool_call.step,
+                    "end_user_id": tool_call.end_user_id or "",
+                    "input": tool_call.serialize_input(),
+                    "output": tool_call.serialize_output(),
+                    "status": tool_call.status,
+                    "latency_seconds": tool_call.latency_seconds,
+                },
+            )
         except Exception as e:  # noqa: BLE001
             logger().error(f"Error saving tool call to Portia Cloud: {e}")
         else:
@@ -1641,19 +2718,19 @@ class PortiaCloudStorage(Storage, AgentMemory):
         try:
             _check_size(output_name, output)
 
-            async with self.client_builder.async_client(json_headers=False) as client:
-                response = await client.put(
-                    url=f"/api/v0/agent-memory/plan-runs/{plan_run_id}/outputs/{output_name}/",
-                    files={
-                        "value": (
-                            "output",
-                            BytesIO(output.serialize_value().encode("utf-8")),
-                        ),
-                    },
-                    data={
-                        "summary": output.get_summary() or "",
-                    },
-                )
+            client = self.client_builder.shared_async_client(json_headers=False)
+            response = await client.put(
+                url=f"/api/v0/agent-memory/plan-runs/{plan_run_id}/outputs/{output_name}/",
+                files={
+                    "value": (
+                        "output",
+                        BytesIO(output.serialize_value().encode("utf-8")),
+                    ),
+                },
+                data={
+                    "summary": output.get_summary() or "",
+                },
+            )
             self.check_response(response)
 
             # Save to local cache
@@ -1753,17 +2830,17 @@ class PortiaCloudStorage(Storage, AgentMemory):
             # Retrieving a value is a two step process
             # 1. Get the output with the storage URL from the backend
             # 2. Fetch the value from the storage URL
-            async with self.client_builder.async_client() as client:
-                output_response = await client.get(
-                    url=f"/api/v0/agent-memory/plan-runs/{plan_run_id}/outputs/{output_name}/",
-                )
-                self.check_response(output_response)
-                output_json = output_response.json()
-                summary = output_json["summary"]
-                value_url = output_json["url"]
+            client = self.client_builder.shared_async_client()
+            output_response = await client.get(
+                url=f"/api/v0/agent-memory/plan-runs/{plan_run_id}/outputs/{output_name}/",
+            )
+            self.check_response(output_response)
+            output_json = output_response.json()
+            summary = output_json["summary"]
+            value_url = output_json["url"]
 
-                value_response = await client.get(value_url)
-                value_response.raise_for_status()
+            value_response = await client.get(value_url)
+            value_response.raise_for_status()
 
             # Create the output object
             output = LocalDataValue(
@@ -1821,15 +2898,15 @@ class PortiaCloudStorage(Storage, AgentMemory):
 
         """
         try:
-            async with self.client_builder.async_client() as client:
-                response = await client.post(
-                    url="/api/v0/plans/embeddings/search/",
-                    json={
-                        "query": query,
-                        "threshold": threshold,
-                        "limit": limit,
-                    },
-                )
+            client = self.client_builder.shared_async_client()
+            response = await client.post(
+                url="/api/v0/plans/embeddings/search/",
+                json={
+                    "query": query,
+                    "threshold": threshold,
+                    "limit": limit,
+                },
+            )
             self.check_response(response)
             results = response.json()
             return [Plan.from_response(result) for result in results]
@@ -1875,11 +2952,11 @@ class PortiaCloudStorage(Storage, AgentMemory):
 
         """
         try:
-            async with self.client_builder.async_client() as client:
-                response = await client.put(
-                    url=f"/api/v0/end-user/{end_user.external_id}/",
-                    json=end_user.model_dump(mode="json"),
-                )
+            client = self.client_builder.shared_async_client()
+            response = await client.put(
+                url=f"/api/v0/end-user/{end_user.external_id}/",
+                json=end_user.model_dump(mode="json"),
+            )
         except Exception as e:
             raise StorageError(e) from e
         else:
@@ -1937,10 +3014,10 @@ class PortiaCloudStorage(Storage, AgentMemory):
 
         """
         try:
-            async with self.client_builder.async_client() as client:
-                response = await client.get(
-                    url=f"/api/v0/end-user/{external_id}/",
-                )
+            client = self.client_builder.shared_async_client()
+            response = await client.get(
+                url=f"/api/v0/end-user/{external_id}/",
+            )
         except Exception as e:
             raise StorageError(e) from e
         else:
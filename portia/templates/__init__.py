@@ -1,5 +1,5 @@
 """Contains templates for LLM Context."""
 
-from portia.templates.render import render_template
+from portia.templates.render import get_template_environment, register_template, render_template
 
-__all__ = ["render_template"]
+__all__ = ["get_template_environment", "register_template", "render_template"]
@@ -3,19 +3,74 @@
 This module provides a utility function to render Jinja templates. It loads a template from the file
 system and renders it to a string, allowing for dynamic generation of content with provided
 keyword arguments.
+
+Templates are rendered from a single Jinja environment shared by the process, which compiles each
+template the first time it is rendered and keeps the compiled template in memory. The environment
+loads the templates shipped in the `portia.templates` package, and templates registered with
+register_template, which take precedence over shipped templates with the same name.
+
+Compiled templates aren't kept between processes by default. To do so, set a Jinja bytecode cache on
+the environment, e.g. `get_template_environment().bytecode_cache = FileSystemBytecodeCache()`.
 """
 
-import importlib.resources
+from __future__ import annotations
+
+import threading
+from functools import cache
 from typing import Any
 
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import ChoiceLoader, DictLoader, Environment, PackageLoader
+
+_registered_templates: dict[str, str] = {}
+_registration_lock = threading.Lock()
+
+
+@cache
+def get_template_environment() -> Environment:
+    """Get the Jinja environment templates are rendered with.
+
+    Templates are not reloaded when their files change, as the shipped templates only change when
+    Portia is upgraded.
+    """
+    return Environment(
+        loader=ChoiceLoader(
+            [DictLoader(_registered_templates), PackageLoader("portia", "templates")],
+        ),
+        autoescape=True,
+        auto_reload=False,
+    )
+
+
+def register_template(file_name: str, source: str) -> None:
+    """Register a template to be rendered by name, replacing any template with the same name.
+
+    The template is compiled when it is registered, so syntax errors are raised straight away.
+    Registering a template with the name of a shipped template (e.g.
+    `default_planning_agent_context.xml.jinja`) customises the prompts Portia renders with it.
+
+    Args:
+        file_name (str): The name to render the template by.
+        source (str): The Jinja source of the template.
+
+    Raises:
+        jinja2.TemplateSyntaxError: If the template is not valid Jinja.
+
+    """
+    environment = get_template_environment()
+    # Compile the template before registering it, so an invalid template isn't registered
+    environment.parse(source)
+    with _registration_lock:
+        _registered_templates[file_name] = source
+        # Templates aren't reloaded, so drop the compiled template the registration replaces
+        if environment.cache is not None:
+            environment.cache.clear()
 
 
 def render_template(file_name: str, **kwargs: Any) -> str:
     """Render a Jinja template from the file system into a string.
 
-    This function loads a template file from the `portia.templates` package,
-    and using Jinja2 renders the template with the provided keyword arguments.
+    This function loads a template file from the `portia.templates` package, or one registered with
+    register_template, and using Jinja2 renders the template with the provided keyword arguments.
 
     Args:
         file_name (str): The name of the template file to be rendered.
@@ -28,10 +83,4 @@ def render_template(file_name: str, **kwargs: Any) -> str:
         rendered = render_template("example_template.html", user_name="Alice")
 
     """
-    from portia import templates
-
-    source = importlib.resources.files(templates).joinpath(file_name)
-    with importlib.resources.as_file(source) as template_path:
-        env = Environment(loader=FileSystemLoader(template_path.parent), autoescape=True)
-        template = env.get_template(file_name)
-        return template.render(**kwargs)
+    return get_template_environment().get_template(file_name).render(**kwargs)
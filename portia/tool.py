@@ -16,9 +16,14 @@ while relying on common functionality provided by the base class.
 from __future__ import annotations
 
 import asyncio
+import contextvars
 import inspect
 import json
+import threading
 from abc import abstractmethod
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack
 from datetime import timedelta
 from functools import partial
 from typing import Any, Generic, Self, TypeVar
@@ -55,7 +60,13 @@ from portia.errors import InvalidToolDescriptionError, ToolHardError, ToolSoftEr
 from portia.execution_agents.execution_utils import is_clarification
 from portia.execution_agents.output import LocalDataValue, Output
 from portia.logger import logger
-from portia.mcp_session import McpClientConfig, get_mcp_session
+from portia.mcp_session import (
+    MCP_CONNECTION_ERRORS,
+    McpClientConfig,
+    get_mcp_session,
+    get_mcp_session_pool,
+    run_mcp_coroutine_sync,
+)
 from portia.plan import Plan
 from portia.plan_run import PlanRun
 from portia.templates.render import render_template
@@ -63,6 +74,43 @@ from portia.templates.render import render_template
 """MAX_TOOL_DESCRIPTION_LENGTH is limited to stop overflows in the planner context window."""
 MAX_TOOL_DESCRIPTION_LENGTH = 16384
 
+"""MAX_BLOCKING_TOOL_THREADS is the number of threads shared by tools that only implement run."""
+MAX_BLOCKING_TOOL_THREADS = 32
+
+T = TypeVar("T")
+
+_blocking_tool_executor: ThreadPoolExecutor | None = None
+_blocking_tool_executor_lock = threading.Lock()
+
+
+def get_blocking_tool_executor() -> ThreadPoolExecutor:
+    """Get the thread pool used to run blocking tools from async code.
+
+    The pool is shared between all event loops, so that async callers which each create their own
+    loop (e.g. Portia.run_plan with a PlanV2) don't each start their own threads.
+    """
+    global _blocking_tool_executor  # noqa: PLW0603
+    with _blocking_tool_executor_lock:
+        if _blocking_tool_executor is None:
+            _blocking_tool_executor = ThreadPoolExecutor(
+                max_workers=MAX_BLOCKING_TOOL_THREADS,
+                thread_name_prefix="portia-tool",
+            )
+        return _blocking_tool_executor
+
+
+async def run_blocking_tool_call(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking function on the shared tool thread pool without blocking the event loop.
+
+    Like asyncio.to_thread, the current context is copied to the thread so that context variables
+    (e.g. those used for tracing) are still available.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        get_blocking_tool_executor(), partial(context.run, func, *args, **kwargs)
+    )
+
 
 class ToolRunContext(BaseModel):
     """Context passed to tools when running.
@@ -72,6 +120,8 @@ class ToolRunContext(BaseModel):
         plan(Plan): The plan the tool run is part of.
         config(Config): The config for the SDK as a whole.
         clarifications(ClarificationListType): Relevant clarifications for this tool plan_run.
+        stream_callback(Callable[[str], None] | None): If set, tools generating text with an LLM
+            stream their response to this callback chunk by chunk.
 
     """
 
@@ -82,6 +132,7 @@ class ToolRunContext(BaseModel):
     plan: Plan
     config: Config
     clarifications: ClarificationListType
+    stream_callback: Callable[[str], None] | None = Field(default=None, exclude=True)
 
 
 class _ArgsSchemaPlaceholder(BaseModel):
@@ -235,6 +286,38 @@ class Tool(BaseModel, Generic[SERIALIZABLE_TYPE_VAR]):
         """
         raise NotImplementedError("Async run is not implemented")  # pragma: no cover
 
+    @property
+    def implements_arun(self) -> bool:
+        """Whether the tool has its own arun, rather than only the blocking run."""
+        return type(self).arun is not Tool.arun
+
+    async def arun_without_blocking(
+        self,
+        ctx: ToolRunContext,
+        *args: Any,
+        **kwargs: Any,
+    ) -> SERIALIZABLE_TYPE_VAR | Clarification:
+        """Run the tool without blocking the event loop.
+
+        Tools implementing arun are awaited directly. Tools which only implement the blocking run
+        method are run on a thread pool shared by all tools.
+
+        Args:
+            ctx (ToolRunContext): The context for the tool.
+            *args (Any): Additional positional arguments for the tool function.
+            **kwargs (Any): Additional keyword arguments for the tool function.
+
+        Returns:
+            SERIALIZABLE_TYPE_VAR | Clarification: The result of the tool's execution.
+
+        """
+        if self.implements_arun:
+            try:
+                return await self.arun(ctx, *args, **kwargs)
+            except NotImplementedError:
+                pass
+        return await run_blocking_tool_call(self.run, ctx, *args, **kwargs)
+
     async def _arun(
         self,
         ctx: ToolRunContext,
@@ -246,10 +329,8 @@ class Tool(BaseModel, Generic[SERIALIZABLE_TYPE_VAR]):
         This method must be implemented by subclasses to define the tool's specific behavior.
         """
         try:
-            output = await self.arun(ctx, *args, **kwargs)
-        except NotImplementedError:
-            # if the subclass does not implement arun, we can just call the sync run method
-            return await asyncio.to_thread(self._run, ctx, *args, **kwargs)
+            # if the subclass does not implement arun, this calls the sync run method in a thread
+            output = await self.arun_without_blocking(ctx, *args, **kwargs)
         except Exception as e:
             # check if error is wrapped as a Hard or Soft Tool Error.
             # if not wrap as ToolSoftError
@@ -713,28 +794,9 @@ class PortiaRemoteTool(Tool, Generic[SERIALIZABLE_TYPE_VAR]):
 
         """
         try:
-            # Default function for JSON serialization of Pydantic models
-            def default_serializer(
-                obj: Any,  # noqa: ANN401
-            ) -> dict[str, Any] | list[Any] | str | int | float | bool | None:
-                if isinstance(obj, BaseModel):
-                    return json.loads(obj.model_dump_json())
-                raise TypeError(f"Object of type {type(obj)} is not JSON serializable")  # noqa: TRY301
-
-            # Send to Cloud
             response = self.client.post(
                 url=f"/api/v0/tools/{self.id}/run/",
-                content=json.dumps(
-                    {
-                        "arguments": combine_args_kwargs(*args, **kwargs),
-                        "execution_context": {
-                            "end_user_id": ctx.end_user.external_id,
-                            "plan_run_id": str(ctx.plan_run.id),
-                            "additional_data": ctx.end_user.additional_data,
-                        },
-                    },
-                    default=default_serializer,
-                ),
+                content=self._run_request_content(ctx, *args, **kwargs),
             )
             response.raise_for_status()
         except httpx.HTTPStatusError as e:
@@ -744,13 +806,86 @@ class PortiaRemoteTool(Tool, Generic[SERIALIZABLE_TYPE_VAR]):
             logger().error(f"Unhandled error from Portia Cloud: {e}")
             raise ToolHardError(e) from e
         else:
-            try:
-                output = self.parse_response(ctx, response.json())
-            except (ValidationError, KeyError) as e:
-                logger().error(f"Error parsing response from Portia Cloud: {e}")
-                raise ToolHardError(e) from e
-            else:
-                return output.get_value()
+            return self._parse_run_response(ctx, response)
+
+    async def arun(
+        self,
+        ctx: ToolRunContext,
+        *args: Any,
+        **kwargs: Any,
+    ) -> SERIALIZABLE_TYPE_VAR | None | Clarification:
+        """Async invoke the run endpoint and handle the response.
+
+        Requests go through the async client for the run's config shared on the running event loop,
+        the same client Portia Cloud storage uses, so concurrent runs and storage calls reuse its
+        kept-alive connections to Portia Cloud.
+
+        Args:
+            ctx (ToolRunContext): The context of the execution, including end user ID, run ID
+            and additional data.
+            *args (Any): The positional arguments for the tool.
+            **kwargs (Any): The keyword arguments for the tool.
+
+        Returns:
+            SERIALIZABLE_TYPE_VAR | None | Clarification: The result of the run execution, which
+            could either be a serialized value, None, or a `Clarification` object.
+
+        Raises:
+            ToolHardError: If the request fails or there is an error parsing the response.
+
+        """
+        try:
+            client = PortiaCloudClient(ctx.config).shared_async_client()
+            response = await client.post(
+                url=f"/api/v0/tools/{self.id}/run/",
+                content=self._run_request_content(ctx, *args, **kwargs),
+            )
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            logger().error(f"Error from Portia Cloud: {e.response.content}")
+            raise ToolHardError(str(e.response.json())) from e
+        except Exception as e:
+            logger().error(f"Unhandled error from Portia Cloud: {e}")
+            raise ToolHardError(e) from e
+        else:
+            return self._parse_run_response(ctx, response)
+
+    def _run_request_content(self, ctx: ToolRunContext, *args: Any, **kwargs: Any) -> str:
+        """Serialize the body of a request to the run endpoint."""
+
+        # Default function for JSON serialization of Pydantic models
+        def default_serializer(
+            obj: Any,  # noqa: ANN401
+        ) -> dict[str, Any] | list[Any] | str | int | float | bool | None:
+            if isinstance(obj, BaseModel):
+                return json.loads(obj.model_dump_json())
+            raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+
+        return json.dumps(
+            {
+                "arguments": combine_args_kwargs(*args, **kwargs),
+                "execution_context": {
+                    "end_user_id": ctx.end_user.external_id,
+                    "plan_run_id": str(ctx.plan_run.id),
+                    "additional_data": ctx.end_user.additional_data,
+                },
+            },
+            default=default_serializer,
+        )
+
+    def _parse_run_response(
+        self,
+        ctx: ToolRunContext,
+        response: httpx.Response,
+    ) -> SERIALIZABLE_TYPE_VAR | None | Clarification:
+        """Parse a successful response from the run endpoint."""
+        try:
+            output = self.parse_response(ctx, response.json())
+        except (ValidationError, KeyError) as e:
+            logger().error(f"Error parsing response from Portia Cloud: {e}")
+            raise ToolHardError(e) from e
+        else:
+            return output.get_value()
 
     @classmethod
     def batch_ready_check(
@@ -807,7 +942,7 @@ class PortiaMcpTool(Tool[str]):
 
         """
         logger().debug(f"Calling tool {self.name} with arguments {kwargs}")
-        return asyncio.run(self.call_remote_mcp_tool(self.name, kwargs))
+        return run_mcp_coroutine_sync(self.call_remote_mcp_tool(self.name, kwargs))
 
     async def arun(self, _: ToolRunContext, **kwargs: Any) -> str:
         """Invoke the tool by dispatching to the MCP server asynchronously."""
@@ -885,23 +1020,48 @@ class PortiaMcpTool(Tool[str]):
             ) from eg
 
     async def _call_mcp_tool(self, name: str, arguments: dict | None = None) -> str:
-        """Call a tool using the MCP session."""
-        async with get_mcp_session(self.mcp_client_config) as session:
-            tool_result = await session.call_tool(
-                name,
-                arguments,
-                read_timeout_seconds=(
-                    timedelta(seconds=self.mcp_client_config.tool_call_timeout_seconds)
-                    if self.mcp_client_config.tool_call_timeout_seconds
-                    else None
-                ),
-            )
-            if tool_result.isError:
-                raise ToolHardError(
-                    f"MCP tool {self.name}({self.id}) returned an error: "
-                    f"{tool_result.model_dump_json()}"
+        """Call a tool using a pooled MCP session.
+
+        Sessions are reused across calls. If the connection goes away while a session is being
+        acquired, acquiring it is retried once on a fresh session. Once the tool call has started,
+        connection errors are raised rather than retried: the request may already have reached
+        the server, and running a tool that isn't idempotent twice could repeat its side effects.
+        The pool discards the broken session, so the next call uses a fresh one.
+        """
+        pool = get_mcp_session_pool()
+        async with AsyncExitStack() as stack:
+            try:
+                session = await stack.enter_async_context(
+                    pool.session(self.mcp_client_config, get_mcp_session),
                 )
-            return tool_result.model_dump_json()
+            except MCP_CONNECTION_ERRORS:
+                session = await stack.enter_async_context(
+                    pool.session(self.mcp_client_config, get_mcp_session),
+                )
+            tool_result = await self._call_tool_on_session(session, name, arguments)
+        if tool_result.isError:
+            raise ToolHardError(
+                f"MCP tool {self.name}({self.id}) returned an error: "
+                f"{tool_result.model_dump_json()}"
+            )
+        return tool_result.model_dump_json()
+
+    async def _call_tool_on_session(
+        self,
+        session: mcp.ClientSession,
+        name: str,
+        arguments: dict | None = None,
+    ) -> mcp.types.CallToolResult:
+        """Invoke the tool on an open MCP session."""
+        return await session.call_tool(
+            name,
+            arguments,
+            read_timeout_seconds=(
+                timedelta(seconds=self.mcp_client_config.tool_call_timeout_seconds)
+                if self.mcp_client_config.tool_call_timeout_seconds
+                else None
+            ),
+        )
 
 
 ExceptionT = TypeVar("ExceptionT", bound=BaseException)
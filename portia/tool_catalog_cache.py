@@ -0,0 +1,228 @@
+"""Cache the tool catalogs of remote tool servers on disk.
+
+Loading a PortiaToolRegistry or McpToolRegistry lists the tools of a remote server, which costs a
+round trip (and for stdio MCP servers, starting the server) every time a process starts. Given a
+ToolCatalogCache, these registries store the raw tool descriptions they list on disk and load
+from there instead:
+
+- A catalog fetched within the cache's TTL is served without contacting the server.
+- A stale catalog is served immediately while it is refreshed in the background for the next
+  load. If the refresh fails or the server is slow, the cached catalog keeps being served. The
+  tools of a registry that has already loaded don't change, so running plans see a stable set.
+- Catalogs are only served for the server they were fetched from. Each is stored with a
+  fingerprint of how the server was connected to (e.g. the MCP command and arguments, or the
+  Portia endpoint and API key), and with the version of the cache format, and entries which don't
+  match are ignored.
+
+Catalogs are stored as one JSON file per server, written atomically so that several processes
+can share a cache directory.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from pydantic import BaseModel, Field, ValidationError
+
+from portia.logger import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from portia.config import Config
+
+CATALOG_CACHE_VERSION = 1
+"""The version of the format catalogs are stored in. Catalogs in other formats are ignored."""
+
+RawToolCatalog = list[dict[str, Any]]
+
+
+class CachedToolCatalog(BaseModel):
+    """The raw tool descriptions listed by a server, as stored in a ToolCatalogCache."""
+
+    version: int = Field(
+        default=CATALOG_CACHE_VERSION,
+        description="The version of the format the catalog is stored in.",
+    )
+    fingerprint: str = Field(description="The fingerprint of the server the catalog came from.")
+    fetched_at: float = Field(description="When the catalog was fetched, in seconds since epoch.")
+    tools: RawToolCatalog = Field(description="The raw descriptions of the server's tools.")
+
+
+def fingerprint(*parts: object) -> str:
+    """Fingerprint the details of how a server is connected to.
+
+    Secrets can safely be included, as only a hash of the parts is stored.
+    """
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class ToolCatalogCache:
+    """Stores the tool catalogs of remote servers on disk, refreshing them in the background.
+
+    Args:
+        path (str | Path): The directory to store catalogs in. It is created if needed.
+        ttl_seconds (float): How long a catalog is served without being refreshed.
+
+    """
+
+    def __init__(self, path: str | Path, ttl_seconds: float = 60 * 60) -> None:
+        """Initialize the cache."""
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self._refreshing: set[str] = set()
+        self._refreshing_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Config) -> ToolCatalogCache | None:
+        """Create the cache configured by config.tool_catalog_cache_path, if any."""
+        if config.tool_catalog_cache_path is None:
+            return None
+        return cls(config.tool_catalog_cache_path, config.tool_catalog_cache_ttl_seconds)
+
+    def get(self, key: str, server_fingerprint: str) -> CachedToolCatalog | None:
+        """Get the cached catalog of a server, if there is a usable one.
+
+        Args:
+            key (str): The server the catalog belongs to.
+            server_fingerprint (str): The fingerprint of how the server is connected to.
+
+        """
+        try:
+            catalog = CachedToolCatalog.model_validate_json(self._file(key).read_bytes())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValidationError) as e:
+            logger().warning(f"Ignoring unreadable tool catalog cache entry for {key}: {e}")
+            return None
+        if catalog.version != CATALOG_CACHE_VERSION or catalog.fingerprint != server_fingerprint:
+            return None
+        return catalog
+
+    def put(self, key: str, server_fingerprint: str, tools: RawToolCatalog) -> None:
+        """Store the catalog of a server.
+
+        Args:
+            key (str): The server the catalog belongs to.
+            server_fingerprint (str): The fingerprint of how the server is connected to.
+            tools (RawToolCatalog): The raw descriptions of the server's tools.
+
+        """
+        catalog = CachedToolCatalog(
+            fingerprint=server_fingerprint,
+            fetched_at=time.time(),
+            tools=tools,
+        )
+        self.path.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file then rename it, so readers never see a partial catalog
+        fd, temp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(catalog.model_dump_json())
+            Path(temp_path).replace(self._file(key))
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+    def is_fresh(self, catalog: CachedToolCatalog) -> bool:
+        """Whether a catalog was fetched within the TTL."""
+        return time.time() - catalog.fetched_at < self.ttl_seconds
+
+    def load(
+        self,
+        key: str,
+        server_fingerprint: str,
+        fetch: Callable[[], RawToolCatalog],
+    ) -> RawToolCatalog:
+        """Load the catalog of a server, from the cache if possible.
+
+        Args:
+            key (str): The server the catalog belongs to.
+            server_fingerprint (str): The fingerprint of how the server is connected to.
+            fetch (Callable[[], RawToolCatalog]): Fetches the catalog from the server.
+
+        Returns:
+            RawToolCatalog: The cached catalog if there is one, otherwise the fetched catalog.
+
+        """
+        catalog = self.get(key, server_fingerprint)
+        if catalog is None:
+            tools = fetch()
+            self.put(key, server_fingerprint, tools)
+            return tools
+        if not self.is_fresh(catalog):
+            self._refresh_in_background(key, server_fingerprint, fetch)
+        return catalog.tools
+
+    async def aload(
+        self,
+        key: str,
+        server_fingerprint: str,
+        fetch: Callable[[], Awaitable[RawToolCatalog]],
+    ) -> RawToolCatalog:
+        """Load the catalog of a server asynchronously, from the cache if possible.
+
+        A stale catalog is refreshed on a background thread with its own event loop, so the
+        refresh isn't cancelled if the caller's event loop finishes first.
+
+        Args:
+            key (str): The server the catalog belongs to.
+            server_fingerprint (str): The fingerprint of how the server is connected to.
+            fetch (Callable[[], Awaitable[RawToolCatalog]]): Fetches the catalog from the server.
+
+        Returns:
+            RawToolCatalog: The cached catalog if there is one, otherwise the fetched catalog.
+
+        """
+        catalog = self.get(key, server_fingerprint)
+        if catalog is None:
+            tools = await fetch()
+            self.put(key, server_fingerprint, tools)
+            return tools
+        if not self.is_fresh(catalog):
+            self._refresh_in_background(
+                key,
+                server_fingerprint,
+                lambda: asyncio.run(_awaited(fetch)),
+            )
+        return catalog.tools
+
+    def _refresh_in_background(
+        self,
+        key: str,
+        server_fingerprint: str,
+        fetch: Callable[[], RawToolCatalog],
+    ) -> None:
+        """Refresh a stale catalog on a background thread, unless it is already being refreshed."""
+        with self._refreshing_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh() -> None:
+            try:
+                tools = fetch()
+                self.put(key, server_fingerprint, tools)
+                logger().debug(f"Refreshed tool catalog for {key}")
+            except Exception as e:  # noqa: BLE001 - The cached catalog is still usable
+                logger().warning(f"Failed to refresh tool catalog for {key}, using cache: {e}")
+            finally:
+                with self._refreshing_lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name="portia-tool-catalog", daemon=True).start()
+
+    def _file(self, key: str) -> Path:
+        return self.path / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+
+async def _awaited(fetch: Callable[[], Awaitable[RawToolCatalog]]) -> RawToolCatalog:
+    return await fetch()
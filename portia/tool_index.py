@@ -0,0 +1,331 @@
+"""Retrieval indexes used to pick the tools relevant to a query.
+
+ToolRegistry.match_tools uses a ToolIndex to narrow large tool catalogs down to the tools most
+relevant to a query before they are passed to the planning agent. Two indexes are provided:
+
+- BM25ToolIndex: an offline lexical index over each tool's id, name, description and argument
+  names. This is the default and needs no extra dependencies.
+- EmbeddingToolIndex: a semantic index backed by any LangChain Embeddings implementation, e.g.
+  a locally hosted sentence-transformers or Ollama embedding model.
+
+Both are updated incrementally as tools are added to or removed from a registry.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from langchain_core.embeddings import Embeddings
+
+    from portia.tool import Tool
+
+_TOKEN_PATTERN = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+_STOP_WORDS = frozenset(
+    {
+        "a",
+        "an",
+        "and",
+        "are",
+        "as",
+        "at",
+        "be",
+        "by",
+        "for",
+        "from",
+        "in",
+        "is",
+        "it",
+        "of",
+        "on",
+        "or",
+        "that",
+        "the",
+        "this",
+        "to",
+        "with",
+    },
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lower case search terms.
+
+    Identifiers are split on punctuation and camel case, so `portia:google:gmail:send_email` and
+    `sendEmail` both produce the terms `send` and `email`. Stop words are dropped and a trailing
+    plural `s` is removed.
+    """
+    terms = []
+    for raw in _TOKEN_PATTERN.findall(text):
+        term = raw.lower()
+        if term in _STOP_WORDS:
+            continue
+        if len(term) > 3 and term.endswith("s") and not term.endswith("ss"):  # noqa: PLR2004
+            term = term[:-1]
+        terms.append(term)
+    return terms
+
+
+def tool_document(tool: Tool) -> str:
+    """Get the text a tool is indexed by: its id, name, description and argument names."""
+    arg_names = " ".join(tool.args_schema.model_fields)
+    return f"{tool.id} {tool.name} {tool.description} {arg_names}"
+
+
+class ToolIndex(ABC):
+    """Base class for retrieval indexes over a set of tools.
+
+    Indexes are keyed by tool id. Re-adding a tool with the same id replaces its entry.
+    """
+
+    @abstractmethod
+    def add(self, tool: Tool) -> None:
+        """Add a tool to the index, replacing any tool with the same id."""
+
+    @abstractmethod
+    def remove(self, tool_id: str) -> None:
+        """Remove a tool from the index if present."""
+
+    @abstractmethod
+    def scores(self, query: str) -> dict[str, float]:
+        """Score the indexed tools against a query.
+
+        Returns:
+            dict[str, float]: The relevance of each tool id with a positive score.
+
+        """
+
+    @abstractmethod
+    def copy(self) -> ToolIndex:
+        """Create an independent copy of the index."""
+
+    def sync(self, tools: Mapping[str, Tool]) -> None:
+        """Bring the index in line with a set of tools.
+
+        Only tools which were added, replaced or removed since the last sync are re-indexed.
+        """
+        indexed = self._indexed_tools()
+        for tool_id in indexed.keys() - tools.keys():
+            self.remove(tool_id)
+        for tool_id, tool in tools.items():
+            if indexed.get(tool_id) is not tool:
+                self.add(tool)
+
+    def top_k(self, query: str, tools: Iterable[Tool], k: int) -> list[Tool]:
+        """Get the k tools most relevant to a query.
+
+        Tools are ranked by score, falling back on the order given for tools with equal scores, so
+        tools which don't match the query fill any remaining places.
+        """
+        scores = self.scores(query)
+        ranked = sorted(
+            enumerate(tools),
+            key=lambda item: (-scores.get(item[1].id, 0.0), item[0]),
+        )
+        return [tool for _, tool in ranked[:k]]
+
+    @abstractmethod
+    def _indexed_tools(self) -> dict[str, Tool]:
+        """Get the tools currently indexed, keyed by id."""
+
+
+class BM25ToolIndex(ToolIndex):
+    """Okapi BM25 index over each tool's id, name, description and argument names."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75) -> None:
+        """Initialize an empty index.
+
+        Args:
+            k1 (float): Controls how quickly repeated terms stop adding to a tool's score.
+            b (float): Controls how much long descriptions are penalised.
+
+        """
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._tools: dict[str, Tool] = {}
+        self._term_counts: dict[str, Counter[str]] = {}
+        self._postings: dict[str, set[str]] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        """Return the number of tools indexed."""
+        return len(self._tools)
+
+    def add(self, tool: Tool) -> None:
+        """Add a tool to the index, replacing any tool with the same id."""
+        term_counts = Counter(tokenize(tool_document(tool)))
+        with self._lock:
+            self._remove(tool.id)
+            self._tools[tool.id] = tool
+            self._term_counts[tool.id] = term_counts
+            self._total_length += term_counts.total()
+            for term in term_counts:
+                self._postings.setdefault(term, set()).add(tool.id)
+
+    def remove(self, tool_id: str) -> None:
+        """Remove a tool from the index if present."""
+        with self._lock:
+            self._remove(tool_id)
+
+    def scores(self, query: str) -> dict[str, float]:
+        """Score the indexed tools against a query using BM25."""
+        with self._lock:
+            count = len(self._tools)
+            if not count:
+                return {}
+            average_length = self._total_length / count or 1.0
+            scores: dict[str, float] = {}
+            for term in set(tokenize(query)):
+                tool_ids = self._postings.get(term)
+                if not tool_ids:
+                    continue
+                idf = math.log(1 + (count - len(tool_ids) + 0.5) / (len(tool_ids) + 0.5))
+                for tool_id in tool_ids:
+                    term_counts = self._term_counts[tool_id]
+                    frequency = term_counts[term]
+                    length_norm = 1 - self.b + self.b * term_counts.total() / average_length
+                    scores[tool_id] = scores.get(tool_id, 0.0) + idf * (
+                        frequency * (self.k1 + 1) / (frequency + self.k1 * length_norm)
+                    )
+            return scores
+
+    def copy(self) -> BM25ToolIndex:
+        """Create an independent copy of the index without re-tokenizing any tools."""
+        index = BM25ToolIndex(k1=self.k1, b=self.b)
+        index.merge(self)
+        return index
+
+    def entries(self) -> list[tuple[Tool, Counter[str]]]:
+        """Get each indexed tool along with the counts of the terms it is indexed by."""
+        with self._lock:
+            return [(self._tools[tool_id], self._term_counts[tool_id]) for tool_id in self._tools]
+
+    def merge(self, other: BM25ToolIndex) -> None:
+        """Add every tool indexed by another BM25 index without re-tokenizing them."""
+        for tool, term_counts in other.entries():
+            with self._lock:
+                self._remove(tool.id)
+                self._tools[tool.id] = tool
+                self._term_counts[tool.id] = term_counts
+                self._total_length += term_counts.total()
+                for term in term_counts:
+                    self._postings.setdefault(term, set()).add(tool.id)
+
+    def _indexed_tools(self) -> dict[str, Tool]:
+        with self._lock:
+            return dict(self._tools)
+
+    def _remove(self, tool_id: str) -> None:
+        """Remove a tool from the index. The caller must hold the lock."""
+        term_counts = self._term_counts.pop(tool_id, None)
+        self._tools.pop(tool_id, None)
+        if term_counts is None:
+            return
+        self._total_length -= term_counts.total()
+        for term in term_counts:
+            tool_ids = self._postings[term]
+            tool_ids.discard(tool_id)
+            if not tool_ids:
+                del self._postings[term]
+
+
+class EmbeddingToolIndex(ToolIndex):
+    """Semantic index ranking tools by the cosine similarity of their embeddings to a query.
+
+    Any LangChain Embeddings implementation can be used. To keep retrieval offline, use a locally
+    hosted model, e.g. HuggingFaceEmbeddings from langchain-huggingface.
+    """
+
+    def __init__(self, embeddings: Embeddings) -> None:
+        """Initialize an empty index.
+
+        Args:
+            embeddings (Embeddings): The model used to embed tools and queries.
+
+        """
+        self.embeddings = embeddings
+        self._lock = threading.Lock()
+        self._tools: dict[str, Tool] = {}
+        self._vectors: dict[str, list[float]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of tools indexed."""
+        return len(self._tools)
+
+    def add(self, tool: Tool) -> None:
+        """Embed a tool and add it to the index, replacing any tool with the same id."""
+        self._add_many([tool])
+
+    def remove(self, tool_id: str) -> None:
+        """Remove a tool from the index if present."""
+        with self._lock:
+            self._tools.pop(tool_id, None)
+            self._vectors.pop(tool_id, None)
+
+    def sync(self, tools: Mapping[str, Tool]) -> None:
+        """Bring the index in line with a set of tools, embedding new tools in a single batch."""
+        indexed = self._indexed_tools()
+        for tool_id in indexed.keys() - tools.keys():
+            self.remove(tool_id)
+        self._add_many(
+            [tool for tool_id, tool in tools.items() if indexed.get(tool_id) is not tool]
+        )
+
+    def scores(self, query: str) -> dict[str, float]:
+        """Score the indexed tools by cosine similarity to the query."""
+        with self._lock:
+            vectors = dict(self._vectors)
+        if not vectors:
+            return {}
+        query_vector = _normalize(self.embeddings.embed_query(query))
+        return {
+            tool_id: sum(q * v for q, v in zip(query_vector, vector, strict=True))
+            for tool_id, vector in vectors.items()
+        }
+
+    def copy(self) -> EmbeddingToolIndex:
+        """Create an independent copy of the index without re-embedding any tools."""
+        index = EmbeddingToolIndex(self.embeddings)
+        index.merge(self)
+        return index
+
+    def entries(self) -> list[tuple[Tool, list[float]]]:
+        """Get each indexed tool along with its normalized embedding."""
+        with self._lock:
+            return [(self._tools[tool_id], self._vectors[tool_id]) for tool_id in self._tools]
+
+    def merge(self, other: EmbeddingToolIndex) -> None:
+        """Add every tool indexed by another embedding index without re-embedding them."""
+        entries = other.entries()
+        with self._lock:
+            for tool, vector in entries:
+                self._tools[tool.id] = tool
+                self._vectors[tool.id] = vector
+
+    def _indexed_tools(self) -> dict[str, Tool]:
+        with self._lock:
+            return dict(self._tools)
+
+    def _add_many(self, tools: list[Tool]) -> None:
+        """Embed tools in a single batch and add them to the index."""
+        if not tools:
+            return
+        vectors = self.embeddings.embed_documents([tool_document(tool) for tool in tools])
+        with self._lock:
+            for tool, vector in zip(tools, vectors, strict=True):
+                self._tools[tool.id] = tool
+                self._vectors[tool.id] = _normalize(vector)
+
+
+def _normalize(vector: list[float]) -> list[float]:
+    """Scale a vector to unit length so dot products give cosine similarity."""
+    norm = math.sqrt(sum(value * value for value in vector))
+    return [value / norm for value in vector] if norm else vector
@@ -16,9 +16,12 @@ Classes:
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import json
 import os
 import re
 import threading
+from collections import OrderedDict
 from enum import StrEnum
 from functools import partial
 from typing import (
@@ -33,6 +36,7 @@ from typing import (
 )
 
 import httpx
+import mcp
 from jsonref import replace_refs
 from pydantic import (
     BaseModel,
@@ -66,11 +70,12 @@ from portia.open_source_tools.map_tool import MapTool
 from portia.open_source_tools.search_tool import SearchTool
 from portia.open_source_tools.weather import WeatherTool
 from portia.tool import PortiaMcpTool, PortiaRemoteTool, Tool
+from portia.tool_catalog_cache import RawToolCatalog, ToolCatalogCache, fingerprint
+from portia.tool_index import BM25ToolIndex, ToolIndex
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Coroutine, Iterator, Sequence
 
-    import mcp
     from pydantic_core.core_schema import SerializerFunctionWrapHandler
 
     from portia.config import Config
@@ -95,6 +100,12 @@ class ToolRegistry:
             Retrieves all tools in the registry.
         match_tools(query: str | None = None, tool_ids: list[str] | None = None) -> list[Tool]:
             Optionally, retrieve tools that match a given query and tool_ids.
+        with_tool_index(
+            index: ToolIndex | None = None,
+            *,
+            max_matched_tools: int | None = DEFAULT_MAX_MATCHED_TOOLS,
+        ) -> ToolRegistry:
+            Configure the retrieval index and cap used by match_tools.
         filter_tools(predicate: Callable[[Tool], bool]) -> ToolRegistry:
             Create a new tool registry with only the tools that match the predicate. Useful to
             implement tool exclusions.
@@ -108,6 +119,9 @@ class ToolRegistry:
 
     """
 
+    DEFAULT_MAX_MATCHED_TOOLS: ClassVar[int] = 50
+    """The number of tools match_tools returns for a query before retrieval is used."""
+
     def __init__(self, tools: dict[str, Tool] | Sequence[Tool] | None = None) -> None:
         """Initialize the tool registry with a sequence or dictionary of tools.
 
@@ -122,6 +136,9 @@ class ToolRegistry:
             self._tools = {tool.id: tool for tool in tools}
         else:
             self._tools = tools
+        self._tool_index: ToolIndex | None = None
+        self._tool_index_lock = threading.Lock()
+        self._max_matched_tools: int | None = self.DEFAULT_MAX_MATCHED_TOOLS
 
     def with_tool(self, tool: Tool, *, overwrite: bool = False) -> None:
         """Update a tool based on tool ID or inserts a new tool.
@@ -137,6 +154,8 @@ class ToolRegistry:
         if tool.id in self._tools and not overwrite:
             raise DuplicateToolError(tool.id)
         self._tools[tool.id] = tool
+        if self._tool_index is not None:
+            self._tool_index.add(tool)
 
     def replace_tool(self, tool: Tool) -> None:
         """Replace a tool with a new tool.
@@ -178,7 +197,7 @@ class ToolRegistry:
 
     def match_tools(
         self,
-        query: str | None = None,  # noqa: ARG002 - useful to have variable name
+        query: str | None = None,
         tool_ids: list[str] | None = None,
     ) -> list[Tool]:
         """Provide a set of tools that match a given query and tool_ids.
@@ -192,14 +211,61 @@ class ToolRegistry:
 
         This method is useful to implement tool filtering whereby only a selection of tools are
         passed to the PlanningAgent based on the query.
-        This method is optional to implement and will default to providing all tools.
+        If tool_ids are given, the tools with those ids are returned. Otherwise, registries with
+        more tools than the cap set with `with_tool_index` return the tools most relevant to the
+        query according to the registry's ToolIndex, and smaller registries return all tools. The
+        number of tools kept and dropped is logged whenever the tools are narrowed down.
 
         """
-        return (
-            [tool for tool in self.get_tools() if tool.id in tool_ids]
-            if tool_ids
-            else self.get_tools()
+        if tool_ids:
+            return [tool for tool in self.get_tools() if tool.id in tool_ids]
+        tools = self.get_tools()
+        if not query or self._max_matched_tools is None or len(tools) <= self._max_matched_tools:
+            return tools
+        index = self._get_tool_index({tool.id: tool for tool in tools})
+        matched_tools = index.top_k(query, tools, self._max_matched_tools)
+        logger().info(
+            f"Matched {len(matched_tools)} of {len(tools)} tools to the query, dropping "
+            f"{len(tools) - len(matched_tools)}. Use with_tool_index(max_matched_tools=...) to "
+            "change how many tools are kept.",
         )
+        return matched_tools
+
+    def with_tool_index(
+        self,
+        index: ToolIndex | None = None,
+        *,
+        max_matched_tools: int | None = DEFAULT_MAX_MATCHED_TOOLS,
+    ) -> ToolRegistry:
+        """Configure how match_tools narrows the registry down to the tools relevant to a query.
+
+        Args:
+            index (ToolIndex | None): The index used to rank tools against a query. Defaults to a
+                BM25ToolIndex over each tool's id, name, description and argument names.
+            max_matched_tools (int | None): The most tools match_tools returns for a query. If
+                None, all tools are returned.
+
+        Returns:
+            Self: The tool registry is updated in place and returned.
+
+        """
+        self._tool_index = index
+        self._max_matched_tools = max_matched_tools
+        return self
+
+    @property
+    def tool_index(self) -> ToolIndex | None:
+        """The index match_tools ranks tools with, or None if it hasn't been needed yet."""
+        return self._tool_index
+
+    def _get_tool_index(self, tools: dict[str, Tool]) -> ToolIndex:
+        """Get the registry's tool index, creating it if needed, in line with the given tools."""
+        with self._tool_index_lock:
+            if self._tool_index is None:
+                self._tool_index = BM25ToolIndex()
+            index = self._tool_index
+        index.sync(tools)
+        return index
 
     def filter_tools(self, predicate: Callable[[Tool], bool]) -> ToolRegistry:
         """Filter the tools in the registry based on a predicate.
@@ -211,7 +277,12 @@ class ToolRegistry:
             Self: A new ToolRegistry with the filtered tools.
 
         """
-        return ToolRegistry({tool.id: tool for tool in self._tools.values() if predicate(tool)})
+        return ToolRegistry(
+            {tool.id: tool for tool in self._tools.values() if predicate(tool)},
+        ).with_tool_index(
+            self._tool_index.copy() if self._tool_index is not None else None,
+            max_matched_tools=self._max_matched_tools,
+        )
 
     def with_tool_description(
         self, tool_id: str, updated_description: str, *, overwrite: bool = False
@@ -296,7 +367,16 @@ class ToolRegistry:
                 )
             tools[tool.id] = tool
 
-        return ToolRegistry(tools)
+        # Reuse what has already been indexed, so the new registry's index is built incrementally
+        index = self._tool_index.copy() if self._tool_index is not None else None
+        if isinstance(index, BM25ToolIndex) and isinstance(
+            other_registry.tool_index, BM25ToolIndex
+        ):
+            index.merge(other_registry.tool_index)
+        return ToolRegistry(tools).with_tool_index(
+            index,
+            max_matched_tools=self._max_matched_tools,
+        )
 
 
 class InMemoryToolRegistry(ToolRegistry):
@@ -334,6 +414,7 @@ class PortiaToolRegistry(ToolRegistry):
         config: Config | None = None,
         client: httpx.Client | None = None,
         tools: dict[str, Tool] | Sequence[Tool] | None = None,
+        catalog_cache: ToolCatalogCache | None = None,
     ) -> None:
         """Initialize the PortiaToolRegistry with the given configuration.
 
@@ -343,15 +424,20 @@ class PortiaToolRegistry(ToolRegistry):
               client will be created.
             tools (dict[str, Tool] | None): A dictionary of tool IDs to tools to create the
               registry with. If not provided, all tools will be loaded from the Portia API.
+            catalog_cache (ToolCatalogCache | None): A cache to load the tools from instead of the
+              Portia API when possible. Defaults to the cache configured by
+              config.tool_catalog_cache_path, if any.
 
         """
+        if catalog_cache is None and config is not None:
+            catalog_cache = ToolCatalogCache.from_config(config)
         if tools is not None:
             super().__init__(tools)
         elif client is not None:
-            super().__init__(self._load_tools(client))
+            super().__init__(self._load_tools(client, catalog_cache))
         elif config is not None:
             client = PortiaCloudClient.new_client(config)
-            super().__init__(self._load_tools(client))
+            super().__init__(self._load_tools(client, catalog_cache))
         else:
             raise ValueError("Either config, client or tools must be provided")
 
@@ -367,24 +453,21 @@ class PortiaToolRegistry(ToolRegistry):
         return PortiaToolRegistry(tools=self.filter_tools(default_tool_filter).get_tools())
 
     @classmethod
-    def _load_tools(cls, client: httpx.Client) -> dict[str, Tool]:
-        """Load the tools from the API into the into the internal storage."""
-        response = client.get(
-            url="/api/v0/tools/descriptions-v2/",
-        )
-        if response.status_code == httpx.codes.NOT_FOUND:
-            response = client.get(
-                url="/api/v0/tools/descriptions/",
-            )
-            response_tools = response.json()
+    def _load_tools(
+        cls,
+        client: httpx.Client,
+        catalog_cache: ToolCatalogCache | None = None,
+    ) -> dict[str, Tool]:
+        """Load the tools from the API, or from the catalog cache if given, into the storage."""
+        if catalog_cache is None:
+            response_tools = cls._fetch_tool_catalog(client)
         else:
-            response.raise_for_status()
-            response_tools = response.json().get("tools", [])
-            for error in response.json().get("errors", []):
-                logger().warning(
-                    f"Error loading Portia Cloud tool for app: {error['app_name']}: "
-                    f"{error['error']}"
-                )
+            authorization = client.headers.get("Authorization", "")
+            response_tools = catalog_cache.load(
+                key=f"portia:{client.base_url}",
+                server_fingerprint=fingerprint(str(client.base_url), authorization),
+                fetch=lambda: cls._fetch_tool_catalog(client),
+            )
         tools = {}
         for raw_tool in response_tools:
             tool = PortiaRemoteTool(
@@ -406,11 +489,35 @@ class PortiaToolRegistry(ToolRegistry):
             tools[raw_tool["tool_id"]] = tool
         return tools
 
+    @classmethod
+    def _fetch_tool_catalog(cls, client: httpx.Client) -> RawToolCatalog:
+        """Fetch the raw descriptions of the tools from the API."""
+        response = client.get(
+            url="/api/v0/tools/descriptions-v2/",
+        )
+        if response.status_code == httpx.codes.NOT_FOUND:
+            response = client.get(
+                url="/api/v0/tools/descriptions/",
+            )
+            response_tools = response.json()
+        else:
+            response.raise_for_status()
+            response_tools = response.json().get("tools", [])
+            for error in response.json().get("errors", []):
+                logger().warning(
+                    f"Error loading Portia Cloud tool for app: {error['app_name']}: "
+                    f"{error['error']}"
+                )
+        return response_tools
+
 
 class McpToolRegistry(ToolRegistry):
     """Provides access to tools within a Model Context Protocol (MCP) server.
 
     See https://modelcontextprotocol.io/introduction for more information on MCP.
+
+    Each constructor accepts a ToolCatalogCache, which the tools the server lists are cached in so
+    that later loads don't need to connect to the server (see portia.tool_catalog_cache).
     """
 
     @classmethod
@@ -423,6 +530,7 @@ class McpToolRegistry(ToolRegistry):
         sse_read_timeout: float = 60 * 5,
         tool_list_read_timeout: float | None = None,
         tool_call_timeout_seconds: float | None = None,
+        catalog_cache: ToolCatalogCache | None = None,
     ) -> McpToolRegistry:
         """Create a new MCPToolRegistry using an SSE connection (Sync version)."""
         config = SseMcpClientConfig(
@@ -433,7 +541,11 @@ class McpToolRegistry(ToolRegistry):
             sse_read_timeout=sse_read_timeout,
             tool_call_timeout_seconds=tool_call_timeout_seconds,
         )
-        tools = cls._load_tools(config, read_timeout=tool_list_read_timeout)
+        tools = cls._load_tools(
+            config,
+            read_timeout=tool_list_read_timeout,
+            catalog_cache=catalog_cache,
+        )
         return cls(tools)
 
     @classmethod
@@ -446,6 +558,7 @@ class McpToolRegistry(ToolRegistry):
         sse_read_timeout: float = 60 * 5,
         tool_list_read_timeout: float | None = None,
         tool_call_timeout_seconds: float | None = None,
+        catalog_cache: ToolCatalogCache | None = None,
     ) -> McpToolRegistry:
         """Create a new MCPToolRegistry using an SSE connection (Async version)."""
         config = SseMcpClientConfig(
@@ -456,7 +569,11 @@ class McpToolRegistry(ToolRegistry):
             sse_read_timeout=sse_read_timeout,
             tool_call_timeout_seconds=tool_call_timeout_seconds,
         )
-        tools = await cls._load_tools_async(config, read_timeout=tool_list_read_timeout)
+        tools = await cls._load_tools_async(
+            config,
+            read_timeout=tool_list_read_timeout,
+            catalog_cache=catalog_cache,
+        )
         return cls(tools)
 
     @classmethod
@@ -470,6 +587,7 @@ class McpToolRegistry(ToolRegistry):
         encoding_error_handler: Literal["strict", "ignore", "replace"] = "strict",
         tool_list_read_timeout: float | None = None,
         tool_call_timeout_seconds: float | None = None,
+        catalog_cache: ToolCatalogCache | None = None,
     ) -> McpToolRegistry:
         """Create a new MCPToolRegistry using a stdio connection (Sync version)."""
         config = StdioMcpClientConfig(
@@ -481,7 +599,11 @@ class McpToolRegistry(ToolRegistry):
             encoding_error_handler=encoding_error_handler,
             tool_call_timeout_seconds=tool_call_timeout_seconds,
         )
-        tools = cls._load_tools(config, read_timeout=tool_list_read_timeout)
+        tools = cls._load_tools(
+            config,
+            read_timeout=tool_list_read_timeout,
+            catalog_cache=catalog_cache,
+        )
         return cls(tools)
 
     @classmethod
@@ -490,6 +612,7 @@ class McpToolRegistry(ToolRegistry):
         config: str | dict[str, Any],
         tool_list_read_timeout: float | None = None,
         tool_call_timeout_seconds: float | None = None,
+        catalog_cache: ToolCatalogCache | None = None,
     ) -> McpToolRegistry:
         """Create a new MCPToolRegistry using a stdio connection from a string.
 
@@ -499,6 +622,7 @@ class McpToolRegistry(ToolRegistry):
             config: The string or dict to parse.
             tool_list_read_timeout: The timeout for the request.
             tool_call_timeout_seconds: The timeout for the tool call.
+            catalog_cache: A cache to load the tools from instead of the server when possible.
 
         Returns:
             A McpToolRegistry.
@@ -506,7 +630,11 @@ class McpToolRegistry(ToolRegistry):
         """
         parsed_config = StdioMcpClientConfig.from_raw(config)
         parsed_config.tool_call_timeout_seconds = tool_call_timeout_seconds
-        tools = cls._load_tools(parsed_config, read_timeout=tool_list_read_timeout)
+        tools = cls._load_tools(
+            parsed_config,
+            read_timeout=tool_list_read_timeout,
+            catalog_cache=catalog_cache,
+        )
         return cls(tools)
 
     @classmethod
@@ -520,6 +648,7 @@ class McpToolRegistry(ToolRegistry):
         encoding_error_handler: Literal["strict", "ignore", "replace"] = "strict",
         tool_list_read_timeout: float | None = None,
         tool_call_timeout_seconds: float | None = None,
+        catalog_cache: ToolCatalogCache | None = None,
     ) -> McpToolRegistry:
         """Create a new MCPToolRegistry using a stdio connection (Async version)."""
         config = StdioMcpClientConfig(
@@ -531,7 +660,11 @@ class McpToolRegistry(ToolRegistry):
             encoding_error_handler=encoding_error_handler,
             tool_call_timeout_seconds=tool_call_timeout_seconds,
         )
-        tools = await cls._load_tools_async(config, read_timeout=tool_list_read_timeout)
+        tools = await cls._load_tools_async(
+            config,
+            read_timeout=tool_list_read_timeout,
+            catalog_cache=catalog_cache,
+        )
         return cls(tools)
 
     @classmethod
@@ -547,6 +680,7 @@ class McpToolRegistry(ToolRegistry):
         auth: httpx.Auth | None = None,
         tool_list_read_timeout: float | None = None,
         tool_call_timeout_seconds: float | None = None,
+        catalog_cache: ToolCatalogCache | None = None,
     ) -> McpToolRegistry:
         """Create a new MCPToolRegistry using a StreamableHTTP connection (Sync version)."""
         config = StreamableHttpMcpClientConfig(
@@ -559,7 +693,11 @@ class McpToolRegistry(ToolRegistry):
             auth=auth,
             tool_call_timeout_seconds=tool_call_timeout_seconds,
         )
-        tools = cls._load_tools(config, read_timeout=tool_list_read_timeout)
+        tools = cls._load_tools(
+            config,
+            read_timeout=tool_list_read_timeout,
+            catalog_cache=catalog_cache,
+        )
         return cls(tools)
 
     @classmethod
@@ -575,6 +713,7 @@ class McpToolRegistry(ToolRegistry):
         auth: httpx.Auth | None = None,
         tool_list_read_timeout: float | None = None,
         tool_call_timeout_seconds: float | None = None,
+        catalog_cache: ToolCatalogCache | None = None,
     ) -> McpToolRegistry:
         """Create a new MCPToolRegistry using a StreamableHTTP connection (Async version)."""
         config = StreamableHttpMcpClientConfig(
@@ -587,7 +726,11 @@ class McpToolRegistry(ToolRegistry):
             auth=auth,
             tool_call_timeout_seconds=tool_call_timeout_seconds,
         )
-        tools = await cls._load_tools_async(config, read_timeout=tool_list_read_timeout)
+        tools = await cls._load_tools_async(
+            config,
+            read_timeout=tool_list_read_timeout,
+            catalog_cache=catalog_cache,
+        )
         return cls(tools)
 
     @classmethod
@@ -596,6 +739,7 @@ class McpToolRegistry(ToolRegistry):
         mcp_client_config: McpClientConfig,
         *,
         read_timeout: float | None = None,
+        catalog_cache: ToolCatalogCache | None = None,
     ) -> list[PortiaMcpTool]:
         """Sync version to load tools from an MCP server."""
         T = TypeVar("T")
@@ -637,7 +781,11 @@ class McpToolRegistry(ToolRegistry):
             asyncio.set_event_loop(loop)
 
         return _run_async_in_new_loop(
-            cls._load_tools_async(mcp_client_config, read_timeout=read_timeout),
+            cls._load_tools_async(
+                mcp_client_config,
+                read_timeout=read_timeout,
+                catalog_cache=catalog_cache,
+            ),
         )
 
     @classmethod
@@ -646,6 +794,7 @@ class McpToolRegistry(ToolRegistry):
         mcp_client_config: McpClientConfig,
         *,
         read_timeout: float | None = None,
+        catalog_cache: ToolCatalogCache | None = None,
     ) -> list[PortiaMcpTool]:
         """Async version to load tools from an MCP server.
 
@@ -655,31 +804,50 @@ class McpToolRegistry(ToolRegistry):
         Args:
             mcp_client_config (McpClientConfig): The MCP client configuration.
             read_timeout (float): The timeout for the request.
+            catalog_cache (ToolCatalogCache | None): A cache to load the tools from instead of
+                the server when possible.
 
         Returns:
             list[PortiaMcpTool]: The list of Portia MCP tools.
 
         """
 
-        async def _inner() -> list[PortiaMcpTool]:
+        async def _inner() -> RawToolCatalog:
             """Inner function to wrap in wait_for to implement timeout."""
             async with get_mcp_session(mcp_client_config) as session:
                 logger().debug("Fetching tools from MCP server")
                 tools = await session.list_tools()
                 logger().debug(f"Got {len(tools.tools)} tools from MCP server")
-                return [
-                    portia_tool
-                    for tool in tools.tools
-                    if (
-                        portia_tool := cls._portia_tool_from_mcp_tool(
-                            tool,
-                            mcp_client_config,
-                        )
-                    )
-                    is not None
-                ]
-
-        return await asyncio.wait_for(_inner(), timeout=read_timeout)
+                return [tool.model_dump(mode="json") for tool in tools.tools]
+
+        async def fetch() -> RawToolCatalog:
+            return await asyncio.wait_for(_inner(), timeout=read_timeout)
+
+        if catalog_cache is None:
+            raw_tools = await fetch()
+        else:
+            raw_tools = await catalog_cache.aload(
+                key=f"mcp:{mcp_client_config.server_name}",
+                server_fingerprint=fingerprint(
+                    type(mcp_client_config).__name__,
+                    mcp_client_config.model_dump(
+                        mode="json",
+                        include={"command", "args", "env", "url", "headers"},
+                    ),
+                ),
+                fetch=fetch,
+            )
+        return [
+            portia_tool
+            for raw_tool in raw_tools
+            if (
+                portia_tool := cls._portia_tool_from_mcp_tool(
+                    mcp.Tool.model_validate(raw_tool),
+                    mcp_client_config,
+                )
+            )
+            is not None
+        ]
 
     @classmethod
     def _portia_tool_from_mcp_tool(
@@ -780,6 +948,12 @@ class GeneratedBaseModel(BaseModel):
 
 BaseModelT = TypeVar("BaseModelT", bound=BaseModel)
 
+MAX_GENERATED_MODELS = 4_096
+"""MAX_GENERATED_MODELS bounds the models kept by generate_pydantic_model_from_json_schema."""
+
+_generated_models: OrderedDict[str, type[BaseModel]] = OrderedDict()
+_generated_models_lock = threading.Lock()
+
 
 def _additional_properties_validator(
     self: BaseModelT,
@@ -803,6 +977,10 @@ def generate_pydantic_model_from_json_schema(
 ) -> type[BaseModel]:
     """Generate a Pydantic model based on a JSON schema.
 
+    Models are cached by their name and the content of their schema, so that identical schemas,
+    e.g. from reloading a registry or from tools shared by several registries, produce the same
+    class and are only generated once. This includes the models of nested objects.
+
     Args:
         model_name (str): The name of the Pydantic model.
         json_schema (dict[str, Any]): The schema to generate the model from.
@@ -811,6 +989,24 @@ def generate_pydantic_model_from_json_schema(
         type[BaseModel]: The generated Pydantic model class.
 
     """
+    key = hashlib.sha256(
+        json.dumps([model_name, json_schema], sort_keys=True, default=str).encode(),
+    ).hexdigest()
+    with _generated_models_lock:
+        if (model := _generated_models.get(key)) is not None:
+            _generated_models.move_to_end(key)
+            return model
+    model = _generate_pydantic_model(model_name, json_schema)
+    with _generated_models_lock:
+        # Another thread may have generated the same model meanwhile, so keep the first one
+        model = _generated_models.setdefault(key, model)
+        while len(_generated_models) > MAX_GENERATED_MODELS:
+            _generated_models.popitem(last=False)
+    return model
+
+
+def _generate_pydantic_model(model_name: str, json_schema: dict[str, Any]) -> type[BaseModel]:
+    """Generate a Pydantic model based on a JSON schema, without caching it."""
     schema_without_refs = replace_refs(json_schema, proxies=False)
 
     # Extract properties and required fields
@@ -95,8 +95,60 @@ class ToolCallWrapper(Tool):
                 status is set to `FAILED`.
 
         """
-        # initialize empty call record
+        record = self._start_record(ctx, *args, **kwargs)
+        start_time = datetime.now(tz=UTC)
+        try:
+            output = self._child_tool.run(ctx, *args, **kwargs)
+        except Exception as e:
+            self._finish_record(record, start_time, error=e)
+            self._storage.save_tool_call(record)
+            # persist changes to the end_user
+            self._storage.save_end_user(ctx.end_user)
+            raise
+        self._finish_record(record, start_time, output=output)
+        self._storage.save_tool_call(record)
+        # persist changes to the end_user
+        self._storage.save_end_user(ctx.end_user)
+        return output
+
+    async def arun(self, ctx: ToolRunContext, *args: Any, **kwargs: Any) -> Any | Clarification:  # noqa: ANN401
+        """Async run the child tool and store the outcome.
+
+        This records the same details as `run`. Child tools implementing arun are awaited directly,
+        while tools which only implement the blocking run are run on a shared thread pool so they
+        don't block the event loop.
 
+        Args:
+            ctx (ToolRunContext): The context containing user data and metadata.
+            *args (Any): Positional arguments for the child tool.
+            **kwargs (Any): Keyword arguments for the child tool.
+
+        Returns:
+            Any | Clarification: The output of the child tool or a clarification request.
+
+        Raises:
+            Exception: If an error occurs during execution, the exception is logged, and the
+                status is set to `FAILED`.
+
+        """
+        record = self._start_record(ctx, *args, **kwargs)
+        start_time = datetime.now(tz=UTC)
+        try:
+            output = await self._child_tool.arun_without_blocking(ctx, *args, **kwargs)
+        except Exception as e:
+            self._finish_record(record, start_time, error=e)
+            await self._storage.asave_tool_call(record)
+            # persist changes to the end_user
+            await self._storage.asave_end_user(ctx.end_user)
+            raise
+        self._finish_record(record, start_time, output=output)
+        await self._storage.asave_tool_call(record)
+        # persist changes to the end_user
+        await self._storage.asave_end_user(ctx.end_user)
+        return output
+
+    def _start_record(self, ctx: ToolRunContext, *args: Any, **kwargs: Any) -> ToolCallRecord:
+        """Create the call record for a call to the child tool and log the call."""
         record = ToolCallRecord(
             input=combine_args_kwargs(*args, **kwargs),
             output=None,
@@ -116,30 +168,26 @@ class ToolCallWrapper(Tool):
         logger().info(
             f"Invoking {record.tool_name!s} with args: {truncated_input}",
         )
-        start_time = datetime.now(tz=UTC)
-        try:
-            output = self._child_tool.run(ctx, *args, **kwargs)
-        except Exception as e:
-            # handle the tool call record
-            record.output = str(e)
-            record.latency_seconds = (datetime.now(tz=UTC) - start_time).total_seconds()
+        return record
+
+    def _finish_record(
+        self,
+        record: ToolCallRecord,
+        start_time: datetime,
+        output: Any | Clarification = None,  # noqa: ANN401
+        error: Exception | None = None,
+    ) -> None:
+        """Update the call record with the outcome of the call to the child tool."""
+        if error is not None:
+            record.output = str(error)
             record.status = ToolCallStatus.FAILED
-            self._storage.save_tool_call(record)
-            # persist changes to the end_user
-            self._storage.save_end_user(ctx.end_user)
-            raise
+        elif isinstance(output, Clarification):
+            record.status = ToolCallStatus.NEED_CLARIFICATION
+            record.output = output.model_dump(mode="json")
+        elif output is None:
+            record.output = LocalDataValue(value=output).model_dump(mode="json")
+            record.status = ToolCallStatus.SUCCESS
         else:
-            if isinstance(output, Clarification):
-                record.status = ToolCallStatus.NEED_CLARIFICATION
-                record.output = output.model_dump(mode="json")
-            elif output is None:
-                record.output = LocalDataValue(value=output).model_dump(mode="json")
-                record.status = ToolCallStatus.SUCCESS
-            else:
-                record.output = output
-                record.status = ToolCallStatus.SUCCESS
-            record.latency_seconds = (datetime.now(tz=UTC) - start_time).total_seconds()
-            self._storage.save_tool_call(record)
-            # persist changes to the end_user
-            self._storage.save_end_user(ctx.end_user)
-        return output
+            record.output = output
+            record.status = ToolCallStatus.SUCCESS
+        record.latency_seconds = (datetime.now(tz=UTC) - start_time).total_seconds()
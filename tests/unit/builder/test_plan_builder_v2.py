@@ -4,12 +4,19 @@ from __future__ import annotations
 
 from typing import Any
 
+import pytest
 from pydantic import BaseModel
 
-from portia.builder.plan_builder_v2 import PlanBuilderV2
+from portia.builder.plan_builder_v2 import PlanBuilderError, PlanBuilderV2
 from portia.builder.plan_v2 import PlanV2
-from portia.builder.reference import Input, StepOutput
-from portia.builder.step_v2 import FunctionStep, InvokeToolStep, LLMStep, SingleToolAgentStep
+from portia.builder.reference import Input, MapItem, StepOutput
+from portia.builder.step_v2 import (
+    FunctionStep,
+    InvokeToolStep,
+    LLMStep,
+    MapStep,
+    SingleToolAgentStep,
+)
 from portia.tool import Tool
 
 
@@ -467,3 +474,75 @@ class TestPlanBuilderV2:
         assert isinstance(func_step, FunctionStep)
         assert isinstance(func_step.args["y"], StepOutput)
         assert func_step.args["y"].step == 1
+
+    def test_parallel_block(self) -> None:
+        """Test steps added between parallel_ and end_parallel share a parallel block."""
+        plan = (
+            PlanBuilderV2()
+            .llm_step(task="First")
+            .parallel_()
+            .llm_step(task="Second", inputs=[StepOutput(0)])
+            .invoke_tool_step(tool="search_tool", args={"query": StepOutput(0)})
+            .end_parallel()
+            .llm_step(task="Fourth", inputs=[StepOutput(1), StepOutput(2)])
+            .build()
+        )
+
+        assert plan.steps[0].parallel_block is None
+        assert plan.steps[1].parallel_block is not None
+        assert plan.steps[1].parallel_block is plan.steps[2].parallel_block
+        assert plan.steps[1].parallel_block.step_indexes == [1, 2]
+        assert plan.steps[3].parallel_block is None
+
+    def test_parallel_block_errors(self) -> None:
+        """Test invalid parallel blocks are rejected."""
+        with pytest.raises(PlanBuilderError, match="end_parallel must be called"):
+            PlanBuilderV2().end_parallel()
+        with pytest.raises(PlanBuilderError, match="parallel_ cannot be called"):
+            PlanBuilderV2().parallel_().parallel_()
+        with pytest.raises(PlanBuilderError, match="if_ cannot be called"):
+            PlanBuilderV2().parallel_().if_(condition=lambda: True)
+        with pytest.raises(PlanBuilderError, match="An end_parallel must be called"):
+            PlanBuilderV2().parallel_().llm_step(task="First").build()
+        with pytest.raises(PlanBuilderError, match="in the same parallel block"):
+            (
+                PlanBuilderV2()
+                .parallel_()
+                .llm_step(task="First", step_name="first")
+                .llm_step(task="Second", inputs=[StepOutput("first")])
+                .end_parallel()
+            )
+
+    def test_map_steps(self) -> None:
+        """Test adding map steps."""
+        plan = (
+            PlanBuilderV2()
+            .input(name="questions")
+            .map_llm_step(
+                over=Input("questions"),
+                task="Research the question",
+                inputs=[MapItem()],
+                max_concurrency=2,
+            )
+            .map_invoke_tool_step(
+                over=StepOutput(0),
+                tool="search_tool",
+                args={"query": MapItem()},
+                step_name="search",
+            )
+            .build()
+        )
+
+        llm_map_step = plan.steps[0]
+        assert isinstance(llm_map_step, MapStep)
+        assert llm_map_step.step_name == "step_0"
+        assert llm_map_step.max_concurrency == 2
+        assert isinstance(llm_map_step.step, LLMStep)
+        assert llm_map_step.step.task == "Research the question"
+
+        tool_map_step = plan.steps[1]
+        assert isinstance(tool_map_step, MapStep)
+        assert tool_map_step.step_name == "search"
+        assert tool_map_step.max_concurrency is None
+        assert isinstance(tool_map_step.step, InvokeToolStep)
+        assert isinstance(tool_map_step.step.args["query"], MapItem)
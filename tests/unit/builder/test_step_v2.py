@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import TYPE_CHECKING, Any
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 from pydantic import BaseModel
 
-from portia.builder.reference import Input, ReferenceValue, StepOutput
+from portia.builder.reference import Input, MapItem, ReferenceValue, StepOutput
 from portia.errors import ToolNotFoundError
 
 if TYPE_CHECKING:
@@ -17,11 +18,13 @@ from portia.builder.step_v2 import (
     FunctionStep,
     InvokeToolStep,
     LLMStep,
+    MapStep,
     SingleToolAgentStep,
     StepV2,
 )
 from portia.clarification import ClarificationCategory
 from portia.execution_agents.output import LocalDataValue
+from portia.execution_hooks import ExecutionHooks
 from portia.model import Message
 from portia.plan import Step as PlanStep
 from portia.plan import Variable
@@ -255,6 +258,7 @@ class TestLLMStep:
         """Test LLMStep run with no inputs."""
         step = LLMStep(task="Analyze data", step_name="analysis")
         mock_run_data = Mock()
+        mock_run_data.portia.execution_hooks = ExecutionHooks()
 
         with (
             patch("portia.builder.step_v2.LLMTool") as mock_llm_tool_class,
@@ -274,11 +278,36 @@ class TestLLMStep:
             assert call_args[1]["task"] == "Analyze data"
             assert call_args[1]["task_data"] == []
 
+    @pytest.mark.asyncio
+    async def test_llm_step_run_streams_to_hook(self) -> None:
+        """Test LLMStep streams its response to the on_llm_response_chunk hook."""
+        step = LLMStep(task="Analyze data", step_name="analysis")
+        legacy_step = PlanStep(task="Analyze data", output="$analysis")
+        chunks = []
+        mock_run_data = Mock()
+        mock_run_data.portia.execution_hooks = ExecutionHooks(
+            on_llm_response_chunk=lambda plan_run, step, chunk: chunks.append(
+                (plan_run, step, chunk)
+            ),
+        )
+
+        with (
+            patch.object(LLMStep, "to_legacy_step", return_value=legacy_step),
+            patch("portia.builder.step_v2.ToolRunContext") as mock_tool_ctx_class,
+            patch("portia.builder.step_v2.LLMTool.arun", return_value="Done"),
+        ):
+            await step.run(mock_run_data)
+
+        stream_callback = mock_tool_ctx_class.call_args.kwargs["stream_callback"]
+        stream_callback("Partial")
+        assert chunks == [(mock_run_data.plan_run, legacy_step, "Partial")]
+
     @pytest.mark.asyncio
     async def test_llm_step_run_one_regular_input(self) -> None:
         """Test LLMStep run with one regular value input."""
         step = LLMStep(task="Process text", step_name="process", inputs=["Hello world"])
         mock_run_data = Mock()
+        mock_run_data.portia.execution_hooks = ExecutionHooks()
 
         with (
             patch("portia.builder.step_v2.LLMTool") as mock_llm_tool_class,
@@ -303,6 +332,7 @@ class TestLLMStep:
         reference_input = StepOutput(0)
         step = LLMStep(task="Summarize result", step_name="summarize", inputs=[reference_input])
         mock_run_data = Mock()
+        mock_run_data.portia.execution_hooks = ExecutionHooks()
         mock_run_data.portia.storage = Mock()
 
         mock_data_value = LocalDataValue(value="Previous step result")
@@ -339,6 +369,7 @@ class TestLLMStep:
             inputs=["Context info", ref1, "Additional data", ref2],
         )
         mock_run_data = Mock()
+        mock_run_data.portia.execution_hooks = ExecutionHooks()
         mock_run_data.portia.storage = Mock()
 
         mock_data_value1 = LocalDataValue(value="John")
@@ -487,7 +518,8 @@ class TestInvokeToolStep:
         step = InvokeToolStep(tool="mock_tool", step_name="run_tool", args={"query": "search term"})
         mock_run_data = Mock()
         mock_tool = Mock()
-        mock_tool.run.return_value = "tool result"
+        mock_tool.arun_without_blocking = AsyncMock()
+        mock_tool.arun_without_blocking.return_value = "tool result"
 
         with (
             patch.object(mock_run_data.portia, "get_tool") as mock_get_tool,
@@ -500,8 +532,8 @@ class TestInvokeToolStep:
 
             assert result == "tool result"
             mock_get_tool.assert_called_once_with("mock_tool", mock_run_data.plan_run)
-            mock_tool.run.assert_called_once()
-            call_args = mock_tool.run.call_args
+            mock_tool.arun_without_blocking.assert_awaited_once()
+            call_args = mock_tool.arun_without_blocking.call_args
             assert call_args[1]["query"] == "search term"
 
     @pytest.mark.asyncio
@@ -515,7 +547,8 @@ class TestInvokeToolStep:
         )
         mock_run_data = Mock()
         mock_tool = Mock()
-        mock_tool.run.return_value = "raw tool result"
+        mock_tool.arun_without_blocking = AsyncMock()
+        mock_tool.arun_without_blocking.return_value = "raw tool result"
 
         # Mock the model and its aget_structured_response method
         mock_model = Mock()
@@ -537,7 +570,7 @@ class TestInvokeToolStep:
             assert isinstance(result, MockOutputSchema)
             assert result.result == "structured result"
             mock_get_tool.assert_called_once_with("mock_tool", mock_run_data.plan_run)
-            mock_tool.run.assert_called_once()
+            mock_tool.arun_without_blocking.assert_awaited_once()
             mock_model.aget_structured_response.assert_called_once()
 
     @pytest.mark.asyncio
@@ -550,7 +583,8 @@ class TestInvokeToolStep:
         mock_run_data = Mock()
         mock_run_data.portia.storage = Mock()
         mock_tool = Mock()
-        mock_tool.run.return_value = "tool result with reference"
+        mock_tool.arun_without_blocking = AsyncMock()
+        mock_tool.arun_without_blocking.return_value = "tool result with reference"
 
         # Create proper ReferenceValue that the real methods can work with
         mock_data_value = LocalDataValue(value="previous step output")
@@ -569,8 +603,8 @@ class TestInvokeToolStep:
 
             assert result == "tool result with reference"
             mock_get_tool.assert_called_once_with("mock_tool", mock_run_data.plan_run)
-            mock_tool.run.assert_called_once()
-            call_args = mock_tool.run.call_args
+            mock_tool.arun_without_blocking.assert_awaited_once()
+            call_args = mock_tool.arun_without_blocking.call_args
             assert call_args[1]["query"] == "previous step output"
 
     @pytest.mark.asyncio
@@ -591,7 +625,8 @@ class TestInvokeToolStep:
         mock_run_data = Mock()
         mock_run_data.portia.storage = Mock()
         mock_tool = Mock()
-        mock_tool.run.return_value = "mixed inputs result"
+        mock_tool.arun_without_blocking = AsyncMock()
+        mock_tool.arun_without_blocking.return_value = "mixed inputs result"
 
         mock_data_value1 = LocalDataValue(value="user question")
         mock_ref1_value = ReferenceValue(value=mock_data_value1, description="User input")
@@ -614,8 +649,8 @@ class TestInvokeToolStep:
 
             assert result == "mixed inputs result"
             mock_get_tool.assert_called_once_with("mock_tool", mock_run_data.plan_run)
-            mock_tool.run.assert_called_once()
-            call_args = mock_tool.run.call_args[1]
+            mock_tool.arun_without_blocking.assert_awaited_once()
+            call_args = mock_tool.arun_without_blocking.call_args[1]
             assert call_args["context"] == "static context"
             assert call_args["user_input"] == "user question"
             assert call_args["limit"] == 10
@@ -635,7 +670,7 @@ class TestInvokeToolStep:
             user_guidance="Need more information",
             plan_run_id=None,
         )
-        mock_tool.run.return_value = mock_clarification
+        mock_tool.arun_without_blocking = AsyncMock(return_value=mock_clarification)
 
         with (
             patch.object(mock_run_data.portia, "get_tool") as mock_get_tool,
@@ -650,7 +685,7 @@ class TestInvokeToolStep:
             assert result.user_guidance == "Need more information"
             assert result.plan_run_id == mock_run_data.plan_run.id
             mock_get_tool.assert_called_once_with("mock_tool", mock_run_data.plan_run)
-            mock_tool.run.assert_called_once_with(mock_ctx_class.return_value)
+            mock_tool.arun_without_blocking.assert_awaited_once_with(mock_ctx_class.return_value)
 
     @pytest.mark.asyncio
     async def test_invoke_tool_step_with_tool_instance(self) -> None:
@@ -993,3 +1028,89 @@ class TestSingleToolAgent:
             assert len(legacy_step.inputs) == 2
             assert legacy_step.inputs[0].name == "query"
             assert legacy_step.inputs[1].name == "step_0_output"
+
+
+class TestMapStep:
+    """Test cases for the MapStep class."""
+
+    @pytest.mark.asyncio
+    async def test_map_step_runs_step_for_each_item(self) -> None:
+        """Test MapStep runs its step for each item with limited concurrency."""
+        step = MapStep(
+            over=StepOutput(0),
+            step=LLMStep(task="Research", inputs=[MapItem()], step_name="research_item"),
+            max_concurrency=2,
+            step_name="research",
+        )
+        mock_run_data = Mock()
+        mock_run_data.portia.execution_hooks = ExecutionHooks()
+        running = 0
+        max_running = 0
+
+        async def fake_arun(_: object, task: str, task_data: list[str]) -> str:  # noqa: ARG001
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return task_data[0].rsplit(" ", 1)[-1]
+
+        with (
+            patch.object(
+                step.over,
+                "get_value",
+                return_value=ReferenceValue(value=LocalDataValue(value=["a", "b", "c", "d"])),
+            ),
+            patch("portia.builder.step_v2.ToolRunContext"),
+            patch("portia.builder.step_v2.LLMTool.arun", side_effect=fake_arun),
+        ):
+            result = await step.run(mock_run_data)
+
+        assert result == ["a", "b", "c", "d"]
+        assert max_running == 2
+
+    @pytest.mark.asyncio
+    async def test_map_step_requires_list(self) -> None:
+        """Test MapStep raises an error if the value mapped over isn't a list."""
+        step = MapStep(
+            over=StepOutput(0),
+            step=LLMStep(task="Research", step_name="research_item"),
+            step_name="research",
+        )
+
+        with (
+            patch.object(
+                step.over,
+                "get_value",
+                return_value=ReferenceValue(value=LocalDataValue(value="not a list")),
+            ),
+            pytest.raises(TypeError, match="MapStep can only map over a list"),
+        ):
+            await step.run(Mock())
+
+    def test_map_step_to_legacy_step(self) -> None:
+        """Test MapStep to_legacy_step method."""
+        over = StepOutput(0)
+        step = MapStep(
+            over=over,
+            step=InvokeToolStep(
+                tool="search_tool",
+                args={"query": MapItem(), "limit": 10},
+                step_name="search_item",
+            ),
+            step_name="search",
+        )
+        mock_plan = Mock()
+        mock_plan.step_output_name.return_value = "$search_output"
+
+        with patch.object(over, "get_legacy_name", return_value="$step_0_output"):
+            legacy_step = step.to_legacy_step(mock_plan)
+
+        assert isinstance(legacy_step, PlanStep)
+        assert legacy_step.task == (
+            "For each item in $step_0_output: Use tool search_tool with inputs: "
+            "query=$map_item, limit=10"
+        )
+        assert legacy_step.tool_id == "search_tool"
+        assert legacy_step.output == "$search_output"
+        assert [variable.name for variable in legacy_step.inputs] == ["$step_0_output"]
@@ -2,17 +2,29 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
 from unittest.mock import MagicMock
 
 import pytest
 
 from portia.config import FEATURE_FLAG_AGENT_MEMORY_ENABLED, GenerativeModelsConfig
+from portia.mcp_session import close_mcp_session_pools
 from portia.model import GenerativeModel
 from portia.portia import Portia
 from portia.telemetry.telemetry_service import BaseProductTelemetry
 from portia.tool_registry import ToolRegistry
 from tests.utils import AdditionTool, ClarificationTool, get_test_config
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+@pytest.fixture(autouse=True)
+def reset_mcp_session_pools() -> Iterator[None]:
+    """Ensure pooled MCP sessions (which may wrap mocks) do not leak between tests."""
+    yield
+    close_mcp_session_pools()
+
 
 @pytest.fixture
 def telemetry() -> MagicMock:
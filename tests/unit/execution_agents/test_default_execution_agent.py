@@ -9,7 +9,7 @@ from unittest import mock
 
 import pytest
 from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
-from langgraph.graph import END
+from langgraph.graph import END, StateGraph
 from langgraph.prebuilt import ToolNode
 from pydantic import BaseModel, Field
 
@@ -27,6 +27,7 @@ from portia.execution_agents.default_execution_agent import (
     VerifiedToolArgument,
     VerifiedToolInputs,
     VerifierModel,
+    get_default_execution_graph,
 )
 from portia.execution_agents.memory_extraction import MemoryExtractionStep
 from portia.execution_agents.output import LocalDataValue, Output
@@ -961,6 +962,47 @@ def test_basic_agent_task_with_verified_args(monkeypatch: pytest.MonkeyPatch) ->
     assert output.get_value() == "Sent email with id: 0"
 
 
+def test_default_execution_agent_compiles_graph_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the execution graph is compiled once and shared between steps."""
+    tool = AdditionTool()
+
+    def tool_calling_model(self, state):  # noqa: ANN001, ANN202, ARG001
+        response = AIMessage(content="")
+        response.tool_calls = [
+            {"name": "add_tool", "type": "tool_call", "id": "call_1", "args": {"a": 1, "b": 2}},
+        ]
+        return {"messages": [response]}
+
+    def tool_call(self, input, config):  # noqa: A002, ANN001, ANN202, ARG001
+        return {
+            "messages": ToolMessage(
+                content="3", artifact=LocalDataValue(value=3), tool_call_id="call_1"
+            ),
+        }
+
+    monkeypatch.setattr(ToolCallingModel, "invoke", tool_calling_model)
+    monkeypatch.setattr(ToolNode, "invoke", tool_call)
+    get_default_execution_graph.cache_clear()
+
+    with mock.patch.object(
+        StateGraph, "compile", autospec=True, side_effect=StateGraph.compile
+    ) as (mock_compile):
+        for _ in range(2):
+            (plan, plan_run) = get_test_plan_run()
+            agent = DefaultExecutionAgent(
+                plan=plan,
+                plan_run=plan_run,
+                config=get_test_config(),
+                end_user=EndUser(external_id="123"),
+                tool=tool,
+                agent_memory=InMemoryStorage(),
+            )
+            agent.verified_args = VerifiedToolInputs(args=[])
+            assert agent.execute_sync().get_value() == 3
+
+    assert mock_compile.call_count == 1
+
+
 def test_default_execution_agent_edge_cases() -> None:
     """Tests edge cases are handled."""
     agent = SimpleNamespace(
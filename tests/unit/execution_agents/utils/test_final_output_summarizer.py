@@ -131,6 +131,27 @@ def test_summarizer_agent_handles_empty_response(
     assert output is None
 
 
+def test_summarizer_agent_streams_summary(
+    summarizer_config: Config,
+    mock_summarizer_model: mock.MagicMock,
+) -> None:
+    """Test that the summary is streamed to the stream callback when one is set."""
+    (plan, plan_run) = get_test_plan_run()
+    chunks: list[str] = []
+    mock_summarizer_model.stream_response.return_value = iter(["It is ", "sunny"])
+
+    summarizer = FinalOutputSummarizer(
+        config=summarizer_config,
+        agent_memory=InMemoryStorage(),
+        stream_callback=chunks.append,
+    )
+    output = summarizer.create_summary(plan=plan, plan_run=plan_run)
+
+    assert output == "It is sunny"
+    assert chunks == ["It is ", "sunny"]
+    mock_summarizer_model.get_response.assert_not_called()
+
+
 def test_build_tasks_and_outputs_context(
     summarizer_config: Config,
 ) -> None:
@@ -1,5 +1,6 @@
 """tests for llm tool."""
 
+from collections.abc import AsyncIterator
 from unittest.mock import MagicMock
 
 import pytest
@@ -171,6 +172,30 @@ async def test_llm_tool_async_plan_run(
     assert result == "Test async response content"
 
 
+@pytest.mark.asyncio
+async def test_llm_tool_streams_response(
+    mock_llm_tool: LLMTool,
+    mock_tool_run_context: ToolRunContext,
+    mock_model: MagicMock,
+) -> None:
+    """Test that LLMTool streams its response to the stream callback when one is set."""
+    chunks: list[str] = []
+    mock_tool_run_context.stream_callback = chunks.append
+    mock_model.stream_response.return_value = iter(["The capital ", "is Paris"])
+
+    async def astream_response(_: list[Message]) -> AsyncIterator[str]:
+        for chunk in ["Paris ", "it is"]:
+            yield chunk
+
+    mock_model.astream_response.side_effect = astream_response
+
+    assert mock_llm_tool.run(mock_tool_run_context, "Capital of France?") == "The capital is Paris"
+    assert await mock_llm_tool.arun(mock_tool_run_context, "Capital of France?") == "Paris it is"
+    assert chunks == ["The capital ", "is Paris", "Paris ", "it is"]
+    mock_model.get_response.assert_not_called()
+    mock_model.aget_response.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_llm_tool_async_structured_output_run(
     mock_llm_tool: LLMTool,
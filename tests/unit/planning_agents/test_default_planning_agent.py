@@ -4,19 +4,27 @@ from __future__ import annotations
 
 import re
 from typing import TYPE_CHECKING
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
+from pydantic import BaseModel, Field
 
 from portia.end_user import EndUser
 from portia.open_source_tools.llm_tool import LLMTool
 from portia.plan import Plan, PlanContext, PlanInput, Step, Variable
 from portia.planning_agents.base_planning_agent import BasePlanningAgent, StepsOrError
 from portia.planning_agents.context import (
+    build_planning_prompt,
+    get_tool_descriptions_for_tools,
     render_prompt_insert_defaults,
 )
 from portia.planning_agents.default_planning_agent import DefaultPlanningAgent
-from tests.utils import AdditionTool, get_mock_generative_model, get_test_config
+from tests.utils import (
+    AdditionTool,
+    ClarificationTool,
+    get_mock_generative_model,
+    get_test_config,
+)
 
 if TYPE_CHECKING:
     from portia.config import Config
@@ -127,11 +135,11 @@ def test_render_prompt() -> None:
     )
 
     overall_pattern = re.compile(
-        r"<PreviousErrors>(.*?)</PreviousErrors>.*?<SystemContext>(.*?)</SystemContext>.*?<Example>(.*?)</Example>.*?<Tools>(.*?)</Tools>.*?<Request>(.*?)</Request>.*?",
+        r"<Tools>(.*?)</Tools>.*?<Example>(.*?)</Example>.*?<SystemContext>(.*?)</SystemContext>.*?<PreviousErrors>(.*?)</PreviousErrors>.*?<Request>(.*?)</Request>.*?",
         re.DOTALL,
     )
 
-    previous_errors_content, system_context, example_match, tools_content, request_content = (
+    tools_content, example_match, system_context, previous_errors_content, request_content = (
         overall_pattern.findall(
             rendered_prompt,
         )[0]
@@ -169,6 +177,88 @@ def test_render_prompt() -> None:
     assert "test error" in previous_errors_content
 
 
+def test_render_prompt_stable_prefix() -> None:
+    """Test prompts for different requests share everything before the per-request context."""
+    first = render_prompt_insert_defaults(
+        query="first query",
+        tool_list=[AdditionTool(), ClarificationTool()],
+        end_user=EndUser(external_id="123", name="Alice"),
+    )
+    second = render_prompt_insert_defaults(
+        query="second query",
+        tool_list=[ClarificationTool(), AdditionTool()],
+        end_user=EndUser(external_id="456", name="Bob"),
+        previous_errors=["test error"],
+    )
+
+    prefix = first[: first.index("<SystemContext>")]
+    assert "<Tools>" in prefix
+    assert "<Examples>" in prefix
+    assert "first query" not in prefix
+    assert second.startswith(prefix)
+
+
+def test_get_tool_descriptions_for_tools_caches_descriptions() -> None:
+    """Test a tool's argument schema is only generated once until the tool changes."""
+
+    class CachedArgsSchema(BaseModel):
+        text: str = Field(description="The text to use")
+
+    tool = AdditionTool(args_schema=CachedArgsSchema)
+    same_tool = AdditionTool(args_schema=CachedArgsSchema)
+    with patch.object(
+        CachedArgsSchema,
+        "model_json_schema",
+        wraps=CachedArgsSchema.model_json_schema,
+    ) as mock_schema:
+        first = get_tool_descriptions_for_tools([tool])
+        second = get_tool_descriptions_for_tools([tool, same_tool])
+        assert mock_schema.call_count == 1
+
+        tool.description = "An updated description"
+        updated = get_tool_descriptions_for_tools([tool])
+        assert mock_schema.call_count == 2
+
+    assert first[0] == second[0] == second[1]
+    assert first[0]["args"] == {
+        "text": {"description": "The text to use", "title": "Text", "type": "string"},
+    }
+    assert updated[0]["description"] == "An updated description"
+
+
+def test_generate_steps_or_error_renders_prompt_once(mock_config: Config) -> None:
+    """Test retries reuse the rendered prompt, only adding the errors from previous attempts."""
+    mock_model = get_mock_generative_model(
+        response=StepsOrError(
+            steps=[Step(task="Calculate sum", tool_id="no_tool_1", output="$result")],
+            error=None,
+        ),
+    )
+    mock_config.get_planning_model.return_value = mock_model  # type: ignore[reportFunctionMemberAccess]
+    planning_agent = DefaultPlanningAgent(mock_config)
+
+    with patch(
+        "portia.planning_agents.default_planning_agent.build_planning_prompt",
+        wraps=build_planning_prompt,
+    ) as mock_build:
+        planning_agent.generate_steps_or_error(
+            query="Calculate something",
+            tool_list=[AdditionTool()],
+            end_user=EndUser(external_id="123"),
+        )
+
+    mock_build.assert_called_once()
+    prompts = [
+        call.args[0][1].content
+        for call in mock_model._client.invoke.call_args_list  # pyright: ignore[reportAttributeAccessIssue]
+    ]
+    assert len(prompts) == 3
+    assert "<PreviousErrors>" not in prompts[0]
+    assert "Attempt 1" in prompts[1]
+    assert "Attempt 2" not in prompts[1]
+    assert "Attempt 2" in prompts[2]
+
+
 def test_generate_steps_or_error_invalid_tool_id(mock_config: Config) -> None:
     """Test handling of invalid tool ID in generated steps."""
     query = "Calculate something"
@@ -0,0 +1,138 @@
+"""Tests for running batches of items."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import threading
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+
+from portia.batch import BatchRunResult, arun_batch, run_batch
+from portia.plan import PlanUUID
+from portia.plan_run import PlanRun, PlanRunState
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+def _plan_run(state: PlanRunState = PlanRunState.COMPLETE) -> PlanRun:
+    return PlanRun(plan_id=PlanUUID(), end_user_id="test", state=state)
+
+
+def test_run_batch_bounds_concurrency_and_records_errors() -> None:
+    """Test at most max_concurrency items run at once and failures don't stop the batch."""
+    lock = threading.Lock()
+    running = 0
+    most_running = 0
+
+    def run_item(item: int) -> PlanRun:
+        nonlocal running, most_running
+        with lock:
+            running += 1
+            most_running = max(most_running, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+        if item == 3:
+            raise ValueError("boom")
+        return _plan_run(PlanRunState.FAILED if item == 4 else PlanRunState.COMPLETE)
+
+    results = sorted(run_batch(run_item, range(10), max_concurrency=3), key=lambda r: r.index)
+
+    assert most_running == 3
+    assert [result.item for result in results] == list(range(10))
+    assert [result.succeeded for result in results] == [
+        True,
+        True,
+        True,
+        False,
+        False,
+        True,
+        True,
+        True,
+        True,
+        True,
+    ]
+    assert isinstance(results[3].error, ValueError)
+    assert results[3].plan_run is None
+    assert results[4].error is None
+    assert results[4].plan_run is not None
+
+
+def test_run_batch_consumes_items_lazily() -> None:
+    """Test items are only taken from the input as earlier ones finish."""
+    taken: list[int] = []
+
+    def items() -> Iterator[int]:
+        for item in range(100):
+            taken.append(item)
+            yield item
+
+    results = run_batch(lambda _: _plan_run(), items(), max_concurrency=2)
+    next(results)
+    assert len(taken) <= 3
+    results.close()
+
+    with pytest.raises(ValueError, match="max_concurrency"):
+        next(run_batch(lambda _: _plan_run(), [1], max_concurrency=0))
+
+
+_batch_context: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "batch_context",
+    default=None,
+)
+
+
+def test_run_batch_runs_items_in_the_callers_context() -> None:
+    """Test items see context variables set by the caller, such as the LLM cache."""
+    seen: list[str | None] = []
+
+    def run_item(_: int) -> PlanRun:
+        seen.append(_batch_context.get())
+        return _plan_run()
+
+    def run() -> None:
+        _batch_context.set("cache")
+        list(run_batch(run_item, range(4), max_concurrency=2))
+
+    contextvars.copy_context().run(run)
+
+    assert seen == ["cache"] * 4
+
+
+def test_arun_batch_bounds_concurrency_and_records_errors() -> None:
+    """Test the async batch bounds concurrency and yields results as items complete."""
+    running = 0
+    most_running = 0
+
+    async def collect() -> list[BatchRunResult]:
+        # Items are released in reverse order, each once the previous one's result is yielded
+        released = [asyncio.Event() for _ in range(5)]
+
+        async def run_item(item: int) -> PlanRun:
+            nonlocal running, most_running
+            running += 1
+            most_running = max(most_running, running)
+            await released[item].wait()
+            running -= 1
+            if item == 0:
+                raise ValueError("boom")
+            return _plan_run()
+
+        results = []
+        released[4].set()
+        async for result in arun_batch(run_item, range(5), max_concurrency=5):
+            results.append(result)
+            if result.index > 0:
+                released[result.index - 1].set()
+        return results
+
+    results = asyncio.run(collect())
+
+    assert most_running == 5
+    assert [result.index for result in results] == [4, 3, 2, 1, 0]
+    assert [result.succeeded for result in results] == [True, True, True, True, False]
+    assert isinstance(results[-1].error, ValueError)
@@ -0,0 +1,80 @@
+"""Tests for the offline benchmark runner."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from click.testing import CliRunner
+
+from benchmarks.__main__ import cli
+from benchmarks.runner import (
+    BenchmarkResult,
+    BenchmarkRun,
+    find_regressions,
+    run_benchmark,
+    select_benchmarks,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_benchmark_result_from_timings() -> None:
+    """Test timings are summarised in seconds per call."""
+    result = BenchmarkResult.from_timings([0.3, 0.1, 0.2, 0.4, 0.5])
+
+    assert result.iterations == 5
+    assert result.min == 0.1
+    assert result.median == 0.3
+    assert result.mean == 0.3
+    assert result.p95 == 0.5
+    assert result.skipped is None
+
+
+def test_run_benchmark_offline() -> None:
+    """Test benchmarks run against the fakes and ones needing the network are skipped."""
+    assert select_benchmarks(["storage.memory"]) == ["storage.memory.round_trip"]
+
+    result = run_benchmark("storage.memory.round_trip", iterations=3, warmup=1)
+    assert result.iterations == 3
+    assert result.median is not None
+
+    # Graphs are compiled on every call rather than served from the cache after warmup
+    compile_result = run_benchmark("execution.compile_graphs", iterations=2, warmup=1)
+    assert compile_result.median is not None
+    assert compile_result.median > 0
+
+    skipped = run_benchmark("storage.cloud.round_trip")
+    assert skipped.median is None
+    assert skipped.skipped == "Portia Cloud storage needs network access"
+
+
+def test_find_regressions_and_compare(tmp_path: Path) -> None:
+    """Test benchmarks slower than the threshold are regressions and fail the compare command."""
+    baseline = BenchmarkRun(
+        results={
+            "fast": BenchmarkResult.from_timings([1.0]),
+            "slow": BenchmarkResult.from_timings([1.0]),
+            "skipped": BenchmarkResult(skipped="No network"),
+        },
+    )
+    current = BenchmarkRun(
+        results={
+            "fast": BenchmarkResult.from_timings([1.1]),
+            "slow": BenchmarkResult.from_timings([1.5]),
+            "skipped": BenchmarkResult.from_timings([1.0]),
+            "new": BenchmarkResult.from_timings([1.0]),
+        },
+    )
+
+    regressions = find_regressions(baseline, current, threshold=0.2)
+    assert [regression.name for regression in regressions] == ["slow"]
+    assert regressions[0].ratio == 1.5
+
+    baseline.save(tmp_path / "baseline.json")
+    current.save(tmp_path / "current.json")
+    assert BenchmarkRun.load(tmp_path / "current.json") == current
+    runner = CliRunner()
+    args = ["compare", str(tmp_path / "baseline.json"), str(tmp_path / "current.json")]
+    assert runner.invoke(cli, args).exit_code == 1
+    assert runner.invoke(cli, [*args, "--threshold", "0.6"]).exit_code == 0
@@ -2,6 +2,7 @@
 
 import re
 from collections.abc import Iterator
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -11,6 +12,8 @@ from portia.cli import cli
 from portia.config import Config, StorageClass
 from portia.model import GenerativeModel, LLMProvider
 from portia.open_source_tools.llm_tool import LLMTool
+from portia.plan import Plan, PlanContext
+from portia.storage import DiskFileStorage
 
 
 @pytest.fixture(autouse=True)
@@ -205,6 +208,18 @@ def test_cli_list_tools() -> None:
     assert llm_tool.name in result.output
 
 
+def test_cli_rebuild_storage_index(tmp_path: Path) -> None:
+    """Test the CLI rebuild-storage-index command."""
+    plan = Plan(plan_context=PlanContext(query="query", tool_ids=[]), steps=[])
+    (tmp_path / f"{plan.id}.json").write_text(plan.model_dump_json())
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["rebuild-storage-index", "--storage-dir", str(tmp_path)])
+    assert result.exit_code == 0
+    assert "Indexed 1 plans and plan runs" in result.output
+    assert DiskFileStorage(storage_dir=str(tmp_path)).get_plan_by_query("query") == plan
+
+
 def test_cli_version() -> None:
     """Test the CLI version command."""
     runner = CliRunner()
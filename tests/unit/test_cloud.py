@@ -0,0 +1,67 @@
+"""Tests for the Portia Cloud HTTP clients."""
+
+import asyncio
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from portia.cloud import PortiaCloudClient, aclose_shared_async_clients, get_shared_async_client
+from tests.utils import get_test_config
+
+
+def test_http_limits_from_config() -> None:
+    """Test the connection pool limits come from the config."""
+    config = get_test_config(
+        portia_http_max_connections=25,
+        portia_http_max_keepalive_connections=5,
+        portia_http_keepalive_expiry=12.5,
+    )
+    limits = PortiaCloudClient.http_limits(config)
+    assert limits.max_connections == 25
+    assert limits.max_keepalive_connections == 5
+    assert limits.keepalive_expiry == 12.5
+
+
+@pytest.mark.asyncio
+async def test_shared_async_client_is_reused() -> None:
+    """Test callers on the same event loop share one client per configuration."""
+    builder = PortiaCloudClient(get_test_config(portia_api_key="test-key"))
+    client = builder.shared_async_client()
+
+    assert builder.shared_async_client() is client
+    assert PortiaCloudClient(get_test_config(portia_api_key="test-key")).shared_async_client() is (
+        client
+    )
+    assert builder.shared_async_client(json_headers=False) is not client
+    assert client.headers["Authorization"] == "Api-Key test-key"
+
+    await aclose_shared_async_clients()
+    assert client.is_closed
+    assert builder.shared_async_client() is not client
+    await aclose_shared_async_clients()
+
+
+def test_shared_async_client_per_event_loop() -> None:
+    """Test each event loop gets its own client."""
+
+    async def get_client() -> httpx.AsyncClient:
+        return get_shared_async_client("https://api.fake-portia.test", {})
+
+    first = asyncio.run(get_client())
+    second = asyncio.run(get_client())
+    assert first is not second
+
+
+@pytest.mark.asyncio
+async def test_shared_async_client_keeps_connections_open(httpx_mock: HTTPXMock) -> None:
+    """Test the shared client stays open between requests."""
+    httpx_mock.add_response(url="https://api.fake-portia.test/ping/", json={}, is_reusable=True)
+    client = get_shared_async_client("https://api.fake-portia.test", {})
+
+    for _ in range(3):
+        response = await client.get("/ping/")
+        assert response.status_code == httpx.codes.OK
+    assert not client.is_closed
+    assert len(httpx_mock.get_requests()) == 3
+    await aclose_shared_async_clients()
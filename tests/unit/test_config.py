@@ -1,6 +1,8 @@
 """Tests for portia classes."""
 
 import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from unittest.mock import MagicMock
 
 import pytest
@@ -13,6 +15,7 @@ from portia.config import (
     Config,
     ExecutionAgentType,
     GenerativeModelsConfig,
+    LLMCacheBackend,
     LLMModel,
     LogLevel,
     PlanningAgentType,
@@ -20,6 +23,7 @@ from portia.config import (
     parse_str_to_enum,
 )
 from portia.errors import ConfigNotFoundError, InvalidConfigError
+from portia.llm_cache import InMemoryLLMCache, SQLiteLLMCache
 from portia.model import (
     AmazonBedrockGenerativeModel,
     AnthropicGenerativeModel,
@@ -164,6 +168,47 @@ def test_llm_redis_cache_url_kwarg(monkeypatch: pytest.MonkeyPatch) -> None:
     assert _llm_cache.get() is mock_redis_cache_instance
 
 
+def test_llm_cache_backend_memory(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The MEMORY LLM cache backend is shared between configs with the same budget."""
+    set_cache = MagicMock()
+    monkeypatch.setattr("portia.config.LangChainGenerativeModel.set_cache", set_cache)
+
+    Config.from_default(openai_api_key=SecretStr("123"), llm_cache_backend="memory")
+    Config.from_default(openai_api_key=SecretStr("123"), llm_cache_backend=LLMCacheBackend.MEMORY)
+
+    first, second = (call.args[0] for call in set_cache.call_args_list)
+    assert isinstance(first, InMemoryLLMCache)
+    assert first is second
+
+
+def test_llm_cache_backend_sqlite(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """The SQLITE LLM cache backend is read from environment variables."""
+    set_cache = MagicMock()
+    monkeypatch.setattr("portia.config.LangChainGenerativeModel.set_cache", set_cache)
+    monkeypatch.setenv("LLM_CACHE_BACKEND", "SQLITE")
+
+    config = Config.from_default(
+        openai_api_key=SecretStr("123"),
+        llm_cache_path=str(tmp_path / "llm.sqlite3"),
+        llm_cache_ttl_seconds=60,
+    )
+
+    assert config.llm_cache_backend == LLMCacheBackend.SQLITE
+    cache = set_cache.call_args.args[0]
+    assert isinstance(cache, SQLiteLLMCache)
+    assert cache.ttl_seconds == 60
+
+
+def test_llm_cache_backend_redis_requires_url() -> None:
+    """The REDIS LLM cache backend needs a Redis URL."""
+    with pytest.raises(InvalidConfigError):
+        Config.from_default(
+            openai_api_key=SecretStr("123"),
+            llm_cache_backend="redis",
+            llm_redis_cache_url=None,
+        )
+
+
 @pytest.mark.parametrize(
     ("model_string", "model_type", "present_env_vars"),
     [
@@ -574,6 +619,33 @@ def test_get_model(monkeypatch: pytest.MonkeyPatch) -> None:
     assert str(from_instsance) == "openai/gpt-4o-mini"
 
 
+def test_get_model_is_cached(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test models built from strings are built once and reused."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-openai-api-key")
+    c = Config.from_default(default_model="openai/gpt-4o")
+    assert c.get_default_model() is c.get_default_model()
+    assert c.get_execution_model() is c.get_default_model()
+    assert c.get_generative_model("openai/gpt-4o-mini") is not c.get_default_model()
+
+
+def test_get_model_cache_is_thread_safe(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test concurrent callers share a single model instance."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-openai-api-key")
+    c = Config.from_default(default_model="openai/gpt-4o")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        models = list(executor.map(lambda _: c.get_default_model(), range(16)))
+    assert all(model is models[0] for model in models)
+
+
+def test_get_model_cache_rebuilds_on_new_credentials(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test changing the provider credentials builds a new model."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-openai-api-key")
+    c = Config.from_default(default_model="openai/gpt-4o")
+    model = c.get_default_model()
+    c.openai_api_key = SecretStr("other-openai-api-key")
+    assert c.get_default_model() is not model
+
+
 @pytest.mark.parametrize(
     ("env_vars", "provider"),
     [
@@ -0,0 +1,123 @@
+"""Tests for the local LLM caches."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, Generation
+from pydantic import BaseModel
+
+from portia.llm_cache import (
+    InMemoryLLMCache,
+    LLMCacheStats,
+    SQLiteLLMCache,
+    deserialize_generations,
+    serialize_generations,
+)
+from portia.model import LangChainGenerativeModel, _llm_cache
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_serialize_generations_round_trip() -> None:
+    """Test chat and text generations survive serialization."""
+    generations = [
+        ChatGeneration(message=AIMessage(content="hello"), generation_info={"finish": "stop"}),
+        Generation(text="plain"),
+    ]
+    restored = deserialize_generations(serialize_generations(generations))
+    assert restored == generations
+    assert isinstance(restored[0], ChatGeneration)
+
+
+def test_in_memory_cache_hit_and_miss() -> None:
+    """Test lookups count hits, misses and the latency saved."""
+    cache = InMemoryLLMCache(max_bytes=10_000)
+
+    assert cache.lookup("prompt", "llm") is None
+    time.sleep(0.01)
+    cache.update("prompt", "llm", [Generation(text="response")])
+
+    assert cache.lookup("prompt", "llm") == [Generation(text="response")]
+    assert cache.lookup("prompt", "other-llm") is None
+    stats = cache.stats
+    assert stats.hits == 1
+    assert stats.misses == 2
+    assert stats.latency_saved_seconds >= 0.01
+    assert stats.hit_rate == pytest.approx(1 / 3)
+
+    cache.clear()
+    assert cache.stats == LLMCacheStats()
+    assert len(cache) == 0
+
+
+def test_in_memory_cache_evicts_least_recently_used() -> None:
+    """Test the cache stays within its byte budget by evicting the oldest entries."""
+    entry_size = len(serialize_generations([Generation(text="a")]).encode())
+    cache = InMemoryLLMCache(max_bytes=entry_size * 2)
+
+    cache.update("first", "llm", [Generation(text="a")])
+    cache.update("second", "llm", [Generation(text="b")])
+    assert cache.lookup("first", "llm") is not None
+    cache.update("third", "llm", [Generation(text="c")])
+
+    assert cache.lookup("second", "llm") is None
+    assert cache.lookup("first", "llm") is not None
+    assert cache.lookup("third", "llm") is not None
+    assert cache.size_bytes <= cache.max_bytes
+
+    cache.update("huge", "llm", [Generation(text="x" * entry_size * 2)])
+    assert cache.lookup("huge", "llm") is None
+    assert len(cache) == 2
+
+
+def test_sqlite_cache_persists_and_expires(tmp_path: Path) -> None:
+    """Test the SQLite cache is shared between instances and honours its TTL."""
+    path = tmp_path / "llm_cache.sqlite3"
+    SQLiteLLMCache(path, ttl_seconds=60).update("prompt", "llm", [Generation(text="response")])
+
+    cache = SQLiteLLMCache(path, ttl_seconds=60)
+    assert cache.lookup("prompt", "llm") == [Generation(text="response")]
+    assert cache.stats.hits == 1
+
+    expired = SQLiteLLMCache(path, ttl_seconds=60)
+    expired.ttl_seconds = 0
+    assert expired.lookup("prompt", "llm") is None
+
+    cache.clear()
+    assert cache.lookup("prompt", "llm") is None
+
+
+class _Response(BaseModel):
+    answer: str
+
+
+def test_instructor_call_uses_local_cache() -> None:
+    """Test structured output calls through instructor are served from a local cache."""
+    cache = InMemoryLLMCache(max_bytes=10_000)
+    client = MagicMock()
+    client.chat.completions.create.return_value = _Response(answer="42")
+    model = MagicMock(spec=LangChainGenerativeModel)
+    token = _llm_cache.set(cache)
+    try:
+        for _ in range(2):
+            response = LangChainGenerativeModel._cached_instructor_call(
+                model,
+                client,
+                [{"role": "user", "content": "question"}],
+                _Response,
+                provider="openai",
+                model="gpt-4o",
+            )
+            assert response == _Response(answer="42")
+    finally:
+        _llm_cache.reset(token)
+
+    client.chat.completions.create.assert_called_once()
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
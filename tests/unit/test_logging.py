@@ -1,15 +1,19 @@
 """Tests for logging functions."""
 
+import json
+import logging
 from datetime import UTC, datetime
+from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import Mock
 
 import pytest
 
-from portia.config import LogLevel
+from portia.config import LogFormat, LogLevel
 from portia.logger import (
     FUNCTION_COLOR_MAP,
     Formatter,
+    LazyMessage,
     LoggerInterface,
     LoggerManager,
     SafeLogger,
@@ -248,3 +252,47 @@ def test_formatter_sanitizes_stack_trace() -> None:
     assert " {value}" not in formatted
     # Stack traces should not be truncated by sanitizer when formatting exceptions
     assert "(truncated" not in formatted
+
+
+def test_safe_logger_lazy_messages_only_built_when_logged(tmp_path: Path) -> None:
+    """Test lazy messages are only built if their level is logged, in the JSON format."""
+    log_file = tmp_path / "portia.log"
+    logger_manager = LoggerManager()
+    logger_manager.configure_from_config(
+        Mock(
+            default_log_sink=str(log_file),
+            default_log_level=LogLevel.INFO,
+            default_log_format=LogFormat.JSON,
+            json_log_serialize=False,
+        ),
+    )
+    build = Mock(return_value="built <tag>")
+
+    logger_manager.logger.debug(build)
+    logger_manager.logger.debug(LazyMessage(build))
+    build.assert_not_called()
+
+    logger_manager.logger.info(build, plan="plan-123")
+    logger_manager.logger.info(LazyMessage(build))
+    assert build.call_count == 2
+
+    lines = [json.loads(line) for line in log_file.read_text().splitlines()]
+    assert [line["message"] for line in lines] == ["built <tag>"] * 2
+    assert lines[0]["level"] == "INFO"
+    assert lines[0]["extra"] == {"plan": "plan-123"}
+    assert "extra" not in lines[1]
+    assert lines[0]["function"] == "test_safe_logger_lazy_messages_only_built_when_logged"
+
+
+def test_safe_logger_lazy_messages_with_standard_logger() -> None:
+    """Test lazy messages are only built when logged by loggers from the logging module."""
+    standard_logger = logging.getLogger("portia.test_lazy_messages")
+    standard_logger.setLevel(logging.WARNING)
+    safe_logger = SafeLogger(standard_logger)  # pyright: ignore[reportArgumentType]
+    build = Mock(return_value="built")
+
+    safe_logger.debug(build)
+    build.assert_not_called()
+
+    safe_logger.warning(build)
+    build.assert_called_once()
@@ -0,0 +1,191 @@
+"""Tests for MCP session pooling."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import CancelledError
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock
+
+import anyio
+import pytest
+from mcp import ClientSession
+
+from portia.mcp_session import (
+    McpSessionPool,
+    SseMcpClientConfig,
+    StdioMcpClientConfig,
+    close_mcp_session_pools,
+    get_mcp_session_pool,
+    mcp_session_key,
+    run_mcp_coroutine_sync,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from portia.mcp_session import McpClientConfig
+
+
+class CountingSessionFactory:
+    """Session factory that records how many sessions were opened and closed."""
+
+    def __init__(self) -> None:
+        """Initialize the factory."""
+        self.opened = 0
+        self.closed = 0
+        self.sessions: list[MagicMock] = []
+
+    @asynccontextmanager
+    async def __call__(self, _: McpClientConfig) -> AsyncIterator[ClientSession]:
+        """Open a mock session."""
+        self.opened += 1
+        session = MagicMock(spec=ClientSession)
+        self.sessions.append(session)
+        try:
+            yield session
+        finally:
+            self.closed += 1
+
+
+def _stdio_config(**kwargs: float) -> StdioMcpClientConfig:
+    return StdioMcpClientConfig(server_name="mock_mcp", command="test", args=["a"], **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_session() -> None:
+    """Test that a session is opened once and reused across calls."""
+    factory = CountingSessionFactory()
+    pool = McpSessionPool()
+
+    async with pool.session(_stdio_config(), factory) as first:
+        pass
+    async with pool.session(_stdio_config(tool_call_timeout_seconds=3), factory) as second:
+        pass
+
+    assert first is second
+    assert factory.opened == 1
+    assert len(pool) == 1
+
+    await pool.aclose()
+    assert factory.closed == 1
+    assert len(pool) == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_separate_sessions_per_config() -> None:
+    """Test that different servers get different sessions."""
+    factory = CountingSessionFactory()
+    pool = McpSessionPool()
+
+    async with pool.session(_stdio_config(), factory):
+        pass
+    async with pool.session(SseMcpClientConfig(server_name="sse", url="http://x/sse"), factory):
+        pass
+
+    assert factory.opened == 2
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_pool_reconnects_after_connection_error() -> None:
+    """Test that a session which lost its connection is replaced on the next call."""
+    factory = CountingSessionFactory()
+    pool = McpSessionPool()
+
+    with pytest.raises(anyio.ClosedResourceError):
+        async with pool.session(_stdio_config(), factory):
+            raise anyio.ClosedResourceError
+
+    assert factory.closed == 1
+    async with pool.session(_stdio_config(), factory) as session:
+        assert session is factory.sessions[1]
+    assert factory.opened == 2
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_pool_reconnects_unhealthy_idle_session() -> None:
+    """Test that an idle session failing its ping is replaced."""
+    factory = CountingSessionFactory()
+    pool = McpSessionPool()
+
+    async with pool.session(_stdio_config(), factory):
+        pass
+    factory.sessions[0].send_ping.side_effect = RuntimeError("gone")
+    next(iter(pool._sessions.values())).last_used = 0
+
+    async with pool.session(_stdio_config(), factory) as session:
+        assert session is factory.sessions[1]
+    assert factory.opened == 2
+    assert factory.closed == 1
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_pool_raises_connection_failure() -> None:
+    """Test that errors opening a session are raised to the caller."""
+
+    @asynccontextmanager
+    async def failing_factory(_: McpClientConfig) -> AsyncIterator[ClientSession]:
+        raise ConnectionError("cannot connect")
+        yield  # pragma: no cover
+
+    pool = McpSessionPool()
+    with pytest.raises(ConnectionError):
+        async with pool.session(_stdio_config(), failing_factory):
+            pass
+    assert len(pool) == 0
+
+
+def test_sync_calls_share_background_pool() -> None:
+    """Test that synchronous callers reuse sessions through the background loop."""
+    factory = CountingSessionFactory()
+
+    async def use_session() -> ClientSession:
+        async with get_mcp_session_pool().session(_stdio_config(), factory) as session:
+            return session
+
+    assert run_mcp_coroutine_sync(use_session()) is run_mcp_coroutine_sync(use_session())
+    assert factory.opened == 1
+
+    close_mcp_session_pools()
+    assert factory.closed == 1
+
+
+def test_close_mcp_session_pools_cancels_running_calls() -> None:
+    """Test synchronous callers mid-call are woken when the background loop is stopped."""
+    started = threading.Event()
+    errors: list[BaseException] = []
+
+    async def wait_forever() -> None:
+        started.set()
+        await asyncio.sleep(60)
+
+    def call() -> None:
+        try:
+            run_mcp_coroutine_sync(wait_forever())
+        except BaseException as e:  # noqa: BLE001
+            errors.append(e)
+
+    thread = threading.Thread(target=call)
+    thread.start()
+    assert started.wait(timeout=5)
+    close_mcp_session_pools()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert len(errors) == 1
+    assert isinstance(errors[0], CancelledError)
+
+
+def test_mcp_session_key_ignores_tool_call_timeout() -> None:
+    """Test the session key only depends on connection details."""
+    assert mcp_session_key(_stdio_config()) == mcp_session_key(
+        _stdio_config(tool_call_timeout_seconds=10)
+    )
+    assert mcp_session_key(_stdio_config()) != mcp_session_key(
+        StdioMcpClientConfig(server_name="mock_mcp", command="other")
+    )
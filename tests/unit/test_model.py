@@ -1,5 +1,6 @@
 """Unit tests for the Message class in portia.model."""
 
+from collections.abc import AsyncIterator
 from types import SimpleNamespace
 from typing import Any
 from unittest import mock
@@ -9,7 +10,13 @@ import pytest
 from langchain_anthropic import ChatAnthropic
 from langchain_core.caches import BaseCache
 from langchain_core.language_models.chat_models import BaseChatModel
-from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+)
 from langchain_core.outputs import Generation
 from pydantic import BaseModel, SecretStr, ValidationError
 
@@ -22,6 +29,7 @@ from portia.model import (
     LLMProvider,
     Message,
     OpenAIGenerativeModel,
+    _instructor_cache_key,
     map_message_to_instructor,
 )
 from portia.planning_agents.base_planning_agent import StepsOrError
@@ -417,6 +425,28 @@ def test_instructor_manual_cache(monkeypatch: pytest.MonkeyPatch) -> None:
     cache.update.assert_called_once()
 
 
+def test_instructor_cache_key_ignores_non_semantic_kwargs() -> None:
+    """Arguments which don't change the response don't change the cache key."""
+
+    class DummyModel(BaseModel):
+        pass
+
+    messages: list = [{"role": "user", "content": "hi"}]
+    key = _instructor_cache_key(messages, DummyModel, "openai", "gpt-4o", {"seed": 1})
+
+    assert key == _instructor_cache_key(
+        messages,
+        DummyModel,
+        "openai",
+        "gpt-4o",
+        {"seed": 1, "max_retries": 2, "timeout": 30},
+    )
+    assert key != _instructor_cache_key(messages, DummyModel, "openai", "gpt-4o", {"seed": 2})
+    assert key != _instructor_cache_key(
+        [{"role": "user", "content": "bye"}], DummyModel, "openai", "gpt-4o", {"seed": 1}
+    )
+
+
 @pytest.mark.asyncio
 async def test_dummy_model_async_methods() -> None:
     """Test that the dummy model async methods work."""
@@ -469,6 +499,44 @@ async def test_langchain_model_async_get_response() -> None:
     assert result.content == "Hello from model"
 
 
+@pytest.mark.asyncio
+async def test_langchain_model_stream_response() -> None:
+    """Test LangchainModel streams the text of each chunk, skipping thinking blocks."""
+    chunks = [
+        AIMessageChunk(content=[{"type": "thinking", "thinking": "Hmm"}]),
+        AIMessageChunk(content="Hello"),
+        AIMessageChunk(content=[{"type": "text", "text": " from"}]),
+        AIMessageChunk(content=" model"),
+    ]
+    base_chat_model = MagicMock(spec=BaseChatModel)
+    base_chat_model.stream.return_value = iter(chunks)
+
+    async def mock_astream(*_: Any, **__: Any) -> AsyncIterator[AIMessageChunk]:
+        for chunk in chunks:
+            yield chunk
+
+    base_chat_model.astream = mock_astream
+    model = LangChainGenerativeModel(client=base_chat_model, model_name="test")
+    messages = [Message(role="user", content="Hello")]
+
+    assert list(model.stream_response(messages)) == ["Hello", " from", " model"]
+    assert [chunk async for chunk in model.astream_response(messages)] == [
+        "Hello",
+        " from",
+        " model",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_dummy_model_streams_whole_response() -> None:
+    """Test models without streaming support yield their whole response as one chunk."""
+    model = DummyGenerativeModel(model_name="test")
+    messages = [Message(role="user", content="Hello")]
+
+    assert list(model.stream_response(messages)) == ["Hello"]
+    assert [chunk async for chunk in model.astream_response(messages)] == ["Hello"]
+
+
 @pytest.mark.asyncio
 async def test_anthropic_model_async_structured_output_returns_invalid_data(
     monkeypatch: pytest.MonkeyPatch,
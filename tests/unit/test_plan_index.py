@@ -0,0 +1,87 @@
+"""Tests for the plan query similarity indexes."""
+
+from __future__ import annotations
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from portia.plan_index import (
+    EmbeddingPlanQueryIndex,
+    TfidfPlanQueryIndex,
+    normalize_query,
+    query_features,
+)
+
+
+def test_normalize_query() -> None:
+    """Test case, punctuation and spacing are ignored."""
+    assert normalize_query("  What's the Weather in London?? ") == "what s the weather in london"
+    assert query_features("Hi") == {"w:hi": 1, "c: hi": 1, "c:hi ": 1}
+
+
+def test_tfidf_index_ranks_similar_queries() -> None:
+    """Test plans are ranked by how similar their queries are."""
+    index = TfidfPlanQueryIndex()
+    index.add("plan-weather", "What is the weather in London?")
+    index.add("plan-weather-paris", "What is the weather in Paris?")
+    index.add("plan-email", "Send an email to Bob about the meeting")
+
+    similar = index.similar("what is the weather in london", threshold=0.0)
+    assert [plan_id for plan_id, _ in similar] == [
+        "plan-weather",
+        "plan-weather-paris",
+        "plan-email",
+    ]
+    assert similar[0][1] == pytest.approx(1.0)
+    assert similar[1][1] > similar[2][1]
+
+    assert [plan_id for plan_id, _ in index.similar("What's the wether in London", 0.6)] == [
+        "plan-weather",
+    ]
+    assert index.similar("Book a flight", threshold=0.5) == []
+    assert len(index.similar("weather", threshold=0.0, limit=1)) == 1
+
+
+def test_tfidf_index_prefers_recent_plans_and_updates() -> None:
+    """Test ties go to the most recently added plan and plans can be replaced and removed."""
+    index = TfidfPlanQueryIndex()
+    index.add("plan-old", "Summarise my inbox")
+    index.add("plan-new", "Summarise my inbox")
+    assert [plan_id for plan_id, _ in index.similar("summarise my inbox")] == [
+        "plan-new",
+        "plan-old",
+    ]
+
+    index.add("plan-new", "Translate this document")
+    assert [plan_id for plan_id, _ in index.similar("summarise my inbox")] == ["plan-old"]
+
+    index.remove("plan-old")
+    assert index.similar("summarise my inbox") == []
+    assert "plan-new" in index
+
+    index.clear()
+    assert len(index) == 0
+    assert index.similar("translate this document") == []
+
+
+class _KeywordEmbeddings(Embeddings):
+    """Embeds text by counting a fixed set of keywords."""
+
+    keywords = ("weather", "email")
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return [float(text.lower().count(keyword)) for keyword in self.keywords]
+
+
+def test_embedding_index_ranks_by_similarity() -> None:
+    """Test the embedding index ranks plans by the cosine similarity of their queries."""
+    index = EmbeddingPlanQueryIndex(_KeywordEmbeddings())
+    index.add("plan-weather", "Get the weather")
+    index.add("plan-email", "Send an email")
+
+    assert index.similar("weather forecast please", threshold=0.9) == [("plan-weather", 1.0)]
+    index.remove("plan-weather")
+    assert index.similar("weather forecast please", threshold=0.9) == []
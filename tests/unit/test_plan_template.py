@@ -0,0 +1,161 @@
+"""Tests for plan templates."""
+
+from __future__ import annotations
+
+from portia.plan import Plan, PlanContext, PlanInput, Step, Variable
+from portia.plan_template import PlanTemplate, PlanTemplateCache, parse_query, template_key
+
+
+def _outline_plan(topic: str) -> Plan:
+    return Plan(
+        plan_context=PlanContext(query=f"Write an outline about {topic}.", tool_ids=["llm_tool"]),
+        steps=[
+            Step(task=f"Research {topic}", tool_id="llm_tool", output="$research"),
+            Step(
+                task=f"Write an outline about {topic.title()}",
+                inputs=[Variable(name="$research")],
+                tool_id="llm_tool",
+                output="$outline",
+            ),
+        ],
+    )
+
+
+def test_parse_query() -> None:
+    """Test values are found in queries and replaced by slots."""
+    assert parse_query("Write an outline about whales.") == (
+        "Write an outline about {topic}.",
+        {"topic": "whales"},
+    )
+    assert parse_query('Summarise "The Hobbit" in 3 lines and email it to bob@example.com') == (
+        'Summarise "{quoted_text}" in {number} lines and email it to {email}',
+        {"quoted_text": "The Hobbit", "email": "bob@example.com", "number": "3"},
+    )
+    assert parse_query("Compare https://a.com/x and https://b.com.") == (
+        "Compare {url} and {url_2}.",
+        {"url": "https://a.com/x", "url_2": "https://b.com"},
+    )
+    assert parse_query("Write an outline about whales and email it to Bob") == (
+        "Write an outline about {topic} and email it to Bob",
+        {"topic": "whales"},
+    )
+    assert parse_query("Tell me about the Roman Empire, then summarise it") == (
+        "Tell me about {topic}, then summarise it",
+        {"topic": "the Roman Empire"},
+    )
+    assert parse_query("Write a post about tides for the newsletter") == (
+        "Write a post about {topic} for the newsletter",
+        {"topic": "tides"},
+    )
+    assert parse_query("What is the time?") == ("What is the time?", {})
+    assert template_key("Write an outline about {topic}.") == template_key(
+        "write an  OUTLINE about {topic}"
+    )
+
+
+def test_plan_template_from_plan() -> None:
+    """Test values in the query are replaced by plan inputs in the steps that use them."""
+    template = PlanTemplate.from_plan(_outline_plan("whales"))
+
+    assert template is not None
+    assert template.slots == ["topic"]
+    assert [step.task for step in template.plan.steps] == [
+        "Research $topic",
+        "Write an outline about $topic",
+    ]
+    assert [variable.name for variable in template.plan.steps[1].inputs] == [
+        "$research",
+        "$topic",
+    ]
+    assert template.plan.plan_inputs == [
+        PlanInput(name="$topic", description="The topic in the query"),
+    ]
+
+
+def test_plan_template_not_made_when_values_are_not_substitutable() -> None:
+    """Test plans are only templated when every value in the query appears in their steps."""
+    plan = _outline_plan("whales")
+    plan.steps[0].task = "Research marine mammals"
+    plan.steps[1].task = "Write an outline"
+    assert PlanTemplate.from_plan(plan) is None
+
+    clashing_plan = _outline_plan("whales")
+    clashing_plan.plan_inputs = [PlanInput(name="$topic")]
+    assert PlanTemplate.from_plan(clashing_plan) is None
+
+    assert (
+        PlanTemplate.from_plan(Plan(plan_context=PlanContext(query="Hi", tool_ids=[]), steps=[]))
+        is None
+    )
+
+
+def test_plan_template_not_made_when_steps_still_mention_values() -> None:
+    """Test plans are not templated when a step depends on a value that wasn't substituted."""
+    plan = _outline_plan("blue whales")
+    plan.steps.append(Step(task="Find photos of whales", tool_id="search_tool", output="$photos"))
+    assert PlanTemplate.from_plan(plan) is None
+
+    # Common words from the value don't stop the plan from being templated
+    plan = _outline_plan("the sea")
+    plan.steps.append(Step(task="Email the outline to Bob", tool_id="send_email", output="$sent"))
+    assert PlanTemplate.from_plan(plan) is not None
+
+
+def test_plan_template_cache_keeps_the_rest_of_the_query() -> None:
+    """Test a plan isn't reused for a query which only shares its topic clause."""
+    cache = PlanTemplateCache()
+    cache.add(
+        Plan(
+            plan_context=PlanContext(
+                query="Write an outline about whales and email it to Bob",
+                tool_ids=["llm_tool", "portia:google:gmail:send_email"],
+            ),
+            steps=[
+                Step(task="Write an outline about whales", tool_id="llm_tool", output="$outline"),
+                Step(
+                    task="Email the outline to Bob",
+                    inputs=[Variable(name="$outline")],
+                    tool_id="portia:google:gmail:send_email",
+                    output="$email",
+                ),
+            ],
+        ),
+    )
+
+    assert cache.instantiate("Write an outline about whales and post it on twitter") is None
+    plan = cache.instantiate("Write an outline about volcanoes and email it to Bob")
+    assert plan is not None
+    assert [step.task for step in plan.steps] == [
+        "Write an outline about $topic",
+        "Email the outline to Bob",
+    ]
+
+
+def test_plan_template_cache_instantiates_plans() -> None:
+    """Test plans are made for queries of the same shape by binding their values."""
+    cache = PlanTemplateCache(max_templates=1)
+    source_plan = _outline_plan("whales")
+    assert cache.add(source_plan) is not None
+
+    plan = cache.instantiate("write an outline about volcanoes")
+
+    assert plan is not None
+    assert plan.id != source_plan.id
+    assert plan.plan_context.query == "write an outline about volcanoes"
+    assert plan.plan_context.tool_ids == ["llm_tool"]
+    assert plan.plan_inputs == [
+        PlanInput(name="$topic", description="The topic in the query", value="volcanoes"),
+    ]
+    assert plan.steps[0].task == "Research $topic"
+    assert cache.instantiate("Write a poem about volcanoes") is None
+    assert cache.instantiate("Write an outline") is None
+
+    # The least recently used template is dropped once the cache is full
+    poem_plan = Plan(
+        plan_context=PlanContext(query="Write a poem about the sea", tool_ids=[]),
+        steps=[Step(task="Write a poem about the sea", output="$poem")],
+    )
+    cache.add(poem_plan)
+    assert len(cache) == 1
+    assert cache.instantiate("Write an outline about volcanoes") is None
+    assert cache.instantiate("Write a poem about the moon") is not None
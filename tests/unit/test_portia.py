@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
 import tempfile
 import threading
@@ -14,10 +15,12 @@ from uuid import UUID, uuid4
 
 import httpx
 import pytest
-from pydantic import BaseModel, HttpUrl, SecretStr
+from pydantic import BaseModel, HttpUrl, SecretStr, ValidationError
 
+from portia.builder.parallel import ParallelBlock
 from portia.builder.plan_v2 import PlanV2
-from portia.builder.step_v2 import StepV2
+from portia.builder.reference import StepOutput
+from portia.builder.step_v2 import FunctionStep, InvokeToolStep, StepV2
 from portia.clarification import (
     ActionClarification,
     Clarification,
@@ -27,8 +30,10 @@ from portia.clarification import (
 )
 from portia.clarification_handler import ClarificationHandler
 from portia.config import (
+    MIN_CACHED_PLAN_SIMILARITY_THRESHOLD,
     Config,
     GenerativeModelsConfig,
+    PlanRunPersistence,
     StorageClass,
 )
 from portia.end_user import EndUser
@@ -47,6 +52,7 @@ from portia.introspection_agents.introspection_agent import (
     PreStepIntrospection,
     PreStepIntrospectionOutcome,
 )
+from portia.mcp_session import run_mcp_coroutine_sync
 from portia.open_source_tools.llm_tool import LLMTool
 from portia.open_source_tools.registry import example_tool_registry, open_source_tool_registry
 from portia.plan import (
@@ -64,6 +70,7 @@ from portia.plan_run import PlanRun, PlanRunOutputs, PlanRunState, PlanRunUUID,
 from portia.planning_agents.base_planning_agent import StepsOrError
 from portia.portia import ExecutionHooks, Portia, RunContext
 from portia.prefixed_uuid import ClarificationUUID
+from portia.stage_timing import InMemoryStageTimingSink
 from portia.storage import StorageError
 from portia.telemetry.views import PortiaFunctionCallTelemetryEvent
 from portia.tool import (
@@ -371,6 +378,85 @@ def test_portia_plan_with_use_cached_plan_not_found(
         assert plan.id != "plan-00000000-0000-0000-0000-000000000000"  # Not a default UUID
 
 
+def test_portia_plan_with_use_cached_plan_similar_query(
+    portia: Portia, planning_model: MagicMock
+) -> None:
+    """Test use_cached_plan reuses plans for similar queries when a threshold is configured."""
+    cached_plan = Plan(
+        plan_context=PlanContext(query="What is the weather in London?", tool_ids=[]),
+        steps=[],
+    )
+    portia.storage.save_plan(cached_plan)
+    planning_model.get_structured_response.return_value = StepsOrError(steps=[], error=None)
+
+    portia.config.cached_plan_similarity_threshold = 0.95
+    with mock.patch("portia.portia.logger") as mock_logger:
+        plan = portia.plan("what is the weather in london", use_cached_plan=True)
+    assert plan.id == cached_plan.id
+    planning_model.get_structured_response.assert_not_called()
+    assert "reused unchanged" in mock_logger().warning.call_args.args[0]
+
+    plan = portia.plan("What is the weather in Paris?", use_cached_plan=True)
+    assert plan.id != cached_plan.id
+    planning_model.get_structured_response.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    ("cached_query", "query"),
+    [
+        ("Write a report on the Roman Empire", "Write a report on the Ottoman Empire"),
+        ("Tell me about the Mongol Empire", "Tell me about the Mughal Empire"),
+        ("What is the weather in Paris?", "What is the weather in Paris, Texas?"),
+        ("Book a flight to Boston", "Cancel a flight to Boston"),
+        ("Send an email to alice@example.com", "Send an email to alice@example.org"),
+        ("Add 1 and 2", "Add 1 and 3"),
+    ],
+)
+def test_portia_plan_with_use_cached_plan_near_miss_query(
+    portia: Portia, planning_model: MagicMock, cached_query: str, query: str
+) -> None:
+    """Test plans for queries about something else aren't reused at the minimum threshold."""
+    cached_plan = Plan(plan_context=PlanContext(query=cached_query, tool_ids=[]), steps=[])
+    portia.storage.save_plan(cached_plan)
+    planning_model.get_structured_response.return_value = StepsOrError(steps=[], error=None)
+
+    portia.config.cached_plan_similarity_threshold = MIN_CACHED_PLAN_SIMILARITY_THRESHOLD
+    plan = portia.plan(query, use_cached_plan=True)
+
+    assert plan.id != cached_plan.id
+    planning_model.get_structured_response.assert_called_once()
+
+
+def test_cached_plan_similarity_threshold_floor() -> None:
+    """Test thresholds low enough to reuse plans for unrelated queries are rejected."""
+    with pytest.raises(ValidationError):
+        get_test_config(cached_plan_similarity_threshold=0.5)
+    config = get_test_config(cached_plan_similarity_threshold=MIN_CACHED_PLAN_SIMILARITY_THRESHOLD)
+    assert config.cached_plan_similarity_threshold == MIN_CACHED_PLAN_SIMILARITY_THRESHOLD
+
+
+def test_portia_plan_with_use_cached_plan_templates(
+    portia: Portia, planning_model: MagicMock
+) -> None:
+    """Test use_cached_plan reuses plans for queries of the same shape when templates are on."""
+    portia.config.cached_plan_templates = True
+    planning_model.get_structured_response.return_value = StepsOrError(
+        steps=[Step(task="Write an outline about whales", output="$outline")],
+        error=None,
+    )
+
+    whale_plan = portia.plan("Write an outline about whales", use_cached_plan=True)
+    plan = portia.plan("Write an outline about volcanoes", use_cached_plan=True)
+
+    planning_model.get_structured_response.assert_called_once()
+    assert plan.id != whale_plan.id
+    assert plan.steps[0].task == "Write an outline about $topic"
+    assert [(plan_input.name, plan_input.value) for plan_input in plan.plan_inputs] == [
+        ("$topic", "volcanoes"),
+    ]
+    assert portia.storage.get_plan(plan.id) == plan
+
+
 def test_portia_plan_with_use_cached_plan_false(portia: Portia, planning_model: MagicMock) -> None:
     """Test planning with use_cached_plan=False (default behavior)."""
     query = "example query"
@@ -1230,6 +1316,75 @@ def test_get_llm_tool() -> None:
     assert isinstance(tool._child_tool, LLMTool)  # pyright: ignore[reportAttributeAccessIssue]
 
 
+def test_portia_run_many(portia: Portia, planning_model: MagicMock) -> None:
+    """Test run_many plans and runs every query, sharing cached plans between them."""
+    planning_model.get_structured_response.return_value = StepsOrError(steps=[], error=None)
+
+    results = list(
+        portia.run_many(["query 1", "query 2", "query 1"], use_cached_plan=True, max_concurrency=1)
+    )
+
+    assert sorted(result.index for result in results) == [0, 1, 2]
+    assert all(result.succeeded for result in results)
+    assert [
+        portia.storage.get_plan(result.plan_run.plan_id).plan_context.query
+        for result in sorted(results, key=lambda result: result.index)
+        if result.plan_run
+    ] == ["query 1", "query 2", "query 1"]
+    assert planning_model.get_structured_response.call_count == 2
+
+
+def test_portia_run_records_stage_timings(portia: Portia, planning_model: MagicMock) -> None:
+    """Test each stage of a plan run is timed when the client has stage timing sinks."""
+    sink = InMemoryStageTimingSink()
+    portia.stage_timing_sinks = [sink]
+    planning_model.get_structured_response.return_value = StepsOrError(
+        steps=[
+            Step(task="Add 1 and 2", tool_id="add_tool", output="$first"),
+            Step(task="Add 3 and 4", tool_id="add_tool", output="$second"),
+        ],
+        error=None,
+    )
+    mock_step_agent = mock.MagicMock()
+    mock_step_agent.execute_sync.side_effect = [LocalDataValue(value=3), LocalDataValue(value=7)]
+
+    with mock.patch.object(portia, "get_agent_for_step", return_value=mock_step_agent):
+        plan_run = portia.run("Add numbers")
+
+    assert plan_run.state == PlanRunState.COMPLETE
+    stages = [(timing.stage, timing.step_index) for timing in plan_run.stage_timings]
+    for index in (0, 1):
+        assert ("introspection", index) in stages
+        assert ("step", index) in stages
+    assert ("final_output_summary", None) in stages
+    assert ("storage_save", None) in stages
+    assert sink.timings(str(plan_run.id)) == plan_run.stage_timings
+
+
+def test_portia_run_plan_many(portia: Portia) -> None:
+    """Test run_plan_many runs plans with their own inputs and records failures per plan."""
+    plan = Plan(
+        plan_context=PlanContext(query="Greet $name", tool_ids=[]),
+        steps=[],
+        plan_inputs=[PlanInput(name="$name")],
+    )
+    missing_plan_id = PlanUUID()
+
+    results = sorted(
+        portia.run_plan_many([(plan, {"$name": "Ada"}), (plan, {"$name": "Bob"}), missing_plan_id]),
+        key=lambda result: result.index,
+    )
+
+    assert [result.succeeded for result in results] == [True, True, False]
+    assert [
+        result.plan_run.plan_run_inputs["$name"].get_value()
+        for result in results
+        if result.plan_run
+    ] == ["Ada", "Bob"]
+    assert results[2].item == missing_plan_id
+    assert isinstance(results[2].error, PlanNotFoundError)
+
+
 def test_portia_run_plan(portia: Portia, planning_model: MagicMock, telemetry: MagicMock) -> None:
     """Test that run_plan calls create_plan_run and resume."""
     query = "example query"
@@ -3126,6 +3281,51 @@ def test_portia_execute_plan_run_and_handle_clarifications_keyboard_interrupt(
         assert result.state == PlanRunState.FAILED
 
 
+@pytest.mark.parametrize(
+    ("persistence", "expected_saves"),
+    [
+        (PlanRunPersistence.EVERY_WRITE, 9),
+        (PlanRunPersistence.PER_STEP, 6),
+        (PlanRunPersistence.ON_TRANSITION, 3),
+    ],
+)
+def test_portia_plan_run_persistence_modes(
+    planning_model: MagicMock,
+    persistence: PlanRunPersistence,
+    expected_saves: int,
+) -> None:
+    """Test plan run saves are coalesced according to the persistence mode."""
+    portia = Portia(
+        config=get_test_config(
+            models=GenerativeModelsConfig(planning_model=planning_model),
+            plan_run_persistence=persistence,
+        ),
+        tools=[AdditionTool()],
+    )
+    plan = Plan(
+        plan_context=PlanContext(query="add numbers", tool_ids=["add_tool"]),
+        steps=[Step(task=f"Add {i}", tool_id="add_tool", output=f"$step_{i}") for i in range(3)],
+    )
+    portia.storage.save_plan(plan)
+    mock_step_agent = mock.MagicMock()
+    mock_step_agent.execute_sync.return_value = LocalDataValue(value=3)
+    mock_summarizer_agent = mock.MagicMock()
+    mock_summarizer_agent.create_summary.return_value = "done"
+
+    with (
+        mock.patch("portia.portia.FinalOutputSummarizer", return_value=mock_summarizer_agent),
+        mock.patch.object(portia, "get_agent_for_step", return_value=mock_step_agent),
+        mock.patch.object(
+            portia.storage, "save_plan_run", wraps=portia.storage.save_plan_run
+        ) as mock_save_plan_run,
+    ):
+        plan_run = portia.run_plan(plan)
+
+    assert plan_run.state == PlanRunState.COMPLETE
+    assert mock_save_plan_run.call_count == expected_saves
+    assert portia.storage.get_plan_run(plan_run.id) == plan_run
+
+
 def test_portia_run_plan_planv2_inside_async_context_raises_runtime_error(portia: Portia) -> None:
     """Test that run_plan with PlanV2 inside async context raises RuntimeError with error log."""
     import asyncio
@@ -3158,3 +3358,152 @@ def test_portia_run_plan_planv2_inside_async_context_raises_runtime_error(portia
         # The original RuntimeError from asyncio.Runner() is re-raised
         # The custom error message is logged but not part of the exception
         assert "Cannot run the event loop while another loop is running" in str(exc_info.value)
+
+
+def test_portia_run_plan_executes_independent_steps_in_parallel(
+    planning_model: MagicMock,
+) -> None:
+    """Test independent steps run concurrently while outputs are processed in plan order."""
+    portia = Portia(
+        config=get_test_config(
+            models=GenerativeModelsConfig(planning_model=planning_model),
+            max_parallel_steps=2,
+        ),
+        tools=[AdditionTool()],
+    )
+    plan = Plan(
+        plan_context=PlanContext(query="add numbers", tool_ids=["add_tool"]),
+        steps=[
+            Step(task="Add 1", tool_id="add_tool", output="$a"),
+            Step(task="Add 2", tool_id="add_tool", output="$b"),
+            Step(
+                task="Add a and b",
+                tool_id="add_tool",
+                output="$c",
+                inputs=[Variable(name="$a"), Variable(name="$b")],
+            ),
+        ],
+    )
+    barrier = threading.Barrier(2, timeout=5)
+    completed_steps = []
+
+    def get_agent_for_step(step: Step, **_: Any) -> MagicMock:
+        def execute_sync() -> Output:
+            if step.output != "$c":
+                # Both independent steps must be running at the same time to pass the barrier
+                barrier.wait()
+            return LocalDataValue(value=step.output)
+
+        agent = mock.MagicMock()
+        agent.execute_sync.side_effect = execute_sync
+        return agent
+
+    mock_summarizer_agent = mock.MagicMock()
+    mock_summarizer_agent.create_summary.return_value = "done"
+    portia.execution_hooks = ExecutionHooks(
+        after_step_execution=lambda _, __, step, ___: completed_steps.append(step.output),
+    )
+
+    with (
+        mock.patch("portia.portia.FinalOutputSummarizer", return_value=mock_summarizer_agent),
+        mock.patch.object(portia, "get_agent_for_step", side_effect=get_agent_for_step),
+    ):
+        plan_run = portia.run_plan(plan)
+    portia.close()
+
+    assert plan_run.state == PlanRunState.COMPLETE
+    assert completed_steps == ["$a", "$b", "$c"]
+    assert plan_run.outputs.step_outputs["$b"].get_value() == "$b"
+    assert plan_run.outputs.final_output is not None
+    assert plan_run.outputs.final_output.get_value() == "$c"
+
+
+def test_portia_close_leaves_shared_mcp_sessions_open(portia: Portia) -> None:
+    """Test closing one client doesn't stop the MCP sessions other clients share."""
+
+    async def get_loop() -> asyncio.AbstractEventLoop:
+        return asyncio.get_running_loop()
+
+    other_portia = Portia(config=portia.config, tools=portia.tool_registry)
+    loop = run_mcp_coroutine_sync(get_loop())
+    portia.close()
+
+    assert not loop.is_closed()
+    assert run_mcp_coroutine_sync(get_loop()) is loop
+    other_portia.close()
+
+
+def test_portia_run_builder_plan_with_parallel_block(portia: Portia) -> None:
+    """Test steps in a parallel block run concurrently and their outputs are kept in order."""
+    import asyncio
+
+    barrier = asyncio.Barrier(2)
+    completed_steps = []
+
+    class BarrierStep(StepV2):
+        async def run(self, run_data: RunContext) -> str:  # noqa: ARG002
+            # Both steps must be running at the same time to pass the barrier
+            await asyncio.wait_for(barrier.wait(), timeout=5)
+            return self.step_name
+
+        def to_legacy_step(self, plan: PlanV2) -> Step:
+            return Step(task=self.step_name, output=plan.step_output_name(self))
+
+    parallel_block = ParallelBlock(step_indexes=[0, 1])
+    plan = PlanV2(
+        steps=[
+            BarrierStep(step_name="first", parallel_block=parallel_block),
+            BarrierStep(step_name="second", parallel_block=parallel_block),
+            FunctionStep(
+                step_name="combine",
+                function=lambda a, b: f"{a} {b}",
+                args={"a": StepOutput("first"), "b": StepOutput("second")},
+            ),
+        ],
+    )
+    portia.execution_hooks = ExecutionHooks(
+        after_step_execution=lambda _, __, step, ___: completed_steps.append(step.task),
+    )
+
+    plan_run = portia.run_plan(plan)
+
+    assert plan_run.state == PlanRunState.COMPLETE
+    assert completed_steps == [
+        "first",
+        "second",
+        "Run function <lambda> with args: a=$step_0_output, b=$step_1_output",
+    ]
+    assert plan_run.outputs.final_output is not None
+    assert plan_run.outputs.final_output.get_value() == "first second"
+
+
+def test_portia_run_builder_plan_parallel_block_tool_call_steps(portia: Portia) -> None:
+    """Test tool calls made by steps in a parallel block are recorded against their own step."""
+    parallel_block = ParallelBlock(step_indexes=[1, 2])
+    plan = PlanV2(
+        steps=[
+            InvokeToolStep(step_name="pre", tool="add_tool", args={"a": 1, "b": 1}),
+            InvokeToolStep(
+                step_name="x",
+                tool="add_tool",
+                args={"a": 1, "b": 2},
+                parallel_block=parallel_block,
+            ),
+            InvokeToolStep(
+                step_name="y",
+                tool="add_tool",
+                args={"a": 1, "b": 3},
+                parallel_block=parallel_block,
+            ),
+        ],
+    )
+
+    with mock.patch.object(portia.storage, "asave_tool_call") as mock_save_tool_call:
+        plan_run = portia.run_plan(plan)
+
+    assert plan_run.state == PlanRunState.COMPLETE
+    steps_by_input = {
+        call.args[0].input["b"]: call.args[0].step for call in mock_save_tool_call.call_args_list
+    }
+    assert steps_by_input == {1: 0, 2: 1, 3: 2}
+    assert plan_run.current_step_index == 2
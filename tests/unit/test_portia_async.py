@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import tempfile
 from pathlib import Path
 from unittest import mock
@@ -17,6 +18,7 @@ from portia.clarification import (
     InputClarification,
     ValueConfirmationClarification,
 )
+from portia.cloud import PortiaCloudClient, aclose_shared_async_clients
 from portia.config import Config, GenerativeModelsConfig, StorageClass
 from portia.end_user import EndUser
 from portia.errors import (
@@ -167,6 +169,24 @@ async def test_portia_aplan_with_use_cached_plan_success(portia: Portia) -> None
         assert plan.plan_context.query == query
 
 
+@pytest.mark.asyncio
+async def test_portia_aplan_with_use_cached_plan_similar_query(
+    portia: Portia, planning_model: MagicMock
+) -> None:
+    """Test async planning reuses plans for similar queries when a threshold is configured."""
+    cached_plan = Plan(
+        plan_context=PlanContext(query="What is the weather in London?", tool_ids=[]),
+        steps=[],
+    )
+    portia.storage.save_plan(cached_plan)
+    portia.config.cached_plan_similarity_threshold = 0.95
+
+    plan = await portia.aplan("what is the weather in london", use_cached_plan=True)
+
+    assert plan.id == cached_plan.id
+    planning_model.aget_structured_response.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_portia_aplan_with_use_cached_plan_not_found(
     portia: Portia, planning_model: MagicMock
@@ -580,6 +600,49 @@ async def test_portia_arun_error_handling(portia: Portia, planning_model: MagicM
         await portia.arun(query)
 
 
+@pytest.mark.asyncio
+async def test_portia_arun_many(portia: Portia, planning_model: MagicMock) -> None:
+    """Test arun_many plans and runs every query, recording failures per query."""
+    planning_model.aget_structured_response.side_effect = lambda messages, **_: StepsOrError(
+        steps=[],
+        error="Cannot plan" if "query 2" in str(messages) else None,
+    )
+
+    results = sorted(
+        [result async for result in portia.arun_many(["query 1", "query 2"], max_concurrency=1)],
+        key=lambda result: result.index,
+    )
+
+    assert results[0].succeeded
+    assert results[0].plan_run is not None
+    assert isinstance(results[1].error, PlanError)
+    assert results[1].item == "query 2"
+
+
+@pytest.mark.asyncio
+async def test_portia_arun_plan_many(portia: Portia) -> None:
+    """Test arun_plan_many runs plans with their own inputs."""
+    plan = Plan(
+        plan_context=PlanContext(query="Greet $name", tool_ids=[]),
+        steps=[],
+        plan_inputs=[PlanInput(name="$name")],
+    )
+
+    results = [
+        result
+        async for result in portia.arun_plan_many(
+            [(plan, {"$name": "Ada"}), (plan, {"$name": "Bob"})]
+        )
+    ]
+
+    assert all(result.succeeded for result in results)
+    assert sorted(
+        result.plan_run.plan_run_inputs["$name"].get_value()
+        for result in results
+        if result.plan_run
+    ) == ["Ada", "Bob"]
+
+
 @pytest.mark.asyncio
 async def test_portia_arun_plan(
     portia: Portia, planning_model: MagicMock, telemetry: MagicMock
@@ -2045,3 +2108,68 @@ async def test_portia__aresolve_string_example_plan(portia: Portia) -> None:
     # Test error case: plan ID string with invalid UUID format
     with pytest.raises(ValueError, match="badly formed hexadecimal UUID string"):
         await portia._aresolve_string_example_plan("plan-invalid-uuid-format")
+
+
+@pytest.mark.asyncio
+async def test_portia_arun_plan_executes_independent_steps_in_parallel(
+    planning_model: MagicMock,
+) -> None:
+    """Test independent steps run concurrently when executing a plan asynchronously."""
+    portia = Portia(
+        config=get_test_config(
+            models=GenerativeModelsConfig(planning_model=planning_model),
+            max_parallel_steps=2,
+        ),
+        tools=[AdditionTool()],
+    )
+    plan = Plan(
+        plan_context=PlanContext(query="add numbers", tool_ids=["add_tool"]),
+        steps=[
+            Step(task="Add 1", tool_id="add_tool", output="$a"),
+            Step(task="Add 2", tool_id="add_tool", output="$b"),
+            Step(
+                task="Add a and b",
+                tool_id="add_tool",
+                output="$c",
+                inputs=[Variable(name="$a"), Variable(name="$b")],
+            ),
+        ],
+    )
+    barrier = asyncio.Barrier(2)
+
+    def get_agent_for_step(step: Step, **_: object) -> MagicMock:
+        async def execute_async() -> LocalDataValue:
+            if step.output != "$c":
+                # Both independent steps must be running at the same time to pass the barrier
+                await asyncio.wait_for(barrier.wait(), timeout=5)
+            return LocalDataValue(value=step.output)
+
+        agent = mock.MagicMock()
+        agent.execute_async.side_effect = execute_async
+        return agent
+
+    mock_summarizer_agent = mock.MagicMock()
+    mock_summarizer_agent.create_summary.return_value = "done"
+    with (
+        mock.patch("portia.portia.FinalOutputSummarizer", return_value=mock_summarizer_agent),
+        mock.patch.object(portia, "get_agent_for_step", side_effect=get_agent_for_step),
+    ):
+        plan_run = await portia.arun_plan(plan)
+
+    assert plan_run.state == PlanRunState.COMPLETE
+    assert list(plan_run.outputs.step_outputs) == ["$a", "$b", "$c"]
+    assert plan_run.outputs.final_output is not None
+    assert plan_run.outputs.final_output.get_value() == "$c"
+
+
+@pytest.mark.asyncio
+async def test_portia_aclose_leaves_shared_cloud_clients_open(portia: Portia) -> None:
+    """Test closing one client doesn't close the Portia Cloud connections other clients share."""
+    config = get_test_config(portia_api_key="test")
+    client = PortiaCloudClient(config).shared_async_client()
+
+    await portia.aclose()
+
+    assert not client.is_closed
+    assert PortiaCloudClient(config).shared_async_client() is client
+    await aclose_shared_async_clients()
@@ -0,0 +1,120 @@
+"""Tests for timing the stages of plan runs."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from portia.llm_cache import InMemoryLLMCache
+from portia.plan import PlanUUID
+from portia.plan_run import PlanRun
+from portia.stage_timing import (
+    InMemoryStageTimingSink,
+    JsonlStageTimingSink,
+    PrometheusStageTimingSink,
+    record_stage_timings,
+    timed_call,
+    timed_stage,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _plan_run() -> PlanRun:
+    return PlanRun(plan_id=PlanUUID(), end_user_id="test")
+
+
+def test_timed_stage_records_nested_stages() -> None:
+    """Test stages are recorded on the plan run and sink, inheriting their step's index."""
+    plan_run = _plan_run()
+    sink = InMemoryStageTimingSink()
+
+    with timed_stage("outside"):
+        pass
+    with record_stage_timings(plan_run, [sink]):
+        with timed_stage("step", step_index=2):
+            with timed_stage("tools"):
+                pass
+            timed_call("summarizer", None, lambda: None)()
+        with pytest.raises(ValueError, match="boom"), timed_stage("storage_save"):
+            raise ValueError("boom")
+    with timed_stage("after"):
+        pass
+
+    assert [(t.stage, t.step_index) for t in plan_run.stage_timings] == [
+        ("tools", 2),
+        ("summarizer", 2),
+        ("step", 2),
+        ("storage_save", None),
+    ]
+    assert sink.timings(str(plan_run.id)) == plan_run.stage_timings
+    assert plan_run.stage_timings[-1].error == "ValueError('boom')"
+    assert all(t.duration_seconds >= 0 for t in plan_run.stage_timings)
+    assert "stage_timings" not in plan_run.model_dump()
+
+    with record_stage_timings(_plan_run(), []), timed_stage("unrecorded"):
+        pass
+    assert len(sink.timings()) == 4
+
+
+def test_timed_stage_counts_tokens_and_cache_lookups() -> None:
+    """Test tokens used by LangChain models and local LLM cache lookups count towards stages."""
+    plan_run = _plan_run()
+    model = GenericFakeChatModel(
+        messages=iter(
+            [
+                AIMessage(
+                    content="Hi",
+                    usage_metadata={"input_tokens": 10, "output_tokens": 3, "total_tokens": 13},
+                ),
+            ],
+        ),
+    )
+    cache = InMemoryLLMCache(max_bytes=1_000)
+
+    with (
+        record_stage_timings(plan_run, [InMemoryStageTimingSink()]),
+        timed_stage("step", step_index=0),
+    ):
+        with timed_stage("tool_agent"):
+            model.invoke("Hello")
+            cache.lookup("prompt", "llm")
+            cache.update("prompt", "llm", [])
+            cache.lookup("prompt", "llm")
+        timed_call("summarizer", None, lambda: cache.lookup("prompt", "llm"))()
+
+    # Usage counts towards the stage it happens in and every stage enclosing it
+    [tool_agent, summarizer, step] = plan_run.stage_timings
+    assert (tool_agent.input_tokens, tool_agent.output_tokens) == (10, 3)
+    assert (tool_agent.llm_cache_hits, tool_agent.llm_cache_misses) == (1, 1)
+    assert (summarizer.input_tokens, summarizer.llm_cache_hits) == (0, 1)
+    assert step.stage == "step"
+    assert (step.input_tokens, step.output_tokens) == (10, 3)
+    assert (step.llm_cache_hits, step.llm_cache_misses) == (2, 1)
+
+
+def test_jsonl_and_prometheus_sinks(tmp_path: Path) -> None:
+    """Test timings are appended to a JSONL file and aggregated for Prometheus."""
+    plan_run = _plan_run()
+    jsonl_sink = JsonlStageTimingSink(tmp_path / "timings" / "stages.jsonl")
+    prometheus_sink = PrometheusStageTimingSink()
+
+    with record_stage_timings(plan_run, [jsonl_sink, prometheus_sink]):
+        for _ in range(2):
+            with timed_stage("introspection", step_index=0):
+                pass
+
+    lines = [json.loads(line) for line in jsonl_sink.path.read_text().splitlines()]
+    assert [line["stage"] for line in lines] == ["introspection", "introspection"]
+    assert lines[0]["plan_run_id"] == str(plan_run.id)
+    assert lines[0]["step_index"] == 0
+
+    metrics = prometheus_sink.render()
+    assert 'portia_stage_duration_seconds_count{stage="introspection"} 2' in metrics
+    assert 'portia_stage_input_tokens_total{stage="introspection"} 0' in metrics
+    assert "# TYPE portia_stage_duration_seconds_sum counter" in metrics
@@ -0,0 +1,79 @@
+"""Tests for the step scheduler."""
+
+from __future__ import annotations
+
+from portia.clarification import InputClarification
+from portia.execution_agents.output import LocalDataValue
+from portia.plan import Plan, PlanContext, Step, Variable
+from portia.plan_run import PlanRun
+from portia.step_scheduler import StepScheduler
+
+
+def _plan(*steps: Step) -> Plan:
+    return Plan(plan_context=PlanContext(query="test", tool_ids=[]), steps=list(steps))
+
+
+def test_independent_steps_are_batched() -> None:
+    """Test steps without shared outputs are scheduled together."""
+    plan = _plan(
+        Step(task="a", output="$a"),
+        Step(task="b", output="$b"),
+        Step(task="c", output="$c", inputs=[Variable(name="$a"), Variable(name="$b")]),
+    )
+    scheduler = StepScheduler(plan)
+
+    assert scheduler.dependencies == [set(), set(), {0, 1}]
+    assert scheduler.next_batch(set(), 4) == [0, 1]
+    assert scheduler.next_batch(set(), 1) == [0]
+    assert scheduler.next_batch({0}, 4) == [1]
+    assert scheduler.next_batch({0, 1}, 4) == [2]
+    assert scheduler.next_batch({0, 1, 2}, 4) == []
+
+
+def test_conditional_steps_are_barriers() -> None:
+    """Test steps with conditions wait for, and are waited on by, every other step."""
+    plan = _plan(
+        Step(task="a", output="$a"),
+        Step(task="b", output="$b", condition="if $a is positive"),
+        Step(task="c", output="$c"),
+    )
+    scheduler = StepScheduler(plan)
+
+    assert scheduler.dependencies == [set(), {0}, {1}]
+    assert scheduler.next_batch({0}, 4) == [1]
+
+
+def test_steps_sharing_outputs_are_ordered() -> None:
+    """Test a step overwriting an input of an earlier step waits for the earlier step."""
+    plan = _plan(
+        Step(task="a", output="$a", inputs=[Variable(name="$b")]),
+        Step(task="b", output="$b"),
+        Step(task="c", output="$c"),
+    )
+    scheduler = StepScheduler(plan)
+
+    assert scheduler.dependencies == [set(), {0}, set()]
+    assert scheduler.next_batch(set(), 4) == [0, 2]
+
+
+def test_completed_steps() -> None:
+    """Test steps executed ahead of the current step without clarifications are complete."""
+    plan = _plan(
+        Step(task="a", output="$a"),
+        Step(task="b", output="$b"),
+        Step(task="c", output="$c"),
+        Step(task="d", output="$d"),
+    )
+    plan_run = PlanRun(plan_id=plan.id, current_step_index=1, end_user_id="test")
+    plan_run.outputs.step_outputs = {
+        "$a": LocalDataValue(value=1),
+        "$c": LocalDataValue(value=3),
+        "$d": LocalDataValue(value=4),
+    }
+    plan_run.outputs.clarifications = [
+        InputClarification(
+            plan_run_id=plan_run.id, argument_name="x", user_guidance="?", step=3, source="test"
+        )
+    ]
+
+    assert StepScheduler(plan).completed_steps(plan_run) == {0, 2}
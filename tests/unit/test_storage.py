@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import TYPE_CHECKING
 from unittest.mock import ANY, MagicMock, patch
@@ -11,7 +14,7 @@ import httpx
 import pytest
 
 from portia.end_user import EndUser
-from portia.errors import StorageError
+from portia.errors import PlanNotFoundError, PlanRunNotFoundError, StorageError
 from portia.execution_agents.output import (
     AgentMemoryValue,
     LocalDataValue,
@@ -21,12 +24,15 @@ from portia.plan_run import PlanRun, PlanRunState, PlanRunUUID
 from portia.storage import (
     MAX_STORAGE_OBJECT_BYTES,
     AdditionalStorage,
+    AgentMemoryCache,
+    AgentMemoryCacheStats,
     DiskFileStorage,
     InMemoryStorage,
     PlanRunListResponse,
     PlanStorage,
     PortiaCloudStorage,
     RunStorage,
+    SQLiteStorage,
 )
 from tests.utils import get_test_config, get_test_plan_run, get_test_tool_call
 
@@ -231,6 +237,153 @@ def test_disk_storage(tmp_path: Path) -> None:
     assert user.get_additional_data("day") == "monday"
 
 
+def test_sqlite_storage(tmp_path: Path) -> None:
+    """Test SQLite storage."""
+    storage = SQLiteStorage(storage_dir=str(tmp_path), page_size=1)
+    (plan, plan_run) = get_test_plan_run()
+    storage.save_plan(plan)
+    assert storage.get_plan(plan.id) == plan
+    assert storage.plan_exists(plan.id)
+    assert not storage.plan_exists(PlanUUID())
+    assert storage.get_plan_by_query(plan.plan_context.query) == plan
+    with pytest.raises(PlanNotFoundError):
+        storage.get_plan(PlanUUID())
+    with pytest.raises(StorageError, match="No plan found for query: other"):
+        storage.get_plan_by_query("other")
+
+    storage.save_plan_run(plan_run)
+    assert storage.get_plan_run(plan_run.id) == plan_run
+    with pytest.raises(PlanRunNotFoundError):
+        storage.get_plan_run(PlanRunUUID())
+    other_run = PlanRun(plan_id=plan.id, end_user_id="user", state=PlanRunState.FAILED)
+    storage.save_plan_run(other_run)
+    assert storage.get_plan_runs().results == [plan_run, other_run]
+    failed = storage.get_plan_runs(PlanRunState.FAILED, page=1)
+    assert failed.results == [other_run]
+    assert failed.total_pages == 1
+    second_page = storage.get_plan_runs(page=2)
+    assert second_page.results == [other_run]
+    assert second_page.count == 2
+    assert second_page.total_pages == 2
+    with pytest.raises(StorageError, match="Invalid page number"):
+        storage.get_plan_runs(page=0)
+
+    value = LocalDataValue(value="v", summary="s")
+    output = storage.save_plan_run_output("$out", value, plan_run.id)
+    assert output == AgentMemoryValue(output_name="$out", plan_run_id=plan_run.id, summary="s")
+    assert storage.get_plan_run_output("$out", plan_run.id) == value
+    assert storage.save_plan_run_output("$mem", output, plan_run.id) is output
+    with pytest.raises(StorageError):
+        storage.get_plan_run_output("$mem", plan_run.id)
+
+    assert storage.get_end_user("123") is None
+    storage.save_end_user(EndUser(external_id="123", additional_data={"a": "1"}))
+    storage.save_end_user(EndUser(external_id="123", additional_data={"b": "2"}))
+    user = storage.get_end_user("123")
+    assert user is not None
+    assert user.additional_data == {"a": "1", "b": "2"}
+
+    # Data persists across instances
+    storage.close()
+    reopened = SQLiteStorage(storage_dir=str(tmp_path))
+    assert reopened.get_plan_run(plan_run.id) == plan_run
+    reopened.close()
+
+
+def test_sqlite_storage_batches_tool_calls(tmp_path: Path) -> None:
+    """Test SQLite storage buffers tool calls and writes them in batches."""
+    storage = SQLiteStorage(storage_dir=str(tmp_path), batch_size=3)
+    (_, plan_run) = get_test_plan_run()
+    tool_call = get_test_tool_call(plan_run)
+
+    def stored_tool_calls() -> int:
+        with storage._connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM tool_calls").fetchone()[0]
+
+    storage.save_tool_call(tool_call)
+    storage.save_tool_call(tool_call)
+    assert stored_tool_calls() == 0
+    storage.save_tool_call(tool_call)
+    assert stored_tool_calls() == 3
+
+    # Pending tool calls are written with the next plan run save
+    storage.save_tool_call(tool_call)
+    storage.save_plan_run(plan_run)
+    assert stored_tool_calls() == 4
+
+    storage.save_tool_call(tool_call)
+    storage.close()
+    assert stored_tool_calls() == 5
+
+
+def test_sqlite_storage_concurrent_writes(tmp_path: Path) -> None:
+    """Test SQLite storage can be written to from several threads and instances at once."""
+    storages = [SQLiteStorage(storage_dir=str(tmp_path)) for _ in range(2)]
+    plan_runs = [PlanRun(plan_id=PlanUUID(), end_user_id="user") for _ in range(20)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(
+            executor.map(
+                lambda i: storages[i % 2].save_plan_run(plan_runs[i]),
+                range(len(plan_runs)),
+            )
+        )
+
+    assert storages[0].get_plan_runs().count == len(plan_runs)
+    for storage in storages:
+        storage.close()
+
+
+def test_sqlite_storage_reuses_connections_across_threads(tmp_path: Path) -> None:
+    """Test SQLite storage doesn't keep a connection open for every thread that uses it."""
+    storage = SQLiteStorage(storage_dir=str(tmp_path))
+    plan = Plan(plan_context=PlanContext(query="query", tool_ids=[]), steps=[])
+    storage.save_plan(plan)
+
+    with patch("portia.storage.sqlite3.connect", wraps=sqlite3.connect) as mock_connect:
+        for _ in range(200):
+            thread = threading.Thread(target=storage.plan_exists, args=(plan.id,))
+            thread.start()
+            thread.join()
+
+    assert mock_connect.call_count == 0
+    assert len(storage._idle_connections) == 1
+    storage.close()
+    assert storage._idle_connections == []
+
+
+def test_sqlite_storage_close_waits_for_connections_in_use(tmp_path: Path) -> None:
+    """Test closing SQLite storage doesn't close a connection mid-query."""
+    storage = SQLiteStorage(storage_dir=str(tmp_path))
+
+    with storage._connection() as conn:
+        storage.close()
+        assert conn.execute("SELECT COUNT(*) FROM plans").fetchone() == (0,)
+
+    # The connection is closed once returned, rather than going back into the pool
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+    assert storage._idle_connections == []
+
+
+@pytest.mark.asyncio
+async def test_sqlite_storage_close_shuts_down_executor(tmp_path: Path) -> None:
+    """Test closing SQLite storage shuts down its threads, which are restarted if it is reused."""
+    storage = SQLiteStorage(storage_dir=str(tmp_path))
+    plan = Plan(plan_context=PlanContext(query="query", tool_ids=[]), steps=[])
+    await storage.asave_plan(plan)
+    executor = storage._executor
+    assert executor is not None
+
+    storage.close()
+    assert storage._executor is None
+    with pytest.raises(RuntimeError):
+        executor.submit(print)
+
+    assert await storage.aplan_exists(plan.id)
+    storage.close()
+
+
 def test_portia_cloud_storage() -> None:
     """Test PortiaCloudStorage raises StorageError on failure responses."""
     config = get_test_config(portia_api_key="test_api_key")
@@ -542,10 +695,10 @@ def test_portia_cloud_storage_errors() -> None:
         )
 
 
-def test_portia_cloud_agent_memory(httpx_mock: HTTPXMock) -> None:
+def test_portia_cloud_agent_memory(httpx_mock: HTTPXMock, tmp_path: Path) -> None:
     """Test PortiaCloudStorage agent memory."""
     config = get_test_config(portia_api_key="test_api_key")
-    agent_memory = PortiaCloudStorage(config)
+    agent_memory = PortiaCloudStorage(config, cache_dir=str(tmp_path))
     plan = Plan(
         id=PlanUUID(uuid=UUID("12345678-1234-5678-1234-567812345678")),
         plan_context=PlanContext(query="", tool_ids=[]),
@@ -580,7 +733,7 @@ def test_portia_cloud_agent_memory(httpx_mock: HTTPXMock) -> None:
     assert result.output_name == "test_output"
     assert result.plan_run_id == plan_run.id
     assert result.summary == output.get_summary()
-    assert Path(f".portia/cache/agent_memory/{plan_run.id}/test_output.json").is_file()
+    assert (tmp_path / str(plan_run.id) / "test_output.json").is_file()
 
     # Test getting an output when it is cached locally
     with patch.object(agent_memory.client, "get") as mock_get:
@@ -643,10 +796,10 @@ def test_portia_cloud_agent_memory(httpx_mock: HTTPXMock) -> None:
         assert result.get_value() == "test value"
 
 
-def test_portia_cloud_agent_memory_local_cache_expiry() -> None:
+def test_portia_cloud_agent_memory_local_cache_expiry(tmp_path: Path) -> None:
     """Test PortiaCloudStorage agent memory."""
     config = get_test_config(portia_api_key="test_api_key")
-    agent_memory = PortiaCloudStorage(config)
+    agent_memory = PortiaCloudStorage(config, cache_dir=str(tmp_path))
     plan = Plan(
         id=PlanUUID(uuid=UUID("12345678-1234-5678-1234-567812345678")),
         plan_context=PlanContext(query="", tool_ids=[]),
@@ -682,10 +835,56 @@ def test_portia_cloud_agent_memory_local_cache_expiry() -> None:
         assert "test_output_20.json" in [file.name for file in cache_files]
 
 
-def test_portia_cloud_agent_memory_errors() -> None:
+def test_agent_memory_cache_lru_eviction_by_bytes(tmp_path: Path) -> None:
+    """Test the agent memory cache evicts least recently used entries to stay within size."""
+    cache = AgentMemoryCache(str(tmp_path), max_bytes=30, max_memory_bytes=30)
+    cache.put("run/a.json", "a" * 10)
+    cache.put("run/b.json", "b" * 10)
+    cache.put("run/c.json", "c" * 10)
+    assert cache.get("run/a.json") == "a" * 10  # a is now the most recently used
+
+    cache.put("run/d.json", "d" * 10)
+    assert cache.get("run/b.json") is None
+    assert not (tmp_path / "run" / "b.json").exists()
+    assert sorted(f.name for f in (tmp_path / "run").iterdir()) == ["a.json", "c.json", "d.json"]
+    assert cache.stats.evictions == 1
+
+    # Overwriting an entry replaces its size rather than adding to it
+    cache.put("run/a.json", "A" * 20)
+    assert cache.get("run/a.json") == "A" * 20
+    assert cache.get("run/c.json") is None
+
+    # Entries larger than the whole cache aren't stored, and replace any older value
+    cache.put("run/a.json", "x" * 31)
+    assert cache.get("run/a.json") is None
+    assert not (tmp_path / "run" / "a.json").exists()
+
+
+def test_agent_memory_cache_tiers_and_stats(tmp_path: Path) -> None:
+    """Test the agent memory cache serves hot entries from memory and counts hits and misses."""
+    cache = AgentMemoryCache(str(tmp_path), max_bytes=1000, max_memory_bytes=15)
+    cache.put("run/a.json", "a" * 10)
+    cache.put("run/b.json", "b" * 10)  # pushes a out of the memory tier
+
+    assert cache.get("run/b.json") == "b" * 10
+    assert cache.get("run/a.json") == "a" * 10
+    assert cache.get("run/a.json") == "a" * 10
+    assert cache.get("run/missing.json") is None
+    assert cache.stats == AgentMemoryCacheStats(memory_hits=2, disk_hits=1, misses=1)
+    assert cache.stats.hits == 3
+
+    # Entries written by another process are picked up, and existing files are indexed
+    (tmp_path / "run" / "c.json").write_text("c" * 10)
+    assert cache.get("run/c.json") == "c" * 10
+    new_cache = AgentMemoryCache(str(tmp_path), max_bytes=25, max_memory_bytes=0)
+    new_cache.put("run/d.json", "d" * 10)
+    assert len(list(tmp_path.glob("**/*.json"))) == 2
+
+
+def test_portia_cloud_agent_memory_errors(tmp_path: Path) -> None:
     """Test PortiaCloudStorage raises StorageError on agent memory failure responses."""
     config = get_test_config(portia_api_key="test_api_key")
-    agent_memory = PortiaCloudStorage(config)
+    agent_memory = PortiaCloudStorage(config, cache_dir=str(tmp_path))
     plan = Plan(
         id=PlanUUID(uuid=UUID("12345678-1234-5678-1234-567812345678")),
         plan_context=PlanContext(query="", tool_ids=[]),
@@ -823,6 +1022,46 @@ def test_similar_plans_error(httpx_mock: HTTPXMock) -> None:
         storage.get_similar_plans("Test query")
 
 
+@pytest.mark.parametrize("storage_class", [InMemoryStorage, DiskFileStorage, SQLiteStorage])
+def test_similar_plans_local_storage(storage_class: type, tmp_path: Path) -> None:
+    """Test local storages find plans with similar queries."""
+    storage = (
+        InMemoryStorage() if storage_class is InMemoryStorage else storage_class(str(tmp_path))
+    )
+    weather_plan = Plan(plan_context=PlanContext(query="Weather in London?", tool_ids=[]), steps=[])
+    email_plan = Plan(plan_context=PlanContext(query="Email Bob the agenda", tool_ids=[]), steps=[])
+    storage.save_plan(weather_plan)
+    storage.save_plan(email_plan)
+
+    assert storage.get_similar_plans("weather in london") == [weather_plan]
+    assert storage.get_similar_plans("email bob", threshold=0.0, limit=1) == [email_plan]
+    assert storage.get_similar_plans("book a flight") == []
+
+    # Plans saved after the index is loaded are indexed too
+    later_plan = Plan(plan_context=PlanContext(query="Weather in Londo", tool_ids=[]), steps=[])
+    storage.save_plan(later_plan)
+    assert storage.get_similar_plans("weather in london") == [weather_plan, later_plan]
+
+
+@pytest.mark.parametrize("storage_class", [DiskFileStorage, SQLiteStorage])
+def test_similar_plans_loaded_from_existing_storage(storage_class: type, tmp_path: Path) -> None:
+    """Test plans saved by another storage instance are found, and deleted plans are skipped."""
+    writer = storage_class(str(tmp_path))
+    reader = storage_class(str(tmp_path))
+    plan = Plan(plan_context=PlanContext(query="Weather in London?", tool_ids=[]), steps=[])
+    writer.save_plan(plan)
+    assert reader.get_similar_plans("weather in london") == [plan]
+
+    other_plan = Plan(plan_context=PlanContext(query="Weather in Paris?", tool_ids=[]), steps=[])
+    writer.save_plan(other_plan)
+    assert reader.get_similar_plans("weather in paris", threshold=0.9) == [other_plan]
+
+    if isinstance(writer, DiskFileStorage):
+        Path(tmp_path, f"{plan.id}.json").unlink()
+        assert reader.get_similar_plans("weather in london", threshold=0.9) == []
+        assert str(plan.id) not in reader.plan_index
+
+
 def test_plan_exists_in_memory_storage() -> None:
     """Test plan_exists method with InMemoryStorage."""
     storage = InMemoryStorage()
@@ -1030,6 +1269,74 @@ def test_get_plan_by_query_disk_storage_multiple_plans(tmp_path: Path) -> None:
     assert found_plan.id == plan3.id
 
 
+def test_disk_storage_get_plan_runs_pagination(tmp_path: Path) -> None:
+    """Test DiskFileStorage pages through runs in creation order using the index."""
+    storage = DiskFileStorage(storage_dir=str(tmp_path), page_size=2)
+    plan = Plan(plan_context=PlanContext(query="query", tool_ids=[]), steps=[])
+    plan_runs = [
+        PlanRun(plan_id=plan.id, end_user_id="user", state=state)
+        for state in [
+            PlanRunState.COMPLETE,
+            PlanRunState.FAILED,
+            PlanRunState.COMPLETE,
+            PlanRunState.COMPLETE,
+            PlanRunState.IN_PROGRESS,
+        ]
+    ]
+    for plan_run in plan_runs:
+        storage.save_plan_run(plan_run)
+
+    first_page = storage.get_plan_runs(page=1)
+    assert first_page.results == plan_runs[:2]
+    assert first_page.count == 5
+    assert first_page.total_pages == 3
+    assert storage.get_plan_runs(page=3).results == plan_runs[4:]
+    assert storage.get_plan_runs(page=4).results == []
+    assert storage.get_plan_runs().results == plan_runs
+
+    completed = storage.get_plan_runs(PlanRunState.COMPLETE, page=2)
+    assert completed.results == [plan_runs[3]]
+    assert completed.count == 3
+    assert completed.current_page == 2
+
+    # Updating the state moves the run between filters without changing its position
+    plan_runs[1].state = PlanRunState.COMPLETE
+    storage.save_plan_run(plan_runs[1])
+    assert storage.get_plan_runs(PlanRunState.FAILED).results == []
+    assert storage.get_plan_runs(PlanRunState.COMPLETE, page=1).results == plan_runs[:2]
+
+    with pytest.raises(StorageError, match="Invalid page number"):
+        storage.get_plan_runs(page=0)
+
+
+def test_disk_storage_index_rebuild(tmp_path: Path) -> None:
+    """Test the index is rebuilt from existing files and skips entries for deleted files."""
+    storage = DiskFileStorage(storage_dir=str(tmp_path))
+    (plan, plan_run) = get_test_plan_run()
+    storage.save_plan(plan)
+    storage.save_plan_run(plan_run)
+
+    # Files written before the index existed are picked up when it is first opened
+    Path(storage.index.path).unlink()
+    fresh_storage = DiskFileStorage(storage_dir=str(tmp_path))
+    assert fresh_storage.get_plan_by_query(plan.plan_context.query) == plan
+    assert fresh_storage.get_plan_runs().results == [plan_run]
+
+    # Files written behind the storage's back are picked up by an explicit rebuild
+    other_plan = Plan(plan_context=PlanContext(query="other query", tool_ids=[]), steps=[])
+    (tmp_path / f"{other_plan.id}.json").write_text(other_plan.model_dump_json())
+    (tmp_path / "plan-invalid.json").write_text("not json")
+    with pytest.raises(StorageError):
+        fresh_storage.get_plan_by_query("other query")
+    assert fresh_storage.rebuild_index() == 3
+    assert fresh_storage.get_plan_by_query("other query") == other_plan
+
+    # Deleted files are dropped rather than raising
+    (tmp_path / f"{plan_run.id}.json").unlink()
+    assert fresh_storage.get_plan_runs().results == []
+    assert fresh_storage.index.plan_run_ids() == ([], 0)
+
+
 def test_get_plan_by_query_portia_cloud_storage(httpx_mock: HTTPXMock) -> None:
     """Test get_plan_by_query method with PortiaCloudStorage."""
     config = get_test_config(portia_api_key="test_api_key")
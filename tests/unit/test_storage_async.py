@@ -23,6 +23,7 @@ from portia.storage import (
     InMemoryStorage,
     PlanRunListResponse,
     PortiaCloudStorage,
+    SQLiteStorage,
 )
 from portia.tool_call import ToolCallRecord, ToolCallStatus
 from tests.utils import get_test_config, get_test_tool_call
@@ -1060,10 +1061,10 @@ async def test_async_portia_cloud_storage_errors(httpx_mock: HTTPXMock) -> None:
 
 
 @pytest.mark.asyncio
-async def test_async_portia_cloud_agent_memory(httpx_mock: HTTPXMock) -> None:
+async def test_async_portia_cloud_agent_memory(httpx_mock: HTTPXMock, tmp_path: Path) -> None:
     """Test async PortiaCloudStorage agent memory."""
     config = get_test_config(portia_api_key="test_api_key")
-    agent_memory = PortiaCloudStorage(config)
+    agent_memory = PortiaCloudStorage(config, cache_dir=str(tmp_path))
     plan = Plan(
         id=PlanUUID(uuid=UUID("12345678-1234-5678-1234-567812345678")),
         plan_context=PlanContext(query="", tool_ids=[]),
@@ -1098,7 +1099,7 @@ async def test_async_portia_cloud_agent_memory(httpx_mock: HTTPXMock) -> None:
     assert result.output_name == "test_output"
     assert result.plan_run_id == plan_run.id
     assert result.summary == output.get_summary()
-    assert Path(f".portia/cache/agent_memory/{plan_run.id}/test_output.json").is_file()
+    assert (tmp_path / str(plan_run.id) / "test_output.json").is_file()
 
     # Test getting an output when it is cached locally
     # Since we're using httpx_mock, we need to mock the cache read instead
@@ -1160,10 +1161,12 @@ async def test_async_portia_cloud_agent_memory(httpx_mock: HTTPXMock) -> None:
 
 
 @pytest.mark.asyncio
-async def test_async_portia_cloud_agent_memory_errors(httpx_mock: HTTPXMock) -> None:
+async def test_async_portia_cloud_agent_memory_errors(
+    httpx_mock: HTTPXMock, tmp_path: Path
+) -> None:
     """Test async PortiaCloudStorage raises StorageError on agent memory failure responses."""
     config = get_test_config(portia_api_key="test_api_key")
-    agent_memory = PortiaCloudStorage(config)
+    agent_memory = PortiaCloudStorage(config, cache_dir=str(tmp_path))
     plan = Plan(
         id=PlanUUID(uuid=UUID("12345678-1234-5678-1234-567812345678")),
         plan_context=PlanContext(query="", tool_ids=[]),
@@ -1419,3 +1422,29 @@ async def test_async_get_plan_by_query_portia_cloud_storage_error(httpx_mock: HT
 
     with pytest.raises(StorageError):
         await storage.aget_plan_by_query("test query")
+
+
+@pytest.mark.asyncio
+async def test_async_sqlite_storage_methods(tmp_path: Path) -> None:
+    """Test async SQLite storage methods."""
+    storage = SQLiteStorage(storage_dir=str(tmp_path))
+    plan = Plan(plan_context=PlanContext(query="test query", tool_ids=[]), steps=[])
+    plan_run = PlanRun(plan_id=plan.id, end_user_id="user", state=PlanRunState.COMPLETE)
+
+    await storage.asave_plan(plan)
+    assert await storage.aget_plan(plan.id) == plan
+    assert await storage.aget_plan_by_query("test query") == plan
+    assert await storage.aplan_exists(plan.id)
+
+    await storage.asave_plan_run(plan_run)
+    assert await storage.aget_plan_run(plan_run.id) == plan_run
+    runs = await storage.aget_plan_runs(PlanRunState.COMPLETE)
+    assert runs.results == [plan_run]
+
+    await storage.asave_plan_run_output("out", LocalDataValue(value="v"), plan_run.id)
+    assert await storage.aget_plan_run_output("out", plan_run.id) == LocalDataValue(value="v")
+
+    await storage.asave_tool_call(get_test_tool_call(plan_run))
+    await storage.asave_end_user(EndUser(external_id="123"))
+    assert await storage.aget_end_user("123") == EndUser(external_id="123")
+    storage.close()
@@ -0,0 +1,59 @@
+"""Tests for rendering templates."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from jinja2 import TemplateSyntaxError
+
+from portia.templates import render
+from portia.templates.render import get_template_environment, register_template, render_template
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+@pytest.fixture(autouse=True)
+def restore_templates() -> Iterator[None]:
+    """Remove the templates registered by a test."""
+    registered = dict(render._registered_templates)
+    yield
+    render._registered_templates.clear()
+    render._registered_templates.update(registered)
+    get_template_environment().cache.clear()  # pyright: ignore[reportOptionalMemberAccess]
+
+
+def test_render_template_compiles_templates_once() -> None:
+    """Test shipped templates are compiled on first use and then reused."""
+    rendered = render_template(
+        "tool_description.xml.jinja",
+        tool={"overview_description": "Adds two numbers", "args": []},
+    )
+
+    assert "Adds two numbers" in rendered
+    environment = get_template_environment()
+    assert environment.get_template("tool_description.xml.jinja") is environment.get_template(
+        "tool_description.xml.jinja",
+    )
+
+
+def test_register_template() -> None:
+    """Test registered templates are rendered, and replace templates with the same name."""
+    register_template("greeting.jinja", "Hello {{ name }}")
+    assert render_template("greeting.jinja", name="<Alice>") == "Hello &lt;Alice&gt;"
+
+    register_template("greeting.jinja", "Goodbye {{ name }}")
+    assert render_template("greeting.jinja", name="Alice") == "Goodbye Alice"
+
+    render_template("tool_description.xml.jinja", tool={})
+    register_template("tool_description.xml.jinja", "Custom {{ tool.overview }}")
+    assert render_template("tool_description.xml.jinja", tool={"overview": "x"}) == "Custom x"
+
+
+def test_register_template_invalid_syntax() -> None:
+    """Test invalid templates are rejected when registered."""
+    with pytest.raises(TemplateSyntaxError):
+        register_template("broken.jinja", "{% if %}")
+
+    assert "broken.jinja" not in render._registered_templates
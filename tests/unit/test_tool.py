@@ -2,10 +2,13 @@
 
 import asyncio
 import json
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from enum import Enum
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import anyio
 import httpx
 import mcp
 import pytest
@@ -21,9 +24,11 @@ from portia.clarification import (
     MultipleChoiceClarification,
     ValueConfirmationClarification,
 )
+from portia.cloud import PortiaCloudClient, aclose_shared_async_clients
 from portia.errors import InvalidToolDescriptionError, ToolHardError, ToolSoftError
 from portia.execution_agents.output import LocalDataValue
-from portia.mcp_session import StdioMcpClientConfig
+from portia.mcp_session import McpClientConfig, StdioMcpClientConfig
+from portia.storage import PortiaCloudStorage
 from portia.tool import PortiaMcpTool, PortiaRemoteTool, Tool, ToolRunContext, flatten_exceptions
 from tests.utils import (
     AdditionTool,
@@ -284,6 +289,51 @@ def test_remote_tool_hard_error_from_server(httpx_mock: HTTPXMock) -> None:
     )
 
 
+@pytest.mark.asyncio
+async def test_remote_tool_arun_uses_shared_async_client(httpx_mock: HTTPXMock) -> None:
+    """Test remote tool arun reuses the async client Portia Cloud storage uses."""
+    endpoint = "https://api.fake-portia.test"
+    httpx_mock.add_response(
+        url=f"{endpoint}/api/v0/tools/test/run/",
+        json={"output": {"value": "Success"}},
+        is_reusable=True,
+    )
+    config = get_test_config(
+        portia_api_endpoint=endpoint,
+        portia_api_key="test",
+        portia_http_max_connections=5,
+        portia_http2=False,
+    )
+    tool = PortiaRemoteTool(
+        id="test",
+        name="test",
+        description="",
+        output_schema=("", ""),
+        client=PortiaCloudClient.new_client(config),
+    )
+    ctx = get_test_tool_context(config=config)
+
+    clients: list[httpx.AsyncClient] = []
+    shared_async_client = PortiaCloudClient.shared_async_client
+
+    def record_client(self: PortiaCloudClient, **kwargs: Any) -> httpx.AsyncClient:
+        clients.append(shared_async_client(self, **kwargs))
+        return clients[-1]
+
+    with patch.object(PortiaCloudClient, "shared_async_client", new=record_client):
+        assert await tool.arun_without_blocking(ctx, a=1) == "Success"
+        assert await tool.arun_without_blocking(ctx, a=2) == "Success"
+
+    assert len(clients) == 2
+    assert clients[0] is clients[1]
+    assert clients[0] is PortiaCloudStorage(config).client_builder.shared_async_client()
+    requests = httpx_mock.get_requests()
+    assert len(requests) == 2
+    assert requests[0].headers["Authorization"] == "Api-Key test"
+    assert json.loads(requests[1].content)["arguments"] == {"a": 2}
+    await aclose_shared_async_clients()
+
+
 def test_remote_tool_run_with_unserializable_object() -> None:
     """Test remote tool run with unserializable object."""
     endpoint = "https://api.fake-portia.test"
@@ -751,20 +801,19 @@ def test_portia_mcp_tool_call_with_error() -> None:
 @pytest.mark.asyncio
 async def test_portia_mcp_tool_call_with_timeout() -> None:
     """Test that the timeout takes effect."""
-    mock_mcp_session = MockMcpSessionWrapper(
-        MagicMock(spec=ClientSession),
-        exit_error=ExceptionGroup(
-            "group",
-            [
-                mcp.McpError(
-                    mcp.types.ErrorData(
-                        code=httpx.codes.REQUEST_TIMEOUT,
-                        message="Request timed out",
-                    ),
+    mock_mcp_session = MockMcpSessionWrapper(MagicMock(spec=ClientSession))
+    # Pooled sessions stay open, so MCP errors surface from the call rather than on exit
+    mock_mcp_session.session.call_tool.side_effect = ExceptionGroup(
+        "group",
+        [
+            mcp.McpError(
+                mcp.types.ErrorData(
+                    code=httpx.codes.REQUEST_TIMEOUT,
+                    message="Request timed out",
                 ),
-                Exception("Another error"),
-            ],
-        ),
+            ),
+            Exception("Another error"),
+        ],
     )
     tool = PortiaMcpTool(
         id="mcp:mock_mcp:test_tool",
@@ -826,9 +875,9 @@ async def test_portia_mcp_tool_call_with_tool_call_timeout() -> None:
 @pytest.mark.asyncio
 async def test_portia_mcp_tool_call_with_other_mcp_error() -> None:
     """Test that other MCP errors are raised as hard errors."""
-    mock_mcp_session = MockMcpSessionWrapper(
-        MagicMock(spec=ClientSession),
-        exit_error=ExceptionGroup(
+    mock_mcp_session = MockMcpSessionWrapper(MagicMock(spec=ClientSession))
+    mock_mcp_session.session.call_tool = AsyncMock(
+        side_effect=ExceptionGroup(
             "group",
             [
                 mcp.McpError(
@@ -841,12 +890,6 @@ async def test_portia_mcp_tool_call_with_other_mcp_error() -> None:
             ],
         ),
     )
-    mock_mcp_session.session.call_tool = AsyncMock(
-        return_value=mcp.types.CallToolResult(
-            content=[],
-            isError=False,
-        ),
-    )
 
     tool = PortiaMcpTool(
         id="mcp:mock_mcp:test_tool",
@@ -871,6 +914,65 @@ async def test_portia_mcp_tool_call_with_other_mcp_error() -> None:
         await tool.arun(get_test_tool_context(), a=1, b=2)
 
 
+def _get_test_mcp_tool() -> PortiaMcpTool:
+    return PortiaMcpTool(
+        id="mcp:mock_mcp:test_tool",
+        name="test_tool",
+        description="I am a tool",
+        output_schema=("str", "Tool output formatted as a JSON string"),
+        mcp_client_config=StdioMcpClientConfig(
+            server_name="mock_mcp",
+            command="test",
+            args=["test"],
+        ),
+    )
+
+
+@pytest.mark.asyncio
+async def test_portia_mcp_tool_call_not_retried_after_connection_lost() -> None:
+    """Test tool calls aren't retried once started, as the tool may already have run."""
+    mock_mcp_session = MockMcpSessionWrapper(MagicMock(spec=ClientSession))
+    mock_mcp_session.session.call_tool = AsyncMock(side_effect=anyio.ClosedResourceError)
+    tool = _get_test_mcp_tool()
+
+    with (
+        patch("portia.tool.get_mcp_session", new=mock_mcp_session.mock_mcp_session),
+        pytest.raises(ToolHardError),
+    ):
+        await tool.arun(get_test_tool_context(), a=1, b=2)
+
+    mock_mcp_session.session.call_tool.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_portia_mcp_tool_call_retries_acquiring_session() -> None:
+    """Test a session whose connection is lost while being acquired is replaced."""
+    mock_session = MagicMock(spec=ClientSession)
+    mock_session.call_tool = AsyncMock(
+        return_value=mcp.types.CallToolResult(
+            content=[mcp.types.TextContent(type="text", text="Hello, world!")],
+            isError=False,
+        ),
+    )
+    sessions_opened = 0
+
+    @asynccontextmanager
+    async def flaky_mcp_session(_: McpClientConfig) -> AsyncIterator[ClientSession]:
+        nonlocal sessions_opened
+        sessions_opened += 1
+        if sessions_opened == 1:
+            raise anyio.ClosedResourceError
+        yield mock_session
+
+    tool = _get_test_mcp_tool()
+    with patch("portia.tool.get_mcp_session", new=flaky_mcp_session):
+        tool_result = await tool.arun(get_test_tool_context(), a=1, b=2)
+
+    assert "Hello, world!" in tool_result
+    assert sessions_opened == 2
+    mock_session.call_tool.assert_called_once()
+
+
 def test_flatten_exceptions() -> None:
     """Test flatten_exceptions."""
     value_error_1 = ValueError("test1")
@@ -0,0 +1,129 @@
+"""Tests for the tool catalog cache."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+
+from portia.tool_catalog_cache import (
+    CATALOG_CACHE_VERSION,
+    CachedToolCatalog,
+    RawToolCatalog,
+    ToolCatalogCache,
+    fingerprint,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+CATALOG: RawToolCatalog = [{"name": "add_one", "inputSchema": {"type": "object"}}]
+UPDATED_CATALOG: RawToolCatalog = [{"name": "add_two", "inputSchema": {"type": "object"}}]
+
+
+def _wait_for_refresh(cache: ToolCatalogCache) -> None:
+    """Wait for the cache's background refreshes to finish."""
+    for thread in threading.enumerate():
+        if thread.name == "portia-tool-catalog":
+            thread.join(timeout=5)
+    assert not cache._refreshing
+
+
+def test_tool_catalog_cache_fetches_on_miss_then_serves_from_cache(tmp_path: Path) -> None:
+    """Test a catalog is fetched once, then served from the cache while fresh."""
+    cache = ToolCatalogCache(tmp_path)
+    fetches = []
+
+    def fetch() -> RawToolCatalog:
+        fetches.append(1)
+        return CATALOG
+
+    assert cache.load("mcp:server", fingerprint("server"), fetch) == CATALOG
+    # A new cache over the same directory, e.g. in another process, is served from disk too
+    assert ToolCatalogCache(tmp_path).load("mcp:server", fingerprint("server"), fetch) == CATALOG
+    assert len(fetches) == 1
+
+
+def test_tool_catalog_cache_serves_stale_catalog_while_refreshing(tmp_path: Path) -> None:
+    """Test a stale catalog is served immediately and refreshed in the background."""
+    cache = ToolCatalogCache(tmp_path, ttl_seconds=60)
+    server_fingerprint = fingerprint("server")
+    cache.put("mcp:server", server_fingerprint, CATALOG)
+    cache._file("mcp:server").write_text(
+        CachedToolCatalog(
+            fingerprint=server_fingerprint,
+            fetched_at=time.time() - 120,
+            tools=CATALOG,
+        ).model_dump_json(),
+    )
+
+    assert cache.load("mcp:server", server_fingerprint, lambda: UPDATED_CATALOG) == CATALOG
+    _wait_for_refresh(cache)
+    catalog = cache.get("mcp:server", server_fingerprint)
+    assert catalog is not None
+    assert catalog.tools == UPDATED_CATALOG
+    assert cache.is_fresh(catalog)
+
+
+@pytest.mark.asyncio
+async def test_tool_catalog_cache_aload_refreshes_stale_catalog(tmp_path: Path) -> None:
+    """Test the async load serves a stale catalog and refreshes it in the background."""
+    cache = ToolCatalogCache(tmp_path, ttl_seconds=60)
+    server_fingerprint = fingerprint("server")
+    cache._file("mcp:server").parent.mkdir(parents=True, exist_ok=True)
+    cache._file("mcp:server").write_text(
+        CachedToolCatalog(
+            fingerprint=server_fingerprint,
+            fetched_at=time.time() - 120,
+            tools=CATALOG,
+        ).model_dump_json(),
+    )
+
+    async def fetch() -> RawToolCatalog:
+        return UPDATED_CATALOG
+
+    assert await cache.aload("mcp:server", server_fingerprint, fetch) == CATALOG
+    _wait_for_refresh(cache)
+    assert await cache.aload("mcp:server", server_fingerprint, fetch) == UPDATED_CATALOG
+
+
+def test_tool_catalog_cache_keeps_catalog_when_refresh_fails(tmp_path: Path) -> None:
+    """Test a failed refresh leaves the stale catalog in place to be served."""
+    cache = ToolCatalogCache(tmp_path, ttl_seconds=0.01)
+    server_fingerprint = fingerprint("server")
+    cache.put("mcp:server", server_fingerprint, CATALOG)
+    time.sleep(0.02)
+
+    def fetch() -> RawToolCatalog:
+        raise ConnectionError("server unavailable")
+
+    assert cache.load("mcp:server", server_fingerprint, fetch) == CATALOG
+    _wait_for_refresh(cache)
+    catalog = cache.get("mcp:server", server_fingerprint)
+    assert catalog is not None
+    assert catalog.tools == CATALOG
+
+
+def test_tool_catalog_cache_ignores_mismatched_entries(tmp_path: Path) -> None:
+    """Test catalogs of other servers, other cache versions or corrupt files aren't served."""
+    cache = ToolCatalogCache(tmp_path)
+    cache.put("mcp:server", fingerprint("server", "old-key"), CATALOG)
+    assert cache.get("mcp:server", fingerprint("server", "new-key")) is None
+
+    cache._file("mcp:server").write_text(
+        CachedToolCatalog(
+            version=CATALOG_CACHE_VERSION + 1,
+            fingerprint=fingerprint("server"),
+            fetched_at=time.time(),
+            tools=CATALOG,
+        ).model_dump_json(),
+    )
+    assert cache.get("mcp:server", fingerprint("server")) is None
+
+    cache._file("mcp:server").write_text("not json")
+    assert cache.get("mcp:server", fingerprint("server")) is None
+    assert cache.load("mcp:server", fingerprint("server"), lambda: UPDATED_CATALOG) == (
+        UPDATED_CATALOG
+    )
@@ -0,0 +1,110 @@
+"""Tests for the tool retrieval indexes."""
+
+from __future__ import annotations
+
+from langchain_core.embeddings import Embeddings
+from pydantic import BaseModel
+
+from portia.tool_index import BM25ToolIndex, EmbeddingToolIndex, tokenize
+from tests.utils import MockTool
+
+WEATHER_TOOL = MockTool(id="weather_tool", name="Weather Tool", description="Get the weather")
+EMAIL_TOOL = MockTool(
+    id="portia:google:gmail:send_email",
+    name="Gmail Tool",
+    description="Sends emails to recipients",
+)
+CALENDAR_TOOL = MockTool(id="calendar_tool", name="Calendar", description="Create calendar events")
+
+
+def test_tokenize_splits_identifiers() -> None:
+    """Test identifiers are split into lower case terms without stop words or plurals."""
+    assert tokenize("portia:google:gmail:send_email") == [
+        "portia",
+        "google",
+        "gmail",
+        "send",
+        "email",
+    ]
+    assert tokenize("sendEmails to the HTTPServer") == ["send", "email", "http", "server"]
+
+
+def test_bm25_index_ranks_relevant_tools() -> None:
+    """Test tools are ranked by their relevance to the query."""
+    index = BM25ToolIndex()
+    for tool in [WEATHER_TOOL, EMAIL_TOOL, CALENDAR_TOOL]:
+        index.add(tool)
+
+    scores = index.scores("send an email to Bob")
+    assert set(scores) == {EMAIL_TOOL.id}
+    assert index.top_k("what's the weather?", [WEATHER_TOOL, EMAIL_TOOL, CALENDAR_TOOL], 2) == [
+        WEATHER_TOOL,
+        EMAIL_TOOL,
+    ]
+
+
+class _GeocodeSchema(BaseModel):
+    postcode: str
+
+
+def test_bm25_index_indexes_argument_names() -> None:
+    """Test argument names are searchable."""
+    index = BM25ToolIndex()
+    index.add(MockTool(id="geocode_tool", args_schema=_GeocodeSchema))
+    index.add(WEATHER_TOOL)
+
+    assert set(index.scores("look up a postcode")) == {"geocode_tool"}
+
+
+def test_bm25_index_updates_incrementally() -> None:
+    """Test tools can be replaced and removed, and that syncing only re-indexes changes."""
+    index = BM25ToolIndex()
+    index.sync({WEATHER_TOOL.id: WEATHER_TOOL, EMAIL_TOOL.id: EMAIL_TOOL})
+    assert len(index) == 2
+
+    forecast_tool = WEATHER_TOOL.model_copy(update={"description": "Get the forecast"})
+    index.add(forecast_tool)
+    assert set(index.scores("forecast")) == {WEATHER_TOOL.id}
+    assert set(index.scores("weather")) == {WEATHER_TOOL.id}
+
+    index.remove(EMAIL_TOOL.id)
+    assert index.scores("email") == {}
+
+    copied = index.copy()
+    copied.sync({CALENDAR_TOOL.id: CALENDAR_TOOL})
+    assert set(copied.scores("calendar forecast")) == {CALENDAR_TOOL.id}
+    assert set(index.scores("calendar forecast")) == {WEATHER_TOOL.id}
+
+
+class _KeywordEmbeddings(Embeddings):
+    """Embeds text by counting a fixed set of keywords."""
+
+    keywords = ("weather", "email", "calendar")
+
+    def __init__(self) -> None:
+        self.documents_embedded = 0
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.documents_embedded += len(texts)
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return [float(text.lower().count(keyword)) for keyword in self.keywords]
+
+
+def test_embedding_index_ranks_by_similarity() -> None:
+    """Test the embedding index ranks tools by cosine similarity and embeds each tool once."""
+    embeddings = _KeywordEmbeddings()
+    index = EmbeddingToolIndex(embeddings)
+    tools = {tool.id: tool for tool in [WEATHER_TOOL, EMAIL_TOOL, CALENDAR_TOOL]}
+    index.sync(tools)
+    index.sync(tools)
+    assert embeddings.documents_embedded == 3
+
+    assert index.top_k("book a calendar slot", tools.values(), 1) == [CALENDAR_TOOL]
+
+    copied = index.copy()
+    copied.remove(CALENDAR_TOOL.id)
+    assert len(copied) == 2
+    assert len(index) == 3
+    assert embeddings.documents_embedded == 3
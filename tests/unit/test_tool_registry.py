@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import time
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from typing import TYPE_CHECKING, Any
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -19,6 +21,8 @@ from portia.model import GenerativeModel
 from portia.open_source_tools.llm_tool import LLMTool
 from portia.open_source_tools.registry import open_source_tool_registry
 from portia.tool import PortiaRemoteTool
+from portia.tool_catalog_cache import ToolCatalogCache
+from portia.tool_index import BM25ToolIndex
 from portia.tool_registry import (
     InMemoryToolRegistry,
     McpToolRegistry,
@@ -30,6 +34,7 @@ from tests.utils import MockMcpSessionWrapper, MockTool, get_test_tool_context
 
 if TYPE_CHECKING:
     from collections.abc import Iterator
+    from pathlib import Path
 
     from pytest_httpx import HTTPXMock
     from pytest_mock import MockerFixture
@@ -137,6 +142,86 @@ def test_tool_registry_match_tools() -> None:
     assert {tool.id for tool in matched_tools} == {MOCK_TOOL_ID, OTHER_MOCK_TOOL_ID}
 
 
+def test_tool_registry_match_tools_retrieves_relevant_tools() -> None:
+    """Test registries larger than the cap return the tools most relevant to the query."""
+    tool_registry = ToolRegistry(
+        [MockTool(id=f"filler_tool_{i}") for i in range(5)],
+    ).with_tool_index(max_matched_tools=2)
+    tool_registry.with_tool(MockTool(id="weather_tool", description="Get the weather"))
+
+    matched_tools = tool_registry.match_tools("What is the weather in London?")
+    assert [tool.id for tool in matched_tools] == ["weather_tool", "filler_tool_0"]
+    assert tool_registry.tool_index is not None
+    assert "weather_tool" in tool_registry.tool_index.scores("weather")
+
+    # Tools added later are indexed incrementally
+    tool_registry.with_tool(MockTool(id="email_tool", description="Send an email"))
+    matched_tools = tool_registry.match_tools("send an email about the weather")
+    assert {tool.id for tool in matched_tools} == {"weather_tool", "email_tool"}
+
+    # Registries within the cap, and queries without a query, return every tool
+    assert len(tool_registry.match_tools()) == 7
+    assert len(tool_registry.with_tool_index(max_matched_tools=None).match_tools("email")) == 7
+
+
+def test_tool_registry_match_tools_logs_dropped_tools(mocker: MockerFixture) -> None:
+    """Test match_tools logs how many tools it keeps and drops when narrowing them down."""
+    mock_logger = mocker.Mock()
+    mocker.patch("portia.tool_registry.logger", return_value=mock_logger)
+    tool_registry = ToolRegistry(
+        [MockTool(id=f"filler_tool_{i}") for i in range(5)],
+    ).with_tool_index(max_matched_tools=2)
+
+    tool_registry.match_tools("filler")
+    mock_logger.info.assert_called_once()
+    assert "Matched 2 of 5 tools to the query, dropping 3" in mock_logger.info.call_args.args[0]
+
+    # Nothing is logged when every tool is returned
+    mock_logger.reset_mock()
+    tool_registry.with_tool_index(max_matched_tools=5).match_tools("filler")
+    mock_logger.info.assert_not_called()
+
+
+def test_tool_registry_creates_tool_index_once_across_threads() -> None:
+    """Test concurrent match_tools calls share one lazily created tool index."""
+    tool_registry = ToolRegistry(
+        [MockTool(id=f"filler_tool_{i}") for i in range(5)],
+    ).with_tool_index(max_matched_tools=2)
+
+    def slow_index() -> BM25ToolIndex:
+        time.sleep(0.01)
+        return BM25ToolIndex()
+
+    with (
+        patch("portia.tool_registry.BM25ToolIndex", side_effect=slow_index) as mock_index,
+        ThreadPoolExecutor(max_workers=8) as executor,
+    ):
+        list(executor.map(lambda _: tool_registry.match_tools("filler"), range(8)))
+
+    mock_index.assert_called_once()
+
+
+def test_tool_registry_retrieval_survives_filtering_and_adding() -> None:
+    """Test filtered and combined registries keep the retrieval settings and index."""
+    tool_registry = ToolRegistry(
+        [MockTool(id=f"filler_tool_{i}") for i in range(3)]
+        + [MockTool(id="weather_tool", description="Get the weather")],
+    ).with_tool_index(max_matched_tools=1)
+    assert [tool.id for tool in tool_registry.match_tools("weather")] == ["weather_tool"]
+
+    filtered = tool_registry.filter_tools(lambda tool: tool.id != "filler_tool_0")
+    assert [tool.id for tool in filtered.match_tools("weather")] == ["weather_tool"]
+
+    other_registry = ToolRegistry(
+        [MockTool(id="email_tool", description="Send an email"), MockTool(id="other_tool")],
+    )
+    other_registry.with_tool_index(max_matched_tools=1).match_tools("email")
+    combined = tool_registry + other_registry
+    assert isinstance(combined.tool_index, BM25ToolIndex)
+    assert len(combined.tool_index) == 6
+    assert [tool.id for tool in combined.match_tools("email")] == ["email_tool"]
+
+
 def test_combined_tool_registry_duplicate_tool() -> None:
     """Test searching across multiple registries in ToolRegistry."""
     tool_registry = ToolRegistry([MockTool(id=MOCK_TOOL_ID)])
@@ -616,6 +701,48 @@ def test_mcp_tool_registry_get_tool(mcp_tool_registry: McpToolRegistry) -> None:
     assert issubclass(tool.args_schema, BaseModel)
 
 
+def test_mcp_tool_registry_loads_tools_from_catalog_cache(tmp_path: Path) -> None:
+    """Test a McpToolRegistry given a catalog cache only lists tools when the cache is empty."""
+    mock_session = MagicMock(spec=ClientSession)
+    mock_session.list_tools = AsyncMock(
+        return_value=mcp.ListToolsResult(
+            tools=[
+                mcp.Tool(
+                    name="test_tool",
+                    description="I am a tool",
+                    inputSchema={"type": "object", "properties": {"input": {"type": "string"}}},
+                ),
+            ],
+        )
+    )
+    catalog_cache = ToolCatalogCache(tmp_path)
+
+    with patch(
+        "portia.tool_registry.get_mcp_session",
+        new=MockMcpSessionWrapper(mock_session).mock_mcp_session,
+    ):
+        registries = [
+            McpToolRegistry.from_stdio_connection(
+                server_name="mock_mcp",
+                command="test",
+                catalog_cache=catalog_cache,
+            )
+            for _ in range(2)
+        ]
+        other_server = McpToolRegistry.from_stdio_connection(
+            server_name="mock_mcp",
+            command="other",
+            catalog_cache=catalog_cache,
+        )
+
+    # The second registry is loaded from the cache, but a changed command invalidates it
+    assert mock_session.list_tools.await_count == 2
+    for registry in [*registries, other_server]:
+        tool = registry.get_tool("mcp:mock_mcp:test_tool")
+        assert tool.description == "I am a tool"
+        assert issubclass(tool.args_schema, BaseModel)
+
+
 def test_mcp_tool_registry_filters_bad_tools() -> None:
     """Test that the MCPToolRegistry filters out tools that are not valid."""
     mock_session = MagicMock(spec=ClientSession)
@@ -895,6 +1022,44 @@ def test_generate_pydantic_model_from_json_schema_handles_omissible_fields_model
     assert model_2._fields_must_omit_none_on_serialize == ["last_name"]  # type: ignore  # noqa: PGH003
 
 
+def test_generate_pydantic_model_from_json_schema_caches_models() -> None:
+    """Test identical schemas produce the same model, including the models of nested objects."""
+
+    def schema(street_description: str) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "address": {
+                    "type": "object",
+                    "properties": {
+                        "street": {"type": "string", "description": street_description},
+                    },
+                },
+                "notes": {"type": "string"},
+            },
+            "required": ["address"],
+        }
+
+    model = generate_pydantic_model_from_json_schema("TestCachedModel", schema("The street"))
+
+    assert (
+        generate_pydantic_model_from_json_schema("TestCachedModel", schema("The street")) is model
+    )
+    assert (
+        generate_pydantic_model_from_json_schema("OtherCachedModel", schema("The street"))
+        is not model
+    )
+    changed = generate_pydantic_model_from_json_schema("TestCachedModel", schema("The road"))
+    assert changed is not model
+    assert (
+        generate_pydantic_model_from_json_schema("OtherCachedModel", schema("The street"))
+        .model_fields["address"]
+        .annotation
+        is model.model_fields["address"].annotation
+    )
+    assert model._fields_must_omit_none_on_serialize == ["notes"]  # type: ignore  # noqa: PGH003
+
+
 def test_generate_pydantic_model_from_json_schema_handles_number_type() -> None:
     """Test for generate_pydantic_model_from_json_schema.
 
@@ -1,5 +1,7 @@
 """Tests for the ToolCallWrapper class."""
 
+import threading
+
 import pytest
 
 from portia.clarification import Clarification
@@ -7,7 +9,7 @@ from portia.end_user import EndUser
 from portia.errors import ToolHardError
 from portia.execution_agents.output import LocalDataValue
 from portia.storage import AdditionalStorage, ToolCallRecord, ToolCallStatus
-from portia.tool import Tool
+from portia.tool import Tool, ToolRunContext
 from portia.tool_wrapper import ToolCallWrapper
 from tests.utils import (
     AdditionTool,
@@ -127,3 +129,58 @@ def test_tool_call_wrapper_run_returns_none(mock_storage: MockStorage) -> None:
     wrapper.run(ctx)
     assert mock_storage.records[-1].output
     assert mock_storage.records[-1].output == LocalDataValue(value=None).model_dump(mode="json")
+
+
+class AsyncAdditionTool(AdditionTool):
+    """Addition tool with a native async implementation."""
+
+    async def arun(self, _: ToolRunContext, a: int, b: int) -> int:
+        """Add the numbers, recording that the async implementation was used."""
+        return a + b + 100
+
+
+@pytest.mark.asyncio
+async def test_tool_call_wrapper_arun_uses_child_arun(mock_storage: MockStorage) -> None:
+    """Test arun awaits the child tool's own arun and records the call."""
+    (_, plan_run) = get_test_plan_run()
+    wrapper = ToolCallWrapper(AsyncAdditionTool(), mock_storage, plan_run)
+    ctx = get_test_tool_context()
+
+    result = await wrapper.arun(ctx, 1, 2)
+
+    assert result == 103
+    assert mock_storage.records[-1].status == ToolCallStatus.SUCCESS
+    assert mock_storage.records[-1].output == 103
+    assert mock_storage.records[-1].latency_seconds > 0
+
+
+@pytest.mark.asyncio
+async def test_tool_call_wrapper_arun_offloads_blocking_tool(mock_storage: MockStorage) -> None:
+    """Test arun runs tools without arun on the shared tool threads."""
+    threads = []
+
+    class BlockingTool(AdditionTool):
+        def run(self, ctx: ToolRunContext, a: int, b: int) -> int:
+            threads.append(threading.current_thread().name)
+            return super().run(ctx, a, b)
+
+    (_, plan_run) = get_test_plan_run()
+    wrapper = ToolCallWrapper(BlockingTool(), mock_storage, plan_run)
+    ctx = get_test_tool_context()
+
+    assert await wrapper.arun(ctx, 1, 2) == 3
+    assert threads[0].startswith("portia-tool")
+    assert mock_storage.records[-1].status == ToolCallStatus.SUCCESS
+
+
+@pytest.mark.asyncio
+async def test_tool_call_wrapper_arun_with_exception(mock_storage: MockStorage) -> None:
+    """Test arun records failed calls."""
+    (_, plan_run) = get_test_plan_run()
+    wrapper = ToolCallWrapper(ErrorTool(), mock_storage, plan_run)
+    ctx = get_test_tool_context()
+
+    with pytest.raises(ToolHardError, match="Test error"):
+        await wrapper.arun(ctx, "Test error", False, False)  # noqa: FBT003
+    assert mock_storage.records[-1].status == ToolCallStatus.FAILED
+    assert mock_storage.records[-1].output == "Test error"